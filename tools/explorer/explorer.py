@@ -20,6 +20,7 @@ import colorama
 from termcolor import colored
 
 from lib import arg_parser
+from lib import batch_match
 from lib import explorer_handler
 from lib import parse_input
 
@@ -28,9 +29,14 @@ colorama.init()
 
 def main(parsed_args):
   """Main method for DBO explorer."""
+  if parsed_args.batch_input:
+    batch_match.RunFromArgs(parsed_args)
+    return
   print('Starting DBO explorer...')
 
-  ontology = explorer_handler.Build(parsed_args.modified_types_filepath)
+  ontology = explorer_handler.Build(
+      parsed_args.modified_types_filepath, parsed_args.index_cache_dir
+  )
   done = False
   while not done:
     try:
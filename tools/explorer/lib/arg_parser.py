@@ -15,6 +15,8 @@
 
 import argparse
 
+from lib import constants
+
 
 def ParseArgs() -> argparse.ArgumentParser:
   """Generates an argument parser for user input.
@@ -35,4 +37,94 @@ def ParseArgs() -> argparse.ArgumentParser:
       metavar='FILE',
   )
 
+  parser.add_argument(
+      '-b',
+      '--batch-input',
+      dest='batch_input',
+      required=False,
+      help=(
+          'Filepath to a JSON or CSV file of device field lists to match to '
+          'entity types without prompting.'
+      ),
+      metavar='FILE',
+  )
+
+  parser.add_argument(
+      '-o',
+      '--batch-output',
+      dest='batch_output',
+      required=False,
+      help=(
+          'Filepath for batch matches, written as CSV if it ends in .csv and '
+          'as JSON Lines otherwise. Defaults to stdout.'
+      ),
+      metavar='FILE',
+  )
+
+  parser.add_argument(
+      '--output-format',
+      dest='output_format',
+      required=False,
+      choices=['jsonl', 'csv'],
+      help='Format of batch matches, overriding the output file extension.',
+  )
+
+  parser.add_argument(
+      '-n',
+      '--matches',
+      dest='matches',
+      required=False,
+      type=int,
+      default=10,
+      help='Number of ranked matches per device, or all types if 0.',
+  )
+
+  parser.add_argument(
+      '-g',
+      '--general-type',
+      dest='general_type',
+      required=False,
+      help='General type name to filter batch matches, e.g. AHU.',
+  )
+
+  parser.add_argument(
+      '-p',
+      '--processes',
+      dest='processes',
+      required=False,
+      type=int,
+      default=1,
+      help='Number of processes used for batch matching.',
+  )
+
+  parser.add_argument(
+      '--sparse-scoring',
+      dest='sparse_scoring',
+      action='store_true',
+      help=(
+          'Score batches of devices at once with sparse matrix products. '
+          'Requires numpy and scipy.'
+      ),
+  )
+
+  parser.add_argument(
+      '--index-cache-dir',
+      dest='index_cache_dir',
+      required=False,
+      default=constants.INDEX_CACHE_DIR,
+      help=(
+          'Directory of persisted explorer indexes, keyed by ontology content '
+          'hash, used to skip rebuilding an unchanged ontology.'
+      ),
+      metavar='DIR',
+  )
+
+  parser.add_argument(
+      '--no-index-cache',
+      dest='index_cache_dir',
+      action='store_const',
+      const=None,
+      help='Always build the ontology without reading or writing an index.',
+  )
+
   return parser
@@ -0,0 +1,405 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Non-interactive matching of many devices' field lists to entity types.
+
+Input is either a JSON object mapping device ids to lists of field names, or a
+CSV file with a header containing device_id and field_name columns, one point
+per row. Ranked matches are streamed as JSON Lines, one object per device, or
+as CSV, one row per device and match.
+"""
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from lib import explorer_handler
+from lib import parse_input
+from lib import sparse_scoring as sparse_scoring_lib
+from lib.model import Match
+from lib.model import StandardField
+from lib.ontology_wrapper import OntologyWrapper
+
+JSONL_FORMAT = 'jsonl'
+CSV_FORMAT = 'csv'
+OUTPUT_FORMATS = (JSONL_FORMAT, CSV_FORMAT)
+
+DEVICE_ID_COLUMN = 'device_id'
+FIELD_NAME_COLUMN = 'field_name'
+CSV_OUTPUT_COLUMNS = (DEVICE_ID_COLUMN, 'rank', 'entity_type', 'score')
+
+DEFAULT_CHUNK_SIZE = 16
+
+# Ontology of the current process. Set before the pool is forked so that
+# workers share the parent's copy, or built once per worker otherwise.
+_ontology: Optional[OntologyWrapper] = None
+
+
+def ReadDeviceFields(input_path: str) -> Iterator[Tuple[str, List[str]]]:
+  """Reads device ids and their field names from a JSON or CSV file.
+
+  Args:
+    input_path: path to a .json file mapping device ids to field name lists, or
+      to a CSV file with device_id and field_name columns.
+
+  Yields:
+    (device id, list of field names) tuples in input order.
+
+  Raises:
+    ValueError: if the file content does not have the expected shape.
+  """
+  if os.path.splitext(input_path)[1].lower() == '.json':
+    with open(input_path, 'r', encoding='utf-8') as input_file:
+      device_fields = json.load(input_file)
+    if not isinstance(device_fields, dict):
+      raise ValueError(
+          f'{input_path} must contain an object of device ids to field lists.'
+      )
+    for device_id, field_names in device_fields.items():
+      if not isinstance(field_names, list):
+        raise ValueError(f'Fields of device {device_id} must be a list.')
+      yield device_id, [str(field_name) for field_name in field_names]
+    return
+
+  with open(input_path, 'r', encoding='utf-8', newline='') as input_file:
+    reader = csv.DictReader(input_file)
+    missing_columns = {DEVICE_ID_COLUMN, FIELD_NAME_COLUMN} - set(
+        reader.fieldnames or []
+    )
+    if missing_columns:
+      raise ValueError(
+          f'{input_path} is missing columns: {sorted(missing_columns)}'
+      )
+    device_fields: Dict[str, List[str]] = {}
+    for row in reader:
+      device_fields.setdefault(row[DEVICE_ID_COLUMN], []).append(
+          row[FIELD_NAME_COLUMN]
+      )
+  yield from device_fields.items()
+
+
+def _PrepareDevice(
+    device_id: str, field_names: List[str]
+) -> Tuple[Dict[str, Any], Optional[List[StandardField]]]:
+  """Returns the result skeleton of a device and its parsed field list.
+
+  The field list is None, and the result holds an error message, if the
+  device cannot be matched.
+  """
+  field_names = [
+      field_name
+      for field_name in (name.strip() for name in field_names)
+      if field_name
+  ]
+  result = {DEVICE_ID_COLUMN: device_id, 'field_count': len(field_names)}
+  if not field_names:
+    result['error'] = 'Device has no fields.'
+    return result, None
+  return result, parse_input.ParseStandardFields(field_names)
+
+
+def _FormatMatches(matches: List[Match]) -> List[Dict[str, Any]]:
+  """Returns the rank, qualified entity type name and score of matches."""
+  return [
+      {
+          'rank': rank,
+          'entity_type': (
+              match.GetEntityType().namespace.namespace
+              + '/'
+              + match.GetEntityType().typename
+          ),
+          'score': match.GetMatchScore(),
+      }
+      for rank, match in enumerate(matches, start=1)
+  ]
+
+
+def MatchDevice(
+    ontology: OntologyWrapper,
+    device_id: str,
+    field_names: List[str],
+    return_size: int = parse_input.DEFAULT_MATCHED_TYPES_LIST_SIZE,
+    general_type: Optional[str] = None,
+) -> Dict[str, Any]:
+  """Ranks entity types for the field list of one device.
+
+  Args:
+    ontology: An instance of the OntologyWrapper class.
+    device_id: id of the device, copied to the result.
+    field_names: field names of the device, with optional increments.
+    return_size: number of matches to return, or all types if not positive.
+    general_type: [Optional] a general type name to filter matches.
+
+  Returns:
+    A dictionary with the device id, its field count and a list of matches
+    with their rank, namespace-qualified entity type name and score. If the
+    device cannot be matched it holds an error message instead of matches.
+  """
+  result, field_list = _PrepareDevice(device_id, field_names)
+  if field_list is not None:
+    result['matches'] = _FormatMatches(
+        ontology.GetEntityTypesFromFields(
+            field_list, return_size=return_size, general_type=general_type
+        )
+    )
+  return result
+
+
+def MatchDevices(
+    ontology: OntologyWrapper,
+    devices: List[Tuple[str, List[str]]],
+    return_size: int = parse_input.DEFAULT_MATCHED_TYPES_LIST_SIZE,
+    general_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+  """Ranks entity types for the field lists of many devices at once.
+
+  The field lists are scored together with
+  OntologyWrapper.GetEntityTypesFromFieldLists(), with sparse matrix products
+  if NumPy and SciPy are installed. Results equal those of MatchDevice().
+
+  Args:
+    ontology: An instance of the OntologyWrapper class.
+    devices: (device id, list of field names) tuples.
+    return_size: number of matches per device, or all types if not positive.
+    general_type: [Optional] a general type name to filter matches.
+
+  Returns:
+    The result of each device, as returned by MatchDevice(), in input order.
+  """
+  prepared = [
+      _PrepareDevice(device_id, field_names)
+      for device_id, field_names in devices
+  ]
+  field_lists = [
+      field_list for _, field_list in prepared if field_list is not None
+  ]
+  matches = iter(
+      ontology.GetEntityTypesFromFieldLists(
+          field_lists, return_size=return_size, general_type=general_type
+      )
+  )
+  for result, field_list in prepared:
+    if field_list is not None:
+      result['matches'] = _FormatMatches(next(matches))
+  return [result for result, _ in prepared]
+
+
+def _InitWorker(
+    ontology_path: Optional[str], index_cache_dir: Optional[str]
+) -> None:
+  """Builds the ontology in a worker that did not inherit it."""
+  global _ontology
+  if _ontology is None:
+    # Workers share stdout with the parent, which may be streaming matches
+    with contextlib.redirect_stdout(sys.stderr):
+      _ontology = explorer_handler.Build(ontology_path, index_cache_dir)
+
+
+def _MatchDeviceInWorker(
+    task: Tuple[str, List[str], int, Optional[str]],
+) -> Dict[str, Any]:
+  device_id, field_names, return_size, general_type = task
+  return MatchDevice(
+      _ontology, device_id, field_names, return_size, general_type
+  )
+
+
+def _MatchDevicesInWorker(
+    task: Tuple[List[Tuple[str, List[str]]], int, Optional[str]],
+) -> List[Dict[str, Any]]:
+  devices, return_size, general_type = task
+  return MatchDevices(_ontology, devices, return_size, general_type)
+
+
+def _Batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+  """Yields consecutive lists of at most batch_size items."""
+  items = iter(items)
+  while True:
+    batch = list(itertools.islice(items, batch_size))
+    if not batch:
+      return
+    yield batch
+
+
+def _WriteResult(
+    result: Dict[str, Any], output_format: str, output_file: TextIO, writer
+) -> None:
+  """Writes the matches of one device in the output format."""
+  if output_format == JSONL_FORMAT:
+    output_file.write(json.dumps(result) + '\n')
+    return
+  if 'error' in result:
+    print(
+        f'[WARNING]\t{result[DEVICE_ID_COLUMN]}: {result["error"]}',
+        file=sys.stderr,
+    )
+    return
+  for match in result['matches']:
+    writer.writerow({DEVICE_ID_COLUMN: result[DEVICE_ID_COLUMN], **match})
+
+
+def GetOutputFormat(output_path: Optional[str]) -> str:
+  """Returns the output format implied by a file extension, JSONL by default."""
+  if output_path and output_path.lower().endswith('.' + CSV_FORMAT):
+    return CSV_FORMAT
+  return JSONL_FORMAT
+
+
+def RunBatchMatch(
+    ontology: OntologyWrapper,
+    input_path: str,
+    output_path: Optional[str] = None,
+    output_format: Optional[str] = None,
+    return_size: int = parse_input.DEFAULT_MATCHED_TYPES_LIST_SIZE,
+    general_type: Optional[str] = None,
+    processes: int = 1,
+    ontology_path: Optional[str] = None,
+    index_cache_dir: Optional[str] = None,
+    sparse_scoring: bool = False,
+) -> int:
+  """Matches every device of an input file and streams ranked matches.
+
+  Results are written in input order as soon as they are available. With more
+  than one process, devices are matched in a process pool. Where processes are
+  forked, workers share the already built ontology; otherwise each worker
+  builds or loads it once from ontology_path and index_cache_dir. With
+  sparse_scoring, devices are matched in batches with MatchDevices().
+
+  Args:
+    ontology: An instance of the OntologyWrapper class.
+    input_path: path to the JSON or CSV file of device field lists.
+    output_path: [Optional] path of the output file; stdout if not set.
+    output_format: [Optional] 'jsonl' or 'csv'; inferred from output_path if
+      not set.
+    return_size: number of matches per device, or all types if not positive.
+    general_type: [Optional] a general type name to filter matches.
+    processes: number of worker processes.
+    ontology_path: [Optional] path of the modified ontology used to build
+      ontology, for workers which do not inherit it.
+    index_cache_dir: [Optional] directory of persisted explorer indexes, for
+      workers which do not inherit the ontology.
+    sparse_scoring: if True, score batches of devices at once with sparse
+      matrix products.
+
+  Returns:
+    The number of devices matched.
+  """
+  global _ontology
+  output_format = output_format or GetOutputFormat(output_path)
+  if output_format not in OUTPUT_FORMATS:
+    raise ValueError(f'Output format must be one of {OUTPUT_FORMATS}.')
+  if sparse_scoring and not sparse_scoring_lib.SPARSE_SCORING_AVAILABLE:
+    print(
+        '[WARNING]\tSparse match scoring requires numpy and scipy; matching'
+        ' each device in turn.',
+        file=sys.stderr,
+    )
+  if sparse_scoring:
+    tasks = (
+        (devices, return_size, general_type)
+        for devices in _Batches(
+            ReadDeviceFields(input_path), sparse_scoring_lib.DEFAULT_BATCH_SIZE
+        )
+    )
+    match_function = MatchDevices
+    worker_function = _MatchDevicesInWorker
+    chunk_size = 1
+  else:
+    tasks = (
+        (device_id, field_names, return_size, general_type)
+        for device_id, field_names in ReadDeviceFields(input_path)
+    )
+    match_function = MatchDevice
+    worker_function = _MatchDeviceInWorker
+    chunk_size = DEFAULT_CHUNK_SIZE
+
+  if output_path:
+    output_file = open(output_path, 'w', encoding='utf-8', newline='')
+  else:
+    output_file = sys.stdout
+  writer = None
+  if output_format == CSV_FORMAT:
+    writer = csv.DictWriter(output_file, fieldnames=CSV_OUTPUT_COLUMNS)
+    writer.writeheader()
+
+  device_count = 0
+  pool = None
+  try:
+    if processes > 1:
+      # Build the index once before forking, so workers do not each build it.
+      _ = ontology.type_index
+      if sparse_scoring:
+        _ = ontology.sparse_scorer
+      _ontology = ontology
+      if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+      else:
+        context = multiprocessing.get_context()
+      pool = context.Pool(
+          processes,
+          initializer=_InitWorker,
+          initargs=(ontology_path, index_cache_dir),
+      )
+      results = pool.imap(worker_function, tasks, chunksize=chunk_size)
+    else:
+      results = (match_function(ontology, *task) for task in tasks)
+    if sparse_scoring:
+      results = itertools.chain.from_iterable(results)
+    for result in results:
+      _WriteResult(result, output_format, output_file, writer)
+      device_count += 1
+  finally:
+    if pool is not None:
+      pool.close()
+      pool.join()
+      _ontology = None
+    if output_path:
+      output_file.close()
+  print(f'[INFO]\tMatched {device_count} devices.', file=sys.stderr)
+  return device_count
+
+
+def RunFromArgs(parsed_args: argparse.Namespace) -> int:
+  """Builds the ontology and runs batch matching for the explorer arguments.
+
+  Matches may be streamed to stdout, so the banner and every diagnostic
+  printed while building the ontology go to stderr instead.
+
+  Args:
+    parsed_args: command line arguments parsed by arg_parser.ParseArgs().
+
+  Returns:
+    The number of devices matched.
+  """
+  with contextlib.redirect_stdout(sys.stderr):
+    print('Starting DBO explorer...')
+    ontology = explorer_handler.Build(
+        parsed_args.modified_types_filepath, parsed_args.index_cache_dir
+    )
+  return RunBatchMatch(
+      ontology,
+      parsed_args.batch_input,
+      output_path=parsed_args.batch_output,
+      output_format=parsed_args.output_format,
+      return_size=parsed_args.matches,
+      general_type=parsed_args.general_type,
+      processes=parsed_args.processes,
+      ontology_path=parsed_args.modified_types_filepath,
+      index_cache_dir=parsed_args.index_cache_dir,
+      sparse_scoring=parsed_args.sparse_scoring,
+  )
@@ -28,3 +28,8 @@ else:
 
 APPLICATION_ROOT = path.join(REPO_ROOT, 'tools', 'explorer', 'lib')
 ONTOLOGY_ROOT = path.join(REPO_ROOT, 'ontology', 'yaml', 'resources')
+
+# default directory of persisted explorer indexes
+INDEX_CACHE_DIR = path.join(
+    path.expanduser('~'), '.cache', 'digitalbuildings', 'explorer'
+)
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Main module for DBO explorer."""
+from typing import Optional
+
 from lib import constants
+from lib import index_cache
 from lib.ontology_wrapper import OntologyWrapper
 
 from yamlformat.validator import external_file_lib
@@ -20,11 +23,17 @@ from yamlformat.validator import namespace_validator as nv
 from yamlformat.validator import presubmit_validate_types_lib
 
 
-def Build(ontology_path: str) -> OntologyWrapper:
+def Build(
+    ontology_path: str, index_cache_dir: Optional[str] = None
+) -> OntologyWrapper:
   """A constructor for the ontology explorer.
 
   Args:
     ontology_path: A path for an alternative ontology extended from DBO.
+    index_cache_dir: [Optional] A directory of persisted explorer indexes. If
+      set, the ontology is loaded from the index matching the content hash of
+      its files when one exists, and an index is written after building it
+      otherwise.
 
   Returns:
     ontology: An instance of the OntologyWrapper class.
@@ -34,10 +43,20 @@ def Build(ontology_path: str) -> OntologyWrapper:
   else:
     yaml_file_path = constants.ONTOLOGY_ROOT
   yaml_files = external_file_lib.RecursiveDirWalk(yaml_file_path)
+  index_path = None
+  if index_cache_dir:
+    index_path = index_cache.GetIndexPath(
+        index_cache_dir, index_cache.ComputeOntologyHash(yaml_files)
+    )
+    ontology = index_cache.LoadIndex(index_path)
+    if ontology is not None:
+      return ontology
   config = presubmit_validate_types_lib.SeparateConfigFiles(yaml_files)
   universe = presubmit_validate_types_lib.BuildUniverse(
       config, require_type_guids=False
   )
   nv.NamespaceValidator(universe.GetEntityTypeNamespaces())
   ontology = OntologyWrapper(universe)
+  if index_path is not None:
+    index_cache.SaveIndex(ontology, index_path)
   return ontology
@@ -0,0 +1,87 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persisted explorer index keyed by the hash of the ontology and code.
+
+The index is a pickle of a fully built OntologyWrapper, holding the universe
+with expanded type fields, the EntityTypeManager and the entity type index.
+It is written once per distinct ontology and loaded in a single read.
+
+Only load index files written by this module into a cache directory you
+control: unpickling runs code named by the file.
+"""
+import os
+from typing import List, Optional
+
+from lib import ontology_wrapper
+from lib.ontology_wrapper import OntologyWrapper
+from yamlformat.validator import base_lib
+from yamlformat.validator import pickle_cache_lib
+
+# Directories of the modules defining the classes of an index, whose sources
+# are part of the cache key.
+_SOURCE_DIRS = (
+    os.path.dirname(os.path.abspath(ontology_wrapper.__file__)),
+    os.path.dirname(os.path.abspath(base_lib.__file__)),
+)
+
+
+def ComputeOntologyHash(yaml_files: List[base_lib.PathParts]) -> str:
+  """Computes a hash of ontology file paths and contents and explorer code.
+
+  Args:
+    yaml_files: PathParts of the ontology yaml files.
+
+  Returns:
+    A hex sha256 digest, which changes if any file is added, removed, renamed
+    or edited, or if the code of the explorer or validator changes.
+  """
+  return pickle_cache_lib.ComputeFilesHash(
+      sorted(yaml_files, key=lambda parts: parts.relative_path),
+      pickle_cache_lib.SourceFingerprint(*_SOURCE_DIRS),
+  )
+
+
+def GetIndexPath(cache_dir: str, ontology_hash: str) -> str:
+  """Returns the path of the index file of an ontology in cache_dir."""
+  return pickle_cache_lib.GetPicklePath(cache_dir, ontology_hash)
+
+
+def LoadIndex(index_path: str) -> Optional[OntologyWrapper]:
+  """Loads a persisted OntologyWrapper.
+
+  Args:
+    index_path: path of an index file written by SaveIndex().
+
+  Returns:
+    The OntologyWrapper, or None if the file is missing or unreadable.
+  """
+  return pickle_cache_lib.LoadPickle(
+      index_path, OntologyWrapper, 'explorer index'
+  )
+
+
+def SaveIndex(ontology: OntologyWrapper, index_path: str) -> None:
+  """Persists an OntologyWrapper with its entity type index built.
+
+  The file is written atomically, so a concurrent or interrupted run never
+  leaves a partial index behind.
+
+  Args:
+    ontology: An instance of the OntologyWrapper class.
+    index_path: path of the index file to write.
+  """
+  # Build lazily constructed lookups so they are persisted too.
+  _ = ontology.type_index
+  ontology.universe.field_universe.GetSubfieldIndex()
+  pickle_cache_lib.SavePickle(ontology, index_path, 'explorer index')
@@ -14,6 +14,7 @@
 
 """Ontology wrapper class for DBO explorer."""
 from typing import List
+from typing import Optional
 from typing import Set
 
 import colorama
@@ -23,6 +24,10 @@ from lib.model import EntityTypeField
 from lib.model import Match
 from lib.model import StandardField
 from lib.model import StandardizeField
+from lib.sparse_scoring import SPARSE_SCORING_AVAILABLE
+from lib.sparse_scoring import SparseMatchScorer
+from lib.type_index import CalculateMatchScore
+from lib.type_index import EntityTypeIndex
 from yamlformat.validator.entity_type_lib import EntityType
 from yamlformat.validator.entity_type_manager import EntityTypeManager
 from yamlformat.validator.presubmit_validate_types_lib import ConfigUniverse
@@ -38,6 +43,10 @@ class OntologyWrapper(object):
     manager: An EntityTypeManager object to find greatest common subsets of
       fields between entity types and complete lists of inherited fields for a
       concrete entity. This is primarily used for _CreateMatch().
+    type_index: An EntityTypeIndex from fields to the concrete entity types
+      using them, built on first use by GetEntityTypesFromFields().
+    sparse_scorer: A SparseMatchScorer over type_index, built on first use by
+      GetEntityTypesFromFieldLists(), or None if NumPy and SciPy are missing.
 
   Returns:
     An instance of OntologyWrapper class.
@@ -53,6 +62,20 @@ class OntologyWrapper(object):
     super().__init__()
     self.universe = universe
     self.manager = EntityTypeManager(self.universe)
+    self._type_index = None
+    self._sparse_scorer = None
+
+  @property
+  def type_index(self) -> EntityTypeIndex:
+    if self._type_index is None:
+      self._type_index = EntityTypeIndex(self.universe)
+    return self._type_index
+
+  @property
+  def sparse_scorer(self) -> Optional[SparseMatchScorer]:
+    if self._sparse_scorer is None and SPARSE_SCORING_AVAILABLE:
+      self._sparse_scorer = SparseMatchScorer(self.type_index)
+    return self._sparse_scorer
 
   def GetFieldsForTypeName(
       self, namespace: str, entity_type_name: str, required_only: bool = False
@@ -150,31 +173,13 @@ class OntologyWrapper(object):
         concrete_fields.intersection(required_canonical_fields)
     )
 
-    total_required_type_fields = len(required_canonical_fields)
-    total_entity_fields = len(concrete_fields)
-    unmatched_entity_fields = len(
-        concrete_fields.difference(standard_canonical_fields)
-    )
-    unmatched_required_fields = len(
-        required_canonical_fields.difference(concrete_fields)
+    return CalculateMatchScore(
+        matched_fields,
+        matched_required_fields,
+        len(concrete_fields),
+        len(required_canonical_fields),
     )
 
-    if total_entity_fields <= 0:
-      raise ValueError('Concrete field set cannot be empty.')
-
-    total_precision = matched_fields - unmatched_entity_fields
-    total_precision /= total_entity_fields
-
-    if total_required_type_fields <= 0:
-      match_score = total_precision / 2.0
-    else:
-      required_precision = matched_required_fields - unmatched_required_fields
-      required_precision /= total_required_type_fields
-      match_score = (total_precision + required_precision) / 2.0
-    final_score = int((match_score + 1.0) * 50)
-    assert final_score in range(0, 101), f'Score: {final_score} out of range'
-    return final_score
-
   def _CreateMatch(
       self, field_list: List[StandardField], entity_type: EntityType
   ) -> Match:
@@ -217,6 +222,10 @@ class OntologyWrapper(object):
   ) -> List[Match]:
     """Get a list of Match objects for all entity types defined in DBO.
 
+    Matching uses an inverted index from fields to entity types, so only types
+    sharing at least one field with field_list are scored. The result is the
+    same as scoring every type with _CreateMatch() and sorting by score.
+
     Args:
       field_list: A list of StandardField objects to match to an entity.
       return_size: An int for the length of the return list of matches. e.g. if
@@ -228,28 +237,50 @@ class OntologyWrapper(object):
     Returns:
       A sorted list of Match objects.
     """
-    entity_type_list = []
-    type_namespaces_list = self.universe.GetEntityTypeNamespaces()
-    for tns in type_namespaces_list:
-      for entity_type in tns.valid_types_map.values():
-        if entity_type.is_abstract or not entity_type.GetAllFields():
-          continue
-        if general_type is not None:
-          if general_type.upper() in entity_type.unqualified_parent_names:
-            entity_type_list.append(entity_type)
-        else:
-          entity_type_list.append(entity_type)
-
-    match_list = []
-    for entity_type in entity_type_list:
-      match_list.append(self._CreateMatch(field_list, entity_type))
-
-    match_list_sorted = sorted(
-        match_list, key=lambda x: x.GetMatchScore(), reverse=True
+    ranked_types = self.type_index.Query(
+        field_list, return_size=return_size, general_type=general_type
+    )
+    return [
+        Match(field_list, entity_type, match_score)
+        for entity_type, match_score in ranked_types
+    ]
+
+  def GetEntityTypesFromFieldLists(
+      self,
+      field_lists: List[List[StandardField]],
+      return_size: int = 0,
+      general_type: str = None,
+  ) -> List[List[Match]]:
+    """Get sorted Match objects for each of many field lists at once.
+
+    If NumPy and SciPy are installed, all field lists are scored in bulk with
+    sparse matrix products. Otherwise each list is matched with
+    GetEntityTypesFromFields(). Both give the same results.
+
+    Args:
+      field_lists: A list of lists of StandardField objects to match.
+      return_size: An int for the length of each returned list of matches.
+      general_type: A string indicating a general type name to filter return
+        results.
+
+    Returns:
+      A sorted list of Match objects for each field list, in input order.
+    """
+    if self.sparse_scorer is None:
+      return [
+          self.GetEntityTypesFromFields(field_list, return_size, general_type)
+          for field_list in field_lists
+      ]
+    ranked_lists = self.sparse_scorer.RankBatch(
+        field_lists, return_size=return_size, general_type=general_type
     )
-    if return_size > 0:
-      return match_list_sorted[:return_size]
-    return match_list_sorted
+    return [
+        [
+            Match(field_list, entity_type, match_score)
+            for entity_type, match_score in ranked_types
+        ]
+        for field_list, ranked_types in zip(field_lists, ranked_lists)
+    ]
 
   def _PopulateMatrix(self, match: Match):
     """Creates a matrix defining field relationships between an entity and type.
@@ -22,7 +22,6 @@ import colorama
 from collections import defaultdict
 from termcolor import colored
 
-from lib import model
 from lib.model import StandardField
 from yamlformat.validator.field_lib import FIELD_INCREMENT_REGEX
 
@@ -38,8 +37,20 @@ def _InputFieldsFromUser() -> List[StandardField]:
     A list of StandardField objects corresponding to the input field names.
   """
   raw_input_string = input('Enter your fields here as a comma separated list: ')
+  return ParseStandardFields(re.split(DELIMITER_REGEX, raw_input_string))
+
+
+def ParseStandardFields(field_names: List[str]) -> List[StandardField]:
+  """Parses field names with optional increments into StandardFields.
+
+  Args:
+    field_names: a list of global field names, e.g. supply_air_flowrate_sensor_1
+
+  Returns:
+    A list of StandardField objects corresponding to the field names.
+  """
   standard_field_list = []
-  for field in re.split(DELIMITER_REGEX, raw_input_string):
+  for field in field_names:
     split_field = re.split(FIELD_INCREMENT_REGEX, field)
     standard_field = StandardField(
         standard_field_name=split_field[0],
@@ -143,21 +154,14 @@ def ValidateFieldName(ontology):
     ontology: An instance of the OntologyWrapper class
   """
   raw_fields = input('Enter fields to validate as a comma separated list: ')
-  fields = re.split(DELIMITER_REGEX, raw_fields)
+  fields = [field for field in re.split(DELIMITER_REGEX, raw_fields) if field]
   global_namespace_string = 'GLOBAL'
-  namespace_list = ['', 'HVAC', 'LIGHTING']
-  valid_fields_map = {}
+  field_universe = ontology.universe.field_universe
   for field_name in fields:
-    valid_fields_map[field_name] = []
-    for namespace in namespace_list:
-      standard_field = model.StandardField(namespace, field_name)
-      if ontology.IsFieldValid(standard_field):
-        if not namespace:
-          valid_fields_map.get(field_name).append(global_namespace_string)
-        else:
-          valid_fields_map.get(field_name).append(namespace)
-  for field_name in fields:
-    valid_namespaces = valid_fields_map.get(field_name)
+    valid_namespaces = [
+        namespace or global_namespace_string
+        for namespace in field_universe.GetFieldNamespaces(field_name)
+    ]
     if valid_namespaces:
       print(
           colored(
@@ -168,6 +172,18 @@ def ValidateFieldName(ontology):
       )
     else:
       print(colored(f'{field_name} is not defined in the ontology', 'red'))
+      suggestions = field_universe.GetFieldSuggestions(field_name)
+      if suggestions:
+        print(
+            colored(
+                'Did you mean: '
+                + ', '.join(
+                    suggestion.lstrip('/') for suggestion in suggestions
+                )
+                + '?',
+                'yellow',
+            )
+        )
 
 
 def GetFieldsForSubfieldList(ontology):
@@ -177,19 +193,19 @@ def GetFieldsForSubfieldList(ontology):
     ontology: An instance of the OntologyWrapper class
   """
   raw_subfields = input('Enter your subfields here as a comma separated list: ')
-  subfields = re.split(DELIMITER_REGEX, raw_subfields)
-
-  all_fields = ontology.universe.field_universe.GetFieldsMap()
-
-  complete_match_list = []
-
-  for field in all_fields:
-    if all(subfield in field for subfield in subfields):
-      complete_match_list.append(field[1:])
+  subfields = [
+      subfield
+      for subfield in re.split(DELIMITER_REGEX, raw_subfields)
+      if subfield
+  ]
+
+  complete_match_list = ontology.universe.field_universe.GetFieldsWithSubfields(
+      subfields
+  )
 
   print(f'\nComplete matches for {subfields}:')
-  for field in sorted(complete_match_list, key=lambda x: x, reverse=False):
-    print(colored(field, 'green'))
+  for field in complete_match_list:
+    print(colored(field.lstrip('/'), 'green'))
 
 
 def CompareFieldsToSpecifiedType(ontology, point_list_input):
@@ -355,6 +371,12 @@ def CompareFieldsToSpecifiedType(ontology, point_list_input):
 
 
 def CheckIfAbstractTypeExists(ontology):
+    """Checks whether a constructed type name, or a permutation, is defined.
+
+    Types are matched by name only: a permutation of the components of a
+    name is a naming conflict whatever the types inherit from, so the type
+    hierarchy is not consulted.
+    """
     input_type = input("Enter constructed typeName: ").strip()
     input_parts = input_type.split('_')
     if len(input_parts) < 2:
@@ -0,0 +1,206 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Vectorized match scoring of many field lists with sparse matrices.
+
+Entity types are encoded as a sparse type-by-field incidence matrix and a
+required-field mask of the same shape. A batch of concrete field lists is a
+sparse query-by-field matrix, so the matched and matched required field counts
+of every query and type are two sparse matrix products.
+
+This module requires NumPy and SciPy, which are optional dependencies of the
+explorer. Check SPARSE_SCORING_AVAILABLE before using it.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from lib.model import StandardField
+from lib.type_index import EntityTypeIndex
+from lib.type_index import GetFieldKey
+from yamlformat.validator.entity_type_lib import EntityType
+
+try:
+  # pylint: disable=g-import-not-at-top
+  import numpy as np
+  from scipy import sparse
+
+  SPARSE_SCORING_AVAILABLE = True
+except ImportError:
+  np = None
+  sparse = None
+  SPARSE_SCORING_AVAILABLE = False
+
+# Number of field lists scored together when ranking, which bounds the size of
+# the dense query-by-type score matrix.
+DEFAULT_BATCH_SIZE = 256
+
+
+class SparseMatchScorer(object):
+  """Scores batches of field lists against every type of an EntityTypeIndex.
+
+  Scores are identical to CalculateMatchScore(), and ranking breaks ties by
+  type position the same way EntityTypeIndex.Query() does.
+
+  Attributes:
+    type_index: the EntityTypeIndex whose types are scored.
+    field_columns: a mapping of field keys to incidence matrix columns.
+  """
+
+  def __init__(self, type_index: EntityTypeIndex):
+    """Init.
+
+    Args:
+      type_index: an EntityTypeIndex of the types to score against.
+
+    Raises:
+      ImportError: if NumPy or SciPy is not installed.
+    """
+    super().__init__()
+    if not SPARSE_SCORING_AVAILABLE:
+      raise ImportError('Sparse match scoring requires numpy and scipy.')
+    self.type_index = type_index
+    self.field_columns: Dict[Tuple[str, str, str], int] = {}
+    rows = []
+    columns = []
+    required = []
+    for position, entity_type in enumerate(type_index.entity_types):
+      for qualified_field in entity_type.GetAllFields().values():
+        field = qualified_field.field
+        field_key = (field.namespace, field.field, field.increment)
+        column = self.field_columns.setdefault(
+            field_key, len(self.field_columns)
+        )
+        rows.append(position)
+        columns.append(column)
+        required.append(not qualified_field.optional)
+
+    shape = (len(type_index.entity_types), len(self.field_columns))
+    rows = np.array(rows, dtype=np.int32)
+    columns = np.array(columns, dtype=np.int32)
+    required = np.array(required, dtype=bool)
+    self._incidence_t = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)), shape=shape
+    ).T.tocsr()
+    self._required_t = sparse.csr_matrix(
+        (
+            np.ones(required.sum(), dtype=np.int32),
+            (rows[required], columns[required]),
+        ),
+        shape=shape,
+    ).T.tocsr()
+    self._required_counts = np.array(type_index.required_counts, dtype=np.int64)
+
+  def _QueryMatrix(self, field_lists: List[List[StandardField]]):
+    """Encodes field lists as a query-by-field matrix and field totals."""
+    rows = []
+    columns = []
+    totals = np.zeros(len(field_lists), dtype=np.int64)
+    for row, field_list in enumerate(field_lists):
+      field_keys = {GetFieldKey(field) for field in field_list}
+      if not field_keys:
+        raise ValueError('Concrete field set cannot be empty.')
+      totals[row] = len(field_keys)
+      for field_key in field_keys:
+        column = self.field_columns.get(field_key)
+        if column is not None:
+          rows.append(row)
+          columns.append(column)
+    query = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+        shape=(len(field_lists), len(self.field_columns)),
+    )
+    return query, totals
+
+  def ScoreBatch(self, field_lists: List[List[StandardField]]):
+    """Scores every field list against every indexed type.
+
+    Args:
+      field_lists: lists of StandardField objects of concrete entities.
+
+    Returns:
+      An integer array of shape (len(field_lists), number of types) holding
+      match scores in [0, 100], with columns in type position order.
+
+    Raises:
+      ValueError: if a field list is empty.
+    """
+    query, totals = self._QueryMatrix(field_lists)
+    matched = (query @ self._incidence_t).toarray().astype(np.int64)
+    matched_required = (query @ self._required_t).toarray().astype(np.int64)
+
+    # Same operations as CalculateMatchScore(), elementwise in float64, so the
+    # scores are bit-for-bit identical.
+    totals = totals[:, np.newaxis]
+    required_counts = self._required_counts[np.newaxis, :]
+    total_precision = (matched - (totals - matched)) / totals
+    has_required = required_counts > 0
+    required_precision = (
+        matched_required - (required_counts - matched_required)
+    ) / np.where(has_required, required_counts, 1)
+    match_score = np.where(
+        has_required,
+        (total_precision + required_precision) / 2.0,
+        total_precision / 2.0,
+    )
+    return np.trunc((match_score + 1.0) * 50).astype(np.int64)
+
+  def RankBatch(
+      self,
+      field_lists: List[List[StandardField]],
+      return_size: int = 0,
+      general_type: Optional[str] = None,
+      batch_size: int = DEFAULT_BATCH_SIZE,
+  ) -> List[List[Tuple[EntityType, int]]]:
+    """Ranks entity types by match score for each of many field lists.
+
+    Args:
+      field_lists: lists of StandardField objects of concrete entities.
+      return_size: number of results per list, or all types if not positive.
+      general_type: [Optional] a general type name to filter results.
+      batch_size: number of field lists scored in one matrix product.
+
+    Returns:
+      For each field list, a list of (EntityType, score) tuples sorted by
+      descending score, equal to EntityTypeIndex.Query() for that list.
+    """
+    positions = np.arange(len(self.type_index.entity_types))
+    if general_type is not None:
+      positions = np.array(
+          sorted(
+              position
+              for position, entity_type in enumerate(
+                  self.type_index.entity_types
+              )
+              if general_type.upper() in entity_type.unqualified_parent_names
+          ),
+          dtype=np.int64,
+      )
+    ranked_lists = []
+    for start in range(0, len(field_lists), batch_size):
+      batch = field_lists[start : start + batch_size]
+      if not positions.size:
+        ranked_lists.extend([] for _ in batch)
+        continue
+      scores = self.ScoreBatch(batch)[:, positions]
+      for row_scores in scores:
+        # A stable sort on descending score keeps ties in position order.
+        order = np.argsort(-row_scores, kind='stable')
+        if return_size > 0:
+          order = order[:return_size]
+        ranked_lists.append([
+            (
+                self.type_index.entity_types[positions[column]],
+                int(row_scores[column]),
+            )
+            for column in order
+        ])
+    return ranked_lists
@@ -0,0 +1,238 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Inverted field index for matching field lists to entity types."""
+import collections
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lib.model import StandardField
+from yamlformat.validator.entity_type_lib import EntityType
+from yamlformat.validator.presubmit_validate_types_lib import ConfigUniverse
+
+# (namespace, standard field name, increment) of a field.
+FieldKey = Tuple[str, str, str]
+
+
+def GetFieldKey(field: StandardField) -> FieldKey:
+  """Returns the hashable index key of a StandardField."""
+  return (
+      field.GetNamespaceName(),
+      field.GetStandardFieldName(),
+      field.GetIncrement(),
+  )
+
+
+def CalculateMatchScore(
+    matched_fields: int,
+    matched_required_fields: int,
+    total_entity_fields: int,
+    total_required_type_fields: int,
+) -> int:
+  """Calculates a match's score in [0, 100] from field counts.
+
+  The score is the average of the total precision, over all concrete fields,
+  and the required precision, over the required fields of the type, mapped
+  from [-1, 1] onto [0, 100]. See OntologyWrapper._CalculateMatchScore().
+
+  Args:
+    matched_fields: number of concrete fields defined on the type.
+    matched_required_fields: number of concrete fields required by the type.
+    total_entity_fields: number of concrete fields.
+    total_required_type_fields: number of fields required by the type.
+
+  Returns:
+    A match's score as an integer in [0, 100].
+  """
+  if total_entity_fields <= 0:
+    raise ValueError('Concrete field set cannot be empty.')
+
+  unmatched_entity_fields = total_entity_fields - matched_fields
+  unmatched_required_fields = (
+      total_required_type_fields - matched_required_fields
+  )
+  total_precision = matched_fields - unmatched_entity_fields
+  total_precision /= total_entity_fields
+
+  if total_required_type_fields <= 0:
+    match_score = total_precision / 2.0
+  else:
+    required_precision = matched_required_fields - unmatched_required_fields
+    required_precision /= total_required_type_fields
+    match_score = (total_precision + required_precision) / 2.0
+  final_score = int((match_score + 1.0) * 50)
+  assert final_score in range(0, 101), f'Score: {final_score} out of range'
+  return final_score
+
+
+class EntityTypeIndex(object):
+  """An inverted index from standard fields to the entity types using them.
+
+  Only concrete entity types with at least one field are indexed. Each type is
+  assigned a position in namespace and type order, which breaks ties between
+  equal scores the same way a stable sort over all types does.
+
+  Attributes:
+    entity_types: indexed EntityType objects in position order.
+    required_counts: number of required fields per type position.
+    field_counts: total number of fields per type position.
+  """
+
+  def __init__(self, universe: ConfigUniverse):
+    """Init.
+
+    Args:
+      universe: an instantiated ConfigUniverse with inherited fields expanded.
+    """
+    super().__init__()
+    self.entity_types: List[EntityType] = []
+    self.required_counts: List[int] = []
+    self.field_counts: List[int] = []
+    self._postings: Dict[FieldKey, List[Tuple[int, bool]]] = (
+        collections.defaultdict(list)
+    )
+    self._general_type_positions: Dict[str, List[int]] = (
+        collections.defaultdict(list)
+    )
+
+    for tns in universe.GetEntityTypeNamespaces():
+      for entity_type in tns.valid_types_map.values():
+        all_fields = entity_type.GetAllFields()
+        if entity_type.is_abstract or not all_fields:
+          continue
+        position = len(self.entity_types)
+        self.entity_types.append(entity_type)
+        required_count = 0
+        for qualified_field in all_fields.values():
+          field = qualified_field.field
+          is_required = not qualified_field.optional
+          required_count += is_required
+          field_key = (field.namespace, field.field, field.increment)
+          self._postings[field_key].append((position, is_required))
+        self.required_counts.append(required_count)
+        self.field_counts.append(len(all_fields))
+        for parent_name in set(entity_type.unqualified_parent_names):
+          self._general_type_positions[parent_name].append(position)
+
+    # A type that shares no field with a query scores 0, or 25 if it has no
+    # required fields, independent of the query. Keep the positions ordered
+    # by that score so they can be merged lazily into top-k results.
+    self._default_scores = [
+        CalculateMatchScore(0, 0, 1, required_count)
+        for required_count in self.required_counts
+    ]
+    self._default_order = self._SortByDefaultScore(
+        range(len(self.entity_types))
+    )
+    for parent_name, positions in self._general_type_positions.items():
+      self._general_type_positions[parent_name] = self._SortByDefaultScore(
+          positions
+      )
+
+  def _SortByDefaultScore(self, positions: Iterable[int]) -> List[int]:
+    return sorted(
+        positions,
+        key=lambda position: (-self._default_scores[position], position),
+    )
+
+  def GetCandidateCounts(
+      self,
+      field_keys: Iterable[FieldKey],
+      allowed_positions: Optional[set] = None,
+  ) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """Counts matched and matched required fields of every candidate type.
+
+    Args:
+      field_keys: distinct field keys of a concrete entity.
+      allowed_positions: [Optional] restricts candidates to these positions.
+
+    Returns:
+      Two mappings of type position to the number of matched fields and to the
+      number of matched required fields, for types sharing at least one field.
+    """
+    matched = collections.Counter()
+    matched_required = collections.Counter()
+    for field_key in field_keys:
+      for position, is_required in self._postings.get(field_key, ()):
+        if allowed_positions is not None and position not in allowed_positions:
+          continue
+        matched[position] += 1
+        if is_required:
+          matched_required[position] += 1
+    return matched, matched_required
+
+  def Query(
+      self,
+      field_list: List[StandardField],
+      return_size: int = 0,
+      general_type: Optional[str] = None,
+  ) -> List[Tuple[EntityType, int]]:
+    """Ranks entity types by match score against a list of fields.
+
+    Only types sharing at least one field with field_list are scored; every
+    other type has a constant score and is merged in only if it ranks within
+    return_size.
+
+    Args:
+      field_list: a list of StandardField objects to match to an entity type.
+      return_size: number of results to return, or all types if not positive.
+      general_type: [Optional] a general type name to filter results.
+
+    Returns:
+      A list of (EntityType, score) tuples sorted by descending score.
+    """
+    field_keys = {GetFieldKey(field) for field in field_list}
+    if general_type is not None:
+      default_order = self._general_type_positions.get(general_type.upper(), [])
+      allowed_positions = set(default_order)
+    else:
+      default_order = self._default_order
+      allowed_positions = None
+    if not default_order:
+      return []
+    if not field_keys:
+      raise ValueError('Concrete field set cannot be empty.')
+
+    matched, matched_required = self.GetCandidateCounts(
+        field_keys, allowed_positions
+    )
+    total_entity_fields = len(field_keys)
+    scored = [
+        (
+            -CalculateMatchScore(
+                matched_count,
+                matched_required[position],
+                total_entity_fields,
+                self.required_counts[position],
+            ),
+            position,
+        )
+        for position, matched_count in matched.items()
+    ]
+    if return_size > 0:
+      scored = heapq.nsmallest(return_size, scored)
+    else:
+      scored.sort()
+    unscored = (
+        (-self._default_scores[position], position)
+        for position in default_order
+        if position not in matched
+    )
+    ranked = heapq.merge(scored, unscored)
+    if return_size > 0:
+      ranked = itertools.islice(ranked, return_size)
+    return [
+        (self.entity_types[position], -negative_score)
+        for negative_score, position in ranked
+    ]
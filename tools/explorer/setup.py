@@ -30,5 +30,8 @@ setup(
         'termcolor',
         'colorama',
     ],
+    extras_require={
+        'sparse': ['numpy', 'scipy'],
+    },
     python_requires='>=3.9',
 )
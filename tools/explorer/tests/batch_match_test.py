@@ -0,0 +1,231 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing module for batch_match.py."""
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+from lib import arg_parser
+from lib import batch_match
+from lib import explorer_handler
+from lib import index_cache
+from lib.ontology_wrapper import OntologyWrapper
+from validate.universe_helper.config_universe import create_simplified_universe
+from yamlformat.validator import namespace_validator as nv
+
+_DAMPER_FIELDS = [
+    'exhaust_air_damper_command',
+    'exhaust_air_damper_status',
+    'manufacturer_label',
+    'model_label',
+]
+
+
+class BatchMatchTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    universe = create_simplified_universe()
+    nv.NamespaceValidator(universe.GetEntityTypeNamespaces())
+    self.ontology = OntologyWrapper(universe)
+    self.temp_dir = tempfile.mkdtemp()
+    self.json_input = self._WriteFile(
+        'devices.json', json.dumps({'DMP-1': _DAMPER_FIELDS, 'EMPTY-1': []})
+    )
+
+  def _WriteFile(self, file_name, content):
+    file_path = os.path.join(self.temp_dir, file_name)
+    with open(file_path, 'w', encoding='utf-8') as input_file:
+      input_file.write(content)
+    return file_path
+
+  def testReadDeviceFields_csvGroupsRowsByDevice(self):
+    csv_input = self._WriteFile(
+        'devices.csv',
+        'device_id,field_name\n'
+        'DMP-1,exhaust_air_damper_command\n'
+        'DMP-2,zone_use_label\n'
+        'DMP-1,exhaust_air_damper_status\n',
+    )
+
+    device_fields = list(batch_match.ReadDeviceFields(csv_input))
+
+    self.assertEqual(
+        device_fields,
+        [
+            (
+                'DMP-1',
+                ['exhaust_air_damper_command', 'exhaust_air_damper_status'],
+            ),
+            ('DMP-2', ['zone_use_label']),
+        ],
+    )
+
+  def testReadDeviceFields_csvMissingColumn_raisesValueError(self):
+    csv_input = self._WriteFile(
+        'devices.csv', 'device,field_name\nDMP-1,zone_use_label\n'
+    )
+
+    with self.assertRaises(ValueError):
+      list(batch_match.ReadDeviceFields(csv_input))
+
+  def testMatchDevice_ranksTypesByScore(self):
+    result = batch_match.MatchDevice(
+        self.ontology, 'DMP-1', _DAMPER_FIELDS, return_size=2
+    )
+
+    self.assertEqual(result['device_id'], 'DMP-1')
+    self.assertEqual(result['field_count'], 4)
+    self.assertEqual(
+        result['matches'],
+        [
+            {'rank': 1, 'entity_type': 'HVAC/DMP_EDM', 'score': 100},
+            {'rank': 2, 'entity_type': 'HVAC/SDC_EXT', 'score': 25},
+        ],
+    )
+
+  def testMatchDevice_noFields_returnsError(self):
+    result = batch_match.MatchDevice(self.ontology, 'EMPTY-1', ['', ' '])
+
+    self.assertNotIn('matches', result)
+    self.assertIn('error', result)
+
+  def testRunBatchMatch_writesJsonLines(self):
+    output_path = os.path.join(self.temp_dir, 'matches.jsonl')
+
+    device_count = batch_match.RunBatchMatch(
+        self.ontology, self.json_input, output_path, return_size=1
+    )
+
+    with open(output_path, 'r', encoding='utf-8') as output_file:
+      results = [json.loads(line) for line in output_file]
+    self.assertEqual(device_count, 2)
+    self.assertEqual(
+        [result['device_id'] for result in results], ['DMP-1', 'EMPTY-1']
+    )
+    self.assertEqual(results[0]['matches'][0]['entity_type'], 'HVAC/DMP_EDM')
+
+  def testRunBatchMatch_processPool_writesCsvInInputOrder(self):
+    serial_path = os.path.join(self.temp_dir, 'serial.csv')
+    pooled_path = os.path.join(self.temp_dir, 'pooled.csv')
+
+    batch_match.RunBatchMatch(
+        self.ontology, self.json_input, serial_path, return_size=3
+    )
+    batch_match.RunBatchMatch(
+        self.ontology,
+        self.json_input,
+        pooled_path,
+        return_size=3,
+        processes=2,
+    )
+
+    with open(serial_path, 'r', encoding='utf-8', newline='') as serial_file:
+      serial_rows = list(csv.DictReader(serial_file))
+    with open(pooled_path, 'r', encoding='utf-8', newline='') as pooled_file:
+      pooled_rows = list(csv.DictReader(pooled_file))
+    self.assertLen(serial_rows, 3)
+    self.assertEqual(serial_rows[0]['entity_type'], 'HVAC/DMP_EDM')
+    self.assertEqual(serial_rows[0]['score'], '100')
+    self.assertEqual(pooled_rows, serial_rows)
+
+  def testMatchDevices_equalsMatchDevice(self):
+    devices = [
+        ('DMP-1', _DAMPER_FIELDS),
+        ('EMPTY-1', []),
+        ('DMP-2', _DAMPER_FIELDS[:2]),
+    ]
+
+    results = batch_match.MatchDevices(
+        self.ontology, devices, return_size=3, general_type='DMP'
+    )
+
+    self.assertEqual(
+        results,
+        [
+            batch_match.MatchDevice(
+                self.ontology, *device, return_size=3, general_type='DMP'
+            )
+            for device in devices
+        ],
+    )
+
+  def testRunBatchMatch_sparseScoring_writesSameMatches(self):
+    serial_path = os.path.join(self.temp_dir, 'serial.jsonl')
+    sparse_path = os.path.join(self.temp_dir, 'sparse.jsonl')
+    pooled_path = os.path.join(self.temp_dir, 'pooled.jsonl')
+
+    batch_match.RunBatchMatch(
+        self.ontology, self.json_input, serial_path, return_size=0
+    )
+    batch_match.RunBatchMatch(
+        self.ontology,
+        self.json_input,
+        sparse_path,
+        return_size=0,
+        sparse_scoring=True,
+    )
+    batch_match.RunBatchMatch(
+        self.ontology,
+        self.json_input,
+        pooled_path,
+        return_size=0,
+        processes=2,
+        sparse_scoring=True,
+    )
+
+    with open(serial_path, 'r', encoding='utf-8') as serial_file:
+      serial_results = serial_file.read()
+    for output_path in (sparse_path, pooled_path):
+      with open(output_path, 'r', encoding='utf-8') as output_file:
+        self.assertEqual(output_file.read(), serial_results)
+
+  def testRunBatchMatch_unknownFormat_raisesValueError(self):
+    with self.assertRaises(ValueError):
+      batch_match.RunBatchMatch(
+          self.ontology, self.json_input, output_format='xml'
+      )
+
+  def testRunFromArgs_toStdout_writesOnlyJsonLines(self):
+    unreadable_index = self._WriteFile('unreadable.pickle', 'not a pickle')
+
+    def _Build(*unused_args):
+      # Warns about the unreadable index as a stale cache would
+      self.assertIsNone(index_cache.LoadIndex(unreadable_index))
+      return self.ontology
+
+    args = arg_parser.ParseArgs().parse_args(
+        ['-b', self.json_input, '-n', '2', '--index-cache-dir', self.temp_dir]
+    )
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with mock.patch.object(
+        explorer_handler, 'Build', side_effect=_Build
+    ), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+      batch_match.RunFromArgs(args)
+
+    results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    self.assertEqual(
+        [result['device_id'] for result in results], ['DMP-1', 'EMPTY-1']
+    )
+    self.assertIn('Starting DBO explorer', stderr.getvalue())
+    self.assertIn('[WARNING]', stderr.getvalue())
+
+
+if __name__ == '__main__':
+  absltest.main()
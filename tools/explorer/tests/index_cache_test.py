@@ -0,0 +1,105 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing module for index_cache.py."""
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+from lib import index_cache
+from lib.model import StandardField
+from lib.ontology_wrapper import OntologyWrapper
+from validate.universe_helper.config_universe import create_simplified_universe
+from yamlformat.validator import base_lib
+from yamlformat.validator import namespace_validator as nv
+from yamlformat.validator import pickle_cache_lib
+
+
+class IndexCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.temp_dir = tempfile.mkdtemp()
+
+  def _WriteYaml(self, relative_path, content):
+    file_path = os.path.join(self.temp_dir, relative_path)
+    with open(file_path, 'w', encoding='utf-8') as yaml_file:
+      yaml_file.write(content)
+    return base_lib.PathParts(root=self.temp_dir, relative_path=relative_path)
+
+  def testComputeOntologyHash_changesWithContentAndPaths(self):
+    fields = self._WriteYaml('fields.yaml', 'literals:\n- a\n')
+    units = self._WriteYaml('units.yaml', 'b: c\n')
+    original_hash = index_cache.ComputeOntologyHash([fields, units])
+
+    self.assertEqual(
+        index_cache.ComputeOntologyHash([units, fields]), original_hash
+    )
+    self.assertNotEqual(
+        index_cache.ComputeOntologyHash([fields]), original_hash
+    )
+    self._WriteYaml('units.yaml', 'b: d\n')
+    self.assertNotEqual(
+        index_cache.ComputeOntologyHash([fields, units]), original_hash
+    )
+
+  def testComputeOntologyHash_changesWithCode(self):
+    fields = self._WriteYaml('fields.yaml', 'literals:\n- a\n')
+    original_hash = index_cache.ComputeOntologyHash([fields])
+
+    with mock.patch.object(
+        pickle_cache_lib, 'SourceFingerprint', return_value='upgraded'
+    ):
+      self.assertNotEqual(
+          index_cache.ComputeOntologyHash([fields]), original_hash
+      )
+
+  def testSaveIndex_loadIndexRoundTrip(self):
+    universe = create_simplified_universe()
+    nv.NamespaceValidator(universe.GetEntityTypeNamespaces())
+    ontology = OntologyWrapper(universe)
+    index_path = index_cache.GetIndexPath(
+        os.path.join(self.temp_dir, 'cache'), 'abc'
+    )
+    field_list = [
+        StandardField('', 'exhaust_air_damper_command'),
+        StandardField('', 'exhaust_air_damper_status'),
+    ]
+
+    index_cache.SaveIndex(ontology, index_path)
+    loaded_ontology = index_cache.LoadIndex(index_path)
+
+    self.assertIsInstance(loaded_ontology, OntologyWrapper)
+    self.assertEqual(
+        [
+            (str(match.GetEntityType().typename), match.GetMatchScore())
+            for match in loaded_ontology.GetEntityTypesFromFields(field_list)
+        ],
+        [
+            (str(match.GetEntityType().typename), match.GetMatchScore())
+            for match in ontology.GetEntityTypesFromFields(field_list)
+        ],
+    )
+
+  def testLoadIndex_missingOrCorruptFile_returnsNone(self):
+    index_path = os.path.join(self.temp_dir, 'corrupt.pickle')
+
+    self.assertIsNone(index_cache.LoadIndex(index_path))
+    with open(index_path, 'wb') as index_file:
+      index_file.write(b'not a pickle')
+    self.assertIsNone(index_cache.LoadIndex(index_path))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -73,6 +73,27 @@ class OntologyTest(absltest.TestCase):
     for i in range(len(expected_output)):
       self.assertEqual(expected_output[i], function_output[i])
 
+  def testGetEntityTypesFromFieldLists(self):
+    field_lists = [
+        [
+            StandardField('', 'exhaust_air_damper_command'),
+            StandardField('', 'exhaust_air_damper_status'),
+        ],
+        [StandardField('', 'zone_use_label')],
+    ]
+
+    function_output = self.ontology.GetEntityTypesFromFieldLists(
+        field_lists, return_size=3
+    )
+
+    self.assertEqual(
+        function_output,
+        [
+            self.ontology.GetEntityTypesFromFields(field_list, return_size=3)
+            for field_list in field_lists
+        ],
+    )
+
   def testGetTopTwoTypeFromFields(self):
     input_field_list = [
         StandardField('', 'exhaust_air_damper_command'),
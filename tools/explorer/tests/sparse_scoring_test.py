@@ -0,0 +1,100 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing module for sparse_scoring.py."""
+from absl.testing import absltest
+from lib import sparse_scoring
+from lib.model import StandardField
+from lib.type_index import EntityTypeIndex
+from validate.universe_helper.config_universe import create_simplified_universe
+from yamlformat.validator import namespace_validator as nv
+
+
+@absltest.skipUnless(
+    sparse_scoring.SPARSE_SCORING_AVAILABLE, 'requires numpy and scipy'
+)
+class SparseMatchScorerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    universe = create_simplified_universe()
+    nv.NamespaceValidator(universe.GetEntityTypeNamespaces())
+    self.index = EntityTypeIndex(universe)
+    self.scorer = sparse_scoring.SparseMatchScorer(self.index)
+    self.field_lists = [
+        [
+            StandardField('', 'exhaust_air_damper_command'),
+            StandardField('', 'exhaust_air_damper_status'),
+            StandardField('', 'manufacturer_label'),
+            StandardField('', 'model_label'),
+        ],
+        [
+            StandardField('', 'exhaust_air_damper_command'),
+            StandardField('', 'zone_use_label'),
+        ],
+        [
+            StandardField('', 'zone_air_temperature_sensor', '_1'),
+            StandardField('', 'not_a_field'),
+        ],
+        [StandardField('', 'not_a_field')],
+    ]
+
+  def testScoreBatch_matchesIndexScores(self):
+    scores = self.scorer.ScoreBatch(self.field_lists)
+
+    self.assertEqual(scores.shape, (4, len(self.index.entity_types)))
+    for row, field_list in enumerate(self.field_lists):
+      expected_scores = {
+          entity_type.typename: score
+          for entity_type, score in self.index.Query(field_list)
+      }
+      for position, entity_type in enumerate(self.index.entity_types):
+        self.assertEqual(
+            scores[row][position], expected_scores[entity_type.typename]
+        )
+
+  def testRankBatch_matchesIndexQuery(self):
+    for return_size in (0, 1, 3):
+      ranked_lists = self.scorer.RankBatch(
+          self.field_lists, return_size=return_size, batch_size=3
+      )
+
+      self.assertEqual(
+          ranked_lists,
+          [
+              self.index.Query(field_list, return_size=return_size)
+              for field_list in self.field_lists
+          ],
+      )
+
+  def testRankBatch_generalType_matchesIndexQuery(self):
+    for general_type in ('dmp', 'UNKNOWN_TYPE'):
+      ranked_lists = self.scorer.RankBatch(
+          self.field_lists, general_type=general_type
+      )
+
+      self.assertEqual(
+          ranked_lists,
+          [
+              self.index.Query(field_list, general_type=general_type)
+              for field_list in self.field_lists
+          ],
+      )
+
+  def testScoreBatch_emptyFieldList_raisesValueError(self):
+    with self.assertRaises(ValueError):
+      self.scorer.ScoreBatch([[]])
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,101 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Testing module for type_index.py."""
+from absl.testing import absltest
+from lib.model import StandardField
+from lib.ontology_wrapper import OntologyWrapper
+from lib.type_index import CalculateMatchScore
+from lib.type_index import EntityTypeIndex
+from validate.universe_helper.config_universe import create_simplified_universe
+from yamlformat.validator import namespace_validator as nv
+
+
+class TypeIndexTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.universe = create_simplified_universe()
+    nv.NamespaceValidator(self.universe.GetEntityTypeNamespaces())
+    self.index = EntityTypeIndex(self.universe)
+    self.field_list = [
+        StandardField('', 'exhaust_air_damper_command'),
+        StandardField('', 'exhaust_air_damper_status'),
+        StandardField('', 'zone_use_label'),
+    ]
+
+  def _ScoreAllTypes(self, field_list, general_type=None):
+    """Scores every indexed type without the index, as a reference."""
+    ontology = OntologyWrapper(self.universe)
+    matches = [
+        ontology._CreateMatch(field_list, entity_type)
+        for entity_type in self.index.entity_types
+        if general_type is None
+        or general_type in entity_type.unqualified_parent_names
+    ]
+    matches.sort(key=lambda match: match.GetMatchScore(), reverse=True)
+    return [(match.GetEntityType(), match.GetMatchScore()) for match in matches]
+
+  def testCalculateMatchScore_perfectMatch(self):
+    self.assertEqual(CalculateMatchScore(4, 2, 4, 2), 100)
+
+  def testCalculateMatchScore_noOverlap(self):
+    self.assertEqual(CalculateMatchScore(0, 0, 3, 2), 0)
+    self.assertEqual(CalculateMatchScore(0, 0, 3, 0), 25)
+
+  def testCalculateMatchScore_emptyConcreteFields_raisesValueError(self):
+    with self.assertRaises(ValueError):
+      CalculateMatchScore(0, 0, 0, 2)
+
+  def testQuery_allTypes_matchesScoringEveryType(self):
+    self.assertEqual(
+        self.index.Query(self.field_list), self._ScoreAllTypes(self.field_list)
+    )
+
+  def testQuery_topK_matchesScoringEveryType(self):
+    for return_size in range(1, len(self.index.entity_types) + 2):
+      self.assertEqual(
+          self.index.Query(self.field_list, return_size=return_size),
+          self._ScoreAllTypes(self.field_list)[:return_size],
+      )
+
+  def testQuery_generalType_filtersTypes(self):
+    self.assertEqual(
+        self.index.Query(self.field_list, general_type='dmp'),
+        self._ScoreAllTypes(self.field_list, general_type='DMP'),
+    )
+
+  def testQuery_unknownGeneralType_returnsEmpty(self):
+    self.assertEmpty(self.index.Query(self.field_list, general_type='NOPE'))
+
+  def testGetCandidateCounts_onlyCountsSharedFields(self):
+    matched, matched_required = self.index.GetCandidateCounts(
+        {('', 'exhaust_air_damper_command', '')}
+    )
+
+    self.assertNotEmpty(matched)
+    for position in matched:
+      self.assertIn(
+          'exhaust_air_damper_command',
+          [
+              qualified_field.field.field
+              for qualified_field in self.index.entity_types[position]
+              .GetAllFields()
+              .values()
+          ],
+      )
+    self.assertLessEqual(set(matched_required), set(matched))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,95 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Command line interface for scoring many configurations against one."""
+
+import argparse
+import pprint
+import sys
+
+from score import batch_score
+from score.constants import MatchingModes
+
+
+def parse_args() -> argparse.ArgumentParser:
+
+  parser = argparse.ArgumentParser(
+      description='Score and rank configurations against one solution'
+  )
+
+  parser.add_argument(
+      '-m',
+      '--modified-ontology-types',
+      dest='ontology',
+      required=False,
+      help='Absolute path for the directory which contains your ontology',
+      metavar='ontology',
+  )
+
+  parser.add_argument(
+      '-sol',
+      '--solution',
+      dest='solution',
+      required=True,
+      help='Absolute path for your solution configuration file',
+      metavar='solution',
+  )
+
+  parser.add_argument(
+      '-prop',
+      '--proposed',
+      dest='proposed',
+      required=True,
+      nargs='+',
+      help='Absolute paths for your proposed configuration files to be scored',
+      metavar='proposed',
+  )
+
+  parser.add_argument(
+      '-match',
+      '--matching-mode',
+      dest='matching_mode',
+      required=False,
+      default=MatchingModes.OPTIMAL,
+      type=MatchingModes,
+      choices=list(MatchingModes),
+      help='How virtual entities are paired: optimal (default) or greedy',
+      metavar='matching_mode',
+  )
+
+  parser.add_argument(
+      '-proc',
+      '--processes',
+      dest='processes',
+      required=False,
+      default=1,
+      type=int,
+      help='Number of processes scoring proposed files simultaneously',
+      metavar='processes',
+  )
+
+  return parser
+
+
+if __name__ == '__main__':
+  pp = pprint.PrettyPrinter()
+  args = parse_args().parse_args(sys.argv[1:])  # pylint: disable=too-many-function-args
+  scorer = batch_score.BatchScore(
+      ontology=args.ontology,
+      solution=args.solution,
+      proposed=args.proposed,
+      matching_mode=args.matching_mode,
+      processes=args.processes,
+  )
+  pp.pprint(scorer.execute())
+  print(scorer.format_leaderboard())
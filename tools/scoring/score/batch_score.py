@@ -0,0 +1,187 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Scores many proposed configuration files against one solution."""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from score import worker_pool
+from score.constants import FileTypes, MatchingModes
+from score.dimensions.dimension import Dimension, SolutionIndex
+from score.parse_config import DIMENSIONS, ParseConfig
+from score.scorer_types import ConfigPath, DeserializedFile, DimensionName, MatchingMode
+
+from validate import handler as validator
+from validate.generate_universe import BuildUniverse
+from yamlformat.validator.presubmit_validate_types_lib import ConfigUniverse
+
+PROPOSED, SOLUTION = FileTypes
+
+
+def _score_proposed(
+    proposed: ConfigPath,
+    universe: ConfigUniverse,
+    solution: DeserializedFile,
+    solution_index: SolutionIndex,
+    matching_mode: Optional[MatchingMode],
+) -> Dict[DimensionName, Dimension]:
+  """Scores a proposed file against a solution with types appended."""
+  print(f'Scoring — {proposed}')
+  proposed_entities = ParseConfig.append_types(
+      universe=universe,
+      deserialized_files={PROPOSED: validator.Deserialize([proposed])[0]},
+  )[PROPOSED]
+  translations = ParseConfig.retrieve_reporting_translations(
+      proposed_entities=proposed_entities,
+      solution_entities=solution,
+  )
+  results = ParseConfig.aggregate_results(
+      dimensions=DIMENSIONS,
+      translations=translations,
+      deserialized_files={PROPOSED: proposed_entities, SOLUTION: solution},
+      matching_mode=matching_mode,
+      solution_index=solution_index,
+  )
+  # Scores are kept rather than the files they were calculated from
+  for evaluated in results.values():
+    evaluated.translations = None
+    evaluated.deserialized_files = None
+    evaluated.translation_index = None
+    evaluated.solution_index = None
+  return results
+
+
+class BatchScore:
+  """Attributes:
+
+    args: Dictionary containing instance arguments
+    universe: Built from the input ontology
+    solution: Parsed solution file with entity types appended
+    solution_index: Parts of the solution which dimensions compare, shared by
+      every proposed file
+    results: Dictionary of proposed file paths and their scored dimensions
+
+  Returns:
+    An instance of the BatchScore class.
+  """
+
+  def __init__(
+      self,
+      *,
+      ontology: str,
+      solution: str,
+      proposed: List[ConfigPath],
+      matching_mode: Optional[MatchingMode] = MatchingModes.OPTIMAL,
+      processes: int = 1,
+  ):
+    """Arguments:
+
+    ontology: Path to the ontology
+    solution: Path to the solution config
+    proposed: Paths to the configs to be evaluated
+    matching_mode: How virtual entities of the files are paired (optional)
+    processes: Number of processes scoring proposed configs (optional)
+
+    Raises:
+      ValueError: If a proposed config is given more than once, as results are
+        keyed by path.
+    """
+    duplicates = sorted(
+        path for path, count in Counter(proposed).items() if count > 1
+    )
+    if duplicates:
+      raise ValueError(
+          f'Proposed configs given more than once: {", ".join(duplicates)}'
+      )
+    self.args = {
+        'ontology': ontology,
+        SOLUTION: solution,
+        PROPOSED: proposed,
+        'matching_mode': matching_mode,
+        'processes': processes,
+    }
+    # The universe, solution and its index are built once and only read while
+    # scoring
+    print('Scoring — building universe')
+    self.universe = BuildUniverse(default_types_filepath=ontology)
+    print('Scoring — deserializing solution')
+    self.solution = ParseConfig.append_types(
+        universe=self.universe,
+        deserialized_files={SOLUTION: validator.Deserialize([solution])[0]},
+    )[SOLUTION]
+    self.solution_index = Dimension.index_solution(self.solution)
+    self.results = {}
+
+  def execute(self) -> Dict[ConfigPath, Dict[DimensionName, str]]:
+    """Scores every proposed file.
+
+    Returns:
+      Dictionary with proposed file paths as keys and values containing the
+      human-readable representation of every scored dimension.
+    """
+    proposed = self.args[PROPOSED]
+    batch_arguments = {
+        'universe': self.universe,
+        'solution': self.solution,
+        'solution_index': self.solution_index,
+        'matching_mode': self.args['matching_mode'],
+    }
+    processes = min(self.args['processes'], len(proposed))
+
+    if processes <= 1:
+      scored = [_score_proposed(path, **batch_arguments) for path in proposed]
+    else:
+      scored = worker_pool.map_shared(
+          _score_proposed, proposed, batch_arguments, processes
+      )
+
+    self.results = dict(zip(proposed, scored))
+    return {
+        path: {name: str(dimension) for name, dimension in results.items()}
+        for path, results in self.results.items()
+    }
+
+  @staticmethod
+  def mean_result(results: Dict[DimensionName, Dimension]) -> Optional[float]:
+    """Mean of the scores for all devices of the dimensions that have one."""
+    scores = [
+        dimension.result_all
+        for dimension in results.values()
+        if dimension.result_all is not None
+    ]
+    return sum(scores) / len(scores) if scores else None
+
+  def leaderboard(self) -> List[Tuple[int, Optional[float], ConfigPath]]:
+    """Ranks the scored files by their mean score, best first.
+
+    Files without any score are ranked last and ties keep the order in which
+    files were given.
+
+    Returns:
+      List of rank, mean score and proposed file path tuples.
+    """
+    means = [
+        (self.mean_result(results), path)
+        for path, results in self.results.items()
+    ]
+    means.sort(key=lambda item: (item[0] is None, -(item[0] or 0)))
+    return [(rank, mean, path) for rank, (mean, path) in enumerate(means, 1)]
+
+  def format_leaderboard(self) -> str:
+    """Human-readable table of the leaderboard."""
+    lines = [f'{"rank":>4}  {"mean":>5}  proposed']
+    for rank, mean, path in self.leaderboard():
+      mean_text = f'{mean:.2f}' if mean is not None else '-'
+      lines.append(f'{rank:>4}  {mean_text:>5}  {path}')
+    return '\n'.join(lines)
@@ -43,3 +43,34 @@ class DimensionCategories(str, Enum):
 class MappingTypes(str, Enum):
   STATE = 'MultiStateValue'
   UNIT = 'DimensionalValue'
+
+
+class MatchingModes(str, Enum):
+  """How proposed and solution virtual entities are paired for scoring.
+
+  OPTIMAL pairs them to share the most raw field names overall, while GREEDY
+  pairs each solution entity with its closest remaining proposed entity.
+  """
+
+  OPTIMAL = 'optimal'
+  """Virtual entities are paired to maximize the total number of raw field
+  names they share."""
+  GREEDY = 'greedy'
+  """Each solution virtual entity in turn is paired with the remaining
+  proposed virtual entity which correlates most closely, as scores were
+  originally calculated."""
+
+  def __str__(self):
+    return self.value
+
+
+class ReportFormats(str, Enum):
+  """File formats of the per-entity scoring report."""
+
+  JSONL = 'jsonl'
+  """One JSON object per line."""
+  CSV = 'csv'
+  """Comma-separated values with a header row; lists are JSON encoded."""
+
+  def __str__(self):
+    return self.value
@@ -13,12 +13,42 @@
 # limitations under the License.
 """Core component base class."""
 
-from collections import defaultdict
-from typing import Dict, List, NamedTuple, Set, Tuple
-from score.constants import MappingTypes
-from score.scorer_types import DeserializedFilesDict, EntityType, FileType, MappingType, PointsVirtualList, RawFieldName, TranslationsDict
+from collections import defaultdict, namedtuple
+import heapq
+import itertools
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from score.constants import FileTypes, MatchingModes
+from score.report import VIRTUAL, ScoringReport
+from score.scorer_types import CloudDeviceId, CloudDeviceIndex, DeserializedFile, DeserializedFilesDict, EntityType, MatchingMode, PointsVirtualList, RawFieldName, TranslationsDict
+from score.translation_index import TranslationIndex
 from validate.entity_instance import EntityInstance
 
+PROPOSED, SOLUTION = FileTypes
+
+
+# Raw field names and type of a virtual entity, compared to pair entities
+PointsVirtual = namedtuple('PointsVirtual', ['raw_field_names', 'entity_type'])
+
+
+class SolutionIndex(NamedTuple):
+  """Parts of a solution file which "complex" dimensions compare.
+
+  They only depend on the solution, so they can be built once and shared by
+  the dimensions scoring any number of proposed files against it.
+
+  Attributes:
+    points_virtual: Points of the canonical virtual entities which have any,
+      those with the most points first
+    source_ids_virtual: `cloud_device_id`s of the entities composing the
+      canonical virtual entities
+    entities_reporting: Canonical reporting entities which do not compose
+      a virtual entity
+  """
+
+  points_virtual: PointsVirtualList
+  source_ids_virtual: Set[CloudDeviceId]
+  entities_reporting: List[EntityInstance]
+
 
 class _VirtualEntityMatch(NamedTuple):
   """Reference for metrics by which subscores were
@@ -119,6 +149,95 @@ class _TypesSubscore(NamedTuple):
     )
 
 
+# Subscore of a pairing of virtual entities which share no raw field name
+_UNSHARED_TALLY = -1.0
+# Metrics which are the same for every pairing of a solution virtual entity
+# with a proposed one sharing no raw field name
+_UNSHARED_CONSTANT_METRICS = frozenset(
+    ['correct', 'correct_ceiling', 'incorrect']
+)
+
+
+def _solve_assignment(weights: List[Dict[int, int]]) -> Dict[int, int]:
+  """Pairs rows with columns to maximize the total weight of the pairs.
+
+  Solves the assignment problem on a sparse weight matrix with the Hungarian
+  method, finding a shortest augmenting path for each row in turn with
+  Dijkstra's algorithm on reduced costs. Each row may also stay unpaired,
+  which is modeled as a private column of weight 0.
+
+  Args:
+    weights: For each row, the positive integer weights of the columns it can
+      be paired with, keyed by column
+
+  Returns:
+    Dictionary whose keys are paired rows and whose values are their columns
+  """
+
+  # Costs are negated weights. Private columns have negative keys.
+  costs = [
+      [(-1 - row, 0)]
+      + [(column, -weight) for column, weight in row_weights.items()]
+      for row, row_weights in enumerate(weights)
+  ]
+  # Column potentials; for a paired row, the reduced cost
+  # cost - potential[column] is smallest at its column.
+  potential = defaultdict(int)
+  column_of = {}
+  cost_of = {}
+  row_of = {}
+  for start_row, start_costs in enumerate(costs):
+    distances = {}
+    reached_from = {}
+    heap = []
+    for column, cost in start_costs:
+      distances[column] = cost - potential[column]
+      reached_from[column] = start_row
+      # Free columns come first among equally distant ones, as they end the
+      # search
+      heap.append((distances[column], column in row_of, column))
+    heapq.heapify(heap)
+
+    scanned = {}
+    while True:
+      distance, _, column = heapq.heappop(heap)
+      if column in scanned:
+        continue
+      scanned[column] = distance
+      row = row_of.get(column)
+      if row is None:
+        break  # as a free column ends the augmenting path
+      offset = distance - cost_of[row] + potential[column]
+      for next_column, cost in costs[row]:
+        if next_column in scanned:
+          continue
+        next_distance = offset + cost - potential[next_column]
+        if (
+            next_column not in distances
+            or next_distance < distances[next_column]
+        ):
+          distances[next_column] = next_distance
+          reached_from[next_column] = row
+          heapq.heappush(
+              heap, (next_distance, next_column in row_of, next_column)
+          )
+
+    # Keep reduced costs non-negative, then flip pairings along the path
+    for scanned_column, scanned_distance in scanned.items():
+      potential[scanned_column] += scanned_distance - distance
+    while True:
+      row = reached_from[column]
+      previous_column = column_of.get(row)
+      column_of[row] = column
+      cost_of[row] = -weights[row][column] if column >= 0 else 0
+      row_of[column] = row
+      if row == start_row:
+        break
+      column = previous_column
+
+  return {row: column for row, column in column_of.items() if column >= 0}
+
+
 class Dimension:
   """Container for floating-point results which
 
@@ -136,6 +255,14 @@ class Dimension:
       devices
     incorrect_virtual: Number of failed attempts within virtual devices
     incorrect_reporting: Number of failed attempts within reporting devices
+    matching_mode: How "complex" dimensions pair virtual entities of the
+      files. Assigned via argument
+    report: Report which per-entity records are written to while evaluating,
+      if any. Assigned via argument
+    translation_index: Index of `translations` which "simple" dimensions
+      compare. Assigned via argument or built on first use
+    solution_index: Index of the solution file which "complex" dimensions
+      compare. Assigned via argument or built on first use
 
   Properties:
     result_all: Calculated result for all devices
@@ -155,9 +282,17 @@ class Dimension:
       *,
       translations: TranslationsDict = None,
       deserialized_files: DeserializedFilesDict = None,
+      matching_mode: MatchingMode = MatchingModes.OPTIMAL,
+      report: Optional[ScoringReport] = None,
+      translation_index: Optional[TranslationIndex] = None,
+      solution_index: Optional[SolutionIndex] = None,
   ):
     self.translations = translations
     self.deserialized_files = deserialized_files
+    self.matching_mode = matching_mode
+    self.report = report
+    self.translation_index = translation_index
+    self.solution_index = solution_index
 
     self.correct_virtual: int = None
     self.correct_reporting: int = None
@@ -224,12 +359,102 @@ class Dimension:
       incorrect_reporting = self.incorrect_reporting or 0
       return incorrect_virtual + incorrect_reporting
 
-  def _condense_translations(self, file_type: FileType):
-    """Combines translations for all devices within the dictionary."""
-    condensed = []
-    for translations in self.translations.values():
-      condensed.extend(translations[file_type])
-    return condensed
+  def _report_entity(self, **fields) -> None:
+    """Writes a per-entity record if a report is being written.
+
+    See ScoringReport.write_entity() for the fields of records.
+    """
+    if self.report is not None:
+      self.report.write_entity(type(self).__name__, **fields)
+
+  def _report_items(
+      self, *, proposed_items: Set[Any], solution_items: Set[Any], **fields
+  ) -> None:
+    """Writes a per-entity record comparing sets of items, if reporting.
+
+    Each solution item is an attempt, which is successful if the proposed
+    entity has the item too.
+    """
+    if self.report is not None:
+      self._report_entity(
+          correct=len(proposed_items.intersection(solution_items)),
+          correct_ceiling=len(solution_items),
+          incorrect=len(solution_items.difference(proposed_items)),
+          missing=solution_items.difference(proposed_items),
+          unexpected=proposed_items.difference(solution_items),
+          **fields,
+      )
+
+  def _report_virtual_matches(
+      self,
+      matches_virtual: Dict[float, List[_VirtualEntityMatch]],
+      *,
+      compare_types: bool,
+  ) -> None:
+    """Writes a per-entity record for each virtual entity of the solution.
+
+    Args:
+      matches_virtual: Pairings returned by _match_virtual_entities()
+      compare_types: Whether the parent types of paired entities are compared,
+        rather than their raw field names
+    """
+    if self.report is None:
+      return
+    for match in itertools.chain.from_iterable(matches_virtual.values()):
+      solution_raw_field_names, solution_type = match.solution
+      proposed_raw_field_names, proposed_type = match.proposed or (set(), None)
+      if compare_types:
+        solution_items = set(solution_type.parent_names.keys())
+        proposed_items = (
+            set(proposed_type.parent_names.keys()) if proposed_type else set()
+        )
+        counts = {
+            'correct': match.types_correct,
+            'correct_ceiling': match.types_correct_ceiling,
+            'incorrect': match.types_incorrect,
+        }
+      else:
+        solution_items = solution_raw_field_names
+        proposed_items = proposed_raw_field_names
+        counts = {
+            'correct': match.correct,
+            'correct_ceiling': match.correct_ceiling,
+            'incorrect': match.incorrect,
+        }
+      self._report_entity(
+          device=VIRTUAL,
+          proposed_entity=self._entity_type_name(proposed_type),
+          solution_entity=self._entity_type_name(solution_type),
+          missing=solution_items.difference(proposed_items),
+          unexpected=proposed_items.difference(solution_items),
+          **counts,
+      )
+
+  @staticmethod
+  def _entity_type_name(entity_type: Optional[EntityType]) -> Optional[str]:
+    """Qualified name of an entity type for reports, e.g. "HVAC/AHU_1"."""
+    if entity_type is None:
+      return None
+    namespace = entity_type.namespace.namespace
+    return (
+        f'{namespace}/{entity_type.typename}'
+        if namespace
+        else entity_type.typename
+    )
+
+  def _index_translations(self) -> TranslationIndex:
+    """Index of `translations`, built on first use unless assigned."""
+    if self.translation_index is None:
+      self.translation_index = TranslationIndex(self.translations)
+    return self.translation_index
+
+  def _index_solution(self) -> SolutionIndex:
+    """Index of the solution file, built on first use unless assigned."""
+    if self.solution_index is None:
+      self.solution_index = self.index_solution(
+          self.deserialized_files[SOLUTION]
+      )
+    return self.solution_index
 
   @property
   def result_all(self) -> float:
@@ -301,6 +526,30 @@ class Dimension:
     """
     return entity.cloud_device_id is not None
 
+  @staticmethod
+  def index_by_cloud_device_id(
+      entities: Iterable[EntityInstance],
+  ) -> CloudDeviceIndex:
+    """Utility for looking up reporting entities by `cloud_device_id`.
+
+    Replaces scans of a whole file for each entity of the other file.
+
+    Args:
+      entities: Standard entity instances, in file order
+
+    Returns:
+      Dictionary with `cloud_device_id`s as keys and lists of the entities
+      having them, in file order, as values. Entities without a
+      `cloud_device_id` are skipped. A list with more than one entity
+      indicates a duplicated `cloud_device_id`; the first entity is the one
+      matched by dimensions.
+    """
+    index = defaultdict(list)
+    for entity in entities:
+      if entity.cloud_device_id is not None:
+        index[entity.cloud_device_id].append(entity)
+    return dict(index)
+
   @staticmethod
   def is_entity_virtual(entity: EntityInstance) -> bool:
     """Utility for determining whether an entity is virtual.
@@ -315,24 +564,150 @@ class Dimension:
     """
     return entity.links is not None
 
+  @classmethod
+  def _isolate_entities_virtual(
+      cls, *, file: DeserializedFile, exclude_noncanonical: bool
+  ) -> Set[EntityInstance]:
+    virtual_entities = filter(cls.is_entity_virtual, file.values())
+    return set(
+        filter(cls.is_entity_canonical, virtual_entities)
+        if exclude_noncanonical
+        else virtual_entities
+    )
+
+  @staticmethod
+  def _fetch_points_virtual(
+      file: DeserializedFile, entities_virtual: Set[EntityInstance]
+  ) -> PointsVirtualList:
+    # For each virtual entity
+    # create a named tuple containing a set and the entity's type.
+    # (The type is required by the matching algo for some dimensions.)
+    # For each link in the entity,
+    # if the field exists at the source
+    # add its raw field name to the set.
+    return [
+        PointsVirtual(
+            set(
+                file[link.source].translation[target_field].raw_field_name
+                for target_field, source_field in link.field_map.items()
+                for link in entity.links
+                if target_field in file[link.source].translation
+            ),
+            entity.type,
+        )
+        for entity in entities_virtual
+        for link in entity.links
+    ]
+
+  @staticmethod
+  def _sort_filter_points_virtual(
+      points_virtual: PointsVirtualList,
+  ) -> PointsVirtualList:
+    # Filter out sets which have no items
+    # and sort by number of fields represented in descending order.
+    filtered = list(
+        filter(lambda entry: len(entry.raw_field_names) > 0, points_virtual)
+    )
+
+    return sorted(
+        filtered, key=lambda entry: len(entry.raw_field_names), reverse=True
+    )
+
+  @classmethod
+  def _isolate_entities_reporting(
+      cls, *, file: DeserializedFile, exclude_noncanonical: bool
+  ) -> Set[EntityInstance]:
+    reporting_entities = filter(cls.is_entity_reporting, file.values())
+    return set(
+        filter(cls.is_entity_canonical, reporting_entities)
+        if exclude_noncanonical
+        else reporting_entities
+    )
+
+  @staticmethod
+  def _fetch_source_ids_virtual(
+      file: DeserializedFile, entities_virtual: Set[EntityInstance]
+  ) -> Set[CloudDeviceId]:
+    # Aggregate IDs for entities which comprise the composites
+    # evaluated above. These will be filtered out so as to
+    # not be scored again.
+    return set(
+        file[source].cloud_device_id
+        for sublist in (
+            (
+                link.source
+                for target_field, source_field in link.field_map.items()
+                for link in entity.links
+                if target_field in file[link.source].translation
+            )
+            for entity in entities_virtual
+            for link in entity.links
+        )
+        for source in sublist
+    )
+
+  @classmethod
+  def index_solution(cls, solution_file: DeserializedFile) -> SolutionIndex:
+    """Builds the parts of a solution file which "complex" dimensions compare.
+
+    Only canonical entities of the solution are compared.
+
+    Args:
+      solution_file: Deserialized solution file with entity types appended
+
+    Returns:
+      A `SolutionIndex` of the file
+    """
+    entities_virtual = cls._isolate_entities_virtual(
+        file=solution_file, exclude_noncanonical=True
+    )
+    source_ids_virtual = cls._fetch_source_ids_virtual(
+        solution_file, entities_virtual
+    )
+    return SolutionIndex(
+        points_virtual=cls._sort_filter_points_virtual(
+            cls._fetch_points_virtual(solution_file, entities_virtual)
+        ),
+        source_ids_virtual=source_ids_virtual,
+        entities_reporting=[
+            entity
+            for entity in cls._isolate_entities_reporting(
+                file=solution_file, exclude_noncanonical=True
+            )
+            if entity.cloud_device_id not in source_ids_virtual
+        ],
+    )
+
   @staticmethod
   def _match_virtual_entities(
       *,
       solution_points_virtual: PointsVirtualList,
       proposed_points_virtual: PointsVirtualList,
       sort_candidates_by_key: str,
+      matching_mode: MatchingMode = MatchingModes.OPTIMAL,
   ) -> Dict[float, List[_VirtualEntityMatch]]:
     """Finds the closest correlating virtual entities between two files
 
     by comparing the intersections of raw field names contained therein.
 
+    Only entities which share at least one raw field name are compared; they
+    are found through an index of proposed entities by raw field name.
+    Solution entities which share no raw field name with any remaining
+    proposed entity are paired, as a last resort, with the remaining proposed
+    entity which ranks first by `sort_candidates_by_key`.
+
     Args:
       solution_points_virtual: Raw field names and entity types for all virtual
         entities in a file
       proposed_points_virtual: Raw field names and entity types for all virtual
         entities in a file
       sort_candidates_by_key: Parameter by which to "break a tie" if there are
-        multiple matches with the same subscore.
+        multiple matches with the same subscore. Must name an integer metric
+        in OPTIMAL mode.
+      matching_mode: OPTIMAL pairs entities to maximize the total number of
+        raw field names shared, breaking ties by the larger total of
+        `sort_candidates_by_key`. GREEDY pairs each solution entity in turn
+        with the remaining proposed entity which correlates most closely.
 
     Returns:
       Dictionary whose keys are floats representing the extent to which the
@@ -343,109 +718,186 @@ class Dimension:
     # Final pairings
     matches_virtual = {None: []}
 
-    for solution_parameters in solution_points_virtual:
-      solution_raw_field_names, solution_entity_type = solution_parameters
-
-      # Record of entities evaluated and associated metrics
-      candidates = defaultdict(list)
-      # Running tally of which entity most closely corellates;
-      # even zero overlap will best the default at -1.0
-      best: float = -1.1
-
-      for proposed_parameters in proposed_points_virtual:
-        proposed_raw_field_names, proposed_entity_type = proposed_parameters
-
-        # Offload the quantification of intersection/difference
-        # and resulting subscore
-        subscore = _FieldsSubscore(
-            proposed_raw_field_names=proposed_raw_field_names,
-            solution_raw_field_names=solution_raw_field_names,
-        )
-
-        # Meanwhile, calculate a similar metric for overlap of types
-        types_score = _TypesSubscore(
-            proposed_entity_type=proposed_entity_type,
-            solution_entity_type=solution_entity_type,
-        )
-
-        # If the current iteration matches better than the last,
-        # take note of its score for later lookup
-        if subscore.tally != 0 and subscore.tally > best:
-          best = subscore.tally
-
-        subscore_reference = _VirtualEntityMatch(
-            correct=subscore.correct,
-            correct_ceiling=subscore.correct_ceiling,
-            incorrect=subscore.incorrect,
-            proposed=proposed_parameters,
-            solution=solution_parameters,
-            types_correct=types_score.correct,
-            types_correct_ceiling=types_score.correct_ceiling,
-            types_incorrect=types_score.incorrect,
-            types_score=types_score.tally,
-        )
+    proposed_by_raw_field_name = defaultdict(list)
+    for proposed_index, (raw_field_names, _) in enumerate(
+        proposed_points_virtual
+    ):
+      for raw_field_name in raw_field_names:
+        proposed_by_raw_field_name[raw_field_name].append(proposed_index)
+    # Indices of the proposed entities not yet paired, in their original order
+    remaining = dict.fromkeys(range(len(proposed_points_virtual)))
+
+    def count_shared(solution_raw_field_names) -> Dict[int, int]:
+      """Counts raw field names shared with each remaining proposed entity."""
+      shared = defaultdict(int)
+      for raw_field_name in solution_raw_field_names:
+        for proposed_index in proposed_by_raw_field_name.get(
+            raw_field_name, ()
+        ):
+          if proposed_index in remaining:
+            shared[proposed_index] += 1
+      return shared
+
+    def compare(
+        solution_parameters, proposed_index: int
+    ) -> Tuple[float, _VirtualEntityMatch]:
+      """Quantifies the correlation of a pair of entities."""
+      proposed_parameters = proposed_points_virtual[proposed_index]
+      # Offload the quantification of intersection/difference
+      # and resulting subscore
+      subscore = _FieldsSubscore(
+          proposed_raw_field_names=proposed_parameters[0],
+          solution_raw_field_names=solution_parameters[0],
+      )
+      # Meanwhile, calculate a similar metric for overlap of types
+      types_score = _TypesSubscore(
+          proposed_entity_type=proposed_parameters[1],
+          solution_entity_type=solution_parameters[1],
+      )
+      return subscore.tally, _VirtualEntityMatch(
+          correct=subscore.correct,
+          correct_ceiling=subscore.correct_ceiling,
+          incorrect=subscore.incorrect,
+          proposed=proposed_parameters,
+          solution=solution_parameters,
+          types_correct=types_score.correct,
+          types_correct_ceiling=types_score.correct_ceiling,
+          types_incorrect=types_score.incorrect,
+          types_score=types_score.tally,
+      )
 
-        # Add record of the evaluation for sorting
-        # after considering all the candidates
-        candidates[subscore.tally].append(subscore_reference)
-
-      # Choose the closest match
-      selected = (
-          sorted(
-              candidates[best],
-              # Use `._asdict()` to reference index by string
-              key=lambda params: params._asdict()[sort_candidates_by_key],
-              reverse=True,
-          )[0]
-          if len(candidates[best])
-          else None
+    def select(candidates):
+      """Returns the first (index, match) ranking highest by the sort key."""
+      selected = None
+      for proposed_index, match in candidates:
+        if selected is None or getattr(match, sort_candidates_by_key) > getattr(
+            selected[1], sort_candidates_by_key
+        ):
+          selected = (proposed_index, match)
+      return selected
+
+    def pair_without_shared(solution_parameters, shared: Dict[int, int]):
+      """Pairs a solution entity with an entity sharing no raw field name.
+
+      Such pairs have a subscore of -1.0, which only bests a subscore of 0.
+      """
+      if not solution_parameters[0]:
+        return None
+      unshared = (
+          proposed_index
+          for proposed_index in remaining
+          if proposed_index not in shared
+      )
+      if sort_candidates_by_key in _UNSHARED_CONSTANT_METRICS:
+        # These metrics are the same for every unshared entity
+        unshared = itertools.islice(unshared, 1)
+      return select(
+          (proposed_index, compare(solution_parameters, proposed_index)[1])
+          for proposed_index in unshared
       )
 
+    def record(solution_parameters, selected, best: float):
+      """Files a pairing, or the lack of one, under its subscore."""
       if selected:
-        if best in matches_virtual:
-          matches_virtual[best].append(selected)
-        else:
-          matches_virtual[best] = [selected]
+        proposed_index, match = selected
+        matches_virtual.setdefault(best, []).append(match)
         # Since a match was found, remove it from the pool
-        proposed_points_virtual.remove(selected.proposed)
-      else:
-        correct_ceiling = len(solution_raw_field_names)
-        none_subscore_reference = _VirtualEntityMatch(
-            correct=0,
-            correct_ceiling=correct_ceiling,
-            incorrect=correct_ceiling,  # i.e. everything is incorrect
-            proposed=set([]),
-            solution=solution_parameters,
-            types_correct=0,
-            types_correct_ceiling=len(
-                set(solution_entity_type.parent_names.keys())
+        remaining.pop(proposed_index, None)
+        return
+
+      solution_raw_field_names, solution_entity_type = solution_parameters
+      correct_ceiling = len(solution_raw_field_names)
+      none_subscore_reference = _VirtualEntityMatch(
+          correct=0,
+          correct_ceiling=correct_ceiling,
+          incorrect=correct_ceiling,  # i.e. everything is incorrect
+          proposed=set([]),
+          solution=solution_parameters,
+          types_correct=0,
+          types_correct_ceiling=len(
+              set(solution_entity_type.parent_names.keys())
+          ),
+          types_incorrect=len(set(solution_entity_type.parent_names.keys())),
+          types_score=-1.0,
+      )
+      matches_virtual[None].append(none_subscore_reference)
+
+    if matching_mode == MatchingModes.GREEDY:
+      for solution_parameters in solution_points_virtual:
+        shared = count_shared(solution_parameters[0])
+        # Evaluate candidates in their original order for tie breaking
+        candidates = [
+            compare(solution_parameters, proposed_index) + (proposed_index,)
+            for proposed_index in sorted(shared)
+        ]
+        # Zero subscores never count as a match
+        best = max(
+            (tally for tally, _, _ in candidates if tally != 0), default=None
+        )
+        if best is not None:
+          selected = select(
+              (proposed_index, match)
+              for tally, match, proposed_index in candidates
+              if tally == best
+          )
+        else:
+          selected = pair_without_shared(solution_parameters, shared)
+          best = _UNSHARED_TALLY
+        record(solution_parameters, selected, best)
+      return matches_virtual
+
+    # Pair entities sharing raw field names, primarily by the number of
+    # raw field names shared and secondarily by the sort key
+    edges = []
+    for solution_parameters in solution_points_virtual:
+      edges.append({
+          proposed_index: (count,) + compare(
+              solution_parameters, proposed_index
+          )
+          for proposed_index, count in count_shared(
+              solution_parameters[0]
+          ).items()
+      })
+    tie_break_ceiling = (
+        max(
+            (
+                getattr(match, sort_candidates_by_key)
+                for row in edges
+                for _, _, match in row.values()
             ),
-            types_incorrect=len(set(solution_entity_type.parent_names.keys())),
-            types_score=-1.0,
+            default=0,
         )
-
-        matches_virtual[None].append(none_subscore_reference)
+        * len(edges)
+        + 1
+    )
+    assignment = _solve_assignment([
+        {
+            proposed_index: count * tie_break_ceiling + getattr(
+                match, sort_candidates_by_key
+            )
+            for proposed_index, (count, _, match) in row.items()
+        }
+        for row in edges
+    ])
+    for proposed_index in assignment.values():
+      del remaining[proposed_index]
+
+    for solution_index, solution_parameters in enumerate(
+        solution_points_virtual
+    ):
+      if solution_index in assignment:
+        proposed_index = assignment[solution_index]
+        _, best, match = edges[solution_index][proposed_index]
+        selected = (proposed_index, match)
+      else:
+        selected = pair_without_shared(
+            solution_parameters, edges[solution_index]
+        )
+        best = _UNSHARED_TALLY
+      record(solution_parameters, selected, best)
 
     return matches_virtual
 
-  @staticmethod
-  def _isolate_mappings(
-      translations, *, mapping_type: MappingType
-  ) -> Set[Tuple[str, Tuple]]:
-    """Distills mappings from each entity into a set for global comparison"""
-    mappings = set()
-    for translation in translations:
-      # (standard_field_name: str, field: obj)
-      field = translation[1]
-      if type(field).__name__ == mapping_type:
-        if mapping_type == MappingTypes.STATE:
-          attribute = 'states'
-        if mapping_type == MappingTypes.UNIT:
-          attribute = 'unit_mapping'
-        for item in getattr(field, attribute).items():
-          mappings.add((field.raw_field_name, item))
-    return mappings
-
   @staticmethod
   def _format_score(score: float, *, precision: int = 2) -> str:
     return f'{score:.{precision}f}' if score is not None else score
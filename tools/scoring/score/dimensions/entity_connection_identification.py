@@ -15,7 +15,7 @@
 
 # from collections import Counter
 
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 from typing import Set
 
 from score.constants import DimensionCategories, FileTypes
@@ -107,4 +107,22 @@ class EntityConnectionIdentification(Dimension):
         self.correct_ceiling_override - self.correct_total_override
     )
 
+    if self.report is not None:
+      # Report connections by their target, the last word of each
+      proposed_by_target = defaultdict(set)
+      solution_by_target = defaultdict(set)
+      for by_target, condensed in (
+          (proposed_by_target, proposed_connections_condensed),
+          (solution_by_target, solution_connections_condensed),
+      ):
+        for connection in condensed:
+          by_target[connection.rsplit(' ', 1)[-1]].add(connection)
+      for target in sorted(solution_by_target):
+        self._report_items(
+            proposed_items=proposed_by_target.get(target, set()),
+            solution_items=solution_by_target[target],
+            device=None,
+            solution_entity=target,
+        )
+
     return self
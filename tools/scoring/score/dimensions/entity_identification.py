@@ -18,6 +18,7 @@ from typing import List
 
 from score.constants import DimensionCategories, FileTypes
 from score.dimensions.dimension import Dimension
+from score.report import REPORTING, VIRTUAL
 from score.scorer_types import CloudDeviceId, DeserializedFile
 
 PROPOSED, SOLUTION = FileTypes
@@ -101,4 +102,20 @@ class EntityIdentification(Dimension):
     self.correct_ceiling_virtual = len(solution_virtual_ids)
     self.incorrect_virtual = self.correct_ceiling_virtual - self.correct_virtual
 
+    if self.report is not None:
+      for device, proposed_ids, solution_ids in (
+          (REPORTING, proposed_reporting_ids, solution_reporting_ids),
+          (VIRTUAL, proposed_virtual_ids, solution_virtual_ids),
+      ):
+        proposed_counts = Counter(proposed_ids)
+        for cloud_device_id, count in Counter(solution_ids).items():
+          correct = min(count, proposed_counts[cloud_device_id])
+          self._report_entity(
+              device=device,
+              cloud_device_id=cloud_device_id,
+              correct=correct,
+              correct_ceiling=count,
+              incorrect=count - correct,
+          )
+
     return self
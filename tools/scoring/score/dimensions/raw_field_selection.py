@@ -15,6 +15,7 @@
 
 from score.constants import DimensionCategories, FileTypes
 from score.dimensions.dimension import Dimension
+from score.report import REPORTING
 
 PROPOSED, SOLUTION = FileTypes
 
@@ -30,22 +31,12 @@ class RawFieldSelection(Dimension):
   # rather than `deserialized_files` to do its calculations
   category = DimensionCategories.SIMPLE
 
-  def _fetch_raw_field_names(self, translations):
-    return set([
-        translation.raw_field_name
-        for standard_field_name, translation in translations
-    ])
-
   def evaluate(self):
     """Calculates and assigns properties necessary for generating a score."""
-
-    proposed_translations, solution_translations = map(
-        self._condense_translations, (PROPOSED, SOLUTION)
-    )
+    translation_index = self._index_translations()
 
     proposed_fields, solution_fields = map(
-        self._fetch_raw_field_names,
-        (proposed_translations, solution_translations),
+        translation_index.raw_field_names, (PROPOSED, SOLUTION)
     )
 
     correct_fields = proposed_fields.intersection(solution_fields)
@@ -55,4 +46,13 @@ class RawFieldSelection(Dimension):
     self.correct_ceiling_reporting = len(solution_fields)
     self.incorrect_reporting = len(incorrect_fields)
 
+    if self.report is not None:
+      for cloud_device_id, device in translation_index.devices.items():
+        self._report_items(
+            proposed_items=device[PROPOSED].raw_field_names,
+            solution_items=device[SOLUTION].raw_field_names,
+            device=REPORTING,
+            cloud_device_id=cloud_device_id,
+        )
+
     return self
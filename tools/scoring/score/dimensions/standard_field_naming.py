@@ -13,10 +13,10 @@
 # limitations under the License.
 """Core component."""
 
-import re as regex
-
 from score.constants import DimensionCategories, FileTypes
 from score.dimensions.dimension import Dimension
+from score.report import REPORTING
+from score.translation_index import split_subfields
 
 PROPOSED, SOLUTION = FileTypes
 
@@ -31,40 +31,54 @@ class StandardFieldNaming(Dimension):
   # rather than `deserialized_files` to do its calculations
   category = DimensionCategories.SIMPLE
 
-  def _split_subfields(self, field):
-    return set(
-        filter(
-            lambda subfield: not bool(regex.match('[0-9]+', subfield)),
-            field.split('_'),
-        )
-    )
-
   def evaluate(self):
     """Calculates and assigns properties necessary for generating a score."""
-    correct_subfields = []
+    correct: int = 0
     correct_ceiling: int = 0
-    incorrect_subfields = []
-
-    for entity_translations in self.translations.values():
-      for solution_field, solution_value in entity_translations[SOLUTION]:
-        solution_subfields = self._split_subfields(solution_field)
-        correct_ceiling += len(solution_subfields)
+    incorrect: int = 0
 
-        proposed_subfields = set()
+    for cloud_device_id, device in self._index_translations().devices.items():
+      # Subfield counts and names of fields which differ, for the report
+      device_correct, device_ceiling, device_incorrect = 0, 0, 0
+      missing_fields, unexpected_fields = [], []
 
-        for proposed_field, proposed_value in entity_translations[PROPOSED]:
-          if proposed_value.raw_field_name == solution_value.raw_field_name:
-            proposed_subfields = self._split_subfields(proposed_field)
-
-        correct_subfields.extend(
-            proposed_subfields.intersection(solution_subfields)
+      for solution_field, solution_value in device[SOLUTION].translations:
+        solution_subfields = split_subfields(solution_field)
+        # The proposed field translating the same raw field, if any
+        proposed_field = device[PROPOSED].by_raw_field_name.get(
+            solution_value.raw_field_name
         )
-        incorrect_subfields.extend(
-            solution_subfields.difference(proposed_subfields)
+        proposed_subfields = (
+            split_subfields(proposed_field)
+            if proposed_field is not None
+            else frozenset()
         )
 
-    self.correct_reporting = len(correct_subfields)
+        correct_count = len(proposed_subfields.intersection(solution_subfields))
+        incorrect_count = len(solution_subfields.difference(proposed_subfields))
+        device_correct += correct_count
+        device_ceiling += len(solution_subfields)
+        device_incorrect += incorrect_count
+        if proposed_field != solution_field:
+          missing_fields.append(solution_field)
+          if proposed_field is not None:
+            unexpected_fields.append(proposed_field)
+
+      self._report_entity(
+          device=REPORTING,
+          cloud_device_id=cloud_device_id,
+          correct=device_correct,
+          correct_ceiling=device_ceiling,
+          incorrect=device_incorrect,
+          missing=missing_fields,
+          unexpected=unexpected_fields,
+      )
+      correct += device_correct
+      correct_ceiling += device_ceiling
+      incorrect += device_incorrect
+
+    self.correct_reporting = correct
     self.correct_ceiling_reporting = correct_ceiling
-    self.incorrect_reporting = len(incorrect_subfields)
+    self.incorrect_reporting = incorrect
 
     return self
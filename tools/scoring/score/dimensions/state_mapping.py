@@ -15,6 +15,7 @@
 
 from score.constants import DimensionCategories, FileTypes, MappingTypes
 from score.dimensions.dimension import Dimension
+from score.report import REPORTING
 
 STATE, UNIT = MappingTypes
 PROPOSED, SOLUTION = FileTypes
@@ -33,15 +34,11 @@ class StateMapping(Dimension):
   def evaluate(self):
     """Calculates and assigns properties necessary for generating a score."""
 
-    proposed_translations, solution_translations = map(
-        self._condense_translations, (PROPOSED, SOLUTION)
-    )
+    translation_index = self._index_translations()
 
-    proposed_mappings = self._isolate_mappings(
-        proposed_translations, mapping_type=STATE
-    )
-    solution_mappings = self._isolate_mappings(
-        solution_translations, mapping_type=STATE
+    proposed_mappings, solution_mappings = (
+        translation_index.mappings(file_type, STATE)
+        for file_type in (PROPOSED, SOLUTION)
     )
 
     correct_mappings = proposed_mappings.intersection(solution_mappings)
@@ -52,4 +49,13 @@ class StateMapping(Dimension):
         self.correct_ceiling_reporting - self.correct_reporting
     )
 
+    if self.report is not None:
+      for cloud_device_id, device in translation_index.devices.items():
+        self._report_items(
+            proposed_items=device[PROPOSED].mappings[STATE],
+            solution_items=device[SOLUTION].mappings[STATE],
+            device=REPORTING,
+            cloud_device_id=cloud_device_id,
+        )
+
     return self
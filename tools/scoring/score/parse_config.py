@@ -13,12 +13,15 @@
 # limitations under the License.
 """File parser for the configuration scoring tool."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Type
 
-from score.constants import DimensionCategories, FileTypes
+from score import worker_pool
+from score.constants import DimensionCategories, FileTypes, MatchingModes
 from score.dimensions import entity_connection_identification, entity_identification, entity_point_identification, entity_type_identification, raw_field_selection, standard_field_naming, state_mapping, unit_mapping
-from score.dimensions.dimension import Dimension
-from score.scorer_types import DeserializedFile, DeserializedFilesDict, DimensionName, TranslationsDict
+from score.dimensions.dimension import Dimension, SolutionIndex
+from score.report import ScoringReport
+from score.scorer_types import DeserializedFile, DeserializedFilesDict, DimensionName, MatchingMode, TranslationsDict
+from score.translation_index import TranslationIndex
 
 from validate import handler as validator
 from validate.generate_universe import BuildUniverse
@@ -27,6 +30,59 @@ from yamlformat.validator.presubmit_validate_types_lib import ConfigUniverse
 PROPOSED, SOLUTION = FileTypes
 SIMPLE, COMPLEX = DimensionCategories
 
+# Dimensions scored by execute()
+DIMENSIONS = [
+    raw_field_selection.RawFieldSelection,
+    standard_field_naming.StandardFieldNaming,
+    state_mapping.StateMapping,
+    unit_mapping.UnitMapping,
+    entity_connection_identification.EntityConnectionIdentification,
+    entity_identification.EntityIdentification,
+    entity_point_identification.EntityPointIdentification,
+    entity_type_identification.EntityTypeIdentification,
+]
+
+
+def _evaluate_dimension(
+    dimension: Type[Dimension],
+    translations: TranslationsDict,
+    deserialized_files: DeserializedFilesDict,
+    matching_mode: Optional[MatchingMode],
+    translation_index: Optional[TranslationIndex] = None,
+    solution_index: Optional[SolutionIndex] = None,
+    report: Optional[ScoringReport] = None,
+) -> Dimension:
+  """Invokes a dimension with the argument for its category and evaluates it."""
+  options = {'report': report} if report else {}
+  if dimension.category == SIMPLE:
+    if translation_index is not None and issubclass(dimension, Dimension):
+      options['translation_index'] = translation_index
+    evaluated = dimension(translations=translations, **options).evaluate()
+  elif dimension.category == COMPLEX:
+    if matching_mode:
+      options['matching_mode'] = matching_mode
+    if solution_index is not None and issubclass(dimension, Dimension):
+      options['solution_index'] = solution_index
+    evaluated = dimension(
+        deserialized_files=deserialized_files, **options
+    ).evaluate()
+  if report:
+    report.write_dimension(evaluated)
+  return evaluated
+
+
+def _evaluate_dimension_in_worker(
+    dimension: Type[Dimension], **arguments
+) -> Dimension:
+  evaluated = _evaluate_dimension(dimension, **arguments)
+  # The parent already holds the inputs; do not send them back
+  if isinstance(evaluated, Dimension):
+    evaluated.translations = None
+    evaluated.deserialized_files = None
+    evaluated.translation_index = None
+    evaluated.solution_index = None
+  return evaluated
+
 
 class ParseConfig:
   """Attributes:
@@ -47,6 +103,9 @@ class ParseConfig:
       solution: str,
       proposed: str,
       verbose: Optional[bool] = False,
+      matching_mode: Optional[MatchingMode] = MatchingModes.OPTIMAL,
+      processes: int = 1,
+      report: Optional[str] = None,
   ):
     """Arguments:
 
@@ -54,12 +113,19 @@ class ParseConfig:
     solution: Path to the solution config
     proposed: Path to the config to be evaluated
     verbose: Print specifics of missing types and translations (optional)
+    matching_mode: How virtual entities of the files are paired (optional)
+    processes: Number of processes evaluating dimensions (optional)
+    report: Path of a JSONL or CSV file to write per-entity results to
+      (optional)
     """
     self.args = {
         'ontology': ontology,
         SOLUTION: solution,
         PROPOSED: proposed,
         'verbose': verbose,
+        'matching_mode': matching_mode,
+        'processes': processes,
+        'report': report,
     }
     print('Scoring — building universe')
     self.universe = BuildUniverse(default_types_filepath=ontology)
@@ -161,6 +227,27 @@ class ParseConfig:
       of translations for the device, keyed under the file type
     """
 
+    # Index proposed entities once rather than scanning them for every
+    # solution entity
+    proposed_index = Dimension.index_by_cloud_device_id(
+        proposed_entities.values()
+    )
+    duplicates = [
+        entities for entities in proposed_index.values() if len(entities) > 1
+    ]
+    if duplicates:
+      print(
+          f'    {PROPOSED} duplicate cloud device ids: {len(duplicates)} '
+          + f'({sum(map(len, duplicates))} instances); '
+          + 'the first instance of each is scored'
+      )
+
+    def aggregate_translations(entity) -> List[Any]:
+      """Isolate translation of an entity pairing."""
+      if getattr(entity, 'translation', None):
+        return list(entity.translation.items())
+      return []
+
     translations = {}
     for solution_entity in solution_entities.values():
       if solution_entity.cloud_device_id is None:
@@ -169,34 +256,8 @@ class ParseConfig:
         continue  # as noncanonical entities are skipped
 
       cloud_device_id = solution_entity.cloud_device_id
-
-      def find_matches(cdid: str) -> List[Any]:
-        """Find the matching proposal via cloud_device_id comparison.
-
-        Args:
-          cdid: cloud device id string.
-
-        Returns:
-          List of matching entities.
-        """
-        matches = [
-            proposed_entity
-            for proposed_entity in proposed_entities.values()
-            if proposed_entity.cloud_device_id == cdid
-        ]
-        return matches
-
-      proposed_entity = (
-          find_matches(cloud_device_id)[0]
-          if find_matches(cloud_device_id)
-          else {}
-      )
-
-      def aggregate_translations(entity) -> List[Any]:
-        """Isolate translation of an entity pairing."""
-        if getattr(entity, 'translation', None):
-          return list(entity.translation.items())
-        return []
+      matches = proposed_index.get(cloud_device_id)
+      proposed_entity = matches[0] if matches else {}
 
       translations[cloud_device_id] = {
           PROPOSED: aggregate_translations(proposed_entity),
@@ -211,6 +272,10 @@ class ParseConfig:
       dimensions: List[Dimension],
       translations: TranslationsDict,
       deserialized_files: DeserializedFilesDict,
+      matching_mode: Optional[MatchingMode] = None,
+      processes: int = 1,
+      report: Optional[ScoringReport] = None,
+      solution_index: Optional[SolutionIndex] = None,
   ) -> Dict[DimensionName, Dimension]:
     """Wrapper which outputs a dictionary of results by invoking each
 
@@ -223,19 +288,72 @@ class ParseConfig:
       deserialized_files: Dictionary with deserialized configuration files keyed
         under their respective file type ("proposed" or "solution"). Used as
         argument for "complex" dimensions.
+      matching_mode: How "complex" dimensions pair virtual entities. Uses the
+        default of each dimension if not specified.
+      processes: Number of worker processes evaluating dimensions
+        simultaneously. Dimensions only read their arguments, which workers
+        share with this process where processes can be forked.
+      report: Open report which dimensions write per-entity records to while
+        they evaluate, followed by their totals. Dimensions are then evaluated
+        in this process, one after another.
+      solution_index: Index of the solution file which "complex" dimensions
+        compare, if already built for the same solution. Built here otherwise.
 
     Returns:
       Dictionary with dimension names as keys and `Dimension`s as values
     """
-    results = {}
+    # "Simple" dimensions share a single index of the translations
+    translation_index = (
+        TranslationIndex(translations)
+        if any(
+            issubclass(dimension, Dimension) and dimension.category == SIMPLE
+            for dimension in dimensions
+        )
+        else None
+    )
+    # "Complex" dimensions share a single index of the solution
+    if solution_index is None and any(
+        issubclass(dimension, Dimension) and dimension.category == COMPLEX
+        for dimension in dimensions
+    ):
+      solution_index = Dimension.index_solution(deserialized_files[SOLUTION])
+    processes = min(processes, len(dimensions))
+    if processes <= 1 or report:
+      return {
+          dimension.__name__: _evaluate_dimension(
+              dimension,
+              translations,
+              deserialized_files,
+              matching_mode,
+              translation_index,
+              solution_index,
+              report,
+          )
+          for dimension in dimensions
+      }
 
-    for dimension in dimensions:
-      # Invoke the functions and append the dictionary with their return values
-      if dimension.category == SIMPLE:
-        evaluated = dimension(translations=translations).evaluate()
-      elif dimension.category == COMPLEX:
-        evaluated = dimension(deserialized_files=deserialized_files).evaluate()
+    evaluated_dimensions = worker_pool.map_shared(
+        _evaluate_dimension_in_worker,
+        dimensions,
+        {
+            'translations': translations,
+            'deserialized_files': deserialized_files,
+            'matching_mode': matching_mode,
+            'translation_index': translation_index,
+            'solution_index': solution_index,
+        },
+        processes,
+    )
 
+    results = {}
+    for dimension, evaluated in zip(dimensions, evaluated_dimensions):
+      if isinstance(evaluated, Dimension):
+        evaluated.translations = translations
+        evaluated.deserialized_files = deserialized_files
+        if evaluated.category == SIMPLE:
+          evaluated.translation_index = translation_index
+        elif evaluated.category == COMPLEX:
+          evaluated.solution_index = solution_index
       results[dimension.__name__] = evaluated
     return results
 
@@ -255,22 +373,21 @@ class ParseConfig:
         solution_entities=deserialized_files_appended[SOLUTION],
     )
 
-    dimensions = [
-        raw_field_selection.RawFieldSelection,
-        standard_field_naming.StandardFieldNaming,
-        state_mapping.StateMapping,
-        unit_mapping.UnitMapping,
-        entity_connection_identification.EntityConnectionIdentification,
-        entity_identification.EntityIdentification,
-        entity_point_identification.EntityPointIdentification,
-        entity_type_identification.EntityTypeIdentification,
-    ]
-
-    self.results = self.aggregate_results(
-        dimensions=dimensions,
-        translations=translations,
-        deserialized_files=deserialized_files_appended,
-    )
+    aggregate_arguments = {
+        'dimensions': DIMENSIONS,
+        'translations': translations,
+        'deserialized_files': deserialized_files_appended,
+        'matching_mode': self.args['matching_mode'],
+        'processes': self.args['processes'],
+    }
+    if self.args['report']:
+      print(f'Scoring — writing report {self.args["report"]}')
+      with ScoringReport(self.args['report']) as report:
+        self.results = self.aggregate_results(
+            **aggregate_arguments, report=report
+        )
+    else:
+      self.results = self.aggregate_results(**aggregate_arguments)
 
     readable = {
         name: str(dimension) for name, dimension in self.results.items()
@@ -0,0 +1,163 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per-entity and per-dimension scoring report for the scoring tool."""
+
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from score.constants import ReportFormats
+from score.scorer_types import ReportFormat
+
+# Kinds of records: an entity (or connection) scored by a dimension, and the
+# totals of a dimension, written once it has been evaluated
+ENTITY_RECORD, DIMENSION_RECORD = 'entity', 'dimension'
+# Devices of entity records, for dimensions which score them separately
+REPORTING, VIRTUAL = 'reporting', 'virtual'
+
+REPORT_FIELDS = (
+    'record',
+    'dimension',
+    'device',
+    'cloud_device_id',
+    'proposed_entity',
+    'solution_entity',
+    'correct',
+    'correct_ceiling',
+    'incorrect',
+    'result',
+    'missing',
+    'unexpected',
+)
+
+# Fields which hold lists of the items compared
+_LIST_FIELDS = ('missing', 'unexpected')
+
+
+class ScoringReport:
+  """Writes scoring records to a file as they are produced.
+
+  Each record is written as soon as it is received and none are kept, so
+  memory does not grow with the size of the building.
+
+  Attributes:
+    path: Path of the report file
+    report_format: Format of the report file
+    records: Number of records written
+  """
+
+  def __init__(self, path: str, report_format: Optional[ReportFormat] = None):
+    """Arguments:
+
+    path: Path of the report file to write
+    report_format: JSONL or CSV; inferred from the file extension by default
+    """
+    if report_format is None:
+      extension = os.path.splitext(path)[1].lstrip('.').lower()
+      try:
+        report_format = ReportFormats(extension)
+      except ValueError as error:
+        raise ValueError(
+            f'Report format of {path} is not one of '
+            + ', '.join(map(str, ReportFormats))
+        ) from error
+    self.path = path
+    self.report_format = ReportFormats(report_format)
+    self.records = 0
+    self._file = None
+    self._writer = None
+
+  def __enter__(self) -> 'ScoringReport':
+    os.makedirs(os.path.dirname(self.path) or os.curdir, exist_ok=True)
+    self._file = open(self.path, 'w', encoding='utf-8', newline='')
+    if self.report_format == ReportFormats.CSV:
+      self._writer = csv.DictWriter(self._file, fieldnames=REPORT_FIELDS)
+      self._writer.writeheader()
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self._file.close()
+    self._file = None
+    self._writer = None
+
+  def write(self, record: Dict[str, Any]) -> None:
+    """Writes a record; fields absent from it are left empty."""
+    record = {field: record.get(field) for field in REPORT_FIELDS}
+    for field in _LIST_FIELDS:
+      if record[field] is not None:
+        record[field] = sorted(map(str, record[field]))
+    if self._writer:
+      for field in _LIST_FIELDS:
+        if record[field] is not None:
+          record[field] = json.dumps(record[field])
+      self._writer.writerow(record)
+    else:
+      self._file.write(json.dumps(record) + '\n')
+    self.records += 1
+
+  def write_entity(
+      self,
+      dimension: str,
+      *,
+      device: Optional[str],
+      correct: int,
+      correct_ceiling: int,
+      incorrect: int,
+      missing: Optional[Iterable[Any]] = None,
+      unexpected: Optional[Iterable[Any]] = None,
+      cloud_device_id: Optional[str] = None,
+      proposed_entity: Optional[str] = None,
+      solution_entity: Optional[str] = None,
+  ) -> None:
+    """Writes the comparison of an entity of the solution by a dimension.
+
+    Args:
+      dimension: Name of the dimension
+      device: "reporting" or "virtual", if the dimension separates them
+      correct: Number of successful attempts for the entity
+      correct_ceiling: Number of attempts possible for the entity
+      incorrect: Number of failed attempts for the entity
+      missing: Solution items absent from the matched proposed entity, if
+        the dimension compares items
+      unexpected: Proposed items absent from the solution entity, if the
+        dimension compares items
+      cloud_device_id: Cloud device id of a reporting entity
+      proposed_entity: Code or type of the matched proposed entity, if any
+      solution_entity: Code or type of the solution entity
+    """
+    self.write({
+        'record': ENTITY_RECORD,
+        'dimension': dimension,
+        'device': device,
+        'cloud_device_id': cloud_device_id,
+        'proposed_entity': proposed_entity,
+        'solution_entity': solution_entity,
+        'correct': correct,
+        'correct_ceiling': correct_ceiling,
+        'incorrect': incorrect,
+        'missing': missing,
+        'unexpected': unexpected,
+    })
+
+  def write_dimension(self, dimension: Any) -> None:
+    """Writes the totals of an evaluated dimension."""
+    self.write({
+        'record': DIMENSION_RECORD,
+        'dimension': type(dimension).__name__,
+        'correct': dimension.correct_total(),
+        'correct_ceiling': dimension.correct_ceiling(),
+        'incorrect': dimension.incorrect_total(),
+        'result': dimension.result_all,
+    })
@@ -19,13 +19,14 @@
 
 from typing import Dict, List, Tuple, Any, Set
 from validate.entity_instance import EntityInstance
-from score.constants import FileTypes, DimensionCategories, MappingTypes
+from score.constants import FileTypes, DimensionCategories, MappingTypes, MatchingModes, ReportFormats
 from yamlformat.validator.entity_type_lib import EntityType as EntType
 
 CloudDeviceId = str
 FileType = FileTypes
 DeserializedFile = Dict[CloudDeviceId, EntityInstance]
 DeserializedFilesDict = Dict[FileType, DeserializedFile]
+CloudDeviceIndex = Dict[CloudDeviceId, List[EntityInstance]]
 DimensionName = str
 TranslationsDict = Dict[CloudDeviceId, Dict[FileType, List[Tuple[str, Any]]]]
 DimensionCategory = DimensionCategories
@@ -34,3 +35,6 @@ RawFieldName = str
 PointsVirtualList = List[Tuple[Set[RawFieldName], EntityType]]
 ConnectionsList = List[Tuple[str, Any]]
 MappingType = MappingTypes
+MatchingMode = MatchingModes
+ReportFormat = ReportFormats
+ConfigPath = str
@@ -0,0 +1,131 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Index of the translations scored by "simple" dimensions."""
+
+import functools
+import re as regex
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Set, Tuple
+
+from score.constants import FileTypes, MappingTypes
+from score.scorer_types import CloudDeviceId, FileType, MappingType, RawFieldName, TranslationsDict
+
+PROPOSED, SOLUTION = FileTypes
+STATE, UNIT = MappingTypes
+
+# Attribute which holds the mappings of the fields of each mapping type
+_MAPPING_ATTRIBUTES = {STATE: 'states', UNIT: 'unit_mapping'}
+
+
+@functools.lru_cache(maxsize=None)
+def split_subfields(standard_field_name: str) -> FrozenSet[str]:
+  """Splits a standard field name into subfields, without numeric ones.
+
+  Results are cached, as the same names recur across devices and files.
+  """
+  return frozenset(
+      subfield
+      for subfield in standard_field_name.split('_')
+      if not regex.match('[0-9]+', subfield)
+  )
+
+
+def isolate_mappings(
+    translations: List[Tuple[str, Any]], *, mapping_type: MappingType
+) -> Set[Tuple[RawFieldName, Tuple]]:
+  """Distills mappings of a type from translations into a set."""
+  attribute = _MAPPING_ATTRIBUTES[mapping_type]
+  mappings = set()
+  for _, field in translations:
+    if type(field).__name__ == mapping_type:
+      for item in getattr(field, attribute).items():
+        mappings.add((field.raw_field_name, item))
+  return mappings
+
+
+class FileTranslations(NamedTuple):
+  """Translations of a device in one file, indexed for comparison.
+
+  Attributes:
+    translations: Standard field names and fields, in file order
+    by_raw_field_name: Standard field name translating each raw field name;
+      the last translation of a raw field name is kept
+    raw_field_names: Raw field names translated
+    mappings: Raw field names and mapped values, by mapping type
+  """
+
+  translations: List[Tuple[str, Any]]
+  by_raw_field_name: Dict[RawFieldName, str]
+  raw_field_names: Set[RawFieldName]
+  mappings: Dict[MappingType, Set[Tuple[RawFieldName, Tuple]]]
+
+  @classmethod
+  def build(cls, translations: List[Tuple[str, Any]]) -> 'FileTranslations':
+    by_raw_field_name = {
+        field.raw_field_name: standard_field_name
+        for standard_field_name, field in translations
+    }
+    return cls(
+        translations=translations,
+        by_raw_field_name=by_raw_field_name,
+        raw_field_names=set(by_raw_field_name),
+        mappings={
+            mapping_type: isolate_mappings(
+                translations, mapping_type=mapping_type
+            )
+            for mapping_type in _MAPPING_ATTRIBUTES
+        },
+    )
+
+
+class TranslationIndex:
+  """Translations of matched reporting devices, indexed once
+
+  so that each "simple" dimension compares them in time linear in their
+  number.
+
+  Attributes:
+    devices: Indexed proposed and solution translations of each device, keyed
+      by `cloud_device_id`
+  """
+
+  def __init__(self, translations: TranslationsDict):
+    self.devices: Dict[CloudDeviceId, Dict[FileType, FileTranslations]] = {
+        cloud_device_id: {
+            file_type: FileTranslations.build(device_translations[file_type])
+            for file_type in (PROPOSED, SOLUTION)
+        }
+        for cloud_device_id, device_translations in translations.items()
+    }
+    self._raw_field_names = {}
+    self._mappings = {}
+
+  def raw_field_names(self, file_type: FileType) -> Set[RawFieldName]:
+    """Raw field names translated in a file across all devices."""
+    if file_type not in self._raw_field_names:
+      self._raw_field_names[file_type] = set().union(*(
+          device[file_type].raw_field_names for device in self.devices.values()
+      ))
+    return self._raw_field_names[file_type]
+
+  def mappings(
+      self, file_type: FileType, mapping_type: MappingType
+  ) -> Set[Tuple[RawFieldName, Tuple]]:
+    """Mappings of a type in a file across all devices."""
+    key = (file_type, mapping_type)
+    if key not in self._mappings:
+      self._mappings[key] = set().union(*(
+          device[file_type].mappings[mapping_type]
+          for device in self.devices.values()
+      ))
+    return self._mappings[key]
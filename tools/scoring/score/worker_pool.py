@@ -0,0 +1,75 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process pool sharing read-only inputs with its workers."""
+
+import functools
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Inputs shared by the items mapped in the current process. Set before the
+# pool is forked so that workers share the parent's copy, or received once per
+# worker otherwise.
+_shared_arguments: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(shared_arguments: Optional[Dict[str, Any]]) -> None:
+  """Receives the shared inputs in a worker that did not inherit them."""
+  global _shared_arguments
+  if _shared_arguments is None:
+    _shared_arguments = shared_arguments
+
+
+def _call_in_worker(function: Callable[..., Any], item: Any) -> Any:
+  return function(item, **_shared_arguments)
+
+
+def map_shared(
+    function: Callable[..., Any],
+    items: Iterable[Any],
+    shared_arguments: Dict[str, Any],
+    processes: int,
+) -> List[Any]:
+  """Maps a function over items in a pool of worker processes.
+
+  Calls `function(item, **shared_arguments)` for every item. Where processes
+  can be forked, workers inherit the shared arguments copy-on-write rather
+  than receiving a pickled copy each.
+
+  Args:
+    function: Module-level function, so that workers can unpickle it
+    items: Items passed one at a time, in order
+    shared_arguments: Keyword arguments passed with every item
+    processes: Number of worker processes
+
+  Returns:
+    List of the results of the function, in the order of the items
+  """
+  global _shared_arguments
+  if 'fork' in multiprocessing.get_all_start_methods():
+    context = multiprocessing.get_context('fork')
+    # Inherited copy-on-write rather than sent to each worker
+    _shared_arguments = shared_arguments
+    initargs = (None,)
+  else:
+    context = multiprocessing.get_context()
+    initargs = (shared_arguments,)
+  try:
+    with context.Pool(
+        processes, initializer=_init_worker, initargs=initargs
+    ) as pool:
+      return pool.map(
+          functools.partial(_call_in_worker, function), items, chunksize=1
+      )
+  finally:
+    _shared_arguments = None
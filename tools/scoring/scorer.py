@@ -18,6 +18,7 @@ import pprint
 import sys
 
 from score import parse_config
+from score.constants import MatchingModes
 
 
 def parse_args() -> argparse.ArgumentParser:
@@ -51,6 +52,39 @@ def parse_args() -> argparse.ArgumentParser:
       metavar='proposed',
   )
 
+  parser.add_argument(
+      '-match',
+      '--matching-mode',
+      dest='matching_mode',
+      required=False,
+      default=MatchingModes.OPTIMAL,
+      type=MatchingModes,
+      choices=list(MatchingModes),
+      help='How virtual entities are paired: optimal (default) or greedy',
+      metavar='matching_mode',
+  )
+
+  parser.add_argument(
+      '-proc',
+      '--processes',
+      dest='processes',
+      required=False,
+      default=1,
+      type=int,
+      help='Number of processes evaluating dimensions simultaneously',
+      metavar='processes',
+  )
+
+  parser.add_argument(
+      '-r',
+      '--report',
+      dest='report',
+      required=False,
+      default=None,
+      help='Path for a .jsonl or .csv file of per-entity results to be written',
+      metavar='report',
+  )
+
   parser.add_argument(
       '-v',
       '--verbose',
@@ -74,5 +108,8 @@ if __name__ == '__main__':
       solution=args.solution,
       proposed=args.proposed,
       verbose=args.verbose,
+      matching_mode=args.matching_mode,
+      processes=args.processes,
+      report=args.report,
   )
   pp.pprint(scorer.execute())
@@ -0,0 +1,108 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test for scoring many proposed configuration files."""
+
+from unittest.mock import patch
+
+from absl.testing import absltest
+from score import batch_score
+from score import parse_config
+from score.constants import FileTypes
+from score.dimensions.dimension import Dimension
+
+PROPOSED, SOLUTION = FileTypes
+
+
+class BatchScoreTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.ontology = '../../ontology/yaml/resources'
+    cls.solution = 'tests/samples/solution/building_config_example.yaml'
+    cls.proposed = [
+        'tests/samples/proposed/building_config_example.yaml',
+        'tests/samples/proposed/entity_type_identification_virtual.yaml',
+        'tests/samples/solution/building_config_example.yaml',
+    ]
+    with patch('builtins.print'):
+      cls.batch = batch_score.BatchScore(
+          ontology=cls.ontology, solution=cls.solution, proposed=cls.proposed
+      )
+      cls.readable = cls.batch.execute()
+
+  def testInitialize(self):
+    self.assertEqual(self.batch.args[SOLUTION], self.solution)
+    self.assertEqual(self.batch.args[PROPOSED], self.proposed)
+    self.assertEqual(self.batch.args['processes'], 1)
+    self.assertEqual(type(self.batch.solution), dict)
+    self.assertNotEmpty(self.batch.solution_index.entities_reporting)
+
+  def testExecuteMatchesParseConfig(self):
+    self.assertEqual(list(self.readable), self.proposed)
+    for proposed in self.proposed:
+      with patch('builtins.print'):
+        expected = parse_config.ParseConfig(
+            ontology=self.ontology, solution=self.solution, proposed=proposed
+        ).execute()
+      self.assertEqual(self.readable[proposed], expected)
+
+  def testExecuteInProcesses(self):
+    with patch('builtins.print'):
+      batch = batch_score.BatchScore(
+          ontology=self.ontology,
+          solution=self.solution,
+          proposed=self.proposed,
+          processes=3,
+      )
+      readable = batch.execute()
+
+    self.assertEqual(readable, self.readable)
+    for results in batch.results.values():
+      for dimension in results.values():
+        self.assertIsInstance(dimension, Dimension)
+
+  def testInitializeRejectsDuplicateProposed(self):
+    with patch('builtins.print'):
+      with self.assertRaisesRegex(ValueError, self.proposed[1]):
+        batch_score.BatchScore(
+            ontology=self.ontology,
+            solution=self.solution,
+            proposed=self.proposed + [self.proposed[1]],
+        )
+
+  def testLeaderboard(self):
+    leaderboard = self.batch.leaderboard()
+
+    self.assertEqual([rank for rank, _, _ in leaderboard], [1, 2, 3])
+    # Files with equal means keep the order in which they were given
+    self.assertEqual(
+        [proposed for _, _, proposed in leaderboard],
+        [self.proposed[0], self.proposed[2], self.proposed[1]],
+    )
+    means = [mean for _, mean, _ in leaderboard]
+    self.assertEqual(means, sorted(means, reverse=True))
+    for _, mean, proposed in leaderboard:
+      self.assertEqual(
+          mean, batch_score.BatchScore.mean_result(self.batch.results[proposed])
+      )
+
+    table = self.batch.format_leaderboard().splitlines()
+    self.assertEqual(table[0], 'rank   mean  proposed')
+    self.assertEqual(table[1], f'   1   {means[0]:.2f}  {self.proposed[0]}')
+    self.assertLen(table, 4)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -16,9 +16,12 @@
 core component base class.
 """
 
+from collections import namedtuple
 import copy
 
 from absl.testing import absltest
+from score.constants import MatchingModes
+from score.dimensions import dimension
 from score.dimensions.dimension import Dimension
 
 from validate import handler as validator
@@ -173,10 +176,91 @@ class DimensionTest(absltest.TestCase):
     self.assertTrue(Dimension.is_entity_reporting(self.entities['reporting']))
     self.assertFalse(Dimension.is_entity_reporting(self.entities['virtual']))
 
+  def testIndexByCloudDeviceId(self):
+    duplicate = copy.copy(self.entities['reporting'])
+    cloud_device_id = self.entities['reporting'].cloud_device_id
+
+    index = Dimension.index_by_cloud_device_id([
+        self.entities['reporting'],
+        self.entities['virtual'],
+        duplicate,
+    ])
+
+    self.assertEqual(list(index), [cloud_device_id])
+    self.assertEqual(
+        index[cloud_device_id], [self.entities['reporting'], duplicate]
+    )
+    self.assertEqual(Dimension.index_by_cloud_device_id([]), {})
+
   def testEntityIsVirtual(self):
     self.assertTrue(Dimension.is_entity_virtual(self.entities['virtual']))
     self.assertFalse(Dimension.is_entity_virtual(self.entities['reporting']))
 
+  def testMatchingModeAttribute(self):
+    self.assertEqual(self.dimension.matching_mode, MatchingModes.OPTIMAL)
+    self.assertEqual(
+        Dimension(
+            translations={}, matching_mode=MatchingModes.GREEDY
+        ).matching_mode,
+        MatchingModes.GREEDY,
+    )
+
+  def testSolveAssignment(self):
+    # pylint: disable=protected-access
+    self.assertEqual(dimension._solve_assignment([]), {})
+    # Pairing row 0 with its best column would leave row 1 unpaired
+    self.assertEqual(
+        dimension._solve_assignment([{0: 3, 1: 2}, {0: 2}]), {0: 1, 1: 0}
+    )
+    # Rows without columns, and columns worth less than the rest, are unpaired
+    self.assertEqual(dimension._solve_assignment([{}, {0: 1}, {0: 5}]), {2: 0})
+
+  def testMatchVirtualEntities(self):
+    points_virtual = namedtuple(
+        'PointsVirtual', ['raw_field_names', 'entity_type']
+    )
+    entity_type = self.entities['canonical_type_appended'].type
+    solution = [
+        points_virtual({'a', 'b'}, entity_type),
+        points_virtual({'b', 'c'}, entity_type),
+    ]
+    proposed = [
+        points_virtual({'a', 'b', 'c'}, entity_type),
+        points_virtual({'a'}, entity_type),
+        points_virtual({'d'}, entity_type),
+    ]
+
+    # pylint: disable=protected-access
+    greedy = Dimension._match_virtual_entities(
+        solution_points_virtual=list(solution),
+        proposed_points_virtual=list(proposed),
+        sort_candidates_by_key='correct_ceiling',
+        matching_mode=MatchingModes.GREEDY,
+    )
+    optimal = Dimension._match_virtual_entities(
+        solution_points_virtual=list(solution),
+        proposed_points_virtual=list(proposed),
+        sort_candidates_by_key='correct_ceiling',
+    )
+
+    # Greedily, the first solution entity takes the closest proposed entity,
+    # leaving the second to the first entity sharing no raw field name
+    self.assertEqual(list(greedy), [None, 1.0, -1.0])
+    self.assertEqual(greedy[1.0][0].proposed, proposed[0])
+    self.assertEqual(greedy[-1.0][0].proposed, proposed[1])
+    self.assertEqual(
+        sum(match.correct for matches in greedy.values() for match in matches),
+        2,
+    )
+    # Optimally, every raw field name of the solution is matched but one
+    self.assertEqual(list(optimal), [None, 0.0, 1.0])
+    self.assertEqual(optimal[0.0][0].proposed, proposed[1])
+    self.assertEqual(optimal[1.0][0].proposed, proposed[0])
+    self.assertEqual(
+        sum(match.correct for matches in optimal.values() for match in matches),
+        3,
+    )
+
   def testStr(self):
     self.assertEqual(
         str(self.dimension),
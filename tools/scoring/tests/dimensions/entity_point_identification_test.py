@@ -16,9 +16,12 @@
 "entity point identification" dimension.
 """
 
+from unittest import mock
+
 from absl.testing import absltest
 from score.constants import DimensionCategories, FileTypes
 from score.dimensions.entity_point_identification import EntityPointIdentification
+from score.report import REPORTING, VIRTUAL
 from tests.helper import TestHelper
 
 PROPOSED, SOLUTION = FileTypes
@@ -179,6 +182,40 @@ class EntityPointIdentificationTest(absltest.TestCase):
     self.assertEqual(middling_score_expected.result_reporting, 1.0)
     self.assertEqual(middling_score_expected.result_virtual, -1.0)
 
+  def testEvaluate_Report(self):
+    report = mock.Mock()
+    EntityPointIdentification(
+        deserialized_files=self.middling_score_argument, report=report
+    ).evaluate()
+
+    report.write_entity.assert_has_calls([
+        # The solution virtual entity has no proposed counterpart
+        mock.call(
+            'EntityPointIdentification',
+            device=VIRTUAL,
+            proposed_entity=None,
+            solution_entity='HVAC/CHWS_WDT',
+            missing={'points.chilled_water_flowrate_sensor.present_value'},
+            unexpected=set(),
+            correct=0,
+            correct_ceiling=1,
+            incorrect=1,
+        ),
+        mock.call(
+            'EntityPointIdentification',
+            correct=1,
+            correct_ceiling=1,
+            incorrect=0,
+            missing=set(),
+            unexpected=set(),
+            device=REPORTING,
+            cloud_device_id='2599571827855502',
+            proposed_entity='VLV-2',
+            solution_entity='VLV-2',
+        ),
+    ])
+    self.assertEqual(report.write_entity.call_count, 2)
+
 
 if __name__ == '__main__':
   absltest.main()
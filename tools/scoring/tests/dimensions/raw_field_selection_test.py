@@ -16,9 +16,12 @@
 "raw field selection" dimension.
 """
 
+from unittest import mock
+
 from absl.testing import absltest
 from score.constants import DimensionCategories, FileTypes
 from score.dimensions.raw_field_selection import RawFieldSelection
+from score.report import REPORTING
 from tests.helper import TestHelper
 
 PROPOSED, SOLUTION = FileTypes
@@ -160,6 +163,36 @@ class RawFieldSelectionTest(absltest.TestCase):
     # "Simple" dimensions don't operate on virtual entities
     self.assertEqual(middling_score_expected.result_virtual, None)
 
+  def testEvaluate_Report(self):
+    report = mock.Mock()
+    RawFieldSelection(
+        translations=self.middling_score_argument, report=report
+    ).evaluate()
+
+    report.write_entity.assert_has_calls([
+        mock.call(
+            'RawFieldSelection',
+            correct=1,
+            correct_ceiling=1,
+            incorrect=0,
+            missing=set(),
+            unexpected=set(),
+            device=REPORTING,
+            cloud_device_id='2599571827844401',
+        ),
+        mock.call(
+            'RawFieldSelection',
+            correct=0,
+            correct_ceiling=1,
+            incorrect=1,
+            missing={'points.space_air_temperature_sensor.present_value'},
+            unexpected=set(),
+            device=REPORTING,
+            cloud_device_id='2599571827855501',
+        ),
+    ])
+    self.assertEqual(report.write_entity.call_count, 2)
+
 
 if __name__ == '__main__':
   absltest.main()
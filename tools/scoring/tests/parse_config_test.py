@@ -13,6 +13,10 @@
 # limitations under the License.
 """Test for configuration file parser."""
 
+import copy
+import json
+import os
+import tempfile
 from typing import Any, NamedTuple
 from unittest.mock import call, patch
 
@@ -122,6 +126,33 @@ class ParseConfigTest(absltest.TestCase):
           type(translations[cdid][f'{SOLUTION}'][0][1]), NonDimensionalValue
       )
 
+  def testRetrieveReportingTranslationsWithDuplicates(self):
+    proposed_entities = validator.Deserialize(
+        ['tests/samples/proposed/retrieve_reporting_translations.yaml']
+    )[0]
+    solution_entities = validator.Deserialize(
+        ['tests/samples/solution/retrieve_reporting_translations.yaml']
+    )[0]
+    cdid = '2599571827844401'
+    duplicate = copy.deepcopy(list(proposed_entities.values())[0])
+    duplicate.translation = {}
+    proposed_entities['duplicate-guid'] = duplicate
+
+    with patch.object(
+        Dimension, 'is_entity_canonical', return_value=True
+    ), patch('builtins.print') as mock_print:
+      translations = parse_config.ParseConfig.retrieve_reporting_translations(
+          proposed_entities=proposed_entities,
+          solution_entities=solution_entities,
+      )
+
+    # The first of the duplicated proposed entities is scored
+    self.assertEqual(translations[cdid][f'{PROPOSED}'][0][0], 'wrong')
+    mock_print.assert_called_once_with(
+        f'    {PROPOSED} duplicate cloud device ids: 1 (2 instances); '
+        + 'the first instance of each is scored'
+    )
+
   def testAggregateResults(self):
     class _MockDimensionComplex(NamedTuple):
       deserialized_files: Any
@@ -153,6 +184,120 @@ class ParseConfigTest(absltest.TestCase):
         'called with argument for complex dimensions',
     )
 
+  def testAggregateResultsInProcesses(self):
+    parse_sequential = parse_config.ParseConfig(
+        ontology=self.ontology, solution=self.solution, proposed=self.proposed
+    )
+    parse_parallel = parse_config.ParseConfig(
+        ontology=self.ontology,
+        solution=self.solution,
+        proposed=self.proposed,
+        processes=4,
+    )
+
+    self.assertEqual(parse_parallel.args['processes'], 4)
+    with patch('builtins.print'):
+      self.assertEqual(parse_parallel.execute(), parse_sequential.execute())
+    self.assertEqual(
+        list(parse_parallel.results), list(parse_sequential.results)
+    )
+    for dimension in parse_parallel.results.values():
+      self.assertIsInstance(dimension, Dimension)
+      self.assertTrue(
+          dimension.deserialized_files is not None
+          or dimension.translations is not None
+      )
+
+  def testAggregateResultsSharesTranslationIndex(self):
+    with patch('builtins.print'):
+      parse = parse_config.ParseConfig(
+          ontology=self.ontology, solution=self.solution, proposed=self.proposed
+      )
+      parse.execute()
+
+    simple_results = [
+        dimension
+        for dimension in parse.results.values()
+        if dimension.category == SIMPLE
+    ]
+    self.assertLen(simple_results, 4)
+    translation_index = simple_results[0].translation_index
+    self.assertIsNotNone(translation_index)
+    for dimension in simple_results:
+      self.assertIs(dimension.translation_index, translation_index)
+    self.assertEqual(
+        set(translation_index.devices), set(simple_results[0].translations)
+    )
+
+  def testAggregateResultsSharesSolutionIndex(self):
+    with patch('builtins.print'):
+      parse = parse_config.ParseConfig(
+          ontology=self.ontology, solution=self.solution, proposed=self.proposed
+      )
+      parse.execute()
+
+    indexed_results = [
+        dimension
+        for dimension in parse.results.values()
+        if dimension.category == COMPLEX
+    ]
+    self.assertLen(indexed_results, 4)
+    solution_index = indexed_results[0].solution_index
+    for dimension in indexed_results:
+      self.assertIs(dimension.solution_index, solution_index)
+    solution_file = indexed_results[0].deserialized_files[SOLUTION]
+    self.assertEqual(
+        set(entity.code for entity in solution_index.entities_reporting),
+        set(
+            entity.code
+            for entity in solution_file.values()
+            if entity.cloud_device_id is not None
+            and entity.type is not None
+            and entity.type.is_canonical
+            and entity.cloud_device_id not in solution_index.source_ids_virtual
+        ),
+    )
+    self.assertNotEmpty(solution_index.entities_reporting)
+
+  def testExecuteWithReport(self):
+    report_path = os.path.join(tempfile.mkdtemp(), 'report.jsonl')
+    with patch('builtins.print'):
+      parse = parse_config.ParseConfig(
+          ontology=self.ontology,
+          solution=self.solution,
+          proposed=self.proposed,
+          processes=4,
+          report=report_path,
+      )
+      readable = parse.execute()
+      expected = parse_config.ParseConfig(
+          ontology=self.ontology, solution=self.solution, proposed=self.proposed
+      ).execute()
+
+    self.assertEqual(readable, expected)
+    with open(report_path, encoding='utf-8') as report_file:
+      records = [json.loads(line) for line in report_file]
+    dimension_records = [
+        record for record in records if record['record'] == 'dimension'
+    ]
+    # Each dimension is followed by its totals, in the order evaluated
+    self.assertEqual(
+        [record['dimension'] for record in dimension_records], list(readable)
+    )
+    self.assertEqual(records[-1], dimension_records[-1])
+    for record in dimension_records:
+      self.assertEqual(
+          record['result'], parse.results[record['dimension']].result_all
+      )
+    entity_dimensions = {
+        record['dimension']
+        for record in records
+        if record['record'] == 'entity'
+    }
+    self.assertContainsSubset(
+        {'RawFieldSelection', 'EntityPointIdentification'}, entity_dimensions
+    )
+
 
 if __name__ == '__main__':
   absltest.main()
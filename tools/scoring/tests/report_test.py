@@ -0,0 +1,105 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test for the per-entity scoring report."""
+
+import csv
+import json
+import os
+import tempfile
+
+from absl.testing import absltest
+from score import report as report_lib
+from score.constants import ReportFormats
+
+
+class _EvaluatedDimension:
+  result_all = 0.5
+
+  def correct_total(self):
+    return 3
+
+  def correct_ceiling(self):
+    return 4
+
+  def incorrect_total(self):
+    return 1
+
+
+class ScoringReportTest(absltest.TestCase):
+
+  def _write_records(self, path, report_format=None):
+    with report_lib.ScoringReport(path, report_format) as report:
+      report.write_entity(
+          'RawFieldSelection',
+          device=report_lib.REPORTING,
+          cloud_device_id='2599571827844401',
+          correct=1,
+          correct_ceiling=2,
+          incorrect=1,
+          missing={'points.b', 'points.a'},
+          unexpected=set(),
+      )
+      report.write_dimension(_EvaluatedDimension())
+    return report
+
+  def testWriteJsonl(self):
+    path = os.path.join(tempfile.mkdtemp(), 'report.jsonl')
+    report = self._write_records(path)
+
+    self.assertEqual(report.report_format, ReportFormats.JSONL)
+    self.assertEqual(report.records, 2)
+    with open(path, encoding='utf-8') as report_file:
+      entity, dimension = map(json.loads, report_file)
+    self.assertEqual(list(entity), list(report_lib.REPORT_FIELDS))
+    self.assertEqual(entity['record'], report_lib.ENTITY_RECORD)
+    self.assertEqual(entity['device'], 'reporting')
+    self.assertEqual(entity['cloud_device_id'], '2599571827844401')
+    self.assertEqual(entity['missing'], ['points.a', 'points.b'])
+    self.assertEqual(entity['unexpected'], [])
+    self.assertIsNone(entity['result'])
+    self.assertEqual(dimension['record'], report_lib.DIMENSION_RECORD)
+    self.assertEqual(dimension['dimension'], '_EvaluatedDimension')
+    self.assertEqual(
+        (
+            dimension['correct'],
+            dimension['correct_ceiling'],
+            dimension['incorrect'],
+            dimension['result'],
+        ),
+        (3, 4, 1, 0.5),
+    )
+    self.assertIsNone(dimension['missing'])
+
+  def testWriteCsv(self):
+    path = os.path.join(tempfile.mkdtemp(), 'report.txt')
+    self._write_records(path, ReportFormats.CSV)
+
+    with open(path, encoding='utf-8', newline='') as report_file:
+      entity, dimension = csv.DictReader(report_file)
+    self.assertEqual(list(entity), list(report_lib.REPORT_FIELDS))
+    self.assertEqual(entity['correct_ceiling'], '2')
+    self.assertEqual(json.loads(entity['missing']), ['points.a', 'points.b'])
+    self.assertEqual(entity['proposed_entity'], '')
+    self.assertEqual(dimension['result'], '0.5')
+
+  def testFormatFromExtension(self):
+    self.assertEqual(
+        report_lib.ScoringReport('report.CSV').report_format, ReportFormats.CSV
+    )
+    with self.assertRaisesRegex(ValueError, 'jsonl, csv'):
+      report_lib.ScoringReport('report.json')
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,107 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test for the index of translations scored by "simple" dimensions."""
+
+from absl.testing import absltest
+from score import translation_index
+from score.constants import FileTypes, MappingTypes
+
+from validate.field_translation import DimensionalValue, MultiStateValue, NonDimensionalValue
+
+PROPOSED, SOLUTION = FileTypes
+STATE, UNIT = MappingTypes
+
+
+class TranslationIndexTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    run_command = NonDimensionalValue('run_command', 'points.run.present_value')
+    run_status = MultiStateValue(
+        'run_status', 'points.run.present_value', {'ON': 'true'}
+    )
+    temperature = DimensionalValue(
+        'zone_air_temperature_sensor',
+        'points.temp.present_value',
+        'units',
+        {'degrees_celsius': 'C'},
+    )
+    self.translations = {
+        'device_1': {
+            PROPOSED: [
+                ('run_command', run_command),
+                ('run_status', run_status),
+            ],
+            SOLUTION: [('run_status', run_status)],
+        },
+        'device_2': {
+            PROPOSED: [],
+            SOLUTION: [('zone_air_temperature_sensor', temperature)],
+        },
+    }
+    self.index = translation_index.TranslationIndex(self.translations)
+
+  def testSplitSubfields(self):
+    self.assertEqual(
+        translation_index.split_subfields('zone_air_temperature_sensor_2'),
+        frozenset(['zone', 'air', 'temperature', 'sensor']),
+    )
+    self.assertIs(
+        translation_index.split_subfields('run_status_1'),
+        translation_index.split_subfields('run_status_1'),
+    )
+
+  def testDevices(self):
+    device = self.index.devices['device_1']
+
+    self.assertEqual(
+        device[PROPOSED].translations, self.translations['device_1'][PROPOSED]
+    )
+    # The last translation of a raw field name is kept
+    self.assertEqual(
+        device[PROPOSED].by_raw_field_name,
+        {'points.run.present_value': 'run_status'},
+    )
+    self.assertEqual(
+        device[SOLUTION].raw_field_names, {'points.run.present_value'}
+    )
+    self.assertEqual(
+        device[SOLUTION].mappings,
+        {STATE: {('points.run.present_value', ('ON', 'true'))}, UNIT: set()},
+    )
+    self.assertEqual(
+        self.index.devices['device_2'][PROPOSED].mappings[UNIT], set()
+    )
+
+  def testAcrossDevices(self):
+    self.assertEqual(
+        self.index.raw_field_names(SOLUTION),
+        {'points.run.present_value', 'points.temp.present_value'},
+    )
+    self.assertEqual(
+        self.index.raw_field_names(PROPOSED), {'points.run.present_value'}
+    )
+    self.assertEqual(
+        self.index.mappings(SOLUTION, UNIT),
+        {('points.temp.present_value', ('degrees_celsius', 'C'))},
+    )
+    self.assertEqual(self.index.mappings(PROPOSED, UNIT), set())
+    self.assertIs(
+        self.index.mappings(SOLUTION, STATE),
+        self.index.mappings(SOLUTION, STATE),
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,39 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test for the process pool sharing inputs with its workers."""
+
+import os
+
+from absl.testing import absltest
+from score import worker_pool
+
+
+def _scale(item, *, factor, offset):
+  return item * factor + offset, os.getpid()
+
+
+class WorkerPoolTest(absltest.TestCase):
+
+  def testMapShared(self):
+    results = worker_pool.map_shared(
+        _scale, range(5), {'factor': 3, 'offset': 1}, 2
+    )
+
+    self.assertEqual([result for result, _ in results], [1, 4, 7, 10, 13])
+    self.assertNotIn(os.getpid(), [pid for _, pid in results])
+    self.assertIsNone(worker_pool._shared_arguments)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -31,6 +31,9 @@ import sys
 
 # pylint: disable=g-importing-member
 from validate import handler
+from validate.constants import DEFAULT_CHECKPOINT_INTERVAL
+from validate.constants import DEFAULT_MAX_EXTRA_ENTITIES
+from validate.constants import DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
 from validate.constants import DEFAULT_TIMEOUT
 
 
@@ -67,12 +70,26 @@ def _ParseArgs() -> argparse.ArgumentParser:
   parser.add_argument(
       '-s',
       '--subscription',
+      action='append',
       dest='subscription',
       required=False,
-      help='Pubsub subscription for telemetry to validate',
+      help=(
+          'Pubsub subscription for telemetry to validate. Repeat to validate '
+          'telemetry from several subscriptions at once. Flow control settings '
+          'may be appended as ";max_messages=N;max_bytes=N"'
+      ),
       metavar='subscription',
   )
 
+  parser.add_argument(
+      '--replay-file',
+      action='append',
+      dest='replay_files',
+      required=False,
+      help='Local telemetry replay file (JSON lines) to validate. Repeatable',
+      metavar='replay-file',
+  )
+
   parser.add_argument(
       '-t',
       '--timeout',
@@ -93,6 +110,57 @@ def _ParseArgs() -> argparse.ArgumentParser:
       metavar='report-directory',
   )
 
+  parser.add_argument(
+      '--max-error-devices',
+      dest='max_invalid_message_blocks',
+      required=False,
+      default=DEFAULT_MAX_INVALID_MESSAGE_BLOCKS,
+      type=int,
+      help=(
+          'Maximum number of invalid devices sampled into the telemetry '
+          'validation report'
+      ),
+      metavar='max-error-devices',
+  )
+
+  parser.add_argument(
+      '--max-extra-devices',
+      dest='max_extra_entities',
+      required=False,
+      default=DEFAULT_MAX_EXTRA_ENTITIES,
+      type=int,
+      help=(
+          'Maximum number of extra devices sampled into the telemetry '
+          'validation report'
+      ),
+      metavar='max-extra-devices',
+  )
+
+  parser.add_argument(
+      '--checkpoint-file',
+      dest='checkpoint_path',
+      required=False,
+      default=None,
+      help=(
+          'Path to a telemetry validation checkpoint file. Validation resumes '
+          'from the checkpoint if the file exists'
+      ),
+      metavar='checkpoint-file',
+  )
+
+  parser.add_argument(
+      '--checkpoint-interval',
+      dest='checkpoint_interval',
+      required=False,
+      default=DEFAULT_CHECKPOINT_INTERVAL,
+      type=int,
+      help=(
+          'Minimum duration (in seconds) between telemetry validation '
+          'checkpoints'
+      ),
+      metavar='checkpoint-interval',
+  )
+
   parser.add_argument(
       '--udmi',
       dest='udmi',
@@ -116,4 +184,9 @@ if __name__ == '__main__':
       report_directory=args.report_directory,
       timeout=int(args.timeout),
       is_udmi=is_udmi,
+      max_invalid_message_blocks=args.max_invalid_message_blocks,
+      max_extra_entities=args.max_extra_entities,
+      checkpoint_path=args.checkpoint_path,
+      checkpoint_interval=args.checkpoint_interval,
+      replay_files=args.replay_files,
   )
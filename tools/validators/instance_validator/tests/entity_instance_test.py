@@ -2065,5 +2065,27 @@ class EntityInstanceTest(absltest.TestCase):
         combination_validator.Validate(entity_instances['CHWS-2-GUID'])
     )
 
+  def testGetFieldSuggestions_WithType_SuggestsTypeFields(self):
+    entity_type = self.config_universe.GetEntityType('HVAC', 'DMP_EDM')
+
+    suggestions = entity_instance._GetFieldSuggestions(
+        self.config_universe, 'exhaust_air_damper_comand', entity_type
+    )
+
+    self.assertEqual(suggestions, ['exhaust_air_damper_command'])
+
+  def testGetFieldSuggestions_WithoutType_SuggestsOntologyFields(self):
+    suggestions = entity_instance._GetFieldSuggestions(
+        self.config_universe, 'zone_air_temprature_sensor'
+    )
+
+    self.assertEqual(suggestions, ['zone_air_temperature_sensor'])
+    self.assertEqual(
+        entity_instance._FormatFieldSuggestions(suggestions),
+        ' Did you mean: zone_air_temperature_sensor?',
+    )
+    self.assertEqual(entity_instance._FormatFieldSuggestions([]), '')
+
+
 if __name__ == '__main__':
   absltest.main()
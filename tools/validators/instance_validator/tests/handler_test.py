@@ -18,6 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import datetime
+import json
 import os
 import re
 import shutil
@@ -28,6 +29,7 @@ from unittest import mock
 from absl.testing import absltest
 
 from tests import test_constants
+from validate import constants
 from validate import entity_instance
 from validate import generate_universe
 from validate import handler
@@ -150,6 +152,7 @@ class HandlerTest(absltest.TestCase):
   @mock.patch.object(telemetry_validator, 'TelemetryValidator')
   @mock.patch.object(subscriber, 'Subscriber')
   def testTelemetryArgsBothSetSuccess(self, mock_subscriber, mock_validator):
+    mock_validator.return_value.is_completed = False
     try:
       input_file = os.path.join(_TESTCASE_PATH, 'GOOD', 'building_type.yaml')
       _RunValidation(
@@ -166,7 +169,16 @@ class HandlerTest(absltest.TestCase):
       ])
       # TODO(berkoben): Make this assert stricter
       mock_validator.assert_has_calls([
-          mock.call(mock.ANY, mock.ANY, mock.ANY, mock.ANY),
+          mock.call(
+              mock.ANY,
+              mock.ANY,
+              mock.ANY,
+              mock.ANY,
+              max_invalid_message_blocks=mock.ANY,
+              max_extra_entities=mock.ANY,
+              checkpoint_path=None,
+              checkpoint_interval=mock.ANY,
+          ),
           mock.call().StartTimer(),
       ])
 
@@ -276,6 +288,13 @@ class HandlerTest(absltest.TestCase):
           is_udmi=True,
           gcp_credential_path='fake_credential_path',
           report_directory=temp_report_directory,
+          max_invalid_message_blocks=(
+              constants.DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
+          ),
+          max_extra_entities=constants.DEFAULT_MAX_EXTRA_ENTITIES,
+          checkpoint_path=None,
+          checkpoint_interval=constants.DEFAULT_CHECKPOINT_INTERVAL,
+          replay_files=None,
       )
     except SystemExit:
       self.fail('ValidationHelper:Validate raised ExceptionType unexpectedly!')
@@ -300,10 +319,68 @@ class HandlerTest(absltest.TestCase):
           is_udmi=True,
           gcp_credential_path='fake_credential_path',
           report_directory=None,
+          max_invalid_message_blocks=(
+              constants.DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
+          ),
+          max_extra_entities=constants.DEFAULT_MAX_EXTRA_ENTITIES,
+          checkpoint_path=None,
+          checkpoint_interval=constants.DEFAULT_CHECKPOINT_INTERVAL,
+          replay_files=None,
       )
     except SystemExit:
       self.fail('ValidationHelper:Validate raised ExceptionType unexpectedly!')
 
+  def testTelemetryHelper_replayFileOnly_generatesReport(self):
+    temp_report_directory = tempfile.mkdtemp()
+    parsed, default_operation = _Helper(
+        [os.path.join(_TESTCASE_PATH, 'GOOD', 'translation_units.yaml')]
+    )
+    entities = {
+        name: entity_instance.EntityInstance.FromYaml(
+            name, entity, default_operation=default_operation
+        )
+        for name, entity in parsed.items()
+    }
+    with open(
+        os.path.join(
+            test_constants.TEST_TELEMETRY, 'message_attributes_CHWS_WDT-17.json'
+        ),
+        encoding='utf-8',
+    ) as f:
+      attributes = json.load(f)
+    with open(
+        os.path.join(test_constants.TEST_TELEMETRY, 'telemetry_good.json'),
+        encoding='utf-8',
+    ) as f:
+      data = f.read()
+    replay_path = os.path.join(temp_report_directory, 'replay.jsonl')
+    with open(replay_path, 'w', encoding='utf-8') as f:
+      f.write(
+          json.dumps({
+              'attributes': attributes,
+              'data': data,
+              'publish_time': '2020-10-15T17:21:59Z',
+          })
+      )
+
+    helper = handler.TelemetryHelper(
+        None, temp_report_directory, replay_files=[replay_path]
+    )
+    helper.Validate(entities, 60, True, gcp_credential_path=None)
+
+    report_files = [
+        filename
+        for filename in os.listdir(temp_report_directory)
+        if filename.endswith(handler.TELEMETRY_VALIDATION_FILENAME)
+    ]
+    self.assertLen(report_files, 1)
+    with open(
+        os.path.join(temp_report_directory, report_files[0]), encoding='utf-8'
+    ) as f:
+      report = json.load(f)
+    self.assertEmpty(report[constants.MISSING_DEVICES])
+    self.assertEmpty(report[constants.ERROR_DEVICES])
+
 
 if __name__ == '__main__':
   absltest.main()
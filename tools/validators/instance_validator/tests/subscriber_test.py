@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Tests tools.validators.instance_validator.instance_validator."""
+import json
+import os
+import tempfile
 from unittest import mock
 from absl.testing import absltest
 from validate import subscriber
@@ -38,5 +41,71 @@ class SubscriberTest(absltest.TestCase):
     test_flow.from_client_secrets_file.assert_called_once()
 
 
+def _WriteReplayFile(device_ids):
+  replay_path = os.path.join(tempfile.mkdtemp(), 'replay.jsonl')
+  with open(replay_path, 'w', encoding='utf-8') as replay_file:
+    for device_id in device_ids:
+      record = {
+          'attributes': {'deviceId': device_id},
+          'data': {'version': 1, 'timestamp': '2020-10-15T17:21:59Z'},
+          'publish_time': '2020-10-15T17:21:59Z',
+      }
+      replay_file.write(json.dumps(record) + '\n')
+  return replay_path
+
+
+class ParseSubscriptionSpecTest(absltest.TestCase):
+
+  def testParseSubscriptionSpec_nameOnly_noFlowControl(self):
+    self.assertEqual(
+        subscriber.ParseSubscriptionSpec(FAKE_SUBSCRIPTION_NAME),
+        (FAKE_SUBSCRIPTION_NAME, {}),
+    )
+
+  def testParseSubscriptionSpec_withFlowControl_success(self):
+    self.assertEqual(
+        subscriber.ParseSubscriptionSpec(
+            f'{FAKE_SUBSCRIPTION_NAME};max_messages=10;max_bytes=2048'
+        ),
+        (FAKE_SUBSCRIPTION_NAME, {'max_messages': 10, 'max_bytes': 2048}),
+    )
+
+  def testParseSubscriptionSpec_unknownSetting_raisesValueError(self):
+    with self.assertRaises(ValueError):
+      subscriber.ParseSubscriptionSpec(f'{FAKE_SUBSCRIPTION_NAME};foo=1')
+
+
+class ReplaySubscriberTest(absltest.TestCase):
+
+  def testListen_replaysEveryMessageInOrder(self):
+    received = []
+    replay = subscriber.ReplaySubscriber(_WriteReplayFile(['A', 'B', 'C']))
+
+    replay.Listen(received.append)
+
+    self.assertEqual(
+        [message.attributes['deviceId'] for message in received],
+        ['A', 'B', 'C'],
+    )
+    self.assertEqual(json.loads(received[0].data)['version'], 1)
+    self.assertEqual(received[0].publish_time.utcoffset().total_seconds(), 0)
+    self.assertEqual(replay.stats.messages, 3)
+
+  def testListenAll_fansInEverySource(self):
+    received = []
+    sources = [
+        subscriber.ReplaySubscriber(_WriteReplayFile(['A', 'B'])),
+        subscriber.ReplaySubscriber(_WriteReplayFile(['C'])),
+    ]
+
+    subscriber.ListenAll(sources, received.append)
+
+    self.assertCountEqual(
+        [message.attributes['deviceId'] for message in received],
+        ['A', 'B', 'C'],
+    )
+    self.assertEqual([source.stats.messages for source in sources], [2, 1])
+
+
 if __name__ == '__main__':
   absltest.main()
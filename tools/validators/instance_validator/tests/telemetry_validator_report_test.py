@@ -31,6 +31,7 @@ from validate.constants import MESSAGE_VERSION
 from validate.constants import MISSING_DEVICES
 from validate.constants import MISSING_POINTS
 from validate.constants import MISSING_PRESENT_VALUES
+from validate.constants import REPORT_SUMMARY
 from validate.constants import REPORT_TIMESTAMP
 from validate.constants import TELEMETRY_MESSAGE_ERRORS
 from validate.constants import TELEMETRY_MESSAGE_WARNINGS
@@ -188,6 +189,18 @@ class TelemetryValidatorReportTest(absltest.TestCase):
         expected_validation_report_json, result_validation_report_json
     )
 
+  @mock.patch.object(tvr, 'datetime')
+  def testGenerateReport_withSummary_success(self, mock_datetime):
+    mock_datetime.datetime.now().strftime.return_value = TEST_TIMESTAMP
+    summary = {'invalidMessageCount': 0}
+    telemetry_validation_report = tvr.TelemetryValidationReport(
+        expected_devices=EXPECTED_REPORT_DEVICES, summary=summary
+    )
+
+    result_validation_report_json = telemetry_validation_report.GenerateReport()
+
+    self.assertEqual(result_validation_report_json[REPORT_SUMMARY], summary)
+
 
 class TelemetryMessageValidationBlockTest(absltest.TestCase):
 
@@ -312,6 +325,14 @@ class TelemetryMessageValidationBlockTest(absltest.TestCase):
     self.assertEqual(self.validation_block.description, 'test description')
     self.assertFalse(self.validation_block.valid)
 
+  def testGetErrorTypes_success(self):
+    self.validation_block.AddMissingPoint(MISSING_PAYLOAD_POINT)
+    self.validation_block.AddExtraPoint(EXTRA_PAYLOAD_POINT_1)
+
+    self.assertEqual(
+        self.validation_block.GetErrorTypes(), [MISSING_POINTS, EXTRA_POINTS]
+    )
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -19,6 +19,8 @@ from __future__ import print_function
 import datetime
 import json
 from os import path
+import random
+import tempfile
 from unittest import mock
 
 from absl.testing import absltest
@@ -27,7 +29,15 @@ from tests import test_constants
 from validate import entity_instance
 from validate import handler
 from validate import instance_parser
+from validate import telemetry_validation_report as tvr
 from validate import telemetry_validator
+from validate.constants import ERROR_DEVICES_SAMPLED
+from validate.constants import ERROR_TYPE_COUNTS
+from validate.constants import ERROR_TYPE_SAMPLES
+from validate.constants import EXTRA_DEVICE_MESSAGE_COUNT
+from validate.constants import EXTRA_DEVICES_SAMPLED
+from validate.constants import INVALID_MESSAGE_COUNT
+from validate.constants import MISSING_POINTS
 
 # Without microseconds
 GOOD_PUBLISH_TIME = datetime.datetime(
@@ -528,6 +538,267 @@ class TelemetryValidatorTest(absltest.TestCase):
     )
     self.assertTrue(validator.AllEntitiesValidated())
 
+  def testTelemetryValidator_extraEntitiesCapped_countsEveryMessage(self):
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_2, 1, callback=_NullCallback, max_extra_entities=1
+    )
+    validator.ValidateMessage(_MESSAGE_MISSING_PRESENT_VALUE)
+    validator.ValidateMessage(_MESSAGE_GOOD_2)
+    validator.ValidateMessage(_MESSAGE_GOOD_2)
+
+    summary = validator.GetValidationSummary()
+
+    self.assertLen(validator.GetExtraEntities(), 1)
+    self.assertEqual(summary[EXTRA_DEVICE_MESSAGE_COUNT], 3)
+    self.assertTrue(summary[EXTRA_DEVICES_SAMPLED])
+
+  def testTelemetryValidator_invalidBlocksCapped_keepsErrorTypeSamples(self):
+    max_blocks, samples_per_error_type = 2, 1
+    validator = telemetry_validator.TelemetryValidator(
+        {},
+        1,
+        callback=_NullCallback,
+        max_invalid_message_blocks=max_blocks,
+        samples_per_error_type=samples_per_error_type,
+        seed=0,
+    )
+    for i in range(10):
+      block = tvr.TelemetryMessageValidationBlock(
+          guid=f'guid_{i}', code=f'code_{i}', expected_points=[]
+      )
+      block.AddMissingPoint('point')
+      validator.AddInvalidMessageBlock(block)
+
+    summary = validator.GetValidationSummary()
+
+    # The error type sample may or may not overlap the overall sample,
+    # depending on the draws of the random number generator
+    blocks = validator.GetInvalidMessageBlocks()
+    error_type_samples = summary[ERROR_TYPE_SAMPLES][MISSING_POINTS]
+    self.assertBetween(
+        len(blocks), max_blocks, max_blocks + samples_per_error_type
+    )
+    self.assertLen(error_type_samples, samples_per_error_type)
+    self.assertContainsSubset(
+        error_type_samples, [block.code for block in blocks]
+    )
+    self.assertEqual(summary[INVALID_MESSAGE_COUNT], 10)
+    self.assertEqual(summary[ERROR_TYPE_COUNTS], {MISSING_POINTS: 10})
+    self.assertTrue(summary[ERROR_DEVICES_SAMPLED])
+
+  def testTelemetryValidator_saveAndLoadCheckpoint_resumesState(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    entities = {**GOOD_ENTITIES_1, **GOOD_ENTITIES_5}
+    validator = telemetry_validator.TelemetryValidator(
+        entities,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+    validator.ValidateMessage(_MESSAGE_MULTIPLE_ERRORS)
+    validator.ValidateMessage(_MESSAGE_GOOD_2)
+    validator.SaveCheckpoint()
+
+    resumed_validator = telemetry_validator.TelemetryValidator(
+        entities,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+    error_blocks = resumed_validator.GetInvalidMessageBlocks()
+
+    self.assertFalse(resumed_validator.is_completed)
+    self.assertEqual(
+        resumed_validator.validated_entities, validator.validated_entities
+    )
+    self.assertEqual(
+        resumed_validator.GetExtraEntities(), validator.GetExtraEntities()
+    )
+    self.assertEqual(
+        resumed_validator.GetValidationSummary(),
+        validator.GetValidationSummary(),
+    )
+    self.assertLen(error_blocks, 1)
+    self.assertEqual(
+        error_blocks[0].CreateJsonReportBlock(),
+        validator.GetInvalidMessageBlocks()[0].CreateJsonReportBlock(),
+    )
+
+  def testTelemetryValidator_checkpointForOtherEntities_isIgnored(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_1,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+    validator.ValidateMessage(_MESSAGE_GOOD)
+    validator.SaveCheckpoint()
+
+    other_validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_2,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+
+    self.assertEmpty(other_validator.validated_entities)
+
+  def testTelemetryValidator_truncatedCheckpoint_isIgnored(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_3_4,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+    validator.ValidateMessage(_MESSAGE_GOOD)
+    validator.SaveCheckpoint()
+    with open(checkpoint_path, encoding='utf-8') as checkpoint_file:
+      checkpoint = json.load(checkpoint_file)
+    del checkpoint['error_type_samples']
+    with open(checkpoint_path, 'w', encoding='utf-8') as checkpoint_file:
+      json.dump(checkpoint, checkpoint_file)
+
+    resumed_validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_3_4,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+    )
+
+    self.assertEmpty(resumed_validator.validated_entities)
+    self.assertEqual(
+        resumed_validator.GetValidationSummary()[EXTRA_DEVICE_MESSAGE_COUNT], 0
+    )
+
+  def testTelemetryValidator_completed_deletesCheckpoint(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_1,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval=0,
+    )
+
+    validator.ValidateMessage(_MESSAGE_MULTIPLE_ERRORS)
+    validator.SaveCheckpoint()
+
+    self.assertTrue(validator.is_completed)
+    self.assertFalse(path.exists(checkpoint_path))
+
+  def testTelemetryValidator_checkpointAllValidated_callsBackOnResume(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_1,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval=0,
+    )
+    # Interrupted after the checkpoint was saved but before the report
+    with mock.patch.object(validator, 'CallbackIfCompleted'):
+      validator.ValidateMessage(_MESSAGE_MULTIPLE_ERRORS)
+    mock_callback = mock.Mock()
+
+    resumed_validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_1,
+        1,
+        callback=mock_callback,
+        checkpoint_path=checkpoint_path,
+    )
+
+    mock_callback.assert_called_once_with(resumed_validator)
+    self.assertTrue(resumed_validator.is_completed)
+    self.assertFalse(path.exists(checkpoint_path))
+
+  def testTelemetryValidator_checkpointIntervalElapsed_savesCheckpoint(self):
+    checkpoint_path = path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    validator = telemetry_validator.TelemetryValidator(
+        GOOD_ENTITIES_2,
+        1,
+        callback=_NullCallback,
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval=0,
+    )
+
+    validator.ValidateMessage(_MESSAGE_GOOD)
+
+    with open(checkpoint_path, encoding='utf-8') as checkpoint_file:
+      checkpoint = json.load(checkpoint_file)
+    self.assertEqual(checkpoint['extra_message_count'], 1)
+
+
+class KeyedReservoirTest(absltest.TestCase):
+
+  def testOffer_underCapacity_keepsEveryItem(self):
+    reservoir = telemetry_validator.KeyedReservoir(3, random.Random(0))
+    for key in ('a', 'b', 'c'):
+      reservoir.Offer(key, key.upper())
+
+    self.assertEqual(reservoir.items, {'a': 'A', 'b': 'B', 'c': 'C'})
+    self.assertFalse(reservoir.is_sampled)
+
+  def testOffer_overCapacity_boundsSampleSize(self):
+    reservoir = telemetry_validator.KeyedReservoir(5, random.Random(0))
+    for i in range(1000):
+      reservoir.Offer(str(i), i)
+
+    self.assertLen(reservoir.items, 5)
+    self.assertTrue(reservoir.is_sampled)
+
+  def testOffer_existingKey_replacesValue(self):
+    reservoir = telemetry_validator.KeyedReservoir(1, random.Random(0))
+    reservoir.Offer('a', 1)
+    reservoir.Offer('a', 2)
+
+    self.assertEqual(reservoir.items, {'a': 2})
+    self.assertFalse(reservoir.is_sampled)
+
+  def testOffer_repeatedKey_isSampledAtDistinctKeyRate(self):
+    capacity, distinct_keys, trials = 2, 20, 2000
+    kept = 0
+    for seed in range(trials):
+      reservoir = telemetry_validator.KeyedReservoir(
+          capacity, random.Random(seed)
+      )
+      for i in range(distinct_keys - 1):
+        reservoir.Offer(str(i), i)
+        # A chatty key offered with every other message
+        reservoir.Offer('chatty', -1)
+      for _ in range(1000):
+        reservoir.Offer('chatty', -1)
+      kept += 'chatty' in reservoir.items
+
+    # Expected rate is capacity / distinct_keys = 0.1
+    self.assertBetween(kept / trials, 0.07, 0.13)
+
+  def testOffer_zeroCapacity_keepsNothing(self):
+    reservoir = telemetry_validator.KeyedReservoir(0, random.Random(0))
+
+    self.assertFalse(reservoir.Offer('a', 1))
+    self.assertEmpty(reservoir.items)
+    self.assertTrue(reservoir.is_sampled)
+
+  def testRestore_fromToDict_preservesSample(self):
+    reservoir = telemetry_validator.KeyedReservoir(2, random.Random(0))
+    for i in range(10):
+      reservoir.Offer(str(i), i)
+    restored = telemetry_validator.KeyedReservoir(2, random.Random(0))
+
+    restored.Restore(json.loads(json.dumps(reservoir.ToDict())))
+
+    self.assertEqual(restored.items, reservoir.items)
+    self.assertTrue(restored.is_sampled)
+    for i in range(10, 100):
+      self.assertEqual(restored.Offer(str(i), i), reservoir.Offer(str(i), i))
+    self.assertEqual(restored.items, reservoir.items)
+
+  def testInit_negativeCapacity_raisesValueError(self):
+    with self.assertRaises(ValueError):
+      telemetry_validator.KeyedReservoir(-1, random.Random(0))
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -34,6 +34,15 @@ ONTOLOGY_ROOT = path.join(REPO_ROOT, 'ontology', 'yaml', 'resources')
 # Default timeout duration for telemetry validation test
 DEFAULT_TIMEOUT = 600
 
+# Default caps on the telemetry validation state retained for the report.
+# Aggregate counters are exact regardless of these caps.
+DEFAULT_MAX_INVALID_MESSAGE_BLOCKS = 1000
+DEFAULT_MAX_EXTRA_ENTITIES = 1000
+DEFAULT_SAMPLES_PER_ERROR_TYPE = 10
+
+# Default interval (in seconds) between telemetry validation checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
 # Telemetry validation constants
 TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 TELEMETRY_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
@@ -44,6 +53,13 @@ EXTRA_DEVICES = 'extra_devices'
 MISSING_DEVICES = 'missing_devices'
 EXPECTED_DEVICES = 'expected_devices'
 ERROR_DEVICES = 'errorDevices'
+REPORT_SUMMARY = 'summary'
+INVALID_MESSAGE_COUNT = 'invalidMessageCount'
+ERROR_TYPE_COUNTS = 'errorTypeCounts'
+ERROR_TYPE_SAMPLES = 'errorTypeSamples'
+EXTRA_DEVICE_MESSAGE_COUNT = 'extraDeviceMessageCount'
+ERROR_DEVICES_SAMPLED = 'errorDevicesSampled'
+EXTRA_DEVICES_SAMPLED = 'extraDevicesSampled'
 
 # Device-level constants
 MESSAGE_TIMESTAMP = 'timestamp'
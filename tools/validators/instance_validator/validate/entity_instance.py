@@ -26,6 +26,7 @@ from validate import field_translation as ft_lib
 from validate import instance_parser as parse
 from validate import link
 from yamlformat.validator import entity_type_lib
+from yamlformat.validator import field_lib
 from yamlformat.validator import findings_lib
 from yamlformat.validator import presubmit_validate_types_lib as pvt
 
@@ -148,6 +149,54 @@ def _GetAllowedField(
   return None
 
 
+def _GetFieldSuggestions(
+    universe: pvt.ConfigUniverse,
+    as_written_field_name: str,
+    entity_type: Optional[entity_type_lib.EntityType] = None,
+) -> List[str]:
+  """Returns the valid field names closest to an undefined field name.
+
+  If an entity type is provided, suggestions are the type's closest fields as
+  they would be written in the config. Otherwise they are the closest fields
+  defined in the ontology for the field's namespace.
+
+  Args:
+    universe: the ConfigUniverse to validate against
+    as_written_field_name: the field name string as written in the config
+    entity_type: the EntityType of the entity the field is defined on
+  """
+  if entity_type and not entity_type.allow_undefined_fields:
+    return field_lib.SuggestClosestNames(
+        as_written_field_name,
+        [
+            entity_type_lib.SeparateFieldNamespace(qualified_field)[1]
+            for qualified_field in entity_type.GetAllFields()
+        ],
+    )
+  if not universe.field_universe:
+    return []
+  try:
+    namespace, field_name = entity_type_lib.SeparateFieldNamespace(
+        as_written_field_name
+    )
+  except TypeError:
+    namespace = ''
+    field_name = as_written_field_name
+  return [
+      qualified_field.lstrip('/')
+      for qualified_field in universe.field_universe.GetFieldSuggestions(
+          field_name, namespace
+      )
+  ]
+
+
+def _FormatFieldSuggestions(suggestions: List[str]) -> str:
+  """Returns a sentence proposing suggested fields, or an empty string."""
+  if not suggestions:
+    return ''
+  return f' Did you mean: {", ".join(suggestions)}?'
+
+
 class CombinationValidator(object):
   """Combines Instance and Graph based validations into one step.
 
@@ -580,17 +629,22 @@ class InstanceValidator(object):
           self.universe, as_written_field_name, entity_type
       )
       if not qualified_field_name and not entity_type.allow_undefined_fields:
+        suggestion_text = _FormatFieldSuggestions(
+            _GetFieldSuggestions(
+                self.universe, as_written_field_name, entity_type
+            )
+        )
         if entity_type and not entity_type.allow_undefined_fields:
           print(
               f'[ERROR]\tEntity {entity.guid} ({entity.code}) translates '
               f'field "{as_written_field_name}" which is not defined on the '
-              f'type "{entity.type_name}"'
+              f'type "{entity.type_name}".{suggestion_text}'
           )
         else:
           print(
               f'[ERROR]\tEntity {entity.guid} ({entity.code}) translates '
               f'field "{as_written_field_name}" which does not exist in the '
-              'ontology.'
+              f'ontology.{suggestion_text}'
           )
         is_valid = False
       elif qualified_field_name and not entity_type.allow_undefined_fields:
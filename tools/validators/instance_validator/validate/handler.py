@@ -20,7 +20,8 @@ import datetime
 import json
 import os
 import sys
-from typing import Dict, List, Tuple
+import threading
+from typing import Dict, List, Tuple, Union
 
 from validate import constants
 from validate import entity_instance
@@ -131,15 +132,30 @@ def _ValidateConfig(
 
 
 def _ValidateTelemetry(
-    subscription: str,
+    subscription: Union[str, List[str]],
     entities: Dict[str, entity_instance.EntityInstance],
     timeout: int,
     is_udmi: bool,
     gcp_credential_path: str,
     report_directory: str = None,
+    max_invalid_message_blocks: int = (
+        constants.DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
+    ),
+    max_extra_entities: int = constants.DEFAULT_MAX_EXTRA_ENTITIES,
+    checkpoint_path: str = None,
+    checkpoint_interval: int = constants.DEFAULT_CHECKPOINT_INTERVAL,
+    replay_files: List[str] = None,
 ) -> None:
   """Runs all telemetry validation checks."""
-  helper = TelemetryHelper(subscription, report_directory)
+  helper = TelemetryHelper(
+      subscription,
+      report_directory,
+      max_invalid_message_blocks=max_invalid_message_blocks,
+      max_extra_entities=max_extra_entities,
+      checkpoint_path=checkpoint_path,
+      checkpoint_interval=checkpoint_interval,
+      replay_files=replay_files,
+  )
   helper.Validate(
       entities, timeout, is_udmi, gcp_credential_path=gcp_credential_path
   )
@@ -150,11 +166,18 @@ def RunValidation(
     use_simplified_universe: bool = False,
     modified_types_filepath: str = None,
     default_types_filepath: str = constants.ONTOLOGY_ROOT,
-    subscription: str = None,
+    subscription: Union[str, List[str]] = None,
     gcp_credential_path: str = None,
     report_directory: str = None,
     timeout: int = constants.DEFAULT_TIMEOUT,
     is_udmi: bool = True,
+    max_invalid_message_blocks: int = (
+        constants.DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
+    ),
+    max_extra_entities: int = constants.DEFAULT_MAX_EXTRA_ENTITIES,
+    checkpoint_path: str = None,
+    checkpoint_interval: int = constants.DEFAULT_CHECKPOINT_INTERVAL,
+    replay_files: List[str] = None,
 ) -> None:
   """Top level runner for all validations.
 
@@ -163,13 +186,24 @@ def RunValidation(
     use_simplified_universe: Boolean to use small testing ConfigUniverse.
     modified_types_filepath: Relative path to a modified ontology.
     default_types_filepath: Relative path to the DigitalBuildings ontology.
-    subscription: Fully qualified path to a Google Cloud Pubsub subscription.
+    subscription: Fully qualified path to a Google Cloud Pubsub subscription,
+      or a list of them. Each may carry flow control settings as described in
+      subscriber.ParseSubscriptionSpec.
     gcp_credential_path: Path to GCP credential file for authenticating against
       Google sheets API. This is an OAuth credential as documented.
         https://developers.google.com/sheets/api/quickstart/python
     report_directory: Fully qualified path to validation reports.
     timeout: Timeout duration of the telemetry validator. Default is 60 seconds.
     is_udmi: Telemetry follows UDMI standards.
+    max_invalid_message_blocks: Maximum number of invalid telemetry messages
+      sampled into the telemetry validation report.
+    max_extra_entities: Maximum number of extra devices sampled into the
+      telemetry validation report.
+    checkpoint_path: Path to a telemetry validation checkpoint file. An
+      existing checkpoint is resumed from.
+    checkpoint_interval: Minimum number of seconds between checkpoints.
+    replay_files: Paths to local telemetry replay files validated alongside
+      the subscriptions.
 
   Returns:
     Report file name or None if no report file is generated.
@@ -200,7 +234,7 @@ def RunValidation(
 
     entities, all_entities_valid = _ValidateConfig(filenames, universe, is_udmi)
 
-    if subscription and all_entities_valid:
+    if (subscription or replay_files) and all_entities_valid:
       print('[INFO]\tStarting telemetry validation.')
       _ValidateTelemetry(
           subscription=subscription,
@@ -209,6 +243,11 @@ def RunValidation(
           is_udmi=is_udmi,
           gcp_credential_path=gcp_credential_path,
           report_directory=report_directory,
+          max_invalid_message_blocks=max_invalid_message_blocks,
+          max_extra_entities=max_extra_entities,
+          checkpoint_path=checkpoint_path,
+          checkpoint_interval=checkpoint_interval,
+          replay_files=replay_files,
       )
     elif not all_entities_valid:
       print(
@@ -238,15 +277,38 @@ class TelemetryHelper(object):
   """A validation helper to encapsulate telemetry validation.
 
   Attributes:
-    subscription: resource string referencing the subscription to check
+    subscriptions: resource strings referencing the subscriptions to check,
+      optionally with flow control settings
+    replay_files: paths to local telemetry replay files to check
     service_account_file: path to file with service account information
     report_directory: fully qualified path to report output directory
+    max_invalid_message_blocks: maximum number of invalid messages sampled into
+      the report
+    max_extra_entities: maximum number of extra devices sampled into the report
+    checkpoint_path: path to the telemetry validation checkpoint file
+    checkpoint_interval: minimum number of seconds between checkpoints
   """
 
-  def __init__(self, subscription, report_directory):
+  def __init__(
+      self,
+      subscription,
+      report_directory,
+      max_invalid_message_blocks=constants.DEFAULT_MAX_INVALID_MESSAGE_BLOCKS,
+      max_extra_entities=constants.DEFAULT_MAX_EXTRA_ENTITIES,
+      checkpoint_path=None,
+      checkpoint_interval=constants.DEFAULT_CHECKPOINT_INTERVAL,
+      replay_files=None,
+  ):
     super().__init__()
-    self.subscription = subscription
+    if isinstance(subscription, str):
+      subscription = [subscription]
+    self.subscriptions = list(subscription or [])
+    self.replay_files = list(replay_files or [])
     self.report_directory = report_directory
+    self.max_invalid_message_blocks = max_invalid_message_blocks
+    self.max_extra_entities = max_extra_entities
+    self.checkpoint_path = checkpoint_path
+    self.checkpoint_interval = checkpoint_interval
 
   def Validate(
       self,
@@ -255,7 +317,10 @@ class TelemetryHelper(object):
       is_udmi: bool,
       gcp_credential_path: str,
   ) -> None:
-    """Validates telemetry payload received from the subscription.
+    """Validates telemetry payload received from every telemetry source.
+
+    Messages from all subscriptions and replay files are consumed concurrently
+    by a single TelemetryValidator.
 
     Args:
       entities: EntityInstance dictionary keyed by entity name
@@ -266,8 +331,16 @@ class TelemetryHelper(object):
         https://developers.google.com/sheets/api/quickstart/python
     """
 
-    print(f'[INFO]\tConnecting to PubSub subscription {self.subscription}')
-    sub = subscriber.Subscriber(self.subscription)
+    sources = []
+    for subscription_spec in self.subscriptions:
+      subscription, flow_control = subscriber.ParseSubscriptionSpec(
+          subscription_spec
+      )
+      print(f'[INFO]\tConnecting to PubSub subscription {subscription}')
+      sources.append(subscriber.Subscriber(subscription, **flow_control))
+    for replay_file in self.replay_files:
+      print(f'[INFO]\tReplaying telemetry from {replay_file}')
+      sources.append(subscriber.ReplaySubscriber(replay_file))
     if is_udmi:
       print('[INFO]\tValidating telemetry payload for UDMI compliance.')
     validator = telemetry_validator.TelemetryValidator(
@@ -275,16 +348,35 @@ class TelemetryHelper(object):
         timeout,
         _TelemetryValidationCallback,
         self.report_directory,
+        max_invalid_message_blocks=self.max_invalid_message_blocks,
+        max_extra_entities=self.max_extra_entities,
+        checkpoint_path=self.checkpoint_path,
+        checkpoint_interval=self.checkpoint_interval,
     )
+    if validator.is_completed:
+      # Resumed from a checkpoint in which every entity was already validated
+      return
     validator.StartTimer()
     try:
       print('[INFO]\tStaring to listen to subscription messages.')
-      sub.Listen(
-          validator.ValidateMessage, gcp_credential_path=gcp_credential_path
-      )
+      if len(sources) == 1:
+        sources[0].Listen(
+            validator.ValidateMessage, gcp_credential_path=gcp_credential_path
+        )
+      else:
+        subscriber.ListenAll(
+            sources,
+            validator.ValidateMessage,
+            gcp_credential_path=gcp_credential_path,
+        )
+      # Replay files run out, unlike subscriptions; report what was seen.
+      if not self.subscriptions:
+        validator.StopTimer()
+        validator.Complete()
     finally:
       print('[INFO]\tStopping subscription listener.')
       validator.StopTimer()
+      validator.SaveCheckpoint()
 
 
 def _TelemetryValidationCallback(
@@ -312,6 +404,7 @@ def _TelemetryValidationCallback(
       extra_devices=validator.GetExtraEntities(),
       missing_devices=validator.GetUnvalidatedEntities(),
       error_devices=error_devices,
+      summary=validator.GetValidationSummary(),
   )
 
   # create formatted validation report string
@@ -332,7 +425,9 @@ def _TelemetryValidationCallback(
     print(f'Report Generated: {telemetry_validation_report_path}')
     print('[INFO]\tTelemetry validation report generated.')
 
-  _thread.interrupt_main()
+  # Stop listening when completion was reached on a listener or timer thread.
+  if threading.current_thread() is not threading.main_thread():
+    _thread.interrupt_main()
 
 
 class EntityHelper(object):
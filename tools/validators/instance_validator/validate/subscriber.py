@@ -11,12 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Reads payload from a pubsub subscription."""
+"""Reads payload from pubsub subscriptions and telemetry replay files."""
 
 from __future__ import print_function
 
 from concurrent import futures
+import datetime
+import json
 import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # pylint: disable=g-importing-member
 from google import auth
@@ -26,6 +31,80 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 
 
 _SCOPES = ['https://www.googleapis.com/auth/pubsub']
+_FLOW_CONTROL_SETTINGS = ('max_messages', 'max_bytes')
+_SPEC_SEPARATOR = ';'
+
+
+def ParseSubscriptionSpec(spec: str) -> Tuple[str, Dict[str, int]]:
+  """Parses a subscription name with optional flow control settings.
+
+  A spec has the form `SUBSCRIPTION[;max_messages=N][;max_bytes=N]`, e.g.
+  `projects/p/subscriptions/s;max_messages=500`.
+
+  Args:
+    spec: subscription spec string.
+
+  Returns:
+    Tuple of the subscription name and a dictionary of flow control settings.
+
+  Raises:
+    ValueError: if a flow control setting is unknown or not an integer.
+  """
+  subscription_name, *settings = spec.split(_SPEC_SEPARATOR)
+  flow_control = {}
+  for setting in settings:
+    key, _, value = setting.partition('=')
+    key = key.strip()
+    if key not in _FLOW_CONTROL_SETTINGS or not value.strip().isdigit():
+      raise ValueError(
+          f'Invalid flow control setting "{setting}" for subscription'
+          f' {subscription_name}. Expected one of {_FLOW_CONTROL_SETTINGS}'
+          ' with an integer value.'
+      )
+    flow_control[key] = int(value)
+  return subscription_name.strip(), flow_control
+
+
+class SourceStats(object):
+  """Thread-safe throughput counters for a telemetry source.
+
+  Attributes:
+    messages: Number of messages received from the source.
+    bytes: Number of payload bytes received from the source.
+  """
+
+  def __init__(self):
+    self.messages = 0
+    self.bytes = 0
+    self._start_time = None
+    self._last_time = None
+    self._lock = threading.Lock()
+
+  def Record(self, message) -> None:
+    """Counts a received message."""
+    now = time.monotonic()
+    with self._lock:
+      if self._start_time is None:
+        self._start_time = now
+      self._last_time = now
+      self.messages += 1
+      self.bytes += len(message.data or b'')
+
+  def MessagesPerSecond(self) -> float:
+    """Returns the average message rate since the first message."""
+    with self._lock:
+      if not self.messages:
+        return 0.0
+      elapsed = self._last_time - self._start_time
+      if not elapsed:
+        return float(self.messages)
+      return self.messages / elapsed
+
+  def __str__(self):
+    return (
+        f'{self.messages} messages, {self.bytes} bytes,'
+        f' {self.MessagesPerSecond():.1f} messages/s'
+    )
 
 
 class Subscriber(object):
@@ -33,21 +112,55 @@ class Subscriber(object):
 
   Attributes:
     subscription_name: Name of the subscription.
+    flow_control: Pubsub flow control settings for the subscription.
+    stats: Throughput counters for the subscription.
   """
 
   def __init__(
       self,
       subscription_name: str,
+      max_messages: Optional[int] = None,
+      max_bytes: Optional[int] = None,
   ):
     """Init.
 
     Args:
       subscription_name: Pubsub subscription name.
+      max_messages: [Optional] maximum number of outstanding messages.
+      max_bytes: [Optional] maximum size of outstanding messages in bytes.
     """
 
     super().__init__()
     assert subscription_name
     self.subscription_name = subscription_name
+    flow_control = {}
+    if max_messages is not None:
+      flow_control['max_messages'] = max_messages
+    if max_bytes is not None:
+      flow_control['max_bytes'] = max_bytes
+    self.flow_control = pubsub_v1.types.FlowControl(**flow_control)
+    self.stats = SourceStats()
+
+  @property
+  def name(self) -> str:
+    return self.subscription_name
+
+  def Subscribe(self, callback, credentials) -> futures.Future:
+    """Starts pulling messages from the subscription without blocking.
+
+    Args:
+      callback: a callback function to handle the message.
+      credentials: GCP credentials for the subscriber client.
+
+    Returns:
+      The streaming pull future of the subscription.
+    """
+    sub_client = pubsub_v1.SubscriberClient(credentials=credentials)
+    return sub_client.subscribe(
+        self.subscription_name,
+        _CountingCallback(self.stats, callback),
+        flow_control=self.flow_control,
+    )
 
   def Listen(self, callback, gcp_credential_path: str = None):
     """Listens to a pubsub subscription.
@@ -58,43 +171,206 @@ class Subscriber(object):
         against Google sheets API. This is an OAuth credential as documented.
         https://developers.google.com/sheets/api/quickstart/python
     """
-    if gcp_credential_path:
-      try:
-        flow = InstalledAppFlow.from_client_secrets_file(
-            os.path.abspath(gcp_credential_path), scopes=_SCOPES
+    ListenAll([self], callback, gcp_credential_path=gcp_credential_path)
+
+
+class ReplayMessage(object):
+  """A telemetry message read from a replay file.
+
+  Attributes:
+    attributes: message attributes.
+    data: message payload.
+    publish_time: time, as a datetime.datetime object, the message was
+      published.
+  """
+
+  def __init__(
+      self,
+      attributes: Dict[str, str],
+      data: str,
+      publish_time: datetime.datetime,
+  ):
+    super().__init__()
+    self.attributes = attributes
+    self.data = data
+    self.publish_time = publish_time
+
+  def ack(self):
+    """Replayed messages need no acknowledgement."""
+
+
+class ReplaySubscriber(object):
+  """Reads payload from a local telemetry replay file.
+
+  A replay file holds one JSON object per line with the keys `attributes`,
+  `data` (the payload as a string or a JSON object) and `publish_time` (an
+  ISO 8601 UTC timestamp).
+
+  Attributes:
+    replay_path: Path to the replay file.
+    stats: Throughput counters for the replay file.
+  """
+
+  def __init__(self, replay_path: str):
+    """Init.
+
+    Args:
+      replay_path: Path to a telemetry replay file.
+    """
+    super().__init__()
+    assert replay_path
+    self.replay_path = replay_path
+    self.stats = SourceStats()
+    self._cancelled = threading.Event()
+
+  @property
+  def name(self) -> str:
+    return self.replay_path
+
+  def _ReadMessages(self):
+    """Yields the messages of the replay file in order."""
+    with open(self.replay_path, 'r', encoding='utf-8') as replay_file:
+      for line in replay_file:
+        if not line.strip():
+          continue
+        record = json.loads(line)
+        data = record['data']
+        if not isinstance(data, str):
+          data = json.dumps(data)
+        publish_time = datetime.datetime.fromisoformat(
+            record['publish_time'].replace('Z', '+00:00')
         )
-        credentials = flow.run_local_server(port=0)
-      except FileNotFoundError as err:
-        raise FileNotFoundError(
-            'Oauth client id credential file json file not found. Please check'
-            ' the path provided.'
-        ) from err
-      except MutualTLSChannelError as err:
-        raise MutualTLSChannelError(
-            'Instance Validator cannot authenticate against GCP.'
-        ) from err
-    else:
-      print(
-          '[INFO]\tNo GCP client credential. Using application default'
-          ' credential'
+        yield ReplayMessage(record['attributes'], data, publish_time)
+
+  def _Replay(self, callback) -> None:
+    for message in self._ReadMessages():
+      if self._cancelled.is_set():
+        return
+      callback(message)
+
+  def Subscribe(self, callback, credentials=None) -> futures.Future:
+    """Starts replaying messages on a background thread.
+
+    Args:
+      callback: a callback function to handle the message.
+      credentials: unused; replay files need no credentials.
+
+    Returns:
+      A future that completes once every message has been replayed.
+    """
+    del credentials  # unused
+    self._cancelled.clear()
+    future = futures.Future()
+    future.add_done_callback(
+        lambda f: self._cancelled.set() if f.cancelled() else None
+    )
+
+    def _Run():
+      if not future.set_running_or_notify_cancel():
+        return
+      try:
+        self._Replay(_CountingCallback(self.stats, callback))
+      except Exception as ex:  # pylint: disable=broad-except
+        future.set_exception(ex)
+      else:
+        future.set_result(None)
+
+    threading.Thread(target=_Run, daemon=True).start()
+    return future
+
+  def Listen(self, callback, gcp_credential_path: str = None):
+    """Replays every message of the replay file.
+
+    Args:
+      callback: a callback function to handle the message.
+      gcp_credential_path: unused; replay files need no credentials.
+    """
+    ListenAll([self], callback, gcp_credential_path=gcp_credential_path)
+
+
+def _CountingCallback(
+    stats: SourceStats, callback: Callable[[Any], None]
+) -> Callable[[Any], None]:
+  """Wraps a message callback to record source throughput."""
+
+  def _Callback(message):
+    stats.Record(message)
+    callback(message)
+
+  return _Callback
+
+
+def _GetCredentials(gcp_credential_path: Optional[str]):
+  """Returns GCP credentials for pubsub subscriptions.
+
+  Args:
+    gcp_credential_path: Path to GCP credential file for authenticating against
+      Google sheets API, or None to use the application default credential.
+  """
+  if gcp_credential_path:
+    try:
+      flow = InstalledAppFlow.from_client_secrets_file(
+          os.path.abspath(gcp_credential_path), scopes=_SCOPES
       )
-      # pylint: disable=unused-variable
-      credentials, project_id = auth.default()
+      return flow.run_local_server(port=0)
+    except FileNotFoundError as err:
+      raise FileNotFoundError(
+          'Oauth client id credential file json file not found. Please check'
+          ' the path provided.'
+      ) from err
+    except MutualTLSChannelError as err:
+      raise MutualTLSChannelError(
+          'Instance Validator cannot authenticate against GCP.'
+      ) from err
+  print(
+      '[INFO]\tNo GCP client credential. Using application default credential'
+  )
+  # pylint: disable=unused-variable
+  credentials, project_id = auth.default()
+  return credentials
 
-    sub_client = pubsub_v1.SubscriberClient(credentials=credentials)
-    future = sub_client.subscribe(self.subscription_name, callback)
+
+def ListenAll(
+    sources: List[Any], callback, gcp_credential_path: str = None
+) -> None:
+  """Consumes messages from several telemetry sources concurrently.
+
+  Messages from every source are passed to the same callback. Returns when
+  every source is exhausted or has failed, or when interrupted.
+
+  Args:
+    sources: Subscriber and ReplaySubscriber instances.
+    callback: a callback function to handle the message.
+    gcp_credential_path: Path to GCP credential file for authenticating against
+      Google sheets API. This is an OAuth credential as documented.
+      https://developers.google.com/sheets/api/quickstart/python
+  """
+  credentials = None
+  if any(isinstance(source, Subscriber) for source in sources):
+    credentials = _GetCredentials(gcp_credential_path)
+
+  future_sources = {}
+  try:
+    # A replay may complete validation, and interrupt the main thread, before
+    # the remaining sources are subscribed.
+    for source in sources:
+      future_sources[source.Subscribe(callback, credentials)] = source
     print('[INFO]\tListening to pub/sub topic. Please wait.')
-    # KeyboardInterrupt does not always cause `result` to exit early, so we
+    # KeyboardInterrupt does not always cause `wait` to exit early, so we
     # give the thread a chance to handle that within a reasonable amount of
-    # time by repeatedly calling `result` with a short timeout.
-    while True:
-      try:
-        future.result(timeout=5)
-      except futures.TimeoutError:
-        continue
-      except (futures.CancelledError, KeyboardInterrupt):
-        future.cancel()
-      except Exception as ex:  # pylint: disable=broad-except
-        print(f'[ERROR]\tPub/sub subscription failed with error: {ex}')
-        future.cancel()
-      break
+    # time by repeatedly calling `wait` with a short timeout.
+    pending = set(future_sources)
+    while pending:
+      done, pending = futures.wait(pending, timeout=5)
+      for future in done:
+        if not future.cancelled() and future.exception():
+          print(
+              f'[ERROR]\tPub/sub subscription {future_sources[future].name}'
+              f' failed with error: {future.exception()}'
+          )
+  except (futures.CancelledError, KeyboardInterrupt):
+    pass
+  finally:
+    for future, source in future_sources.items():
+      future.cancel()
+      print(f'[INFO]\tTelemetry source {source.name}: {source.stats}')
@@ -35,6 +35,7 @@ from validate.constants import MISSING_PRESENT_VALUES
 from validate.constants import MISSING_TIMESTAMP
 from validate.constants import MISSING_VERSION
 from validate.constants import REPORT_TIMESTAMP
+from validate.constants import REPORT_SUMMARY
 from validate.constants import TELEMETRY_MESSAGE_ERRORS
 from validate.constants import TELEMETRY_MESSAGE_WARNINGS
 from validate.constants import TIMESTAMP_FORMAT
@@ -58,6 +59,9 @@ class TelemetryValidationReport(object):
       configuration file.
     error_devices: List of TelemetryMessageValidationBlock instances for
       telemetry messages that generate validation errors.
+    summary: [Optional] Aggregate counters and sampling metadata for the
+      validation run. Set when error_devices and extra_devices are a bounded
+      sample rather than every device observed.
   """
 
   def __init__(
@@ -66,6 +70,7 @@ class TelemetryValidationReport(object):
       extra_devices: Optional[Dict[str, str]] = None,
       missing_devices: Optional[Dict[str, str]] = None,
       error_devices: Optional[List[TelemetryMessageValidationBlock]] = None,
+      summary: Optional[Dict[str, Any]] = None,
   ):
     """Init."""
     self._timestamp = datetime.datetime.now(tz=datetime.timezone.utc).strftime(
@@ -82,6 +87,7 @@ class TelemetryValidationReport(object):
     self._error_devices = []
     if error_devices:
       self._error_devices = error_devices
+    self._summary = summary
 
   @property
   def timestamp(self) -> str:
@@ -103,6 +109,10 @@ class TelemetryValidationReport(object):
   def error_devices(self) -> List[TelemetryMessageValidationBlock]:
     return self._error_devices
 
+  @property
+  def summary(self) -> Optional[Dict[str, Any]]:
+    return self._summary
+
   def AddExtraDevice(self, guid_to_code_map: Dict[str, str]) -> None:
     """Add a device that exists in telemetry but not in the building config."""
     self._extra_devices.update(guid_to_code_map)
@@ -128,6 +138,8 @@ class TelemetryValidationReport(object):
             block.CreateJsonReportBlock() for block in self._error_devices
         ],
     }
+    if self._summary is not None:
+      validation_report_dict[REPORT_SUMMARY] = self._summary
     return validation_report_dict
 
 
@@ -244,6 +256,67 @@ class TelemetryMessageValidationBlock(object):
     self._valid = False
     self._invalid_dimensional_values.append((point, value))
 
+  def ToDict(self) -> Dict[str, Any]:
+    """Returns a lossless json-serializable representation of the block."""
+    return {
+        'guid': self.guid,
+        'code': self.code,
+        'timestamp': self.timestamp,
+        'version': self.version,
+        'expected_points': self._expected_points,
+        'extra_points': self._extra_points,
+        'missing_points': self._missing_points,
+        'missing_present_values': self._missing_present_values,
+        'unmapped_states': self._unmapped_states,
+        'invalid_dimensional_values': self._invalid_dimensional_values,
+        'valid': self._valid,
+        'description': self._description,
+    }
+
+  @classmethod
+  def FromDict(
+      cls, block_dict: Dict[str, Any]
+  ) -> TelemetryMessageValidationBlock:
+    """Creates a validation block from the output of ToDict()."""
+    validation_block = cls(
+        guid=block_dict['guid'],
+        code=block_dict['code'],
+        expected_points=block_dict['expected_points'],
+        timestamp=block_dict['timestamp'],
+        version=block_dict['version'],
+        description=block_dict['description'],
+    )
+    validation_block._extra_points = block_dict['extra_points']
+    validation_block._missing_points = block_dict['missing_points']
+    validation_block._missing_present_values = block_dict[
+        'missing_present_values'
+    ]
+    validation_block._unmapped_states = [
+        tuple(state) for state in block_dict['unmapped_states']
+    ]
+    validation_block._invalid_dimensional_values = [
+        tuple(value) for value in block_dict['invalid_dimensional_values']
+    ]
+    validation_block._valid = block_dict['valid']
+    return validation_block
+
+  def GetErrorTypes(self) -> List[str]:
+    """Returns the report keys of every error category present in the block."""
+    error_types = [
+        error_type
+        for error_type, values in (
+            (MISSING_POINTS, self._missing_points),
+            (MISSING_PRESENT_VALUES, self._missing_present_values),
+            (INVALID_DIMENSIONAL_VALUES, self._invalid_dimensional_values),
+            (EXTRA_POINTS, self._extra_points),
+            (UNMAPPED_STATES, self._unmapped_states),
+        )
+        if values
+    ]
+    if self._description:
+      error_types.append(MESSAGE_DESCRIPTION)
+    return error_types
+
   def CreateJsonReportBlock(self) -> Dict[str, Any]:
     """Exports a telemetry validation report point(block) as valid json."""
 
@@ -18,23 +18,148 @@ is received for all of the entities in the building config file, or if the
 specfied timeout is reached. Current version only supports UDMI payloads.
 """
 
+import collections
 import datetime
+import hashlib
+import heapq
+import json
+import os
+import random
 import re
 import sys
 import threading
 import time
-from typing import Dict
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
 
 # pylint: disable=g-importing-member
 from validate import field_translation as ft_lib
 from validate import telemetry
 from validate import telemetry_validation_report as tvr
+from validate.constants import DEFAULT_CHECKPOINT_INTERVAL
+from validate.constants import DEFAULT_MAX_EXTRA_ENTITIES
+from validate.constants import DEFAULT_MAX_INVALID_MESSAGE_BLOCKS
+from validate.constants import DEFAULT_SAMPLES_PER_ERROR_TYPE
+from validate.constants import ERROR_DEVICES_SAMPLED
+from validate.constants import ERROR_TYPE_COUNTS
+from validate.constants import ERROR_TYPE_SAMPLES
+from validate.constants import EXTRA_DEVICE_MESSAGE_COUNT
+from validate.constants import EXTRA_DEVICES_SAMPLED
+from validate.constants import INVALID_MESSAGE_COUNT
 from validate.constants import TELEMETRY_TIMESTAMP_FORMAT
 
 DEVICE_ID = telemetry.DEVICE_ID
 DEVICE_NUM_ID = telemetry.DEVICE_NUM_ID
 GUID = 'guid'
 MAX_TIMESTAMP_DIFFERENCE_SEC = 10  # in seconds
+CHECKPOINT_VERSION = 2
+
+_V = TypeVar('_V')
+
+
+class KeyedReservoir(Generic[_V]):
+  """Uniform fixed-size sample of distinct keys drawn from an unbounded stream.
+
+  Implements bottom-k sampling: each key is given a priority by a hash of the
+  key salted per reservoir, and the keys with the lowest priorities are
+  retained. A priority does not depend on when or how often its key is
+  offered, so a key offered many times is no more likely to be sampled than a
+  key offered once, and offering a sampled key again only replaces its value.
+
+  Attributes:
+    capacity: Maximum number of items retained, or None for no limit.
+    items: Mapping of sampled keys to values.
+    is_sampled: True if at least one offered key was not retained.
+  """
+
+  def __init__(self, capacity: Optional[int], rng: random.Random):
+    """Init.
+
+    Args:
+      capacity: maximum number of items retained, or None for no limit.
+      rng: random number generator drawing the salt of the key priorities.
+    """
+    if capacity is not None and capacity < 0:
+      raise ValueError(f'Reservoir capacity must be non-negative: {capacity}')
+    self.capacity = capacity
+    self._salt = rng.getrandbits(64).to_bytes(8, 'big')
+    self._is_sampled = False
+    # Max-heap of the sampled keys by priority, as (negated priority, key)
+    self._heap = []
+    self._items = {}
+
+  @property
+  def items(self) -> Dict[str, _V]:
+    return self._items
+
+  @property
+  def is_sampled(self) -> bool:
+    return self._is_sampled
+
+  def _Priority(self, key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(
+            key.encode('utf-8'), digest_size=8, key=self._salt
+        ).digest(),
+        'big',
+    )
+
+  def Offer(self, key: str, value: _V) -> bool:
+    """Offers a keyed item to the reservoir.
+
+    Args:
+      key: unique key of the item.
+      value: item to retain if selected.
+
+    Returns:
+      True if the item is retained in the sample.
+    """
+    if key in self._items:
+      self._items[key] = value
+      return True
+    entry = (-self._Priority(key), key)
+    if self.capacity is None or len(self._heap) < self.capacity:
+      heapq.heappush(self._heap, entry)
+      self._items[key] = value
+      return True
+    self._is_sampled = True
+    if not self._heap or entry <= self._heap[0]:
+      return False
+    _, evicted_key = heapq.heapreplace(self._heap, entry)
+    del self._items[evicted_key]
+    self._items[key] = value
+    return True
+
+  def ToDict(
+      self, encode: Callable[[_V], Any] = lambda value: value
+  ) -> Dict[str, Any]:
+    """Returns a json-serializable snapshot of the reservoir.
+
+    Args:
+      encode: function converting a sampled value to a json-serializable one.
+    """
+    return {
+        'salt': self._salt.hex(),
+        'is_sampled': self._is_sampled,
+        'items': [[key, encode(value)] for key, value in self._items.items()],
+    }
+
+  def Restore(
+      self,
+      reservoir_dict: Dict[str, Any],
+      decode: Callable[[Any], _V] = lambda value: value,
+  ) -> None:
+    """Replaces the reservoir contents with a snapshot from ToDict().
+
+    Args:
+      reservoir_dict: snapshot created by ToDict().
+      decode: function converting an encoded value back to a sampled value.
+    """
+    self._salt = bytes.fromhex(reservoir_dict['salt'])
+    self._is_sampled = bool(reservoir_dict['is_sampled'])
+    self._heap = []
+    self._items = {}
+    for key, value in reservoir_dict['items']:
+      self.Offer(key, decode(value))
 
 
 class TelemetryValidator(object):
@@ -48,15 +173,35 @@ class TelemetryValidator(object):
     validated_entities: Map of entity guid to entity code Entities that have
       been run through ValidateMessage() and passed.
     timer: Validation timeout timer.
-    invalid_message_blocks: List of TelemetryMessageValidationBlock instances
-      for invalid pubsub messages.
-    extra_entities: Mapping of entity guids to entity codes for entities
-      reported in a tlemetry payload but not recorded in the building config
-      file being validated.
+    invalid_message_blocks: Bounded sample of TelemetryMessageValidationBlock
+      instances for invalid pubsub messages, keyed by entity guid.
+    error_type_samples: Mapping of error type to a bounded sample of
+      TelemetryMessageValidationBlock instances exhibiting that error.
+    error_type_counts: Exact count of invalid messages by error type.
+    invalid_message_count: Exact count of invalid messages.
+    extra_entities: Bounded sample of the mapping of entity guids to entity
+      codes for entities reported in a tlemetry payload but not recorded in
+      the building config file being validated.
+    extra_message_count: Exact count of messages received for extra entities.
     report_directory: fully qualified path to report output directory
+    checkpoint_path: fully qualified path to the checkpoint file, or None if
+      checkpointing is disabled.
+    checkpoint_interval: minimum number of seconds between checkpoints.
   """
 
-  def __init__(self, entities, timeout, callback, report_directory=None):
+  def __init__(
+      self,
+      entities,
+      timeout,
+      callback,
+      report_directory=None,
+      max_invalid_message_blocks=DEFAULT_MAX_INVALID_MESSAGE_BLOCKS,
+      max_extra_entities=DEFAULT_MAX_EXTRA_ENTITIES,
+      samples_per_error_type=DEFAULT_SAMPLES_PER_ERROR_TYPE,
+      seed=None,
+      checkpoint_path=None,
+      checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+  ):
     """Init.
 
     Args:
@@ -66,6 +211,18 @@ class TelemetryValidator(object):
         entities were seen or because the timeout duration was reached.
       report_directory: [Optional] fully quailified path to report output
         directory.
+      max_invalid_message_blocks: [Optional] maximum number of invalid message
+        blocks retained for the report, or None for no limit.
+      max_extra_entities: [Optional] maximum number of extra entities retained
+        for the report, or None for no limit.
+      samples_per_error_type: [Optional] number of invalid message blocks
+        retained for each error type in addition to the overall sample.
+      seed: [Optional] seed for the sampling random number generator.
+      checkpoint_path: [Optional] fully qualified path to a checkpoint file.
+        Validation state is periodically written to this file and, if the file
+        already exists, restored from it.
+      checkpoint_interval: [Optional] minimum number of seconds between
+        checkpoints.
     """
     super().__init__()
     # cloud_device_id update requires translations; enforced in entity_instance
@@ -78,25 +235,228 @@ class TelemetryValidator(object):
     self.callback = callback
     self.validated_entities = {}
     self._timer: threading.Timer = None
-    self._invalid_message_blocks = []
-    self._extra_entities = {}
+    self._rng = random.Random(seed)
+    self._invalid_message_blocks = KeyedReservoir(
+        max_invalid_message_blocks, self._rng
+    )
+    self._samples_per_error_type = samples_per_error_type
+    self._error_type_samples: Dict[str, KeyedReservoir] = {}
+    self._error_type_counts = collections.Counter()
+    self._invalid_message_count = 0
+    self._extra_entities = KeyedReservoir(max_extra_entities, self._rng)
+    self._extra_message_count = 0
     self.report_directory = report_directory
+    self._lock = threading.RLock()
+    self._completed = False
+    self.checkpoint_path = checkpoint_path
+    self.checkpoint_interval = checkpoint_interval
+    self._last_checkpoint_time = time.monotonic()
+    if checkpoint_path and os.path.exists(checkpoint_path):
+      if self.LoadCheckpoint():
+        # A run interrupted after every entity was validated reports at once
+        self.CallbackIfCompleted()
 
   def AddInvalidMessageBlock(self, validation_block):
-    self._invalid_message_blocks.append(validation_block)
+    """Counts an invalid message block and offers it to the samples."""
+    self._invalid_message_count += 1
+    self._invalid_message_blocks.Offer(validation_block.guid, validation_block)
+    for error_type in validation_block.GetErrorTypes():
+      self._error_type_counts[error_type] += 1
+      if error_type not in self._error_type_samples:
+        self._error_type_samples[error_type] = KeyedReservoir(
+            self._samples_per_error_type, self._rng
+        )
+      self._error_type_samples[error_type].Offer(
+          validation_block.guid, validation_block
+      )
 
-  def GetInvalidMessageBlocks(self):
+  def GetInvalidMessageBlocks(
+      self,
+  ) -> List[tvr.TelemetryMessageValidationBlock]:
     """Returns list of TelemetryMessageValidationBlock for invalid messages.
 
     A TelemetryMessageValidationBlock instance is a container for validations
-    performed on a pubsub message.
+    performed on a pubsub message. The list is the union of the overall sample
+    and the per error type samples, so every observed error type is
+    represented even when the overall sample is full.
     """
-    return self._invalid_message_blocks
+    blocks = dict(self._invalid_message_blocks.items)
+    for samples in self._error_type_samples.values():
+      blocks.update(samples.items)
+    return list(blocks.values())
+
+  def _AddExtraEntity(self, entity_guid: str, entity_code: str) -> None:
+    """Counts a message from an extra entity and offers it to the sample."""
+    self._extra_message_count += 1
+    self._extra_entities.Offer(entity_guid, entity_code)
+
+  def GetValidationSummary(self) -> Dict[str, Any]:
+    """Returns exact aggregate counters and the sampled entity codes."""
+    return {
+        INVALID_MESSAGE_COUNT: self._invalid_message_count,
+        ERROR_TYPE_COUNTS: dict(self._error_type_counts),
+        ERROR_TYPE_SAMPLES: {
+            error_type: sorted(block.code for block in samples.items.values())
+            for error_type, samples in self._error_type_samples.items()
+        },
+        ERROR_DEVICES_SAMPLED: self._invalid_message_blocks.is_sampled,
+        EXTRA_DEVICE_MESSAGE_COUNT: self._extra_message_count,
+        EXTRA_DEVICES_SAMPLED: self._extra_entities.is_sampled,
+    }
+
+  def _EntitiesFingerprint(self) -> str:
+    """Returns a hash identifying the set of entities being validated."""
+    entity_keys = sorted(
+        f'{entity.guid}:{entity_code}'
+        for entity_code, entity in self.entities_with_translation.items()
+    )
+    return hashlib.sha256('\n'.join(entity_keys).encode('utf-8')).hexdigest()
+
+  def SaveCheckpoint(self) -> None:
+    """Atomically writes the accumulated validation state to the checkpoint.
+
+    Nothing is written once validation has completed, as the checkpoint is
+    deleted when the report is produced.
+    """
+    if not self.checkpoint_path:
+      return
+    with self._lock:
+      if self._completed:
+        return
+      checkpoint = {
+          'version': CHECKPOINT_VERSION,
+          'entities': self._EntitiesFingerprint(),
+          'validated_entities': self.validated_entities,
+          'invalid_message_count': self._invalid_message_count,
+          'error_type_counts': self._error_type_counts,
+          'extra_message_count': self._extra_message_count,
+          'blocks': [
+              block.ToDict() for block in self.GetInvalidMessageBlocks()
+          ],
+          'invalid_message_blocks': self._invalid_message_blocks.ToDict(
+              lambda block: block.guid
+          ),
+          'error_type_samples': {
+              error_type: samples.ToDict(lambda block: block.guid)
+              for error_type, samples in self._error_type_samples.items()
+          },
+          'extra_entities': self._extra_entities.ToDict(),
+      }
+      temp_path = f'{self.checkpoint_path}.tmp'
+      with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file, separators=(',', ':'))
+      os.replace(temp_path, self.checkpoint_path)
+      self._last_checkpoint_time = time.monotonic()
+    print(
+        '[INFO]\tTelemetry validation checkpoint saved:'
+        f' {len(self.validated_entities)} of'
+        f' {len(self.entities_with_translation)} entities validated,'
+        f' {self._invalid_message_count} invalid messages,'
+        f' {self._extra_message_count} messages from extra entities.'
+    )
+
+  def LoadCheckpoint(self) -> bool:
+    """Restores validation state from the checkpoint file.
+
+    The checkpoint is ignored if it was written for a different set of
+    entities or by an incompatible version of the validator.
+
+    Returns:
+      True if the validation state was restored.
+    """
+    with open(self.checkpoint_path, 'r', encoding='utf-8') as checkpoint_file:
+      try:
+        checkpoint = json.load(checkpoint_file)
+      except json.JSONDecodeError:
+        print(
+            '[WARNING]\tIgnoring unreadable telemetry validation checkpoint:'
+            f' {self.checkpoint_path}'
+        )
+        return False
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+      print(
+          '[WARNING]\tIgnoring telemetry validation checkpoint with'
+          f' unsupported version: {checkpoint.get("version")}'
+      )
+      return False
+    if checkpoint.get('entities') != self._EntitiesFingerprint():
+      print(
+          '[WARNING]\tIgnoring telemetry validation checkpoint written for a'
+          ' different building config.'
+      )
+      return False
+
+    # Restored into new containers first, so that a truncated checkpoint
+    # leaves the current state untouched
+    try:
+      blocks = {
+          block_dict['guid']: tvr.TelemetryMessageValidationBlock.FromDict(
+              block_dict
+          )
+          for block_dict in checkpoint['blocks']
+      }
+      invalid_message_blocks = KeyedReservoir(
+          self._invalid_message_blocks.capacity, self._rng
+      )
+      invalid_message_blocks.Restore(
+          checkpoint['invalid_message_blocks'], blocks.__getitem__
+      )
+      error_type_samples = {}
+      for error_type, samples in checkpoint['error_type_samples'].items():
+        error_type_samples[error_type] = KeyedReservoir(
+            self._samples_per_error_type, self._rng
+        )
+        error_type_samples[error_type].Restore(samples, blocks.__getitem__)
+      extra_entities = KeyedReservoir(self._extra_entities.capacity, self._rng)
+      extra_entities.Restore(checkpoint['extra_entities'])
+      validated_entities = dict(checkpoint['validated_entities'])
+      error_type_counts = collections.Counter(checkpoint['error_type_counts'])
+      invalid_message_count = checkpoint['invalid_message_count']
+      extra_message_count = checkpoint['extra_message_count']
+    except (KeyError, TypeError, ValueError):
+      print(
+          '[WARNING]\tIgnoring incomplete telemetry validation checkpoint:'
+          f' {self.checkpoint_path}'
+      )
+      return False
+
+    with self._lock:
+      self.validated_entities = validated_entities
+      self._invalid_message_count = invalid_message_count
+      self._error_type_counts = error_type_counts
+      self._extra_message_count = extra_message_count
+      self._invalid_message_blocks = invalid_message_blocks
+      self._error_type_samples = error_type_samples
+      self._extra_entities = extra_entities
+    print(
+        '[INFO]\tResumed telemetry validation from checkpoint:'
+        f' {len(self.validated_entities)} of'
+        f' {len(self.entities_with_translation)} entities already validated.'
+    )
+    return True
+
+  def DeleteCheckpoint(self) -> None:
+    """Removes the checkpoint file, if any, so later runs start afresh."""
+    if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+      os.remove(self.checkpoint_path)
+      print(
+          '[INFO]\tRemoved telemetry validation checkpoint:'
+          f' {self.checkpoint_path}'
+      )
+
+  def _CheckpointIfDue(self) -> None:
+    """Saves a checkpoint if the checkpoint interval has elapsed."""
+    if (
+        self.checkpoint_path
+        and time.monotonic() - self._last_checkpoint_time
+        >= self.checkpoint_interval
+    ):
+      self.SaveCheckpoint()
 
   def StartTimer(self):
     """Starts the validation timeout timer."""
     if not self._timer:
-      self._timer = threading.Timer(self.timeout, lambda: self.callback(self))
+      self._timer = threading.Timer(self.timeout, self.Complete)
       self._timer.start()
 
   def StopTimer(self):
@@ -124,9 +484,7 @@ class TelemetryValidator(object):
       try:
         unvalidated_entities.pop(validated_entity_code)
       except KeyError:
-        self._extra_entities.update(
-            {validated_entity_guid: validated_entity_code}
-        )
+        self._extra_entities.Offer(validated_entity_guid, validated_entity_code)
     return {
         entity.guid: entity_code
         for entity_code, entity in unvalidated_entities.items()
@@ -136,14 +494,35 @@ class TelemetryValidator(object):
     """Gets entities reported in telemetry payload but not in building config.
 
     Returns:
-        Mapping of cloud_device_id to entity_code.
+        Mapping of cloud_device_id to entity_code, bounded by the extra entity
+        sample size.
     """
-    return self._extra_entities
+    return self._extra_entities.items
 
   def CallbackIfCompleted(self):
     """Checks if all entities have been validated, and calls the callback."""
     if self.AllEntitiesValidated():
-      self.callback(self)
+      self.Complete()
+
+  @property
+  def is_completed(self) -> bool:
+    return self._completed
+
+  def Complete(self):
+    """Calls the callback unless it has already been called.
+
+    Messages from several telemetry sources and the timeout timer may all
+    reach completion; only the first one produces a report. The checkpoint is
+    deleted before the report is produced, as the callback may stop the
+    process, so that a rerun with the same checkpoint file validates afresh
+    instead of resuming a finished run.
+    """
+    with self._lock:
+      if self._completed:
+        return
+      self._completed = True
+      self.DeleteCheckpoint()
+    self.callback(self)
 
   def ValidateMessage(self, message):
     """Validates a telemetry message.
@@ -163,27 +542,30 @@ class TelemetryValidator(object):
     entity_code = tele.attributes[DEVICE_ID]
     cloud_device_id = tele.attributes[DEVICE_NUM_ID]
 
-    # Telemetry message received for an entity not in building config
-    if entity_code not in self.entities_with_translation.keys():
-      self._extra_entities.update({cloud_device_id: entity_code})
-      message.ack()
-      return
+    with self._lock:
+      # Telemetry message received for an entity not in building config
+      if entity_code not in self.entities_with_translation.keys():
+        self._AddExtraEntity(cloud_device_id, entity_code)
+        message.ack()
+        self._CheckpointIfDue()
+        return
 
-    entity = self.entities_with_translation[entity_code]
+      entity = self.entities_with_translation[entity_code]
 
-    # Telemetry message received for a device that's already been validated.
-    if entity.guid in self.validated_entities:
-      # Already validated telemetry for this entity,
-      # so the message can be skipped.
-      message.ack()
-      return
-    self.validated_entities.update({entity.guid: entity_code})
+      # Telemetry message received for a device that's already been validated.
+      if entity.guid in self.validated_entities:
+        # Already validated telemetry for this entity,
+        # so the message can be skipped.
+        message.ack()
+        return
+      self.validated_entities.update({entity.guid: entity_code})
 
-    validation_block = self._ValidationBlockHelper(message, entity)
+      validation_block = self._ValidationBlockHelper(message, entity)
 
-    if not validation_block.valid:
-      self.AddInvalidMessageBlock(validation_block)
-    message.ack()
+      if not validation_block.valid:
+        self.AddInvalidMessageBlock(validation_block)
+      message.ack()
+      self._CheckpointIfDue()
     self.CallbackIfCompleted()
 
   def _PublishTimeDifferenceHelper(
@@ -65,4 +65,36 @@ def CreateParser() -> argparse.ArgumentParser:
       help='if the validator should not require entity type guids',
   )
 
+  parser.add_argument(
+      '-c',
+      '--base_cache_dir',
+      dest='base_cache_dir',
+      default=None,
+      help='directory caching the original ontology universe across runs',
+      required=False,
+      metavar='BASE_CACHE_DIR',
+  )
+
+  # A profile is written at the end of a single validation, which never comes
+  # in watch mode.
+  watch_or_profile = parser.add_mutually_exclusive_group()
+
+  watch_or_profile.add_argument(
+      '-w',
+      '--watch',
+      action='store_true',
+      dest='watch',
+      help='revalidate the ontology every time one of its files changes',
+  )
+
+  watch_or_profile.add_argument(
+      '-p',
+      '--profile',
+      dest='profile_path',
+      default=None,
+      help='path of a JSON file to write the time and memory of each phase to',
+      required=False,
+      metavar='PROFILE_PATH',
+  )
+
   return parser
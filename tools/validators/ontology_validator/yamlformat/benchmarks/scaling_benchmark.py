@@ -0,0 +1,205 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of ontology validation on synthetic ontologies of growing scale.
+
+For each scale factor, a synthetic ontology and a changed revision of it are
+generated, and the time and peak traced memory of the main validation stages
+are reported:
+  build_universe: BuildUniverse() on the ontology files.
+  namespace_validator: NamespaceValidator() expanding inherited fields.
+  analyze: EntityTypeManager.Analyze() on the expanded types.
+  backwards_compatibility: CheckBackwardsCompatibility() of the revision.
+
+Usage:
+  python -m yamlformat.benchmarks.scaling_benchmark --scales 0.5,1,2,4 \
+      --output /tmp/scaling.json
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List
+
+from yamlformat.benchmarks import synthetic_ontology
+from yamlformat.validator import entity_type_manager
+from yamlformat.validator import external_file_lib
+from yamlformat.validator import namespace_validator
+from yamlformat.validator import presubmit_validate_types_lib
+from yamlformat.validator import profile_lib
+
+STAGES = [
+    'build_universe',
+    'namespace_validator',
+    'analyze',
+    'backwards_compatibility',
+]
+
+
+def _BuildUniverse(ontology_path):
+  yaml_files = external_file_lib.RecursiveDirWalk(ontology_path)
+  config = presubmit_validate_types_lib.SeparateConfigFiles(yaml_files)
+  return presubmit_validate_types_lib.BuildUniverse(config)
+
+
+def _ProfileScale(
+    ontology_dir: str,
+    changed_dir: str,
+    trace_memory: bool,
+) -> profile_lib.PhaseProfiler:
+  """Profiles the validation stages on a generated ontology and revision."""
+  # The changed revision is prepared outside of the profile: it only stands in
+  # for the base universe of a presubmit.
+  changed_universe = _BuildUniverse(changed_dir)
+  namespace_validator.NamespaceValidator(
+      changed_universe.GetEntityTypeNamespaces()
+  )
+
+  profiler = profile_lib.PhaseProfiler(trace_memory=trace_memory)
+  try:
+    with profiler.Phase('build_universe'):
+      universe = _BuildUniverse(ontology_dir)
+    with profiler.Phase('namespace_validator'):
+      namespace_validator.NamespaceValidator(universe.GetEntityTypeNamespaces())
+    with profiler.Phase('analyze'):
+      entity_type_manager.EntityTypeManager(
+          universe.entity_type_universe
+      ).Analyze()
+    with profiler.Phase('backwards_compatibility'):
+      presubmit_validate_types_lib.CheckBackwardsCompatibility(
+          changed_universe.entity_type_universe,
+          universe.entity_type_universe,
+      )
+  finally:
+    profiler.Stop()
+  return profiler
+
+
+def RunBenchmark(
+    scales: List[float],
+    base_scale: synthetic_ontology.OntologyScale = (
+        synthetic_ontology.OntologyScale()
+    ),
+    removed_field_ratio: float = 0.1,
+    seed: int = 0,
+    trace_memory: bool = True,
+) -> List[Dict[str, Any]]:
+  """Profiles the validation stages across scales of a synthetic ontology.
+
+  Args:
+    scales: factors multiplying the types and fields of base_scale.
+    base_scale: scale of the ontology at factor 1.
+    removed_field_ratio: share of concrete types changed in the revision
+      checked for backwards compatibility.
+    seed: random seed of the ontologies.
+    trace_memory: set false to time stages without tracing memory, which
+      slows them down.
+
+  Returns:
+    A list with, for each scale, the factor, the counts of generated items and
+    the profile of the stages.
+  """
+  results = []
+  print(
+      f'{"scale":>6} {"types":>7} {"fields":>7} {"stage":<24}'
+      f' {"seconds":>8} {"peak MB":>8}'
+  )
+  for factor in scales:
+    scale = base_scale.Scaled(factor)
+    work_dir = tempfile.mkdtemp()
+    try:
+      ontology_dir = os.path.join(work_dir, 'ontology')
+      changed_dir = os.path.join(work_dir, 'changed')
+      size = synthetic_ontology.GenerateOntology(ontology_dir, scale, seed)
+      synthetic_ontology.GenerateOntology(
+          changed_dir, scale, seed, removed_field_ratio
+      )
+      profiler = _ProfileScale(ontology_dir, changed_dir, trace_memory)
+    finally:
+      shutil.rmtree(work_dir, ignore_errors=True)
+
+    types = size.abstract_types + size.concrete_types
+    for phase in profiler.phases:
+      peak = phase.get('peak_memory_bytes')
+      peak_text = f'{peak / 2**20:>8.1f}' if peak is not None else f'{"-":>8}'
+      print(
+          f'{factor:>6g} {types:>7} {size.fields:>7} {phase["name"]:<24}'
+          f' {phase["seconds"]:>8.2f} {peak_text}'
+      )
+    results.append({
+        'scale': factor,
+        'size': size._asdict(),
+        'profile': profiler.GetProfile(),
+    })
+  return results
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Benchmark ontology validation on synthetic ontologies'
+  )
+  parser.add_argument(
+      '--scales',
+      default='0.5,1,2,4',
+      help='comma separated factors multiplying the types and fields',
+  )
+  for name, default in synthetic_ontology.OntologyScale._field_defaults.items():
+    parser.add_argument(
+        f'--{name}',
+        type=type(default),
+        default=default,
+        help=f'{name} of the ontology at scale 1',
+    )
+  parser.add_argument(
+      '--removed_field_ratio',
+      type=float,
+      default=0.1,
+      help='share of concrete types changed in the compared revision',
+  )
+  parser.add_argument(
+      '--seed', type=int, default=0, help='random seed of the ontologies'
+  )
+  parser.add_argument(
+      '--no_memory',
+      action='store_true',
+      help='time stages without tracing memory',
+  )
+  parser.add_argument(
+      '--output', help='path of a JSON file to write the results to'
+  )
+  args = parser.parse_args()
+  base_scale = synthetic_ontology.OntologyScale(**{
+      name: getattr(args, name)
+      for name in synthetic_ontology.OntologyScale._fields
+  })
+  results = RunBenchmark(
+      [float(scale) for scale in args.scales.split(',')],
+      base_scale,
+      args.removed_field_ratio,
+      args.seed,
+      not args.no_memory,
+  )
+  if args.output:
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+      json.dump(results, output_file, indent=2)
+      output_file.write('\n')
+
+
+if __name__ == '__main__':
+  main()
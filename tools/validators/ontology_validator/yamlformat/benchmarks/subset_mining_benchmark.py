@@ -0,0 +1,239 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of common field subset mining in the EntityTypeManager.
+
+Compares GetTypenamesBySubsetOI(), which mines closed field sets, against the
+previous implementation, which enumerated combinations of types per shard and
+merged shards by pairwise intersection with every known subset. The previous
+implementation is kept here as the reference; both must produce the same map.
+
+The number of common subsets grows quickly with the number of types, so the
+comparison runs on random samples of the concrete types of the ontology. The
+time of Analyze() on the whole ontology is reported last.
+
+Usage:
+  python -m yamlformat.benchmarks.subset_mining_benchmark --sizes 50,100,200
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import itertools
+import random
+import time
+from typing import Dict, FrozenSet, Set
+
+from yamlformat import constants
+from yamlformat.validator import entity_type_manager
+from yamlformat.validator import external_file_lib
+from yamlformat.validator import namespace_validator
+from yamlformat.validator import presubmit_validate_types_lib
+
+# Shard size of the previous implementation.
+LEGACY_TYPE_SHARD_SIZE = 1
+
+
+def _LegacyMapTypenamesBySubset(
+    types_to_include, field_to_typenames, min_set_size
+):
+  """Creates a map of type sets keyed by unique fields sets."""
+  subsets_by_typegroup = {}
+  for field in field_to_typenames:
+    types_with_field = list(
+        field_to_typenames[field].intersection(types_to_include)
+    )
+    for i in range(1, len(types_with_field) + 1):
+      for group in itertools.combinations(types_with_field, i):
+        typegroup = frozenset(group)
+        if typegroup not in subsets_by_typegroup:
+          subsets_by_typegroup[typegroup] = set()
+        subsets_by_typegroup[typegroup].add(field)
+
+  typenames_by_subset = {}
+  for typegroup, fields in subsets_by_typegroup.items():
+    if len(fields) < min_set_size:
+      continue
+    field_set = frozenset(fields)
+    if field_set not in typenames_by_subset:
+      typenames_by_subset[field_set] = set()
+    typenames_by_subset[field_set].update(typegroup)
+  return typenames_by_subset
+
+
+def LegacyTypenamesBySubset(
+    complete_field_sets: Dict[FrozenSet[object], Set[str]],
+    min_set_size: int = entity_type_manager.MIN_SET_SIZE,
+) -> Dict[FrozenSet[object], Set[str]]:
+  """Computes GetTypenamesBySubsetOI() the way it was before closed set mining.
+
+  Args:
+    complete_field_sets: map of type field sets to type names, as returned by
+      GetCompleteFieldSetsOI().
+    min_set_size: minimum number of fields a subset must have to be included.
+
+  Returns:
+    A map of common field subsets to the names of types having them.
+  """
+  type_shards = []
+  field_to_typenames = {}
+  for field_set, typenames in complete_field_sets.items():
+    for typename in typenames:
+      if not type_shards or len(type_shards[-1]) >= LEGACY_TYPE_SHARD_SIZE:
+        type_shards.append(set())
+      type_shards[-1].add(typename)
+      for field in field_set:
+        field_to_typenames.setdefault(field, set()).add(typename)
+
+  typenames_by_subset_output = {}
+  for shard in type_shards:
+    typenames_by_subset = _LegacyMapTypenamesBySubset(
+        shard, field_to_typenames, min_set_size
+    )
+    new_subsets = {}
+    for subset in typenames_by_subset:
+      if subset not in typenames_by_subset_output:
+        new_subsets.setdefault(subset, set()).update(
+            typenames_by_subset[subset]
+        )
+      for master_subset in typenames_by_subset_output:
+        if subset == master_subset:
+          typenames_by_subset_output[master_subset].update(
+              typenames_by_subset[subset]
+          )
+          continue
+        new_subset = frozenset(subset.intersection(master_subset))
+        if len(new_subset) >= min_set_size:
+          combined_typenames = typenames_by_subset[subset].union(
+              typenames_by_subset_output[master_subset]
+          )
+          if new_subset not in typenames_by_subset_output:
+            new_subsets.setdefault(new_subset, set()).update(combined_typenames)
+            continue
+          typenames_by_subset_output[new_subset].update(combined_typenames)
+    typenames_by_subset_output.update(new_subsets)
+
+  # pylint: disable=protected-access
+  entity_type_manager._CleanMap(typenames_by_subset_output, complete_field_sets)
+  return typenames_by_subset_output
+
+
+def _BuildExpandedUniverse(ontology_path):
+  """Builds the universe of an ontology with inherited fields expanded."""
+  yaml_files = external_file_lib.RecursiveDirWalk(ontology_path)
+  config = presubmit_validate_types_lib.SeparateConfigFiles(yaml_files)
+  universe = presubmit_validate_types_lib.BuildUniverse(config)
+  namespace_validator.NamespaceValidator(universe.GetEntityTypeNamespaces())
+  return universe
+
+
+def _KeepConcreteTypes(type_namespaces, all_types_maps, kept_types):
+  """Restricts the concrete types of each namespace to kept_types."""
+  for type_namespace, all_types_map in zip(type_namespaces, all_types_maps):
+    type_namespace.valid_types_map = {
+        typename: entity_type
+        for typename, entity_type in all_types_map.items()
+        if entity_type.is_abstract
+        or f'{type_namespace.namespace}/{typename}' in kept_types
+    }
+
+
+def RunBenchmark(ontology_path, sizes, seed=0):
+  """Times both implementations on random samples of concrete types.
+
+  Args:
+    ontology_path: path of the ontology yaml files.
+    sizes: numbers of concrete types to sample.
+    seed: random seed of the samples.
+
+  Raises:
+    AssertionError: if the implementations produce different maps.
+  """
+  universe = _BuildExpandedUniverse(ontology_path)
+  type_universe = universe.entity_type_universe
+  # Index field bitsets while every type is present.
+  type_universe.GetFieldIdTable()
+  type_namespaces = type_universe.GetNamespaces()
+  all_types_maps = [dict(ns.valid_types_map) for ns in type_namespaces]
+  concrete_types = sorted(
+      f'{ns.namespace}/{typename}'
+      for ns in type_namespaces
+      for typename, entity_type in ns.valid_types_map.items()
+      if not entity_type.is_abstract
+  )
+
+  print(
+      f'{"types":>6} {"subsets":>9} {"legacy (s)":>11} {"mined (s)":>10}'
+      f' {"speedup":>8}'
+  )
+  for size in sizes:
+    kept_types = set(
+        random.Random(seed).sample(
+            concrete_types, min(size, len(concrete_types))
+        )
+    )
+    _KeepConcreteTypes(type_namespaces, all_types_maps, kept_types)
+    manager = entity_type_manager.EntityTypeManager(type_universe)
+    manager.Analyze()
+
+    start_time = time.time()
+    mined = manager.GetTypenamesBySubsetOI()
+    mined_time = time.time() - start_time
+    start_time = time.time()
+    legacy = LegacyTypenamesBySubset(manager.GetCompleteFieldSetsOI())
+    legacy_time = time.time() - start_time
+
+    if mined != legacy:
+      raise AssertionError(f'Subset maps differ for {size} types')
+    print(
+        f'{len(kept_types):>6} {len(mined):>9} {legacy_time:>11.2f}'
+        f' {mined_time:>10.2f} {legacy_time / max(mined_time, 1e-6):>7.1f}x'
+    )
+
+  _KeepConcreteTypes(type_namespaces, all_types_maps, set(concrete_types))
+  manager = entity_type_manager.EntityTypeManager(type_universe)
+  start_time = time.time()
+  findings = manager.Analyze()
+  print(
+      f'Analyze() on all {len(concrete_types)} concrete types:'
+      f' {time.time() - start_time:.2f}s, {len(findings)} findings'
+  )
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Benchmark common field subset mining'
+  )
+  parser.add_argument(
+      '--ontology',
+      default=constants.ONTOLOGY_ROOT,
+      help='path of the ontology yaml files',
+  )
+  parser.add_argument(
+      '--sizes',
+      default='50,100,200',
+      help='comma separated numbers of concrete types to sample',
+  )
+  parser.add_argument(
+      '--seed', type=int, default=0, help='random seed of the samples'
+  )
+  args = parser.parse_args()
+  RunBenchmark(
+      args.ontology, [int(size) for size in args.sizes.split(',')], args.seed
+  )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,399 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Generator of valid synthetic ontologies at a configurable scale.
+
+Ontologies are written in the layout of ontology/yaml/resources: global
+subfields, fields, states and units folders, and one folder per namespace
+holding entity type files. Every namespace has type_depth levels of abstract
+types, each implementing fan_out types of the level above, and concrete types
+implementing fan_out types of the deepest level. Generation is deterministic
+for a given scale and seed.
+
+Usage:
+  python -m yamlformat.benchmarks.synthetic_ontology --output /tmp/onto \
+      --namespaces 8 --fields 800
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import string
+import uuid
+from typing import Dict, List, NamedTuple, Set
+
+import yaml
+
+# Subfields every synthetic ontology defines besides generated ones.
+_MEASUREMENT = 'temperature'
+_NUMERIC_POINT_TYPE = 'sensor'
+_STATE_POINT_TYPE = 'status'
+_STATES = ['ON', 'OFF']
+# Concrete types of a namespace are grouped in files of this many types.
+_TYPES_PER_FILE = 20
+
+
+class OntologyScale(NamedTuple):
+  """Size and shape of a synthetic ontology.
+
+  Attributes:
+    namespaces: number of entity type namespaces.
+    types_per_namespace: number of concrete types in each namespace.
+    abstract_types_per_level: number of abstract types in each level of a
+      namespace.
+    fields: number of global fields.
+    subfields: number of generated descriptor and component subfields.
+    type_depth: number of levels of abstract types in each namespace.
+    fan_out: number of parents implemented by each type below the first level.
+    local_fields_per_type: number of fields each type declares itself.
+    optional_ratio: probability that a local field is optional.
+  """
+
+  namespaces: int = 4
+  types_per_namespace: int = 50
+  abstract_types_per_level: int = 8
+  fields: int = 400
+  subfields: int = 40
+  type_depth: int = 3
+  fan_out: int = 2
+  local_fields_per_type: int = 4
+  optional_ratio: float = 0.3
+
+  def Scaled(self, factor: float) -> 'OntologyScale':
+    """Returns this scale with factor times the namespaces and fields.
+
+    The number of types grows with the number of namespaces, so the number of
+    types and of fields are both multiplied by factor. Fields combine two
+    subfields, so subfields grow with the square root of factor.
+
+    Args:
+      factor: multiplier of the scale.
+    """
+    return self._replace(
+        namespaces=max(1, round(self.namespaces * factor)),
+        fields=max(1, round(self.fields * factor)),
+        subfields=max(2, round(self.subfields * factor**0.5)),
+    )
+
+
+class OntologySize(NamedTuple):
+  """Counts of the items of a generated ontology."""
+
+  namespaces: int
+  subfields: int
+  fields: int
+  abstract_types: int
+  concrete_types: int
+
+
+def _Letters(index: int) -> str:
+  """Returns a unique uppercase name for a non-negative index: A, B, .., BA."""
+  letters = string.ascii_uppercase[index % 26]
+  index //= 26
+  while index:
+    letters = string.ascii_uppercase[index % 26] + letters
+    index //= 26
+  return letters
+
+
+def _MakeGuid(rng: random.Random) -> str:
+  return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _MakeFieldNames(scale: OntologyScale) -> List[str]:
+  """Returns the names of the global fields of an ontology.
+
+  Fields combine a descriptor and a component subfield and alternate between
+  numeric temperature sensors and multi-state statuses.
+
+  Raises:
+    ValueError: if there are too few subfields to name every field.
+  """
+  num_components = max(1, scale.subfields // 4)
+  num_descriptors = max(1, scale.subfields - num_components)
+  if scale.fields > 2 * num_descriptors * num_components:
+    raise ValueError(
+        f'{scale.subfields} subfields can name at most'
+        f' {2 * num_descriptors * num_components} fields, not {scale.fields}.'
+    )
+  field_names = []
+  for index in range(scale.fields):
+    pair = index // 2
+    descriptor = pair % num_descriptors
+    component = pair // num_descriptors
+    if index % 2:
+      suffix = _STATE_POINT_TYPE
+    else:
+      suffix = f'{_MEASUREMENT}_{_NUMERIC_POINT_TYPE}'
+    field_names.append(f'descriptor{descriptor}_component{component}_{suffix}')
+  return field_names
+
+
+def _WriteYaml(path: str, document: object) -> None:
+  os.makedirs(os.path.dirname(path), exist_ok=True)
+  with open(path, 'w', encoding='utf-8') as yaml_file:
+    yaml.safe_dump(
+        document, yaml_file, default_flow_style=False, sort_keys=False
+    )
+
+
+def _WriteGlobalConfigs(
+    output_dir: str, scale: OntologyScale, field_names: List[str]
+) -> int:
+  """Writes the subfield, field, state and unit files.
+
+  Returns:
+    The number of subfields written.
+  """
+  num_components = max(1, scale.subfields // 4)
+  num_descriptors = max(1, scale.subfields - num_components)
+  subfields = {
+      'descriptor': {
+          f'descriptor{index}': f'Synthetic descriptor {index}.'
+          for index in range(num_descriptors)
+      },
+      'component': {
+          f'component{index}': f'Synthetic component {index}.'
+          for index in range(num_components)
+      },
+      'measurement': {_MEASUREMENT: 'Synthetic temperature measurement.'},
+      'point_type': {
+          _NUMERIC_POINT_TYPE: 'Synthetic sensor point type.',
+          _STATE_POINT_TYPE: 'Synthetic status point type.',
+      },
+  }
+  _WriteYaml(os.path.join(output_dir, 'subfields', 'subfields.yaml'), subfields)
+
+  literals = []
+  for field_name in field_names:
+    if field_name.endswith(_STATE_POINT_TYPE):
+      literals.append({field_name: list(_STATES)})
+    else:
+      literals.append(
+          {field_name: {'flexible_min': 0.0, 'flexible_max': 500.0}}
+      )
+  _WriteYaml(
+      os.path.join(output_dir, 'fields', 'telemetry_fields.yaml'),
+      {'literals': literals},
+  )
+  _WriteYaml(
+      os.path.join(output_dir, 'states', 'states.yaml'),
+      {state: f'Synthetic state {state}.' for state in _STATES},
+  )
+  _WriteYaml(
+      os.path.join(output_dir, 'units', 'units.yaml'),
+      {
+          _MEASUREMENT: {
+              'kelvins': 'STANDARD',
+              'degrees_celsius': {'multiplier': 1.0, 'offset': 273.15},
+          }
+      },
+  )
+  return num_descriptors + num_components + 3
+
+
+class _TypeBuilder(object):
+  """Draws the parents and local fields of the types of a namespace."""
+
+  def __init__(
+      self, rng: random.Random, scale: OntologyScale, field_names: List[str]
+  ):
+    self._rng = rng
+    self._scale = scale
+    self._field_names = field_names
+    # Fields of each type, local and inherited.
+    self._all_fields: Dict[str, Set[str]] = {}
+
+  def DrawParents(self, candidates: List[str]) -> List[str]:
+    """Returns up to fan_out distinct types drawn from candidates."""
+    return self._rng.sample(
+        candidates, min(self._scale.fan_out, len(candidates))
+    )
+
+  def MakeType(
+      self, typename: str, parents: List[str], is_abstract: bool
+  ) -> Dict[str, object]:
+    """Returns the yaml document of a type, with fields not yet inherited."""
+    inherited = set()
+    for parent in parents:
+      inherited.update(self._all_fields[parent])
+    local_fields = []
+    while len(local_fields) < min(
+        self._scale.local_fields_per_type,
+        len(self._field_names) - len(inherited),
+    ):
+      field_name = self._rng.choice(self._field_names)
+      if field_name not in inherited and field_name not in local_fields:
+        local_fields.append(field_name)
+    self._all_fields[typename] = inherited.union(local_fields)
+
+    document = {
+        'guid': _MakeGuid(self._rng),
+        'description': f'Synthetic type {typename}.',
+    }
+    if is_abstract:
+      document['is_abstract'] = True
+    if parents:
+      document['implements'] = list(parents)
+    uses = []
+    opt_uses = []
+    for field_name in sorted(local_fields):
+      if self._rng.random() < self._scale.optional_ratio:
+        opt_uses.append(field_name)
+      else:
+        uses.append(field_name)
+    if uses:
+      document['uses'] = uses
+    if opt_uses:
+      document['opt_uses'] = opt_uses
+    return document
+
+
+def _RemoveLocalFields(
+    type_files: Dict[str, Dict[str, Dict[str, object]]],
+    rng: random.Random,
+    removed_field_ratio: float,
+) -> None:
+  """Removes a local field from a share of the concrete types."""
+  for types in type_files.values():
+    for document in types.values():
+      if document.get('is_abstract') or rng.random() >= removed_field_ratio:
+        continue
+      for key in ('opt_uses', 'uses'):
+        if document.get(key):
+          document[key].pop()
+          if not document[key]:
+            del document[key]
+          break
+
+
+def GenerateOntology(
+    output_dir: str,
+    scale: OntologyScale = OntologyScale(),
+    seed: int = 0,
+    removed_field_ratio: float = 0.0,
+) -> OntologySize:
+  """Writes a valid synthetic ontology.
+
+  Args:
+    output_dir: directory to write the ontology in. Existing files with the
+      same names are overwritten.
+    scale: size and shape of the ontology.
+    seed: random seed of the types.
+    removed_field_ratio: share of concrete types that lose a local field.
+      Generating the same scale and seed with a positive ratio produces a
+      changed revision of the ontology, which breaks backwards compatibility.
+
+  Returns:
+    The counts of the items written.
+
+  Raises:
+    ValueError: if there are too few subfields to name every field.
+  """
+  field_names = _MakeFieldNames(scale)
+  num_subfields = _WriteGlobalConfigs(output_dir, scale, field_names)
+
+  rng = random.Random(seed)
+  abstract_types = 0
+  concrete_types = 0
+  for ns_index in range(scale.namespaces):
+    namespace = f'NS{_Letters(ns_index)}'
+    builder = _TypeBuilder(rng, scale, field_names)
+    type_files = {'ABSTRACT': {}}
+    parent_level = []
+    for level in range(scale.type_depth):
+      current_level = []
+      for index in range(scale.abstract_types_per_level):
+        typename = f'ABS{_Letters(level)}_{index}'
+        parents = builder.DrawParents(parent_level)
+        type_files['ABSTRACT'][typename] = builder.MakeType(
+            typename, parents, is_abstract=True
+        )
+        current_level.append(typename)
+      parent_level = current_level
+      abstract_types += len(current_level)
+
+    for index in range(scale.types_per_namespace):
+      equipment_class = f'EQ{_Letters(index // _TYPES_PER_FILE)}'
+      typename = f'{equipment_class}_{index}'
+      parents = builder.DrawParents(parent_level)
+      type_files.setdefault(equipment_class, {})[typename] = builder.MakeType(
+          typename, parents, is_abstract=False
+      )
+      concrete_types += 1
+
+    if removed_field_ratio:
+      _RemoveLocalFields(
+          type_files, random.Random(f'{seed}:{namespace}'), removed_field_ratio
+      )
+    for file_name, types in type_files.items():
+      if types:
+        _WriteYaml(
+            os.path.join(
+                output_dir, namespace, 'entity_types', f'{file_name}.yaml'
+            ),
+            types,
+        )
+
+  return OntologySize(
+      namespaces=scale.namespaces,
+      subfields=num_subfields,
+      fields=len(field_names),
+      abstract_types=abstract_types,
+      concrete_types=concrete_types,
+  )
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Generate a valid synthetic ontology'
+  )
+  parser.add_argument(
+      '--output', required=True, help='directory to write the ontology in'
+  )
+  for name, default in OntologyScale._field_defaults.items():
+    parser.add_argument(
+        f'--{name}',
+        type=type(default),
+        default=default,
+        help=f'{name} of the ontology scale',
+    )
+  parser.add_argument(
+      '--seed', type=int, default=0, help='random seed of the types'
+  )
+  parser.add_argument(
+      '--removed_field_ratio',
+      type=float,
+      default=0.0,
+      help='share of concrete types that lose a local field',
+  )
+  args = parser.parse_args()
+  scale = OntologyScale(
+      **{name: getattr(args, name) for name in OntologyScale._fields}
+  )
+  size = GenerateOntology(
+      args.output, scale, args.seed, args.removed_field_ratio
+  )
+  print(
+      f'[INFO]\tWrote {size.abstract_types} abstract and'
+      f' {size.concrete_types} concrete types using {size.fields} fields to'
+      f' {args.output}'
+  )
+
+
+if __name__ == '__main__':
+  main()
@@ -70,6 +70,34 @@ class ArgParserTest(absltest.TestCase):
     self.assertTrue(ast.literal_eval(parsed.interactive))
     self.assertFalse(parsed.allow_missing_type_guids)
 
+  def testBaseCacheDir(self):
+    parsed = self.parser.parse_args(
+        ['--original', './my/path/to/foo', '--base_cache_dir', '~/cache']
+    )
+    self.assertEqual(parsed.base_cache_dir, '~/cache')
+    parsed = self.parser.parse_args(['--original', './my/path/to/foo'])
+    self.assertIsNone(parsed.base_cache_dir)
+
+  def testWatchFlag(self):
+    parsed = self.parser.parse_args(['--original', './my/path/to/foo', '-w'])
+    self.assertTrue(parsed.watch)
+    parsed = self.parser.parse_args(['--original', './my/path/to/foo'])
+    self.assertFalse(parsed.watch)
+
+  def testProfilePath(self):
+    parsed = self.parser.parse_args(
+        ['--original', './my/path/to/foo', '--profile', 'profile.json']
+    )
+    self.assertEqual(parsed.profile_path, 'profile.json')
+    parsed = self.parser.parse_args(['--original', './my/path/to/foo'])
+    self.assertIsNone(parsed.profile_path)
+
+  def testWatchAndProfileAreExclusive(self):
+    with self.assertRaises(SystemExit):
+      self.parser.parse_args(
+          ['--original', './my/path/to/foo', '-w', '--profile', 'p.json']
+      )
+
 
 if __name__ == '__main__':
   absltest.main()
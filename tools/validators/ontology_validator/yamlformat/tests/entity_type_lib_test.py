@@ -63,6 +63,185 @@ class EntityTypeLibTest(absltest.TestCase):
     )
     self.assertFalse(types_universe.IsValid())
 
+  def testEntityTypeUniverseGetTypeHierarchy(self):
+    filepath = _GOOD_PATH + '/file.yaml'
+    folder = entity_type_lib.EntityTypeFolder(_GOOD_PATH)
+    namespace = folder.local_namespace
+    for typename, parents, is_abstract in (
+        ('animal', [], True),
+        ('mammal', ['animal'], True),
+        ('dog', ['mammal', 'undefined'], False),
+        ('puppy', ['dog', 'animal'], False),
+        ('chicken', ['egg'], False),
+        ('egg', ['chicken'], False),
+    ):
+      namespace.InsertType(
+          entity_type_lib.EntityType(
+              typename=typename,
+              filepath=filepath,
+              description='hi',
+              parents=parents,
+              is_abstract=is_abstract,
+          )
+      )
+
+    types_universe = entity_type_lib.EntityTypeUniverse([folder])
+    hierarchy = types_universe.GetTypeHierarchy()
+
+    def Names(entity_types):
+      return [entity_type.typename for entity_type in entity_types]
+
+    self.assertTrue(
+        hierarchy.IsSubtypeOf('mynamespace', 'puppy', 'mynamespace', 'animal')
+    )
+    self.assertFalse(
+        hierarchy.IsSubtypeOf('mynamespace', 'animal', 'mynamespace', 'puppy')
+    )
+    self.assertFalse(
+        hierarchy.IsSubtypeOf('mynamespace', 'dog', 'mynamespace', 'dog')
+    )
+    self.assertEqual(
+        Names(hierarchy.GetAncestors('mynamespace', 'puppy')),
+        ['animal', 'dog', 'mammal'],
+    )
+    self.assertEqual(
+        Names(hierarchy.GetDescendants('mynamespace', 'animal')),
+        ['dog', 'mammal', 'puppy'],
+    )
+    self.assertEqual(
+        Names(
+            hierarchy.GetDescendants(
+                'mynamespace', 'animal', concrete_only=True
+            )
+        ),
+        ['dog', 'puppy'],
+    )
+    self.assertEqual(
+        Names(hierarchy.GetAncestors('mynamespace', 'egg')), ['chicken']
+    )
+    self.assertEqual(hierarchy.GetDescendants('mynamespace', 'cat'), [])
+
+  def testEntityTypeUniverseGetFieldBitsets(self):
+    filepath = _GOOD_PATH + '/file.yaml'
+    folder = entity_type_lib.EntityTypeFolder(_GOOD_PATH)
+    namespace = folder.local_namespace
+    parent = entity_type_lib.EntityType(
+        typename='parent',
+        filepath=filepath,
+        description='hi',
+        local_field_tuples=[_F('/woof'), _F('/wag', optional=True)],
+    )
+    child = entity_type_lib.EntityType(
+        typename='child',
+        filepath=filepath,
+        description='hi',
+        local_field_tuples=_FS(['/bark']),
+        parents=['parent'],
+    )
+    namespace.InsertType(parent)
+    namespace.InsertType(child)
+    # Expand inherited fields the way the namespace validator does.
+    parent.inherited_fields_expanded = True
+    child.inherited_field_names.update(parent.local_field_names)
+    child.inherited_fields_expanded = True
+
+    types_universe = entity_type_lib.EntityTypeUniverse([folder])
+    field_ids = types_universe.GetFieldIdTable()
+    bitsets = types_universe.GetFieldBitsets('mynamespace', 'child')
+
+    self.assertLen(field_ids, 3)
+    self.assertEqual(field_ids.ToNames(bitsets.local), {'/bark'})
+    self.assertEqual(field_ids.ToNames(bitsets.all), {'/bark', '/woof', '/wag'})
+    self.assertEqual(field_ids.ToNames(bitsets.required), {'/bark', '/woof'})
+    self.assertEqual(
+        types_universe.GetFieldBitsets('mynamespace', 'parent').all
+        & ~bitsets.all,
+        0,
+    )
+    self.assertEqual(entity_type_lib.CountBits(bitsets.all), 3)
+    self.assertIsNone(types_universe.GetFieldBitsets('mynamespace', 'cat'))
+
+  def testEntityTypeUniverseGetFieldIdTableRequiresExpandedFields(self):
+    folder = entity_type_lib.EntityTypeFolder(_GOOD_PATH)
+    entity_type = entity_type_lib.EntityType(
+        typename='dog',
+        filepath=_GOOD_PATH + '/file.yaml',
+        description='hi',
+        local_field_tuples=_FS(['/bark']),
+    )
+    folder.local_namespace.InsertType(entity_type)
+    types_universe = entity_type_lib.EntityTypeUniverse([folder])
+
+    with self.assertRaises(RuntimeError):
+      types_universe.GetFieldIdTable()
+    with self.assertRaises(RuntimeError):
+      types_universe.GetFieldBitsets('mynamespace', 'dog')
+
+    entity_type.inherited_fields_expanded = True
+    bitsets = types_universe.GetFieldBitsets('mynamespace', 'dog')
+
+    self.assertEqual(
+        types_universe.GetFieldIdTable().ToNames(bitsets.all), {'/bark'}
+    )
+
+  def testFieldIdTable(self):
+    field_ids = entity_type_lib.FieldIdTable()
+
+    bits = field_ids.ToBits(['/a', 'HVAC/b', '/a'])
+
+    self.assertLen(field_ids, 2)
+    self.assertEqual(field_ids.Intern('HVAC/b'), 1)
+    self.assertEqual(field_ids.GetName(0), '/a')
+    self.assertIsNone(field_ids.GetId('/c'))
+    self.assertEqual(bits, 0b11)
+    self.assertEqual(field_ids.ToNames(bits & ~0b1), {'HVAC/b'})
+    self.assertEqual(field_ids.ToNames(0), set())
+
+  def testEntityTypeGetFingerprint(self):
+    def MakeType(typename='one', description='hi', optional=False, **kwargs):
+      entity_type = entity_type_lib.EntityType(
+          typename=typename,
+          filepath=_GOOD_PATH + '/file.yaml',
+          description=description,
+          local_field_tuples=[_F('/woof'), _F('/wag', optional=optional)],
+          inherited_fields_expanded=True,
+          **kwargs,
+      )
+      return entity_type.GetFingerprint()
+
+    fingerprint = MakeType()
+
+    self.assertEqual(MakeType(), fingerprint)
+    self.assertEqual(MakeType(guid=_GUID_1, parents=['two']), fingerprint)
+    self.assertNotEqual(MakeType(typename='two'), fingerprint)
+    self.assertNotEqual(MakeType(description='bye'), fingerprint)
+    self.assertNotEqual(MakeType(optional=True), fingerprint)
+    self.assertNotEqual(MakeType(is_abstract=True), fingerprint)
+    self.assertNotEqual(MakeType(is_canonical=True), fingerprint)
+    with self.assertRaises(RuntimeError):
+      entity_type_lib.EntityType(typename='one').GetFingerprint()
+
+  def testTypeNamespaceGetFingerprint(self):
+    def MakeNamespace(*guids):
+      folder = entity_type_lib.EntityTypeFolder(_GOOD_PATH)
+      for typename, guid in zip(['one', 'two'], guids):
+        folder.local_namespace.InsertType(
+            entity_type_lib.EntityType(
+                typename=typename,
+                filepath=_GOOD_PATH + '/file.yaml',
+                description='hi',
+                inherited_fields_expanded=True,
+                guid=guid,
+            )
+        )
+      return folder.local_namespace.GetFingerprint()
+
+    fingerprint = MakeNamespace(_GUID_1, _GUID_2)
+
+    self.assertEqual(MakeNamespace(_GUID_1, _GUID_2), fingerprint)
+    self.assertNotEqual(MakeNamespace(_GUID_2, _GUID_1), fingerprint)
+    self.assertNotEqual(MakeNamespace(_GUID_1), fingerprint)
+
   def testEntityTypeUniverseFindsDupGuids(self):
     filepath = _GOOD_PATH + '/file.yaml'
     folder = entity_type_lib.EntityTypeFolder(_GOOD_PATH)
@@ -369,6 +369,56 @@ class EntityTypeManagerTest(absltest.TestCase):
 
     self.assertEqual(expected_output, function_output)
 
+  def testGetTypenamesBySubsetOIFindsAllCommonSubsets(self):
+    yaml = {'literals': ['field1', 'field2', 'field3', 'field4', 'field5']}
+    field_universe = field_lib.FieldUniverse([_GetFieldFolder(yaml)])
+    yaml = {
+        'VAV_a': {
+            'guid': _GUID_1,
+            'description': 'a',
+            'uses': ['field1', 'field2', 'field3'],
+        },
+        'VAV_b': {
+            'guid': _GUID_2,
+            'description': 'b',
+            'uses': ['field1', 'field2', 'field4'],
+        },
+        'VAV_c': {
+            'guid': _GUID_3,
+            'description': 'c',
+            'uses': ['field1', 'field3', 'field4'],
+        },
+        'VAV_d': {
+            'guid': _GUID_4,
+            'description': 'd',
+            'uses': ['field1', 'field2', 'field3', 'field5'],
+        },
+    }
+    type_folder = _GetEntityTypeFolder(field_universe, yaml)
+    universe = _GetEntityTypeUniverse([type_folder])
+    manager = entity_type_manager.EntityTypeManager(universe)
+
+    def _Fields(*field_names):
+      return frozenset(
+          FieldParts(namespace='', field=field_name, increment='')
+          for field_name in field_names
+      )
+
+    # Every intersection of two or more types; VAV_a is dropped from its own
+    # field set, which VAV_d extends.
+    expected_output = {
+        _Fields('field1'): {'/VAV_a', '/VAV_b', '/VAV_c', '/VAV_d'},
+        _Fields('field1', 'field2'): {'/VAV_a', '/VAV_b', '/VAV_d'},
+        _Fields('field1', 'field3'): {'/VAV_a', '/VAV_c', '/VAV_d'},
+        _Fields('field1', 'field4'): {'/VAV_b', '/VAV_c'},
+        _Fields('field1', 'field2', 'field3'): {'/VAV_d'},
+    }
+
+    manager.Analyze()
+    function_output = manager.GetTypenamesBySubsetOI()
+
+    self.assertEqual(expected_output, function_output)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -17,6 +17,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import pickle
+
 from absl.testing import absltest
 
 from yamlformat.validator import field_lib
@@ -106,6 +108,231 @@ class FieldLibTest(absltest.TestCase):
     self.assertDictEqual(global_fields, expected_global)
     self.assertDictEqual(all_fields, expected_all)
 
+  def testFieldUniverseGetFieldsWithSubfields(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    folder = field_lib.FieldFolder(_GOOD_PATH, global_folder.local_namespace)
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('supply_air_temperature_sensor')
+    )
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('chair_count_sensor')
+    )
+    folder.local_namespace.PutIfAbsent(field_lib.Field('zone_air_meow'))
+
+    universe = field_lib.FieldUniverse([folder, global_folder])
+
+    self.assertEqual(
+        universe.GetFieldsWithSubfields(['temperature', 'air']),
+        ['/supply_air_temperature_sensor', '/zone_air_temperature_sensor'],
+    )
+    self.assertEqual(
+        universe.GetFieldsWithSubfields(['air', 'zone']),
+        ['/zone_air_temperature_sensor', _GOOD_NAMESPACE + '/zone_air_meow'],
+    )
+    self.assertEqual(universe.GetFieldsWithSubfields(['ai']), [])
+    self.assertEqual(
+        universe.GetFieldsWithSubfields(['chair', 'temperature']), []
+    )
+    self.assertLen(universe.GetFieldsWithSubfields([]), 4)
+
+  def testFieldUniverseGetFieldsWithSubfieldsAfterInvalidation(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    universe = field_lib.FieldUniverse([global_folder])
+    self.assertLen(universe.GetFieldsWithSubfields(['air']), 1)
+
+    universe._namespace_map[''].append(
+        field_lib.Field('supply_air_temperature_sensor')
+    )
+    universe.InvalidateFieldLookups()
+
+    self.assertEqual(
+        universe.GetFieldsWithSubfields(['air']),
+        ['/supply_air_temperature_sensor', '/zone_air_temperature_sensor'],
+    )
+    self.assertTrue(
+        universe.IsFieldDefined('supply_air_temperature_sensor', '')
+    )
+
+  def testFieldUniverseInvalidateFieldLookupsIsPerUniverse(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    universe = field_lib.FieldUniverse([global_folder])
+    other_universe = field_lib.FieldUniverse([global_folder])
+    subfield_index = universe.GetSubfieldIndex()
+
+    # The namespace map is a snapshot of the namespace fields
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    other_universe.InvalidateFieldLookups()
+
+    self.assertIs(universe.GetSubfieldIndex(), subfield_index)
+    universe.InvalidateFieldLookups()
+    self.assertIsNot(universe.GetSubfieldIndex(), subfield_index)
+
+  def testFieldUniverseUnpickledRebuildsStaleLookups(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    universe = field_lib.FieldUniverse([global_folder])
+    universe.GetSubfieldIndex()
+
+    restored = pickle.loads(pickle.dumps(universe))
+    subfield_index = restored._subfield_index
+    universe.InvalidateFieldLookups()
+    restored_stale = pickle.loads(pickle.dumps(universe))
+
+    self.assertIsNotNone(subfield_index)
+    self.assertIsNot(restored_stale.GetSubfieldIndex(), subfield_index)
+    self.assertEqual(
+        restored_stale.GetFieldsWithSubfields(['air']),
+        ['/zone_air_temperature_sensor'],
+    )
+
+  def testFieldUniverseUnpickledKeepsCurrentLookups(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    universe = field_lib.FieldUniverse([global_folder])
+    universe.GetSubfieldIndex()
+
+    restored = pickle.loads(pickle.dumps(universe))
+    subfield_index = restored._subfield_index
+
+    self.assertIsNotNone(subfield_index)
+    self.assertIs(restored.GetSubfieldIndex(), subfield_index)
+
+  def testFieldUniverseGetFieldNamespaces(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    folder = field_lib.FieldFolder(_GOOD_PATH)
+    global_folder.local_namespace.PutIfAbsent(field_lib.Field('claws_cat'))
+    folder.local_namespace.PutIfAbsent(field_lib.Field('claws_cat'))
+    folder.local_namespace.PutIfAbsent(field_lib.Field('meow_cat'))
+
+    universe = field_lib.FieldUniverse([folder, global_folder])
+
+    self.assertEqual(
+        universe.GetFieldNamespaces('claws_cat_2'), ['', _GOOD_NAMESPACE]
+    )
+    self.assertEqual(universe.GetFieldNamespaces('meow_cat'), [_GOOD_NAMESPACE])
+    self.assertEqual(universe.GetFieldNamespaces('purr_cat'), [])
+    self.assertTrue(universe.IsFieldDefined('meow_cat_1', _GOOD_NAMESPACE))
+    self.assertFalse(universe.IsFieldDefined('meow_cat', ''))
+
+  def testBoundedEditDistanceMatchesLevenshtein(self):
+    def Levenshtein(source, target):
+      previous_row = list(range(len(target) + 1))
+      for row, source_char in enumerate(source, 1):
+        current_row = [row]
+        for column, target_char in enumerate(target, 1):
+          current_row.append(
+              min(
+                  previous_row[column] + 1,
+                  current_row[column - 1] + 1,
+                  previous_row[column - 1] + (source_char != target_char),
+              )
+          )
+        previous_row = current_row
+      return previous_row[-1]
+
+    words = ['', 'a', 'ab', 'ba', 'abc', 'acb', 'zone_air', 'zone_iar', 'zoner']
+    for source in words:
+      for target in words:
+        distance = Levenshtein(source, target)
+        for max_distance in range(4):
+          expected = distance if distance <= max_distance else None
+          self.assertEqual(
+              field_lib.BoundedEditDistance(source, target, max_distance),
+              expected,
+              f'{source} -> {target} within {max_distance}',
+          )
+
+  def testSuggestClosestNames(self):
+    candidates = ['run_status', 'run_command', 'zone_run_status', 'speed']
+
+    self.assertEqual(
+        field_lib.SuggestClosestNames('run_statis', candidates),
+        ['run_status'],
+    )
+    self.assertEqual(
+        field_lib.SuggestClosestNames('run_status', candidates), []
+    )
+
+  def testFieldSuggesterSuggestsShortNames(self):
+    names = ['a', 'b', 'a_b', 'abc', 'axc', 'zone_air']
+    suggester = field_lib.FieldSuggester(
+        {'': [field_lib.Field(name) for name in names]}
+    )
+
+    # Names this short share no n-gram with the fields close to them
+    self.assertCountEqual(
+        suggester.Suggest('ab', limit=len(names)), ['/a', '/b', '/a_b', '/abc']
+    )
+    self.assertEqual(suggester.Suggest('abc', limit=1), ['/axc'])
+    for fieldname in ['', 'a', 'ab', 'abd', 'xbc', 'zone_ai']:
+      max_distance = field_lib.GetMaxSuggestionDistance(fieldname)
+      expected = {
+          '/' + name
+          for name in names
+          if name != fieldname
+          and field_lib.BoundedEditDistance(fieldname, name, max_distance)
+          is not None
+      }
+      self.assertEqual(
+          set(suggester.Suggest(fieldname, limit=len(names))),
+          expected,
+          fieldname,
+      )
+
+  def testFieldUniverseGetFieldSuggestions(self):
+    global_folder = field_lib.FieldFolder(_GOOD_GLOBAL_PATH)
+    folder = field_lib.FieldFolder(_GOOD_PATH)
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+    global_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_setpoint')
+    )
+    folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensors')
+    )
+    other_folder = field_lib.FieldFolder('othernamespace/fields/anyfolder')
+    other_folder.local_namespace.PutIfAbsent(
+        field_lib.Field('zone_air_temperature_sensor')
+    )
+
+    universe = field_lib.FieldUniverse([folder, global_folder, other_folder])
+
+    self.assertEqual(
+        universe.GetFieldSuggestions('zone_air_temprature_sensor_1', ''),
+        ['/zone_air_temperature_sensor'],
+    )
+    self.assertEqual(
+        universe.GetFieldSuggestions(
+            'zone_air_temprature_sensor', _GOOD_NAMESPACE
+        ),
+        [
+            '/zone_air_temperature_sensor',
+            _GOOD_NAMESPACE + '/zone_air_temperature_sensors',
+        ],
+    )
+    self.assertEqual(
+        universe.GetFieldSuggestions('zone_air_temprature_sensor', limit=1),
+        ['/zone_air_temperature_sensor'],
+    )
+    self.assertEqual(
+        universe.GetFieldSuggestions('temperature_zone_air_setpoint', ''),
+        ['/zone_air_temperature_setpoint'],
+    )
+    self.assertEqual(universe.GetFieldSuggestions('meow', ''), [])
+
   def testGetSubFieldList(self):
     field = field_lib.Field('test_name')
     expected = ['test', 'name']
@@ -132,6 +132,78 @@ class FindingsLibTest(absltest.TestCase):
     self.assertLen(findings, 2)
     self.assertFalse(self.findings_class.IsValid())
 
+  def testFindingsCacheIsInvalidatedByDescendants(self):
+    namespace = entity_type_lib.TypeNamespace('ANIMAL')
+    entity_type = entity_type_lib.EntityType(
+        filepath='path/to/ANIMAL/mammal',
+        typename='dog',
+        description='canine animal',
+        guid='4d68ac84-786f-425c-9a65-097b1fb04c91',
+    )
+    namespace.InsertType(entity_type)
+    self.assertTrue(namespace.IsValid())
+    self.assertEqual(namespace.GetErrorCount(), 0)
+
+    warning = findings_lib.ValidationWarning(
+        'warning', findings_lib.FileContext('filepath')
+    )
+    entity_type.AddFinding(warning)
+    namespace.GetFindings().clear()
+
+    self.assertEqual(namespace.GetFindings(), [warning])
+    self.assertEmpty(namespace.GetFindings(filter_old_warnings=True))
+    entity_type.SetChanged()
+    self.assertEqual(namespace.GetFindings(filter_old_warnings=True), [warning])
+
+    entity_type.AddFinding(
+        findings_lib.ValidationError(
+            'error', findings_lib.FileContext('filepath')
+        )
+    )
+    self.assertFalse(namespace.IsValid())
+    self.assertEqual(namespace.GetErrorCount(), 1)
+
+  def testFindingsCacheIsScopedToItsTree(self):
+    # pylint: disable=protected-access
+    namespace = entity_type_lib.TypeNamespace('ANIMAL')
+    other_namespace = entity_type_lib.TypeNamespace('PLANT')
+    findings = namespace._GetCachedFindings(False)[0]
+
+    findings_lib.Findings()
+    other_namespace.AddFinding(
+        findings_lib.ValidationError(
+            'error', findings_lib.FileContext('filepath')
+        )
+    )
+    other_namespace.SetChanged()
+
+    self.assertIs(namespace._GetCachedFindings(False)[0], findings)
+    findings_lib.InvalidateFindings()
+    self.assertIsNot(namespace._GetCachedFindings(False)[0], findings)
+
+  def testFindingsCacheIsInvalidatedBySharedDescendants(self):
+    entity_type = entity_type_lib.EntityType(
+        filepath='path/to/ANIMAL/mammal',
+        typename='dog',
+        description='canine animal',
+        guid='4d68ac84-786f-425c-9a65-097b1fb04c91',
+    )
+    namespace = entity_type_lib.TypeNamespace('ANIMAL')
+    other_namespace = entity_type_lib.TypeNamespace('ANIMAL')
+    namespace.InsertType(entity_type)
+    other_namespace.InsertType(entity_type)
+    self.assertTrue(namespace.IsValid())
+    self.assertTrue(other_namespace.IsValid())
+
+    entity_type.AddFinding(
+        findings_lib.ValidationError(
+            'error', findings_lib.FileContext('filepath')
+        )
+    )
+
+    self.assertFalse(namespace.IsValid())
+    self.assertFalse(other_namespace.IsValid())
+
   def testFindingsAddBadArg(self):
     with self.assertRaises(TypeError):
       self.findings_class.AddFinding('some string.')
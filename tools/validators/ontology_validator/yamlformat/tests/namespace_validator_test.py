@@ -481,6 +481,64 @@ class NamespaceValidatorTest(absltest.TestCase):
     self.assertTrue(field_map['/woof'].optional)
     self.assertFalse(field_map['/wag'].optional)
 
+  def testExpandsHierarchyDeeperThanRecursionLimit(self):
+    depth = 1500
+    type_namespace = entity_type_lib.TypeNamespace(namespace='ANIMAL')
+    # Insert the deepest type first, so its expansion walks the whole chain.
+    for level in reversed(range(depth)):
+      type_namespace.InsertType(
+          entity_type_lib.EntityType(
+              filepath='path/to/ANIMAL/mammal',
+              typename=f'level{level}',
+              description='one level of a deep hierarchy',
+              local_field_tuples=_F([f'/field{level}']),
+              parents=[f'ANIMAL/level{level - 1}'] if level else [],
+          )
+      )
+
+    namespace_validate = namespace_validator.NamespaceValidator(
+        [type_namespace]
+    )
+
+    self.assertTrue(namespace_validate.IsValid())
+    deepest_type = type_namespace.valid_types_map[f'level{depth - 1}']
+    self.assertTrue(deepest_type.inherited_fields_expanded)
+    self.assertLen(deepest_type.GetAllFields(), depth)
+
+  def testNonexistentAncestorIsReportedForEachDescendant(self):
+    type_namespace = entity_type_lib.TypeNamespace(namespace='ANIMAL')
+    for typename, parent in (
+        ('puppy', 'ANIMAL/dog'),
+        ('dog', 'ANIMAL/wolf'),
+        ('wolf', 'ANIMAL/nonexistent'),
+    ):
+      type_namespace.InsertType(
+          entity_type_lib.EntityType(
+              filepath='path/to/ANIMAL/mammal',
+              typename=typename,
+              description='canine animal',
+              local_field_tuples=_F(['/woof']),
+              parents=[parent],
+          )
+      )
+
+    namespace_validate = namespace_validator.NamespaceValidator(
+        [type_namespace]
+    )
+
+    findings = namespace_validate.GetFindings()
+    self.assertTrue(
+        all(
+            isinstance(finding, findings_lib.NonexistentParentError)
+            for finding in findings
+        )
+    )
+    # Innermost type first, as the missing parent is unwound.
+    self.assertEqual(
+        [finding.message.split('"')[1] for finding in findings],
+        ['wolf', 'dog', 'puppy'],
+    )
+
 
 if __name__ == '__main__':
   absltest.main()
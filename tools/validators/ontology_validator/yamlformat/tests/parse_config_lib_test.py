@@ -17,8 +17,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 from os import path
 import re
+import shutil
+import tempfile
 
 from absl.testing import absltest
 
@@ -113,6 +116,66 @@ class ParseConfigLibTest(absltest.TestCase):
         type_folders[0].HasFindingTypes([findings_lib.DuplicateKeyError])
     )
 
+  def testParseTypeFoldersFromFilesWithDocumentCache(self):
+    document_cache = parse.DocumentCache()
+    files = [
+        self.good_types_file,
+        self.good_types_file_2,
+        self.duplicate_types_file,
+    ]
+
+    type_folders = parse.ParseTypeFoldersFromFiles(
+        files, document_cache=document_cache
+    )
+    cached_type_folders = parse.ParseTypeFoldersFromFiles(
+        files, document_cache=document_cache
+    )
+
+    expected_folders = parse.ParseTypeFoldersFromFiles(files)
+    for folders in (type_folders, cached_type_folders):
+      self.assertEqual(
+          [folder.GetFolderpath() for folder in folders],
+          [folder.GetFolderpath() for folder in expected_folders],
+      )
+      for folder, expected_folder in zip(folders, expected_folders):
+        self.assertSameElements(
+            folder.local_namespace.valid_types_map,
+            expected_folder.local_namespace.valid_types_map,
+        )
+        self.assertEqual(
+            [str(f) for f in folder.GetFindings()],
+            [str(f) for f in expected_folder.GetFindings()],
+        )
+
+  def testDocumentCacheReparsesChangedFiles(self):
+    temp_dir = tempfile.mkdtemp()
+    file_path = path.join(temp_dir, 'types.yaml')
+    shutil.copyfile(
+        path.join(self.base_dir, self.good_types_file_2.relative_path),
+        file_path,
+    )
+    document_cache = parse.DocumentCache()
+
+    documents, finding = document_cache.LoadDocuments(file_path)
+    cached_documents, _ = document_cache.LoadDocuments(file_path)
+    with open(file_path, 'a', encoding='utf-8') as f:
+      f.write('  - fan_run_status\n')
+    changed_documents, _ = document_cache.LoadDocuments(file_path)
+    shutil.copyfile(
+        path.join(self.base_dir, self.duplicate_types_file.relative_path),
+        file_path,
+    )
+    os.utime(file_path, ns=(0, 0))
+    _, duplicate_finding = document_cache.LoadDocuments(file_path)
+
+    self.assertIsNone(finding)
+    self.assertIs(cached_documents, documents)
+    self.assertEqual(
+        changed_documents[0]['FAN_4']['uses'],
+        ['fan_run_command', 'fan_run_status'],
+    )
+    self.assertIsInstance(duplicate_finding, findings_lib.DuplicateKeyError)
+
   def testParseTypeFoldersFromFilesWithFieldsUniverse(self):
     fields_universe = field_lib.FieldUniverse([])
     fields_universe._namespace_map = {
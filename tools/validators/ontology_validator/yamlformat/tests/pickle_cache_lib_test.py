@@ -0,0 +1,92 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for pickle_cache_lib."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+
+from absl.testing import absltest
+
+from yamlformat.validator import pickle_cache_lib
+
+
+def _WriteSource(source_dir, file_name, content):
+  with open(os.path.join(source_dir, file_name), 'w', encoding='utf-8') as f:
+    f.write(content)
+
+
+class PickleCacheLibTest(absltest.TestCase):
+
+  def setUp(self):
+    super(PickleCacheLibTest, self).setUp()
+    self.root = tempfile.mkdtemp()
+
+  def testSourceFingerprintChangesWithSources(self):
+    source_dirs = []
+    for content in ('A = 1\n', 'A = 2\n', 'A = 1\n'):
+      source_dir = tempfile.mkdtemp()
+      _WriteSource(source_dir, 'model_lib.py', content)
+      _WriteSource(source_dir, 'notes.txt', content * len(source_dirs))
+      source_dirs.append(source_dir)
+
+    fingerprints = [
+        pickle_cache_lib.SourceFingerprint(source_dir)
+        for source_dir in source_dirs
+    ]
+
+    self.assertNotEqual(fingerprints[0], fingerprints[1])
+    # Only python sources matter, wherever they are
+    self.assertEqual(fingerprints[0], fingerprints[2])
+
+  def testComputeFilesHashChangesWithKeys(self):
+    self.assertNotEqual(
+        pickle_cache_lib.ComputeFilesHash([], 'a', 'b'),
+        pickle_cache_lib.ComputeFilesHash([], 'a', 'c'),
+    )
+
+  def testSaveAndLoadPickle(self):
+    pickle_path = pickle_cache_lib.GetPicklePath(
+        os.path.join(self.root, 'cache'), 'abc'
+    )
+
+    pickle_cache_lib.SavePickle({'a': 1}, pickle_path, 'test object')
+
+    self.assertEqual(
+        pickle_cache_lib.LoadPickle(pickle_path, dict, 'test object'),
+        {'a': 1},
+    )
+    self.assertIsNone(
+        pickle_cache_lib.LoadPickle(pickle_path, list, 'test object')
+    )
+    self.assertEqual(os.listdir(os.path.dirname(pickle_path)), ['abc.pickle'])
+
+  def testLoadPickleTruncated(self):
+    pickle_path = pickle_cache_lib.GetPicklePath(self.root, 'abc')
+    pickle_cache_lib.SavePickle(list(range(100)), pickle_path, 'test object')
+    with open(pickle_path, 'rb') as pickle_file:
+      content = pickle_file.read()
+    with open(pickle_path, 'wb') as pickle_file:
+      pickle_file.write(content[: len(content) // 2])
+
+    self.assertIsNone(
+        pickle_cache_lib.LoadPickle(pickle_path, list, 'test object')
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -17,7 +17,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 from os import path
+import tempfile
 
 from absl import flags
 from absl.testing import absltest
@@ -30,6 +32,7 @@ from yamlformat.validator import field_lib
 from yamlformat.validator import findings_lib
 from yamlformat.validator import namespace_validator
 from yamlformat.validator import presubmit_validate_types_lib
+from yamlformat.validator import profile_lib
 from yamlformat.validator import state_lib
 from yamlformat.validator import subfield_lib
 from yamlformat.validator import test_helpers_lib
@@ -150,6 +153,10 @@ class PresubmitValidateTypesTest(absltest.TestCase):
         ])
     )
     self.assertFalse(config_universe.IsValid())
+    self.assertIs(
+        config_universe.GetTypeHierarchy(), type_universe.GetTypeHierarchy()
+    )
+    self.assertEmpty(config_universe.GetTypeHierarchy().entity_types)
 
   def testConfigUniverseGetEntityTypeNamespace(self):
     context = findings_lib.FileContext('')
@@ -343,6 +350,89 @@ class PresubmitValidateTypesTest(absltest.TestCase):
     with self.assertRaises(ValueError):
       presubmit_validate_types_lib.RunPresubmit([], [], [bad_path])
 
+  def testRunPresubmitWithBaseCacheDir(self):
+    config_files = [self.good2_file, self.global_fields, self.global_subfields]
+    cache_dir = tempfile.mkdtemp()
+    expected = presubmit_validate_types_lib.RunPresubmit(
+        [], config_files, config_files
+    )
+
+    findings = presubmit_validate_types_lib.RunPresubmit(
+        [], config_files, config_files, base_cache_dir=cache_dir
+    )
+    # pylint: disable=protected-access
+    presubmit_validate_types_lib._base_universe_memo.clear()
+    cached_findings = presubmit_validate_types_lib.RunPresubmit(
+        [], config_files, config_files, base_cache_dir=cache_dir
+    )
+
+    self.assertLen(os.listdir(cache_dir), 1)
+    self.assertEqual([str(f) for f in expected], [str(f) for f in findings])
+    self.assertEqual(
+        [str(f) for f in expected], [str(f) for f in cached_findings]
+    )
+
+  def testRunPresubmitWithProfiler(self):
+    config_files = [self.good2_file, self.global_fields, self.global_subfields]
+    profiler = profile_lib.PhaseProfiler()
+    # pylint: disable=protected-access
+    presubmit_validate_types_lib._base_universe_memo.clear()
+
+    presubmit_validate_types_lib.RunPresubmit(
+        [], config_files, config_files, profiler=profiler
+    )
+
+    self.assertEqual(
+        [phase['name'] for phase in profiler.phases],
+        [
+            'new_universe',
+            'new_universe/subfields',
+            'new_universe/fields',
+            'new_universe/entity_types',
+            'new_namespace_validation',
+            'old_universe',
+            'old_universe/subfields',
+            'old_universe/fields',
+            'old_universe/entity_types',
+            'old_universe/namespace_validation',
+            'type_analysis',
+            'backwards_compatibility',
+            'change_marking',
+            'findings',
+        ],
+    )
+
+  def testBuildBaseUniverseIsReused(self):
+    config_files = [self.good2_file, self.global_fields, self.global_subfields]
+    cache_dir = tempfile.mkdtemp()
+
+    # pylint: disable=protected-access
+    universe = presubmit_validate_types_lib._BuildBaseUniverse(
+        config_files, True, cache_dir
+    )
+    reused_universe = presubmit_validate_types_lib._BuildBaseUniverse(
+        config_files, True, cache_dir
+    )
+    presubmit_validate_types_lib._base_universe_memo.clear()
+    loaded_universe = presubmit_validate_types_lib._BuildBaseUniverse(
+        config_files, True, cache_dir
+    )
+    other_universe = presubmit_validate_types_lib._BuildBaseUniverse(
+        config_files[1:], True, cache_dir
+    )
+
+    self.assertIs(universe, reused_universe)
+    self.assertIsNot(universe, loaded_universe)
+    self.assertIsNot(loaded_universe, other_universe)
+    self.assertLen(os.listdir(cache_dir), 2)
+    loaded_type = loaded_universe.GetEntityType('GOOD', 'FAN_4')
+    self.assertTrue(loaded_type.inherited_fields_expanded)
+    self.assertEqual(
+        universe.GetEntityType('GOOD', 'FAN_4').GetAllFields(),
+        loaded_type.GetAllFields(),
+    )
+    self.assertIsNone(other_universe.GetEntityType('GOOD', 'FAN_4'))
+
   def testSeparateConfigFiles(self):
     field1 = base_lib.PathParts(
         root='path/to/resources', relative_path='fields/field1'
@@ -523,6 +613,43 @@ class PresubmitValidateTypesTest(absltest.TestCase):
     self.assertIsInstance(findings[0], findings_lib.RemovedTypeWarning)
     self.assertIn('type2', str(findings[0]))
 
+  def testBackwardsCompatibilityOnlyMarksChangedNamespaces(self):
+    def MakeFolder(path, *descriptions):
+      folder = entity_type_lib.EntityTypeFolder(path)
+      for i, description in enumerate(descriptions):
+        folder.local_namespace.InsertType(
+            entity_type_lib.EntityType(
+                filepath=path + '/file.yaml',
+                typename=f'type{i}',
+                description=description,
+                local_field_tuples=_F(['/local1']),
+                inherited_fields_expanded=True,
+            )
+        )
+      return folder
+
+    ns1_path = 'namespace_one/entity_types/anyfolder'
+    ns2_path = 'namespace_two/entity_types/anyfolder'
+    old_uv = entity_type_lib.EntityTypeUniverse(
+        [MakeFolder(ns1_path, 'a', 'b'), MakeFolder(ns2_path, 'a', 'b')]
+    )
+    new_uv = entity_type_lib.EntityTypeUniverse(
+        [MakeFolder(ns1_path, 'a', 'b'), MakeFolder(ns2_path, 'a', 'c')]
+    )
+
+    findings = presubmit_validate_types_lib.CheckBackwardsCompatibility(
+        new_uv, old_uv
+    )
+
+    self.assertEmpty(findings)
+    ns1 = new_uv.GetNamespace('namespace_one')
+    ns2 = new_uv.GetNamespace('namespace_two')
+    self.assertFalse(ns1.IsChanged())
+    self.assertFalse(ns1.GetType('type0').IsChanged())
+    self.assertTrue(ns2.IsChanged())
+    self.assertFalse(ns2.GetType('type0').IsChanged())
+    self.assertTrue(ns2.GetType('type1').IsChanged())
+
   def testBackwardsCompatibilityAcrossNamespaces(self):
     # Two types.  One is abstract.
     ns1_path = 'namespace_one/entity_types/anyfolder'
@@ -0,0 +1,107 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for profile_lib."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import tempfile
+import tracemalloc
+
+from absl.testing import absltest
+
+from yamlformat.validator import profile_lib
+
+
+class ProfileLibTest(absltest.TestCase):
+
+  def testPhasesAreNestedAndTimed(self):
+    profiler = profile_lib.PhaseProfiler()
+
+    with profiler.Phase('build'):
+      with profiler.Phase('fields'):
+        pass
+      with profiler.Phase('entity_types'):
+        pass
+    with profiler.Phase('analysis'):
+      pass
+
+    profile = profiler.GetProfile()
+    self.assertEqual(
+        [phase['name'] for phase in profile['phases']],
+        ['build', 'build/fields', 'build/entity_types', 'analysis'],
+    )
+    self.assertGreaterEqual(
+        profiler.GetSeconds('build'), profiler.GetSeconds('build/fields')
+    )
+    self.assertAlmostEqual(
+        profile['total_seconds'],
+        profiler.GetSeconds('build') + profiler.GetSeconds('analysis'),
+    )
+    self.assertNotIn('peak_memory_bytes', profile)
+    self.assertIsNone(profiler.GetSeconds('fields'))
+
+  def testPhaseIsRecordedOnError(self):
+    profiler = profile_lib.PhaseProfiler()
+
+    with self.assertRaises(ValueError):
+      with profiler.Phase('build'):
+        raise ValueError('bad config')
+
+    self.assertIsNotNone(profiler.GetSeconds('build'))
+
+  def testTraceMemory(self):
+    profiler = profile_lib.PhaseProfiler(trace_memory=True)
+
+    with profiler.Phase('build'):
+      kept = [0] * 100000
+      with profiler.Phase('temporary'):
+        temporary = [0] * 1000000
+        del temporary
+    profiler.Stop()
+
+    phases = {phase['name']: phase for phase in profiler.phases}
+    self.assertFalse(tracemalloc.is_tracing())
+    self.assertGreater(phases['build/temporary']['peak_memory_bytes'], 8000000)
+    self.assertLess(phases['build/temporary']['allocated_bytes'], 8000000)
+    self.assertGreaterEqual(
+        phases['build']['peak_memory_bytes'],
+        phases['build/temporary']['peak_memory_bytes'],
+    )
+    self.assertGreater(phases['build']['allocated_bytes'], 800000)
+    self.assertEqual(
+        profiler.GetProfile()['peak_memory_bytes'],
+        phases['build']['peak_memory_bytes'],
+    )
+    del kept
+
+  def testWriteJson(self):
+    profiler = profile_lib.PhaseProfiler()
+    with profiler.Phase('build'):
+      pass
+    profile_path = os.path.join(tempfile.mkdtemp(), 'out', 'profile.json')
+
+    profiler.WriteJson(profile_path)
+
+    with open(profile_path, 'r', encoding='utf-8') as profile_file:
+      profile = json.load(profile_file)
+    self.assertEqual(profile['version'], profile_lib.PROFILE_VERSION)
+    self.assertEqual(profile['phases'][0]['name'], 'build')
+
+
+if __name__ == '__main__':
+  absltest.main()
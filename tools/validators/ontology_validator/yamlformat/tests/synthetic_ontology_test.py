@@ -0,0 +1,122 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for synthetic_ontology."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+
+from absl.testing import absltest
+
+from yamlformat.benchmarks import synthetic_ontology
+from yamlformat.validator import external_file_lib
+from yamlformat.validator import findings_lib
+from yamlformat.validator import namespace_validator
+from yamlformat.validator import presubmit_validate_types_lib
+
+_SMALL_SCALE = synthetic_ontology.OntologyScale(
+    namespaces=2,
+    types_per_namespace=30,
+    abstract_types_per_level=4,
+    fields=60,
+    subfields=16,
+)
+
+
+def _BuildExpandedUniverse(ontology_dir):
+  yaml_files = external_file_lib.RecursiveDirWalk(ontology_dir)
+  config = presubmit_validate_types_lib.SeparateConfigFiles(yaml_files)
+  universe = presubmit_validate_types_lib.BuildUniverse(config)
+  namespace_validator.NamespaceValidator(universe.GetEntityTypeNamespaces())
+  return universe
+
+
+class SyntheticOntologyTest(absltest.TestCase):
+
+  def testGenerateOntologyIsValid(self):
+    ontology_dir = tempfile.mkdtemp()
+
+    size = synthetic_ontology.GenerateOntology(ontology_dir, _SMALL_SCALE)
+
+    self.assertEqual(size.fields, 60)
+    self.assertEqual(size.abstract_types, 2 * 3 * 4)
+    self.assertEqual(size.concrete_types, 2 * 30)
+    self.assertTrue(
+        os.path.isfile(
+            os.path.join(ontology_dir, 'NSB', 'entity_types', 'EQB.yaml')
+        )
+    )
+    universe = _BuildExpandedUniverse(ontology_dir)
+    self.assertEmpty([
+        finding
+        for finding in universe.GetFindings()
+        if isinstance(finding, findings_lib.ValidationError)
+    ])
+    type_universe = universe.entity_type_universe
+    self.assertLen(type_universe.GetNamespaces(), 2)
+    entity_type = type_universe.GetEntityType('NSA', 'EQA_0')
+    self.assertLen(entity_type.parent_names, _SMALL_SCALE.fan_out)
+    self.assertGreater(
+        len(entity_type.GetAllFields()), _SMALL_SCALE.local_fields_per_type
+    )
+
+  def testGenerateOntologyIsDeterministic(self):
+    first_dir = tempfile.mkdtemp()
+    second_dir = tempfile.mkdtemp()
+    type_file = os.path.join('NSA', 'entity_types', 'ABSTRACT.yaml')
+
+    synthetic_ontology.GenerateOntology(first_dir, _SMALL_SCALE, seed=3)
+    synthetic_ontology.GenerateOntology(second_dir, _SMALL_SCALE, seed=3)
+
+    with open(os.path.join(first_dir, type_file), 'r') as first_file:
+      with open(os.path.join(second_dir, type_file), 'r') as second_file:
+        self.assertEqual(first_file.read(), second_file.read())
+
+  def testRemovedFieldsBreakBackwardsCompatibility(self):
+    ontology_dir = tempfile.mkdtemp()
+    changed_dir = tempfile.mkdtemp()
+    synthetic_ontology.GenerateOntology(ontology_dir, _SMALL_SCALE)
+    synthetic_ontology.GenerateOntology(
+        changed_dir, _SMALL_SCALE, removed_field_ratio=0.5
+    )
+
+    findings = presubmit_validate_types_lib.CheckBackwardsCompatibility(
+        _BuildExpandedUniverse(changed_dir).entity_type_universe,
+        _BuildExpandedUniverse(ontology_dir).entity_type_universe,
+    )
+
+    self.assertNotEmpty(findings)
+    for finding in findings:
+      self.assertIsInstance(finding, findings_lib.RemovedFieldWarning)
+
+  def testScaled(self):
+    scale = _SMALL_SCALE.Scaled(4)
+
+    self.assertEqual(scale.namespaces, 8)
+    self.assertEqual(scale.fields, 240)
+    self.assertEqual(scale.subfields, 32)
+    self.assertEqual(scale.types_per_namespace, 30)
+
+  def testTooFewSubfields(self):
+    scale = _SMALL_SCALE._replace(fields=100, subfields=4)
+
+    with self.assertRaises(ValueError):
+      synthetic_ontology.GenerateOntology(tempfile.mkdtemp(), scale)
+
+
+if __name__ == '__main__':
+  absltest.main()
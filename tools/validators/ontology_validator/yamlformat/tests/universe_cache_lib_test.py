@@ -0,0 +1,118 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for universe_cache_lib."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+
+from yamlformat.validator import base_lib
+from yamlformat.validator import pickle_cache_lib
+from yamlformat.validator import universe_cache_lib
+
+
+def _WriteFile(root, relative_path, content):
+  file_path = os.path.join(root, relative_path)
+  os.makedirs(os.path.dirname(file_path), exist_ok=True)
+  with open(file_path, 'w', encoding='utf-8') as config_file:
+    config_file.write(content)
+  return base_lib.PathParts(root=root, relative_path=relative_path)
+
+
+class UniverseCacheLibTest(absltest.TestCase):
+
+  def setUp(self):
+    super(UniverseCacheLibTest, self).setUp()
+    self.root = tempfile.mkdtemp()
+    self.fields = _WriteFile(
+        self.root, 'fields/fields.yaml', 'literals:\n- zone_air_temperature\n'
+    )
+    self.types = _WriteFile(
+        self.root, 'HVAC/entity_types/FAN.yaml', 'FAN:\n  is_abstract: true\n'
+    )
+
+  def testComputeConfigHashIsStable(self):
+    other_root = tempfile.mkdtemp()
+    other_fields = _WriteFile(
+        other_root, 'fields/fields.yaml', 'literals:\n- zone_air_temperature\n'
+    )
+    other_types = _WriteFile(
+        other_root, 'HVAC/entity_types/FAN.yaml', 'FAN:\n  is_abstract: true\n'
+    )
+
+    self.assertEqual(
+        universe_cache_lib.ComputeConfigHash([self.fields, self.types], True),
+        universe_cache_lib.ComputeConfigHash([other_fields, other_types], True),
+    )
+
+  def testComputeConfigHashChanges(self):
+    config_hash = universe_cache_lib.ComputeConfigHash(
+        [self.fields, self.types], True
+    )
+    reordered_hash = universe_cache_lib.ComputeConfigHash(
+        [self.types, self.fields], True
+    )
+    option_hash = universe_cache_lib.ComputeConfigHash(
+        [self.fields, self.types], False
+    )
+    removed_hash = universe_cache_lib.ComputeConfigHash([self.fields], True)
+    _WriteFile(self.root, self.types.relative_path, 'FAN:\n  guid: abc\n')
+    edited_hash = universe_cache_lib.ComputeConfigHash(
+        [self.fields, self.types], True
+    )
+
+    self.assertLen(
+        {config_hash, reordered_hash, option_hash, removed_hash, edited_hash},
+        5,
+    )
+
+  def testComputeConfigHashChangesWithValidatorSources(self):
+    config_hash = universe_cache_lib.ComputeConfigHash([self.fields], True)
+    with mock.patch.object(
+        pickle_cache_lib, 'SourceFingerprint', return_value='upgraded'
+    ):
+      upgraded_hash = universe_cache_lib.ComputeConfigHash([self.fields], True)
+
+    self.assertNotEqual(config_hash, upgraded_hash)
+
+  def testSaveAndLoadUniverse(self):
+    universe_path = universe_cache_lib.GetUniversePath(
+        os.path.join(self.root, 'cache'), 'abc'
+    )
+
+    universe_cache_lib.SaveUniverse({'fields': ['a', 'b']}, universe_path)
+
+    self.assertEqual(
+        universe_cache_lib.LoadUniverse(universe_path), {'fields': ['a', 'b']}
+    )
+    self.assertEqual(os.listdir(os.path.dirname(universe_path)), ['abc.pickle'])
+
+  def testLoadUniverseMissingOrUnreadable(self):
+    universe_path = universe_cache_lib.GetUniversePath(self.root, 'abc')
+    self.assertIsNone(universe_cache_lib.LoadUniverse(universe_path))
+
+    with open(universe_path, 'wb') as universe_file:
+      universe_file.write(b'not a pickle')
+
+    self.assertIsNone(universe_cache_lib.LoadUniverse(universe_path))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,129 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for watch_lib."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+from os import path
+import shutil
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+import yaml
+
+from yamlformat.tests import test_constants
+from yamlformat.validator import findings_lib
+from yamlformat.validator import watch_lib
+
+_TYPES_PATH = 'GOOD/entity_types/good2.yaml'
+
+
+class WatchLibTest(absltest.TestCase):
+
+  def setUp(self):
+    super(WatchLibTest, self).setUp()
+    self.ontology_dir = tempfile.mkdtemp()
+    for relative_path in (
+        'fields/global_fields.yaml',
+        'subfields/global_subfields.yaml',
+        _TYPES_PATH,
+    ):
+      os.makedirs(
+          path.dirname(path.join(self.ontology_dir, relative_path)),
+          exist_ok=True,
+      )
+      shutil.copyfile(
+          path.join(test_constants.TEST_RESOURCES, relative_path),
+          path.join(self.ontology_dir, relative_path),
+      )
+    self.types_file = path.join(self.ontology_dir, _TYPES_PATH)
+    with open(self.types_file, 'r', encoding='utf-8') as f:
+      self.types_content = f.read()
+    self.watcher = watch_lib.OntologyWatcher(self.ontology_dir)
+
+  def _WriteTypes(self, content):
+    with open(self.types_file, 'w', encoding='utf-8') as f:
+      f.write(content)
+
+  def testPollOnlyValidatesChanges(self):
+    result = self.watcher.Poll()
+
+    self.assertLen(result.changed_files, 3)
+    self.assertEmpty(result.findings)
+    self.assertIsNone(self.watcher.Poll())
+
+  def testPollReportsImpactedFindings(self):
+    self.watcher.Poll()
+
+    self._WriteTypes(
+        self.types_content.replace('fan_run_command', 'fan_run_commandx')
+    )
+    result = self.watcher.Poll()
+    self._WriteTypes(self.types_content)
+    fixed_result = self.watcher.Poll()
+
+    self.assertEqual(result.changed_files, [self.types_file])
+    self.assertLen(result.findings, 1)
+    self.assertIsInstance(result.findings[0], findings_lib.UndefinedFieldError)
+    self.assertEqual(result.resolved_count, 0)
+    self.assertEmpty(fixed_result.findings)
+    self.assertEqual(fixed_result.resolved_count, 1)
+
+  def testPollRaisesInvalidYaml(self):
+    self.watcher.Poll()
+
+    self._WriteTypes(self.types_content + '\n  - [unclosed\n')
+
+    with self.assertRaises(yaml.YAMLError):
+      self.watcher.Poll()
+    with self.assertRaises(yaml.YAMLError):
+      self.watcher.Poll()
+
+  def testPollRevalidatesAfterFailedValidation(self):
+    self.watcher.Poll()
+    self._WriteTypes(self.types_content + '\n  - [unclosed\n')
+    with self.assertRaises(yaml.YAMLError):
+      self.watcher.Poll()
+
+    self._WriteTypes(self.types_content)
+    result = self.watcher.Poll()
+
+    self.assertEqual(result.changed_files, [self.types_file])
+    self.assertEmpty(result.findings)
+    self.assertIsNone(self.watcher.Poll())
+
+  def testRunPrintsRepeatedErrorOnce(self):
+    self.watcher.Poll()
+    self._WriteTypes(self.types_content + '\n  - [unclosed\n')
+    sleep_calls = []
+
+    def _Sleep(seconds):
+      sleep_calls.append(seconds)
+      if len(sleep_calls) == 3:
+        raise KeyboardInterrupt()
+
+    with mock.patch.object(watch_lib.time, 'sleep', side_effect=_Sleep):
+      with mock.patch('builtins.print') as mock_print:
+        self.watcher.Run(poll_interval=0)
+
+    printed = [call.args[0] for call in mock_print.call_args_list]
+    self.assertLen([line for line in printed if '[ERROR]' in line], 1)
+
+
+if __name__ == '__main__':
+  absltest.main()
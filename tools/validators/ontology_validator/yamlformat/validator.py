@@ -25,6 +25,7 @@ import sys
 
 from yamlformat.arg_parser import CreateParser
 from yamlformat.validator import external_file_lib
+from yamlformat.validator import watch_lib
 
 
 def main(parsed_args: argparse.ArgumentParser):
@@ -42,6 +43,23 @@ def main(parsed_args: argparse.ArgumentParser):
         parsed_args.modified_types_filepath
     )
 
+  base_cache_dir = parsed_args.base_cache_dir
+  if base_cache_dir is not None:
+    base_cache_dir = path.expanduser(base_cache_dir)
+
+  profile_path = parsed_args.profile_path
+  if profile_path is not None:
+    profile_path = path.expanduser(profile_path)
+
+  if parsed_args.watch:
+    watch_lib.OntologyWatcher(
+        path.expanduser(parsed_args.original),
+        modified_types_filepath,
+        require_type_guids=not parsed_args.allow_missing_type_guids,
+        base_cache_dir=base_cache_dir,
+    ).Run(filter_text)
+    return
+
   print('Starting Yaml Validator!')
   external_file_lib.Validate(
       filter_text,
@@ -49,6 +67,8 @@ def main(parsed_args: argparse.ArgumentParser):
       modified_types_filepath,
       interactive=ast.literal_eval(parsed_args.interactive),
       require_type_guids=not parsed_args.allow_missing_type_guids,
+      base_cache_dir=base_cache_dir,
+      profile_path=profile_path,
   )
 
 
@@ -90,6 +90,7 @@ class ConfigFolder(findings_lib.Findings):
   @local_namespace.setter
   def local_namespace(self, local_namespace):
     self._local_namespace = local_namespace
+    self._InvalidateFindings()
 
   def _GetDynamicFindings(self, filter_old_warnings):
     if self._local_namespace is None:
@@ -163,6 +163,7 @@ class ConnectionNamespace(findings_lib.Findings):
       )
       return
     self.connections[connection.name] = connection
+    self._InvalidateFindings()
 
 
 class Connection(findings_lib.Findings):
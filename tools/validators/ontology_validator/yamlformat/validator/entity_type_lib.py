@@ -17,6 +17,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
 import re
 import typing
 from typing import Optional, Tuple
@@ -46,6 +47,11 @@ TypeParts = typing.NamedTuple(
 EntityIdByEntry = typing.NamedTuple(
     'EntityIdByEntry', [('namespace', str), ('typename', str)]
 )
+# Local, all (local and inherited) and required fields of a type as bitsets
+# over the ids of a FieldIdTable.
+FieldBitsets = typing.NamedTuple(
+    'FieldBitsets', [('local', int), ('all', int), ('required', int)]
+)
 
 
 def SeparateFieldNamespace(qualified_field_name: str) -> Tuple[str, str]:
@@ -93,6 +99,202 @@ def SeparateFieldIncrement(field_name) -> Tuple[str, str]:
   return field_name_part, increment_part
 
 
+def CountBits(bits):
+  """Returns the number of set bits of a non-negative int."""
+  return bin(bits).count('1')
+
+
+def BitsToIds(bits):
+  """Returns the sorted positions of the set bits of a non-negative int."""
+  # Scanning the reversed binary string is linear in the width of the int,
+  # where clearing the lowest bit in a loop is quadratic.
+  binary = bin(bits)[:1:-1]
+  ids = []
+  bit_id = binary.find('1')
+  while bit_id >= 0:
+    ids.append(bit_id)
+    bit_id = binary.find('1', bit_id + 1)
+  return ids
+
+
+class FieldIdTable(object):
+  """Interns qualified field names as small integer ids.
+
+  A set of fields is then an int with the bit of each field id set, so that
+  subset, intersection and equality tests are word-level int operations.
+  """
+
+  def __init__(self):
+    super().__init__()
+    self._ids = {}
+    self._names = []
+
+  def __len__(self):
+    return len(self._names)
+
+  def Intern(self, field_name):
+    """Returns the id of a qualified field name, assigning one if needed."""
+    field_id = self._ids.get(field_name)
+    if field_id is None:
+      field_id = len(self._names)
+      self._ids[field_name] = field_id
+      self._names.append(field_name)
+    return field_id
+
+  def GetId(self, field_name):
+    """Returns the id of a qualified field name, or None if not interned."""
+    return self._ids.get(field_name)
+
+  def GetName(self, field_id):
+    """Returns the qualified field name of an id."""
+    return self._names[field_id]
+
+  def ToBits(self, field_names):
+    """Returns the bitset of qualified field names, interning new names."""
+    bits = 0
+    for field_name in field_names:
+      bits |= 1 << self.Intern(field_name)
+    return bits
+
+  def ToNames(self, bits):
+    """Returns the set of qualified field names in a bitset."""
+    return {self._names[field_id] for field_id in BitsToIds(bits)}
+
+
+class TypeHierarchy(object):
+  """A precomputed transitive closure of the entity type hierarchy.
+
+  Types are numbered in the sorted order of their qualified names. Each type's
+  ancestors are kept as an integer bitset for constant-time subtype checks,
+  and both ancestors and descendants as sorted id lists for enumeration in
+  time linear in the result. Build it after parent names are qualified; parent
+  references to undefined types and inheritance cycles are ignored, since the
+  validators report those separately.
+
+  Attributes:
+    entity_types: EntityType objects in id order.
+  """
+
+  def __init__(self, type_namespaces):
+    """Init.
+
+    Args:
+      type_namespaces: a list of TypeNamespace objects.
+    """
+    super().__init__()
+    qualified_types = {}
+    for type_namespace in type_namespaces:
+      type_namespace.QualifyParentNames()
+      for entity_type in type_namespace.valid_types_map.values():
+        qualified_types[(type_namespace.namespace, entity_type.typename)] = (
+            entity_type
+        )
+    self._type_ids = {
+        type_key: type_id
+        for type_id, type_key in enumerate(sorted(qualified_types))
+    }
+    self.entity_types = [
+        qualified_types[type_key] for type_key in sorted(qualified_types)
+    ]
+    self._parent_ids = [
+        sorted({
+            self._type_ids[(parent.namespace, parent.typename)]
+            for parent in (entity_type.parent_names or {}).values()
+            if (parent.namespace, parent.typename) in self._type_ids
+        })
+        for entity_type in self.entity_types
+    ]
+
+    self._ancestor_bits = [None] * len(self.entity_types)
+    for type_id in range(len(self.entity_types)):
+      self._ComputeAncestorBits(type_id)
+    self._ancestor_ids = [BitsToIds(bits) for bits in self._ancestor_bits]
+    descendant_ids = [[] for _ in self.entity_types]
+    for type_id, ancestor_ids in enumerate(self._ancestor_ids):
+      for ancestor_id in ancestor_ids:
+        descendant_ids[ancestor_id].append(type_id)
+    self._descendant_ids = descendant_ids
+
+  def _ComputeAncestorBits(self, type_id):
+    """Sets the ancestor bitsets of a type and its ancestors iteratively."""
+    on_stack = set()
+    stack = [type_id]
+    while stack:
+      current_id = stack[-1]
+      if self._ancestor_bits[current_id] is not None:
+        stack.pop()
+        continue
+      on_stack.add(current_id)
+      pending = [
+          parent_id
+          for parent_id in self._parent_ids[current_id]
+          if self._ancestor_bits[parent_id] is None
+          and parent_id not in on_stack
+      ]
+      if pending:
+        stack.extend(pending)
+        continue
+      bits = 0
+      for parent_id in self._parent_ids[current_id]:
+        bits |= 1 << parent_id
+        # A parent still on the stack closes a cycle and adds no ancestors.
+        bits |= self._ancestor_bits[parent_id] or 0
+      bits &= ~(1 << current_id)
+      self._ancestor_bits[current_id] = bits
+      on_stack.discard(current_id)
+      stack.pop()
+
+  def GetTypeId(self, namespace_name, typename):
+    """Returns the id of a type, or None if it is not defined."""
+    return self._type_ids.get((namespace_name, typename))
+
+  def IsSubtypeOf(
+      self, namespace_name, typename, ancestor_namespace, ancestor_typename
+  ):
+    """Returns true if a type inherits, directly or not, from another type.
+
+    A type is not its own subtype.
+
+    Args:
+      namespace_name: namespace of the candidate subtype.
+      typename: name of the candidate subtype.
+      ancestor_namespace: namespace of the candidate ancestor.
+      ancestor_typename: name of the candidate ancestor.
+    """
+    type_id = self.GetTypeId(namespace_name, typename)
+    ancestor_id = self.GetTypeId(ancestor_namespace, ancestor_typename)
+    if type_id is None or ancestor_id is None:
+      return False
+    return bool(self._ancestor_bits[type_id] >> ancestor_id & 1)
+
+  def GetAncestors(self, namespace_name, typename):
+    """Returns all types a type inherits from, sorted by qualified name."""
+    type_id = self.GetTypeId(namespace_name, typename)
+    if type_id is None:
+      return []
+    return [self.entity_types[i] for i in self._ancestor_ids[type_id]]
+
+  def GetDescendants(self, namespace_name, typename, concrete_only=False):
+    """Returns all types inheriting from a type, sorted by qualified name.
+
+    Args:
+      namespace_name: namespace of the ancestor type.
+      typename: name of the ancestor type.
+      concrete_only: if true, only non-abstract descendants are returned.
+    """
+    type_id = self.GetTypeId(namespace_name, typename)
+    if type_id is None:
+      return []
+    descendants = [self.entity_types[i] for i in self._descendant_ids[type_id]]
+    if concrete_only:
+      return [
+          entity_type
+          for entity_type in descendants
+          if not entity_type.is_abstract
+      ]
+    return descendants
+
+
 class EntityTypeUniverse(findings_lib.Findings):
   """Helper class to represent the defined universe of EntityTypes.
 
@@ -114,6 +316,9 @@ class EntityTypeUniverse(findings_lib.Findings):
     self.namespace_folder_map = {}
     self.type_namespaces_map = {}
     self.type_guids_map = {}
+    self._type_hierarchy = None
+    self._field_id_table = None
+    self._field_bitsets = {}
     self._BuildNamespaceFolderMap(entity_type_folders)
     self._BuildTypeMaps(
         [folder.local_namespace for folder in entity_type_folders]
@@ -137,6 +342,68 @@ class EntityTypeUniverse(findings_lib.Findings):
     """
     return list(self.type_namespaces_map.values())
 
+  def GetTypeHierarchy(self):
+    """Returns the TypeHierarchy of this universe, built on first use.
+
+    Only call it once the universe is complete, as the hierarchy is not
+    rebuilt when types are added afterwards.
+    """
+    if self._type_hierarchy is None:
+      self._type_hierarchy = TypeHierarchy(self.GetNamespaces())
+    return self._type_hierarchy
+
+  def GetFieldIdTable(self):
+    """Returns the universe-wide FieldIdTable, built on first use.
+
+    Building the table also computes the FieldBitsets of every type, so it
+    must only be called once inherited fields are expanded.
+
+    Raises:
+      RuntimeError: if fields have not yet been expanded for any type.
+    """
+    if self._field_id_table is None:
+      for type_namespace in self.GetNamespaces():
+        for entity_type in type_namespace.valid_types_map.values():
+          if not entity_type.inherited_fields_expanded:
+            raise RuntimeError(
+                f'Type {entity_type.typename} has not been expanded'
+            )
+      field_id_table = FieldIdTable()
+      field_bitsets = {}
+      for type_namespace in self.GetNamespaces():
+        for entity_type in type_namespace.valid_types_map.values():
+          all_fields = entity_type.GetAllFields()
+          field_bitsets[(type_namespace.namespace, entity_type.typename)] = (
+              FieldBitsets(
+                  local=field_id_table.ToBits(entity_type.local_field_names),
+                  all=field_id_table.ToBits(all_fields),
+                  required=field_id_table.ToBits(
+                      field_name
+                      for field_name, field in all_fields.items()
+                      if not field.optional
+                  ),
+              )
+          )
+      self._field_bitsets = field_bitsets
+      self._field_id_table = field_id_table
+    return self._field_id_table
+
+  def GetFieldBitsets(self, namespace_name, typename):
+    """Returns the FieldBitsets of a type, or None if it is not defined.
+
+    Bits are ids of GetFieldIdTable(). The string keyed field dictionaries of
+    the type remain the reference; the bitsets are a compact view of them.
+
+    Args:
+      namespace_name: namespace of the type.
+      typename: name of the type.
+
+    Raises:
+      RuntimeError: if fields have not yet been expanded for any type.
+    """
+    self.GetFieldIdTable()
+    return self._field_bitsets.get((namespace_name, typename))
+
   def _GetDynamicFindings(self, filter_old_warnings):
     findings = []
     for folder in self.namespace_folder_map.values():
@@ -394,6 +661,7 @@ class TypeNamespace(findings_lib.Findings):
       mapped_entity_type = self.valid_types_map.get(typename)
       if mapped_entity_type is None:
         self.valid_types_map[typename] = entity_type
+        self._InvalidateFindings()
         return True
       # entity_type is a duplicate type
       self.AddFinding(
@@ -456,6 +724,25 @@ class TypeNamespace(findings_lib.Findings):
       entity_type.parent_names = fq_tuplemap
     self._parents_qualified = True
 
+  def GetFingerprint(self):
+    """Returns a hash of the types of this namespace.
+
+    Namespaces with equal fingerprints define the same type names, with the
+    same guids and equal type fingerprints. The fingerprint is not memoized,
+    as types may be added to the namespace.
+
+    Raises:
+      RuntimeError: if fields have not yet been expanded for any type.
+    """
+    digest = hashlib.sha256()
+    for typename in sorted(self.valid_types_map):
+      entity_type = self.valid_types_map[typename]
+      fingerprint = entity_type.GetFingerprint()
+      digest.update(
+          f'{typename}\0{entity_type.guid}\0{fingerprint}\0'.encode('utf-8')
+      )
+    return digest.hexdigest()
+
   def IsLocalField(self, field_name):
     """Returns true if this unqualified field is defined in the namespace.
 
@@ -595,6 +882,7 @@ class EntityType(findings_lib.Findings):
 
     self._all_fields = None
     self._has_optional_fields = None
+    self._fingerprint = None
 
     self.is_abstract = is_abstract
     self.allow_undefined_fields = allow_undefined_fields
@@ -642,6 +930,34 @@ class EntityType(findings_lib.Findings):
       self._all_fields = tmp
     return self._all_fields
 
+  def GetFingerprint(self) -> str:
+    """Returns a hash of the expanded definition of this type.
+
+    Types with equal fingerprints have the same typename, description, abstract
+    and canonical flags, and the same expanded fields with the same optionality.
+    The guid, parents and file of the type are not part of the fingerprint.
+
+    Raises:
+      RuntimeError: if fields have not yet been expanded.
+    """
+    if self._fingerprint is None:
+      # Qualified field names are built from their FieldParts, so they and the
+      # optional flag identify the OptWrapper of each field.
+      fields = sorted(
+          f'{field_name}?' if field.optional else field_name
+          for field_name, field in self.GetAllFields().items()
+      )
+      definition = [
+          self.typename,
+          self.description,
+          str(self.is_abstract),
+          str(self.is_canonical),
+      ] + fields
+      self._fingerprint = hashlib.sha256(
+          '\0'.join(definition).encode('utf-8')
+      ).hexdigest()
+    return self._fingerprint
+
   def HasFieldAsWritten(
       self, fieldname_as_written: str, run_unsafe: bool = False
   ) -> bool:
@@ -22,10 +22,10 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
-import itertools
 from typing import Dict, FrozenSet, Set
 
 from yamlformat.validator import base_lib
+from yamlformat.validator import entity_type_lib
 from yamlformat.validator import findings_lib
 from yamlformat.validator.entity_type_lib import EntityType
 
@@ -34,11 +34,6 @@ MIN_SET_SIZE = 1
 # Max allowed number of required fields difference between two types in an
 # incomplete flex type warning
 MAX_FIELDS_FOR_INCOMPLETE = 3
-# Max number of types to include in a processing group
-# number must be small enough such that the combinations of type pairs with a
-# single field must never overrun the system memory.  <20 is probably safe
-# 2019-10-03: For the current data, brute force (size=1) is empirically fastest.
-MAX_TYPE_SHARD_SIZE = 1
 
 
 def _CreateOptionalityInsensitiveCopy(sets_to_types):
@@ -50,6 +45,86 @@ def _CreateOptionalityInsensitiveCopy(sets_to_types):
   return oi_sets_to_types
 
 
+def _IndexTypesByField(field_sets):
+  """Returns a map of field id to the bitset of ids of types having it."""
+  types_by_field = {}
+  for type_id, field_bits in enumerate(field_sets):
+    type_bit = 1 << type_id
+    for field_id in entity_type_lib.BitsToIds(field_bits):
+      types_by_field[field_id] = types_by_field.get(field_id, 0) | type_bit
+  return types_by_field
+
+
+def _MineClosedFieldSets(field_sets, min_set_size):
+  """Finds the closed field sets shared by at least two types.
+
+  A field set is closed when it is the intersection of the field sets of all
+  the types having it, so these are exactly the distinct intersections of two
+  or more types. The search is LCM's prefix preserving closure extension: a
+  depth-first walk where each closed set is generated once, from one parent,
+  and both field and type sets are int bitsets.
+
+  Args:
+    field_sets: list of field bitsets of the types, indexed by type id.
+    min_set_size: minimum number of fields of a returned set.
+
+  Returns:
+    A dictionary of each closed field bitset with at least min_set_size fields
+    to the bitset of ids of the types having it.
+  """
+  if len(field_sets) < 2:
+    return {}
+  types_by_field = _IndexTypesByField(field_sets)
+  closures = {}
+
+  def _Closure(type_bits):
+    field_bits = closures.get(type_bits)
+    if field_bits is None:
+      field_bits = -1
+      for type_id in entity_type_lib.BitsToIds(type_bits):
+        field_bits &= field_sets[type_id]
+      closures[type_bits] = field_bits
+    return field_bits
+
+  all_types = (1 << len(field_sets)) - 1
+  root_fields = _Closure(all_types)
+  closed_field_sets = {}
+  if entity_type_lib.CountBits(root_fields) >= min_set_size:
+    closed_field_sets[root_fields] = all_types
+  root_candidates = 0
+  for field_id, type_bits in types_by_field.items():
+    if type_bits & (type_bits - 1):
+      root_candidates |= 1 << field_id
+  # Each entry is a closed set, its types and the fields it may be extended
+  # by, which are the fields shared by two of its parent's types that come
+  # after the field it was extended by.
+  stack = [(root_fields, all_types, root_candidates & ~root_fields)]
+  while stack:
+    field_bits, type_bits, candidates = stack.pop()
+    extensions = []
+    for field_id in entity_type_lib.BitsToIds(candidates):
+      extended_types = type_bits & types_by_field[field_id]
+      # Skip extensions shared by fewer than two types.
+      if extended_types & (extended_types - 1):
+        extensions.append((field_id, extended_types))
+    later_candidates = 0
+    for field_id, extended_types in reversed(extensions):
+      extended_fields = _Closure(extended_types)
+      # The closure must not add fields below field_id, or the set has another
+      # parent in the walk.
+      prefix = (1 << field_id) - 1
+      if extended_fields & prefix == field_bits & prefix:
+        if entity_type_lib.CountBits(extended_fields) >= min_set_size:
+          closed_field_sets[extended_fields] = extended_types
+        stack.append((
+            extended_fields,
+            extended_types,
+            later_candidates & ~extended_fields,
+        ))
+      later_candidates |= 1 << field_id
+  return closed_field_sets
+
+
 def _CleanMap(typenames_by_subset, complete_field_sets):
   """Removes values that are whole types and keys with too-small sets."""
   group_too_small = set()
@@ -86,6 +161,13 @@ class EntityTypeManager(findings_lib.Findings):
     self._complete_field_sets_oi = None  # OI = optionality insensitive
     self._typenames_by_subset_oi = None  # OI = optionality insensitive
     self._new_parents = 0
+    self._field_id_table = None
+    self._min_set_size = MIN_SET_SIZE
+    self._typenames = []  # complete types, indexed by type id
+    self._field_sets = []  # field bitsets, indexed by type id
+    self._fields_by_id = {}
+    self._types_by_field = {}
+    self._complete_field_bits = {}
 
   def Analyze(self):
     """Performs analysis on the universe to suggest parentage and naming.
@@ -108,7 +190,8 @@ class EntityTypeManager(findings_lib.Findings):
       be used for debugging.
     """
     self._complete_field_sets_oi = {}
-    self._typenames_by_subset_oi = {}
+    self._typenames_by_subset_oi = None
+    self._field_id_table = self._universe.GetFieldIdTable()
 
     findings = []
     self._MapFields(MIN_SET_SIZE)
@@ -126,7 +209,7 @@ class EntityTypeManager(findings_lib.Findings):
       # used by the commented code below, reduce the verbosity of warnings.
       # incomplete_parent_rollup = {}
       # Check each complete type for partial types having same fields
-      possible_parents = self._typenames_by_subset_oi.get(subset, None)
+      possible_parents = self._GetSupersetTypenames(subset)
       if not possible_parents:
         continue
 
@@ -148,7 +231,7 @@ class EntityTypeManager(findings_lib.Findings):
         best_diff = 1000000
         best_incomplete_diff = 1000000
         best_incomplete_diff_opt = 1000000
-        entity_type_fields = set(entity_type.GetAllFields().keys())
+        type_bitsets = self._GetFieldBitsets(typename)
         # get difference set of entity_type and each parent with this subset
         # check that every remaining field is optional.
         # Each loop tests one possible pairing
@@ -168,28 +251,24 @@ class EntityTypeManager(findings_lib.Findings):
           if not (p_match and t_match and (p_match == t_match)):
             continue
 
-          parent_fields = set(parent_entity.GetAllFields().keys())
-          subset_fields = parent_fields.intersection(entity_type_fields)
-          diff = parent_fields.difference(entity_type_fields)
+          parent_bitsets = self._GetFieldBitsets(parent)
+          subset_bits = parent_bitsets.all & type_bitsets.all
+          diff_bits = parent_bitsets.all & ~type_bitsets.all
 
           # skip anything where the diff is 0 because it will be handled by
           # duplicate type. this may not ever happen because complete types
           # should be stripped out of the map
-          if not diff:
+          if not diff_bits:
             continue
 
-          # Validate that common fields are compatible
-          optionality_compatible = True
-          optionality_changes = 0
-          for field in subset_fields:
-            parent_field = parent_entity.GetAllFields()[field]
-            child_field = entity_type.GetAllFields()[field]
-            if not parent_field.optional and child_field.optional:
-              optionality_compatible = False
-            if parent_field != child_field:
-              optionality_changes += 1
-          if not optionality_compatible:
+          # Validate that common fields are compatible: no field required by
+          # the parent may be optional in the child.
+          if parent_bitsets.required & ~type_bitsets.required & subset_bits:
             continue
+          optionality_changes = entity_type_lib.CountBits(
+              (parent_bitsets.required ^ type_bitsets.required) & subset_bits
+          )
+          diff = self._field_id_table.ToNames(diff_bits)
 
           is_match = True
           is_optional = False
@@ -308,19 +387,14 @@ class EntityTypeManager(findings_lib.Findings):
               and other_name not in entity_type.parent_names
           ):
 
-            optionality_compatible = True
-            optionality_changes = 0
-            for field in entity_type.GetAllFields():
-              parent_field = entity_type.GetAllFields()[field]
-              other_field = other_type.GetAllFields()[field]
-              if not parent_field.optional and other_field.optional:
-                optionality_compatible = False
-                break
-              if parent_field != other_field:
-                optionality_changes += 1
-            if not optionality_compatible:
+            # Field sets are equal, so only optionality can differ.
+            type_required = self._GetFieldBitsets(typename).required
+            other_required = self._GetFieldBitsets(other_name).required
+            if type_required & ~other_required:
               continue
-            not_related[other_name] = optionality_changes
+            not_related[other_name] = entity_type_lib.CountBits(
+                type_required ^ other_required
+            )
 
         if not not_related:
           continue
@@ -333,6 +407,10 @@ class EntityTypeManager(findings_lib.Findings):
         findings.append(finding)
     return findings
 
+  def _GetFieldBitsets(self, qualified_name):
+    split = qualified_name.split('/')
+    return self._universe.GetFieldBitsets(split[0], split[1])
+
   def _GetTypeByName(self, qualified_name):
     split = qualified_name.split('/')
     return self._universe.GetEntityType(split[0], split[1])
@@ -342,131 +420,88 @@ class EntityTypeManager(findings_lib.Findings):
     return self._universe.GetNamespace(split[0])
 
   def _MapFields(self, min_set_size):
-    """Executes unique common subsets detection.
+    """Indexes the field sets of the complete types.
 
-    Identifies all the unique field subsets of at least min_set_size that have
-    at least 2 associated types. As a side effect this also creates
-    a map of all the field sets for complete types. Both optionality sensitive
-    and optionality insensitive version of the maps are created.
+    Creates a map of all the field sets for complete types, in its
+    optionality insensitive version, and the field bitsets from which
+    GetTypenamesBySubsetOI() mines the unique common field subsets of at least
+    min_set_size fields.
 
     Args:
       min_set_size: minimum number of fields a subset must have to be included
     """
-    current_shard = set()
-    type_shards = []
-    type_shards.append(current_shard)
+    self._min_set_size = min_set_size
+    self._typenames = []
+    self._field_sets = []
+    self._fields_by_id = {}
+    self._complete_field_bits = {}
     complete_field_sets_output = {}
-    typenames_by_subset_output = {}
-    # Map each individual field to the types that have that field
-    # In the process also define groups of types to shard
-    field_to_typenames = {}
     for namespace in self._universe.GetNamespaces():
       ns_name = namespace.namespace
       for entity_type in namespace.valid_types_map.values():
         if entity_type.allow_undefined_fields or entity_type.is_abstract:
           continue
         full_qual_type = f'{ns_name}/{entity_type.typename}'
-
-        # Sharding list calculation
-        if len(current_shard) >= MAX_TYPE_SHARD_SIZE:
-          current_shard = set()
-          type_shards.append(current_shard)
-        current_shard.add(full_qual_type)
-
+        field_bits = self._GetFieldBitsets(full_qual_type).all
+        self._typenames.append(full_qual_type)
+        self._field_sets.append(field_bits)
+
+        all_fields = entity_type.GetAllFields()
+        for field_name, field in all_fields.items():
+          self._fields_by_id[self._field_id_table.GetId(field_name)] = (
+              field.field
+          )
         all_qualified_fields = frozenset(
-            [et.field for et in entity_type.GetAllFields().values()]
+            [et.field for et in all_fields.values()]
         )
 
-        for full_qual_field in all_qualified_fields:
-          if full_qual_field not in field_to_typenames:
-            field_to_typenames[full_qual_field] = set()
-          field_to_typenames[full_qual_field].add(full_qual_type)
-
         # Add type to mapping of full type field sets.
         if all_qualified_fields not in complete_field_sets_output:
           complete_field_sets_output[all_qualified_fields] = set()
+          self._complete_field_bits[all_qualified_fields] = field_bits
         complete_field_sets_output[all_qualified_fields].add(full_qual_type)
 
-    # Evaluate the sets in each shard and merge them
-    for shard in type_shards:
-      typenames_by_subset = self._MapTypenamesBySubset(
-          shard, field_to_typenames, min_set_size
-      )
-
-      # Check each new subset against the existing master subsets
-      # NB: All subsets should initially be large enough
-      new_subsets = {}
-      for subset in typenames_by_subset:
-        if subset not in typenames_by_subset_output:
-          if subset not in new_subsets:
-            new_subsets[subset] = set()
-          new_subsets[subset].update(typenames_by_subset[subset])
-
-        for master_subset in typenames_by_subset_output:
-          # Add new Types to master group for any identical field subsets
-          if subset == master_subset:
-            typenames_by_subset_output[master_subset].update(
-                typenames_by_subset[subset]
-            )
-            continue
-
-          # Find the common fields from the two field sets
-          new_subset = frozenset(subset.intersection(master_subset))
-          # if new set of fields is big enough, save for addition to master list
-          if len(new_subset) >= min_set_size:
-            combined_typenames = typenames_by_subset[subset].union(
-                typenames_by_subset_output[master_subset]
-            )
-            if new_subset not in typenames_by_subset_output:
-              if new_subset not in new_subsets:
-                new_subsets[new_subset] = set()
-              new_subsets[new_subset].update(combined_typenames)
-              continue
-            typenames_by_subset_output[new_subset].update(combined_typenames)
-
-      # Add any new subsets that were created
-      for new_subset in new_subsets:
-        typenames_by_subset_output[new_subset] = new_subsets[new_subset]
-
-    self._typenames_by_subset_oi = typenames_by_subset_output
+    self._types_by_field = _IndexTypesByField(self._field_sets)
     self._complete_field_sets_oi = complete_field_sets_output
-    _CleanMap(self._typenames_by_subset_oi, self._complete_field_sets_oi)
 
-  def _MapTypenamesBySubset(
-      self, types_to_include, field_to_typenames, min_set_size
-  ):
-    """Creates a map of type sets keyed by unique fields sets."""
+  def _GetSupersetTypenames(self, complete_subset):
+    """Returns the names of types whose fields strictly contain a type's fields.
 
-    subsets_by_typegroup = {}
-    for field in field_to_typenames:
-      types_with_field = field_to_typenames[field].intersection(
-          types_to_include
-      )
-      i = 1
-      stable_types_with_field = list(types_with_field)
-      while i <= len(stable_types_with_field):
-        groups = itertools.combinations(stable_types_with_field, i)
-        for group in groups:
-          typegroup = frozenset(group)
-          if typegroup not in subsets_by_typegroup:
-            subsets_by_typegroup[typegroup] = set()
-          subsets_by_typegroup[typegroup].add(field)
-        i += 1
-
-    # at the end of the above, it's possible to get multiple type groups with
-    # the same field sets.  We merge them below to get one group of types mapped
-    # to each unique set of fields
-    # Reverse the mapping to find unique subsets and their associated types
-    typenames_by_subset = {}
-    for typegroup in subsets_by_typegroup:
-      fields = subsets_by_typegroup[typegroup]
-      if len(fields) < min_set_size:
-        continue
-      field_set = frozenset(fields)
-      if field_set not in typenames_by_subset:
-        typenames_by_subset[field_set] = set()
-      typenames_by_subset[field_set].update(typegroup)
+    This is the GetTypenamesBySubsetOI() entry of a complete field set, found
+    by intersecting the per field type bitsets instead of mining all subsets.
 
+    Args:
+      complete_subset: a key of the complete field sets map.
+    """
+    if len(complete_subset) < self._min_set_size:
+      return set()
+    type_bits = (1 << len(self._typenames)) - 1
+    for field_id in entity_type_lib.BitsToIds(
+        self._complete_field_bits[complete_subset]
+    ):
+      type_bits &= self._types_by_field[field_id]
+    typenames = {
+        self._typenames[type_id]
+        for type_id in entity_type_lib.BitsToIds(type_bits)
+    }
+    return typenames.difference(self._complete_field_sets_oi[complete_subset])
+
+  def _MapTypenamesBySubset(self):
+    """Creates a map of type sets keyed by unique common fields sets."""
+    typenames_by_subset = {}
+    closed_field_sets = _MineClosedFieldSets(
+        self._field_sets, self._min_set_size
+    )
+    for field_bits, type_bits in closed_field_sets.items():
+      subset = frozenset(
+          self._fields_by_id[field_id]
+          for field_id in entity_type_lib.BitsToIds(field_bits)
+      )
+      typenames_by_subset[subset] = {
+          self._typenames[type_id]
+          for type_id in entity_type_lib.BitsToIds(type_bits)
+      }
+    _CleanMap(typenames_by_subset, self._complete_field_sets_oi)
     return typenames_by_subset
 
   def GetCompleteFieldSetsOI(self) -> Dict[FrozenSet[str], Set[EntityType]]:
@@ -492,7 +527,11 @@ class EntityTypeManager(findings_lib.Findings):
     # NOTE:This is a temporary implementation meant for development
     # TODO(travis) :Refactor underlying logic to expose field subset to entity
     # type maps
-    if self._typenames_by_subset_oi is None:
+    if self._complete_field_sets_oi is None:
       # pylint: disable=broad-exception-raised
       raise Exception('Run Analyze() to access this mapping')
+    # Analyze() itself only needs the entries of complete field sets, so the
+    # whole map is mined on first access.
+    if self._typenames_by_subset_oi is None:
+      self._typenames_by_subset_oi = self._MapTypenamesBySubset()
     return self._typenames_by_subset_oi
@@ -26,6 +26,7 @@ import os
 from yamlformat.validator import base_lib
 from yamlformat.validator import findings_lib
 from yamlformat.validator import presubmit_validate_types_lib
+from yamlformat.validator import profile_lib
 
 
 def Validate(
@@ -34,6 +35,8 @@ def Validate(
     changed_directory,
     interactive=True,
     require_type_guids=True,
+    base_cache_dir=None,
+    profile_path=None,
 ):
   """Validates two directory paths of a diff of ontology versions.
 
@@ -48,6 +51,10 @@ def Validate(
     require_type_guids: whether type guids are required to be present. This is
       needed to bypass write permission issues on the ontology validator GitHub
       Action.
+    base_cache_dir: optional directory persisting the universe of the original
+      ontology across runs.
+    profile_path: optional path of a JSON file to write the time and memory of
+      each phase of the validation to. Memory is traced with tracemalloc.
 
   Raises:
     Exception: The Ontology is not valid.
@@ -56,24 +63,42 @@ def Validate(
     changed_directory = original_directory
     original_directory = None
 
-  modified_base = RecursiveDirWalk(original_directory)
-  modified_client = RecursiveDirWalk(changed_directory)
-
-  if interactive:
-    presubmit_validate_types_lib.RunInteractive(
-        filter_text, modified_base, modified_client, require_type_guids
-    )
-  else:
-    findings = presubmit_validate_types_lib.RunPresubmit(
-        [], modified_base, modified_client, require_type_guids
-    )
-    presubmit_validate_types_lib.PrintFindings(findings, '')
-    # TODO(charbelk): add diff files in the presubmit in modified base
-    findings_class = findings_lib.Findings()
-    findings_class.AddFindings(findings)
-    if not findings_class.IsValid():
-      # pylint: disable=broad-exception-raised
-      raise Exception('The Ontology is no longer valid.')
+  profiler = profile_lib.PhaseProfiler(trace_memory=profile_path is not None)
+  try:
+    with profiler.Phase('file_walk'):
+      modified_base = RecursiveDirWalk(original_directory)
+      modified_client = RecursiveDirWalk(changed_directory)
+
+    if interactive:
+      presubmit_validate_types_lib.RunInteractive(
+          filter_text,
+          modified_base,
+          modified_client,
+          require_type_guids,
+          base_cache_dir,
+          profiler,
+      )
+    else:
+      findings = presubmit_validate_types_lib.RunPresubmit(
+          [],
+          modified_base,
+          modified_client,
+          require_type_guids,
+          base_cache_dir,
+          profiler=profiler,
+      )
+      presubmit_validate_types_lib.PrintFindings(findings, '')
+      # TODO(charbelk): add diff files in the presubmit in modified base
+      findings_class = findings_lib.Findings()
+      findings_class.AddFindings(findings)
+      if not findings_class.IsValid():
+        # pylint: disable=broad-exception-raised
+        raise Exception('The Ontology is no longer valid.')
+  finally:
+    profiler.Stop()
+    if profile_path:
+      profiler.WriteJson(profile_path)
+      print(f'[INFO]\tWrote validation profile to {profile_path}')
 
 
 def RecursiveDirWalk(directory):
@@ -17,8 +17,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import bisect
+import collections
 import re
-from typing import Dict, List, NamedTuple, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from yamlformat.validator import base_lib
 from yamlformat.validator import config_folder_lib
@@ -52,12 +54,404 @@ def SplitFieldName(qualified_field_name):
   return namespace, field_only
 
 
+def _IntersectSorted(left: List[int], right: List[int]) -> List[int]:
+  """Intersects two sorted lists of unique ints, left being the shorter."""
+  intersection = []
+  start = 0
+  for value in left:
+    start = bisect.bisect_left(right, value, start)
+    if start == len(right):
+      break
+    if right[start] == value:
+      intersection.append(value)
+  return intersection
+
+
+class SubfieldIndex(object):
+  """An inverted index from subfields to the fields composed of them.
+
+  Fields are numbered in the sorted order of their qualified names, so every
+  posting list is sorted and multi-subfield queries are merge intersections.
+
+  Returns:
+    An instance of the SubfieldIndex class.
+  """
+
+  def __init__(self, namespace_fields: Dict[str, List['Field']]):
+    """Init.
+
+    Args:
+      namespace_fields: a map of namespace names to the fields defined there.
+    """
+    super().__init__()
+    qualified_fields = sorted(
+        (namespace + '/' + field.name, namespace, field)
+        for namespace, fields in namespace_fields.items()
+        for field in fields
+    )
+    self._qualified_names = [name for name, _, _ in qualified_fields]
+    self._postings: Dict[str, List[int]] = collections.defaultdict(list)
+    self._namespaces: Dict[str, List[str]] = collections.defaultdict(list)
+    for field_id, (_, namespace, field) in enumerate(qualified_fields):
+      for subfield in field.subfields:
+        self._postings[subfield].append(field_id)
+      self._namespaces[field.name].append(namespace)
+
+  def GetFieldsWithSubfields(self, subfields: Iterable[str]) -> List[str]:
+    """Returns the fields composed of all of the given subfields.
+
+    Subfields match exactly, so 'air' does not match a 'chair' subfield.
+
+    Args:
+      subfields: subfield names, in any order.
+
+    Returns:
+      A sorted list of qualified field names, e.g. '/zone_air_temperature'. All
+      fields are returned if subfields is empty.
+    """
+    postings = []
+    for subfield in set(subfields):
+      posting = self._postings.get(subfield)
+      if not posting:
+        return []
+      postings.append(posting)
+    if not postings:
+      return list(self._qualified_names)
+    postings.sort(key=len)
+    field_ids = postings[0]
+    for posting in postings[1:]:
+      field_ids = _IntersectSorted(field_ids, posting)
+      if not field_ids:
+        break
+    return [self._qualified_names[field_id] for field_id in field_ids]
+
+  def GetFieldNamespaces(self, fieldname: str) -> List[str]:
+    """Returns the sorted names of namespaces defining a field.
+
+    Args:
+      fieldname: name of a field without namespace or increment.
+    """
+    return list(self._namespaces.get(fieldname, []))
+
+
+# Default number of suggestions returned for an undefined field name.
+DEFAULT_SUGGESTION_LIMIT = 3
+# Length of the character n-grams indexed by FieldSuggester.
+_NGRAM_SIZE = 3
+
+
+def GetMaxSuggestionDistance(fieldname: str) -> int:
+  """Returns the edit distance allowed between a name and its suggestions.
+
+  One edit is allowed per four characters, between one and three edits, so
+  short names are not matched to unrelated short fields.
+
+  Args:
+    fieldname: the field name to find suggestions for.
+  """
+  return min(3, max(1, len(fieldname) // 4))
+
+
+def BoundedEditDistance(
+    source: str, target: str, max_distance: int
+) -> Optional[int]:
+  """Returns the Levenshtein distance of two strings if within a bound.
+
+  Only a diagonal band of width 2 * max_distance + 1 is computed, and the
+  computation stops as soon as every cell of a row exceeds max_distance.
+
+  Args:
+    source: the first string.
+    target: the second string.
+    max_distance: the largest distance of interest.
+
+  Returns:
+    The edit distance, or None if it is greater than max_distance.
+  """
+  if abs(len(source) - len(target)) > max_distance:
+    return None
+  if source == target:
+    return 0
+  out_of_bound = max_distance + 1
+  previous_row = [
+      column if column <= max_distance else out_of_bound
+      for column in range(len(target) + 1)
+  ]
+  for row in range(1, len(source) + 1):
+    first_column = max(1, row - max_distance)
+    last_column = min(len(target), row + max_distance)
+    current_row = [out_of_bound] * (len(target) + 1)
+    current_row[0] = row if row <= max_distance else out_of_bound
+    row_minimum = current_row[0]
+    source_char = source[row - 1]
+    for column in range(first_column, last_column + 1):
+      # Inlined minimum of substitution, deletion and insertion costs.
+      distance = previous_row[column - 1]
+      if source_char != target[column - 1]:
+        distance += 1
+      if previous_row[column] < distance:
+        distance = previous_row[column] + 1
+      if current_row[column - 1] < distance:
+        distance = current_row[column - 1] + 1
+      if distance > out_of_bound:
+        distance = out_of_bound
+      current_row[column] = distance
+      if distance < row_minimum:
+        row_minimum = distance
+    if row_minimum > max_distance:
+      return None
+    previous_row = current_row
+  distance = previous_row[len(target)]
+  return distance if distance <= max_distance else None
+
+
+def SuggestClosestNames(
+    name: str,
+    candidates: Iterable[str],
+    limit: int = DEFAULT_SUGGESTION_LIMIT,
+) -> List[str]:
+  """Returns the candidates closest to a name by bounded edit distance.
+
+  Suitable for small candidate sets, such as the fields of one entity type.
+  Use FieldUniverse.GetFieldSuggestions() to search the whole ontology.
+
+  Args:
+    name: the undefined name.
+    candidates: valid names to choose from.
+    limit: the maximum number of suggestions.
+
+  Returns:
+    Up to limit candidates, other than name, ordered by distance then name.
+  """
+  max_distance = GetMaxSuggestionDistance(name)
+  scored = []
+  for candidate in set(candidates):
+    if candidate == name:
+      continue
+    distance = BoundedEditDistance(name, candidate, max_distance)
+    if distance is not None:
+      scored.append((distance, candidate))
+  return [candidate for _, candidate in sorted(scored)[:limit]]
+
+
+def _GetNGrams(name: str) -> Set[str]:
+  """Returns the distinct character n-grams of a name padded at both ends."""
+  padded = f'^{name}$'
+  return {
+      padded[start : start + _NGRAM_SIZE]
+      for start in range(len(padded) - _NGRAM_SIZE + 1)
+  }
+
+
+class FieldSuggester(object):
+  """Suggests valid fields close to an undefined field name.
+
+  Candidates come from a character n-gram index: a field within edit distance
+  k of a name shares all but at most k * n of the name's distinct n-grams, so
+  only fields passing that count filter are verified with a bounded edit
+  distance. Names too short for the filter to require a shared n-gram are
+  instead verified against every field whose length is within k of theirs.
+  Fields made of the same subfields in another order, e.g.
+  temperature_zone_air_sensor, are suggested after the close spellings.
+
+  Results are cached per name and namespace, since configs repeat the same
+  undefined fields across many entities.
+
+  Returns:
+    An instance of the FieldSuggester class.
+  """
+
+  def __init__(self, namespace_fields: Dict[str, List['Field']]):
+    """Init.
+
+    Args:
+      namespace_fields: a map of namespace names to the fields defined there.
+    """
+    super().__init__()
+    self._fields: List[Tuple[str, str]] = []
+    self._postings: Dict[str, List[int]] = collections.defaultdict(list)
+    self._fields_by_key: Dict[frozenset, List[int]] = collections.defaultdict(
+        list
+    )
+    self._fields_by_length: Dict[int, List[int]] = collections.defaultdict(list)
+    for namespace, fields in sorted(namespace_fields.items()):
+      for field in sorted(fields, key=lambda field: field.name):
+        field_id = len(self._fields)
+        self._fields.append((namespace, field.name))
+        for ngram in _GetNGrams(field.name):
+          self._postings[ngram].append(field_id)
+        self._fields_by_key[frozenset(field.name.split('_'))].append(field_id)
+        self._fields_by_length[len(field.name)].append(field_id)
+    self._cache: Dict[Tuple[str, Optional[str], int], List[str]] = {}
+
+  def Suggest(
+      self,
+      fieldname: str,
+      namespace_name: Optional[str] = None,
+      limit: int = DEFAULT_SUGGESTION_LIMIT,
+  ) -> List[str]:
+    """Returns the valid fields closest to a field name.
+
+    Args:
+      fieldname: a field name without namespace or increment.
+      namespace_name: [Optional] restricts suggestions to fields visible from
+        this namespace, which are its own and the global fields.
+      limit: the maximum number of suggestions.
+
+    Returns:
+      Up to limit qualified field names, e.g. '/zone_air_temperature_sensor',
+      ordered by edit distance then name. The name itself is never suggested.
+    """
+    cache_key = (fieldname, namespace_name, limit)
+    suggestions = self._cache.get(cache_key)
+    if suggestions is None:
+      suggestions = self._Suggest(fieldname, namespace_name, limit)
+      self._cache[cache_key] = suggestions
+    return list(suggestions)
+
+  def _Suggest(
+      self, fieldname: str, namespace_name: Optional[str], limit: int
+  ) -> List[str]:
+    max_distance = GetMaxSuggestionDistance(fieldname)
+    ngrams = _GetNGrams(fieldname)
+    min_shared = len(ngrams) - max_distance * _NGRAM_SIZE
+    if min_shared > 0:
+      shared_counts = collections.Counter()
+      for ngram in ngrams:
+        shared_counts.update(self._postings.get(ngram, ()))
+      candidates = [
+          field_id
+          for field_id, shared in shared_counts.items()
+          if shared >= min_shared
+      ]
+    else:
+      # Fields within the distance may share no n-gram at all
+      candidates = [
+          field_id
+          for length in range(
+              len(fieldname) - max_distance, len(fieldname) + max_distance + 1
+          )
+          for field_id in self._fields_by_length.get(length, ())
+      ]
+
+    ranked = {}
+    for field_id in candidates:
+      if not self._IsVisible(field_id, namespace_name):
+        continue
+      name = self._fields[field_id][1]
+      if name == fieldname:
+        continue
+      distance = BoundedEditDistance(fieldname, name, max_distance)
+      if distance is not None:
+        ranked[field_id] = distance
+    for field_id in self._fields_by_key.get(
+        frozenset(fieldname.split('_')), ()
+    ):
+      if field_id in ranked or not self._IsVisible(field_id, namespace_name):
+        continue
+      if self._fields[field_id][1] != fieldname:
+        ranked[field_id] = max_distance + 1
+
+    suggestions = sorted(
+        ranked, key=lambda field_id: (ranked[field_id], self._fields[field_id])
+    )
+    return [
+        self._fields[field_id][0] + '/' + self._fields[field_id][1]
+        for field_id in suggestions[:limit]
+    ]
+
+  def _IsVisible(self, field_id: int, namespace_name: Optional[str]) -> bool:
+    if namespace_name is None:
+      return True
+    return self._fields[field_id][0] in ('', namespace_name)
+
+
 class FieldUniverse(findings_lib.FindingsUniverse):
   """Helper class to represent the defined universe of fields.
 
   Only contains valid fields.
   """
 
+  def __init__(self, folders):
+    """Init.
+
+    Args:
+      folders: list of FieldFolder objects parsed from field files.
+    """
+    super().__init__(folders)
+    # Lookups of the fields, built on first use from the namespace map. They
+    # are dropped when the map is replaced or InvalidateFieldLookups() is
+    # called.
+    self._lookup_source = None
+    self._subfield_index: Optional[SubfieldIndex] = None
+    self._field_suggester: Optional[FieldSuggester] = None
+    self._field_names: Dict[str, frozenset] = {}
+
+  def InvalidateFieldLookups(self) -> None:
+    """Drops the lookups built from the namespace map.
+
+    Call this after changing the fields of the namespace map in place. The map
+    is a snapshot of the namespaces' fields, so fields inserted into a
+    namespace afterwards do not change it.
+    """
+    self._lookup_source = None
+
+  def _ResetLookupsIfStale(self) -> None:
+    """Drops lookups built from another namespace map or invalidated."""
+    if self._lookup_source is not self._namespace_map:
+      self._lookup_source = self._namespace_map
+      self._subfield_index = None
+      self._field_suggester = None
+      self._field_names = {}
+
+  def GetSubfieldIndex(self) -> SubfieldIndex:
+    """Returns a SubfieldIndex of the fields, built on first use."""
+    self._ResetLookupsIfStale()
+    if self._subfield_index is None:
+      self._subfield_index = SubfieldIndex(self._namespace_map)
+    return self._subfield_index
+
+  def GetFieldSuggestions(
+      self,
+      fieldname: str,
+      namespace_name: Optional[str] = None,
+      limit: int = DEFAULT_SUGGESTION_LIMIT,
+  ) -> List[str]:
+    """Returns the defined fields closest to an undefined field name.
+
+    See FieldSuggester.Suggest().
+
+    Args:
+      fieldname: string. Name of a field, optionally with increment.
+      namespace_name: [Optional] string. Restricts suggestions to fields
+        visible from this namespace.
+      limit: the maximum number of suggestions.
+    """
+    self._ResetLookupsIfStale()
+    if self._field_suggester is None:
+      self._field_suggester = FieldSuggester(self._namespace_map)
+    fieldname_part, _ = entity_type_lib.SeparateFieldIncrement(fieldname)
+    return self._field_suggester.Suggest(fieldname_part, namespace_name, limit)
+
+  def GetFieldsWithSubfields(self, subfields: Iterable[str]) -> List[str]:
+    """Returns sorted qualified names of fields made of all given subfields.
+
+    See SubfieldIndex.GetFieldsWithSubfields().
+
+    Args:
+      subfields: subfield names, in any order.
+    """
+    return self.GetSubfieldIndex().GetFieldsWithSubfields(subfields)
+
+  def GetFieldNamespaces(self, fieldname: str) -> List[str]:
+    """Returns the sorted names of namespaces defining a field.
+
+    Args:
+      fieldname: string. Name of a field, optionally with increment.
+    """
+    fieldname_part, _ = entity_type_lib.SeparateFieldIncrement(fieldname)
+    return self.GetSubfieldIndex().GetFieldNamespaces(fieldname_part)
+
   def _GetNamespaceMapValue(self, namespace: str) -> List['Field']:
     """Helper method for FindingsUniverse._MakeNamespaceMap.
 
@@ -82,9 +476,14 @@ class FieldUniverse(findings_lib.FindingsUniverse):
       namespace_name: string.
     """
     fieldname_part, _ = entity_type_lib.SeparateFieldIncrement(fieldname)
-    return fieldname_part in {
-        field.name for field in self._namespace_map.get(namespace_name, [])
-    }
+    self._ResetLookupsIfStale()
+    field_names = self._field_names.get(namespace_name)
+    if field_names is None:
+      field_names = frozenset(
+          field.name for field in self._namespace_map.get(namespace_name, [])
+      )
+      self._field_names[namespace_name] = field_names
+    return fieldname_part in field_names
 
   def GetFieldsMap(
       self, namespace_name: Optional[str] = None
@@ -507,6 +906,7 @@ class FieldNamespace(findings_lib.Findings):
     if field.key in self.fields:
       return self.fields[field.key]
     self.fields[field.key] = field
+    self._InvalidateFindings()
     return None
 
   def InsertField(self, field):
@@ -20,6 +20,62 @@ MISSING_PARENT_VALIDATION_RANK = 60
 
 # TODO(b/254872070): Add type annotations
 
+# Identity token replaced by InvalidateFindings(), which invalidates the
+# aggregated findings cached by every Findings object in the process.
+_findings_epoch = object()
+# Generation handed to the objects whose findings are being collected.
+_collecting_generation = None
+
+
+def InvalidateFindings():
+  """Invalidates the aggregated findings cached by all Findings objects.
+
+  This drops the caches of every universe in the process, including ones
+  unrelated to the change. Changes made through Findings methods and the
+  namespace insert methods only invalidate the tree they belong to, so call
+  this only after changing which child objects a Findings object collects
+  findings from by other means.
+  """
+  global _findings_epoch
+  _findings_epoch = object()
+
+
+class FindingsGeneration(object):
+  """Counter of the changes to the findings of a tree of Findings objects.
+
+  The root of a tree, usually a universe, hands its generation to the objects
+  it collects findings from, so a change anywhere in the tree invalidates the
+  findings cached in that tree only. An object collected into a second tree
+  forwards the changes of the second tree's generation to the first, whose
+  caches still hold the object's findings.
+
+  Attributes:
+    count: number of changes to the findings of the tree.
+  """
+
+  def __init__(self):
+    self.count = 0
+    self._forwards = []
+
+  def Invalidate(self):
+    """Counts a change to this generation and those it forwards to."""
+    pending = [self]
+    seen = set()
+    while pending:
+      generation = pending.pop()
+      if id(generation) in seen:
+        continue
+      seen.add(id(generation))
+      generation.count += 1
+      pending.extend(generation._forwards)  # pylint: disable=protected-access
+
+  def Forward(self, generation):
+    """Makes changes to this generation invalidate another generation too."""
+    if generation is not self and all(
+        forward is not generation for forward in self._forwards
+    ):
+      self._forwards.append(generation)
+
 
 def MakeFieldString(field):
   """Represents OptWrapper as a string prepending '(opt)' for optional fields.
@@ -161,6 +217,11 @@ class Findings(object):
   def __init__(self):
     self._findings_list = []
     self._is_changed = False
+    self._own_generation = FindingsGeneration()
+    self._generation = self._own_generation
+    # Maps filter_old_warnings to a tuple of the findings epoch, generation and
+    # generation count, the findings and their number of errors.
+    self._findings_cache = {}
 
   def _GetDynamicFindings(self, filter_old_warnings):
     """Override this to include additional findings not in self._findings_list.
@@ -206,16 +267,64 @@ class Findings(object):
       )
 
     self._findings_list.append(finding)
+    self._InvalidateFindings()
 
-  def GetFindings(self, filter_old_warnings=False):
-    """Get findings found under this object.
+  def _InvalidateFindings(self):
+    """Invalidates the findings cached by the tree this object belongs to.
+
+    AddFinding() and SetChanged() call this. Subclasses call it as well after
+    changing which child objects they collect findings from, e.g. after
+    inserting a new item into a namespace.
+    """
+    self._generation.Invalidate()
+
+  def _AdoptGeneration(self, generation):
+    """Joins the tree of the object collecting findings from this one."""
+    if generation is self._generation:
+      return
+    if self._generation is not self._own_generation:
+      # A parent outside the new tree may still cache this object's findings
+      generation.Forward(self._generation)
+    self._generation = generation
+
+  def _GetCachedFindings(self, filter_old_warnings):
+    """Returns the cached findings and error count, collecting them if stale.
 
     Args:
       filter_old_warnings: Set True to filter warnings on unchanged components.
 
     Returns:
-      A list of findings for this object and its children
+      A tuple of the list of findings for this object and its children, which
+      must not be modified, and the number of ValidationErrors in it.
     """
+    global _collecting_generation
+    if _collecting_generation is not None:
+      self._AdoptGeneration(_collecting_generation)
+    generation = self._generation
+    cached = self._findings_cache.get(filter_old_warnings)
+    if (
+        cached is None
+        or cached[0] is not _findings_epoch
+        or cached[1] is not generation
+        or cached[2] != generation.count
+    ):
+      epoch = _findings_epoch
+      count = generation.count
+      parent_generation = _collecting_generation
+      _collecting_generation = generation
+      try:
+        findings = self._CollectFindings(filter_old_warnings)
+      finally:
+        _collecting_generation = parent_generation
+      error_count = sum(
+          1 for finding in findings if isinstance(finding, ValidationError)
+      )
+      cached = (epoch, generation, count, findings, error_count)
+      self._findings_cache[filter_old_warnings] = cached
+    return cached[3], cached[4]
+
+  def _CollectFindings(self, filter_old_warnings):
+    """Walks this object and its children to collect their findings."""
     dynamic_findings = self._GetDynamicFindings(filter_old_warnings)
     if not filter_old_warnings:
       return list(_DedupFindings(self._findings_list + dynamic_findings))
@@ -226,27 +335,46 @@ class Findings(object):
         filtered_findings.append(finding)
     return _SortFindings(_DedupFindings(filtered_findings))
 
+  def GetFindings(self, filter_old_warnings=False):
+    """Get findings found under this object.
+
+    Findings are collected once and cached until a finding is added or a
+    component is changed in the tree this object belongs to.
+
+    Args:
+      filter_old_warnings: Set True to filter warnings on unchanged components.
+
+    Returns:
+      A list of findings for this object and its children
+    """
+    findings, _ = self._GetCachedFindings(filter_old_warnings)
+    return list(findings)
+
+  def GetErrorCount(self):
+    """Returns the number of actionable errors for this object and children."""
+    _, error_count = self._GetCachedFindings(False)
+    return error_count
+
   def HasFindingTypes(self, finding_types):
     """Returns true if any finding is one of the types in findings_types.
 
     Args:
       finding_types: list of types of findings.
     """
-    for finding in self.GetFindings():
+    findings, _ = self._GetCachedFindings(False)
+    for finding in findings:
       if isinstance(finding, tuple(finding_types)):
         return True
     return False
 
   def IsValid(self):
     """Returns true if there are no actionable errors in _findings_list."""
-    for finding in self.GetFindings():
-      if isinstance(finding, ValidationError):
-        return False
-    return True
+    return self.GetErrorCount() == 0
 
   def SetChanged(self):
     """Marks this object as containing a change in the latest cl."""
     self._is_changed = True
+    self._InvalidateFindings()
 
   def IsChanged(self):
     """Returns True if this object contains a change in the latest cl."""
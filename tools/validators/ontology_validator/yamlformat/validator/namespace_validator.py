@@ -24,6 +24,25 @@ from yamlformat.validator import findings_lib
 MIN_SIZE_FOR_LOCAL_FIELD_DUPES = 2
 
 
+def _InheritFields(entity_type, fields):
+  """Merges a parent's fields into the inherited fields of an entity type.
+
+  A required field takes precedence over an optional one with the same name.
+
+  Args:
+    entity_type: EntityType inheriting the fields.
+    fields: dictionary of qualified field names to OptWrapper tuples of the
+      parent, which is read and never modified.
+  """
+  inherited_fields = entity_type.inherited_field_names
+  if not inherited_fields:
+    inherited_fields.update(fields)
+    return
+  for field, fv in fields.items():
+    if not fv.optional or field not in inherited_fields:
+      inherited_fields[field] = fv
+
+
 class NamespaceValidator(findings_lib.Findings):
   """Validates types across namespaces and records findings.
 
@@ -73,9 +92,8 @@ class NamespaceValidator(findings_lib.Findings):
     for type_namespace in type_namespaces_map.values():
       namespace = type_namespace.namespace
       for entity_type in type_namespace.valid_types_map.values():
-        on_stack = set()
         try:
-          self._ExpandFieldsForType(namespace, entity_type, on_stack)
+          self._ExpandFieldsForType(namespace, entity_type)
         # terminate if any fatal inheritance errors are encountered
         except (
             findings_lib.NonexistentEntityProcessError,
@@ -83,91 +101,100 @@ class NamespaceValidator(findings_lib.Findings):
         ):
           break
 
-  def _ExpandFieldsForType(self, namespace, entity_type, on_stack):
-    """Updates the inherited_field_names attribute for an entity recursively.
+  def _ExpandFieldsForType(self, namespace, entity_type):
+    """Updates the inherited_field_names attribute for an entity and ancestors.
 
-    Uses a DFS approach. Expands fields during the DFS according to parent
-       relationships and updates inherited_field_names for all entity
-       types encountered. All types encountered are marked as expanded
-       (inherited_fields_expanded is set to True)
+    Uses an iterative DFS over parent relationships, so the depth of the
+    hierarchy is not bound by the recursion limit. Parents are expanded before
+    their children and every type encountered is marked as expanded
+    (inherited_fields_expanded is set to True), so each type's fields are
+    computed once and the expansion of all types is linear in the size of the
+    inheritance graph. Children merge the memoized field maps of their parents
+    without copying them.
 
     If cycles are detected in the inheritance graph, records
       InheritanceCycleError.
-    If a parent entity type does not exist, records NonexistentParentError.
+    If a parent entity type does not exist, records NonexistentParentError for
+      the type and each type on the DFS stack that depends on it.
 
     Args:
-      namespace: namespace we are currently in.
-      entity_type: current entity_type object.
-      on_stack: set to keep track of nodes on the recursion stack.
-
-    Returns:
-      Set of local and inherited fields for entity_type, if it exists.
+      namespace: namespace of entity_type.
+      entity_type: entity_type object to expand.
 
     Raises:
       NonexistentEntityProcessError: entity type does not exist.
       InheritanceCycleProcessError: inheritance cycle detected.
     """
-
     # if current entity does not exist, record error
     if not entity_type:
       raise findings_lib.NonexistentEntityProcessError('')
 
-    # If reached leaf node or entity_type has already been expanded,
-    # return the union of the local and inherited field sets
+    # Leaf nodes and types that have already been expanded are done.
     if not entity_type.parent_names or entity_type.inherited_fields_expanded:
       entity_type.inherited_fields_expanded = True
-      return entity_type.GetAllFields()
+      return
 
-    # Add current entity to recursion stack.
+    # Each frame is a type being expanded, its stack key, an iterator over its
+    # parent names and the parent name being expanded.
     stack_key = f'{namespace}/{entity_type.typename}'
-    on_stack.add(stack_key)
-
-    # Recurse for all parents. If any parent is in on_stack,
-    # report a cycle.
-    for parent_literal in entity_type.parent_names:
-      # Get namespace info and a normalized key from parent.
-      # Parent_name has already been validated for formatting.
-      parent_tuple = entity_type.parent_names[parent_literal]
-      parent_namespace = parent_tuple.namespace
-      parent_name = parent_tuple.typename
-      parent_key = parent_literal
+    stack = [[entity_type, stack_key, iter(entity_type.parent_names), None]]
+    on_stack = {stack_key}
+    while stack:
+      frame = stack[-1]
+      current_type = frame[0]
+      parent_literal = next(frame[2], None)
+      frame[3] = parent_literal
+
+      # All parents are merged: mark the type as expanded and merge its fields
+      # into the child that is waiting on it.
+      if parent_literal is None:
+        current_type.inherited_fields_expanded = True
+        on_stack.remove(frame[1])
+        stack.pop()
+        if stack:
+          _InheritFields(stack[-1][0], current_type.GetAllFields())
+        continue
 
       # if on stack, there is a cycle
-      if parent_key in on_stack:
+      if parent_literal in on_stack:
         self.AddFinding(
-            findings_lib.InheritanceCycleError(entity_type, parent_literal)
+            findings_lib.InheritanceCycleError(current_type, parent_literal)
         )
         raise findings_lib.InheritanceCycleProcessError('')
 
-      # Recurse.
-      try:
-        parent_type = None
-        type_namespace = self.type_namespaces_map.get(parent_namespace)
-        if type_namespace is not None:
-          parent_type = type_namespace.valid_types_map.get(parent_name)
-        if parent_type is not None and parent_type.allow_undefined_fields:
+      # Get namespace info from parent.
+      # Parent_name has already been validated for formatting.
+      parent_tuple = current_type.parent_names[parent_literal]
+      parent_type = None
+      type_namespace = self.type_namespaces_map.get(parent_tuple.namespace)
+      if type_namespace is not None:
+        parent_type = type_namespace.valid_types_map.get(parent_tuple.typename)
+      if not parent_type:
+        for waiting_frame in reversed(stack):
           self.AddFinding(
-              findings_lib.PassthroughParentError(entity_type, parent_name)
+              findings_lib.NonexistentParentError(
+                  waiting_frame[0], waiting_frame[3]
+              )
           )
-          continue
-        fields = self._ExpandFieldsForType(
-            parent_namespace, parent_type, on_stack
-        )
-      except findings_lib.NonexistentEntityProcessError as e:
+        raise findings_lib.NonexistentEntityProcessError('')
+      if parent_type.allow_undefined_fields:
         self.AddFinding(
-            findings_lib.NonexistentParentError(entity_type, parent_key)
+            findings_lib.PassthroughParentError(
+                current_type, parent_tuple.typename
+            )
         )
-        raise e
-      for field in fields:
-        fv = fields[field]
-        if not fv.optional or field not in entity_type.inherited_field_names:
-          entity_type.inherited_field_names[field] = fv
-
-    # Mark entity as expanded
-    entity_type.inherited_fields_expanded = True
-    on_stack.remove(stack_key)
-    # Return union of local and inherited fields
-    return entity_type.GetAllFields()
+        continue
+
+      if not parent_type.parent_names or parent_type.inherited_fields_expanded:
+        parent_type.inherited_fields_expanded = True
+        _InheritFields(current_type, parent_type.GetAllFields())
+        continue
+
+      parent_key = f'{parent_tuple.namespace}/{parent_type.typename}'
+      stack.append(
+          [parent_type, parent_key, iter(parent_type.parent_names), None]
+      )
+      on_stack.add(parent_key)
 
   def _FindBadIncrements(self, type_namespaces_map):
     """Add errors if any types have incremented fields without duplicate bases.
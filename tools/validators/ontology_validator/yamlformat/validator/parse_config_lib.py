@@ -92,13 +92,61 @@ UniqueKeyLoader.add_constructor(
 )
 
 
-def _ParseFoldersFromFiles(files, component_type, create_folder_fn):
+class DocumentCache(object):
+  """Yaml documents of config files, reused while the files are unchanged.
+
+  Parsing yaml is most of the time it takes to build a universe. A cache lets
+  repeated builds of an ontology, as in watch mode, only parse the files that
+  changed since the last build. A file is considered unchanged while its
+  modification time and size are.
+  """
+
+  def __init__(self):
+    # Maps absolute file paths to a tuple of the file signature, the documents
+    # of the file and the finding raised while parsing them, if any.
+    self._entries = {}
+
+  def LoadDocuments(self, file_path):
+    """Returns the documents of a config file and its parse finding, if any.
+
+    Documents before a ParseError are returned along with its finding, the way
+    they are added to a folder when the file is parsed directly.
+
+    Args:
+      file_path: absolute path of the config file.
+
+    Raises:
+      OSError: if the file cannot be read.
+      yaml.YAMLError: if the file is not valid yaml.
+    """
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = self._entries.get(file_path)
+    if entry is not None and entry[0] == signature:
+      return entry[1], entry[2]
+
+    documents = []
+    finding = None
+    with open(file_path, 'r', encoding='utf-8') as f:
+      try:
+        for document in yaml.load_all(f, Loader=UniqueKeyLoader):
+          documents.append(document)
+      except ParseError as e:
+        finding = e.finding
+    self._entries[file_path] = (signature, documents, finding)
+    return documents, finding
+
+
+def _ParseFoldersFromFiles(
+    files, component_type, create_folder_fn, document_cache=None
+):
   """Returns a list of ConfigFolder objects parsed from the given files.
 
   Args:
     files: list of absolute paths to config files.
     component_type: the component associated with the created folders.
     create_folder_fn: function to create an instance of a ConfigFolder subclass.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   if not files:
@@ -120,6 +168,7 @@ def _ParseFoldersFromFiles(files, component_type, create_folder_fn):
         None,
         create_folder_fn,
         files_by_folder.get(global_path, []),
+        document_cache,
     )
     folders.append(global_folder)
     global_namespace = global_folder.local_namespace
@@ -132,15 +181,30 @@ def _ParseFoldersFromFiles(files, component_type, create_folder_fn):
             global_namespace,
             create_folder_fn,
             files_by_folder.get(folderpath),
+            document_cache,
         )
     )
   return folders
 
 
-def _CreateFolder(folderpath, global_namespace, create_folder_fn, file_tuples):
+def _CreateFolder(
+    folderpath,
+    global_namespace,
+    create_folder_fn,
+    file_tuples,
+    document_cache=None,
+):
   """Creates a ConfigFolder for the given folderpath."""
   folder = create_folder_fn(folderpath, global_namespace)
   for ft in file_tuples:
+    if document_cache is not None:
+      documents, finding = document_cache.LoadDocuments(
+          os.path.join(ft.root, ft.relative_path)
+      )
+      folder.AddFromConfig(documents, ft.relative_path)
+      if finding is not None:
+        folder.AddFinding(finding)
+      continue
     with open(
         os.path.join(ft.root, ft.relative_path), 'r', encoding='utf-8'
     ) as f:
@@ -154,7 +218,10 @@ def _CreateFolder(folderpath, global_namespace, create_folder_fn, file_tuples):
 
 
 def ParseFieldFoldersFromFiles(
-    field_files, subfield_universe=None, state_universe=None
+    field_files,
+    subfield_universe=None,
+    state_universe=None,
+    document_cache=None,
 ):
   """Returns list of FieldFolder objects parsed from field_files.
 
@@ -164,6 +231,7 @@ def ParseFieldFoldersFromFiles(
       given, validation of subfields is not performed.
     state_universe: optional StateUniverse object for validation. If not given,
       validation of states is not performed.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateFieldFolder(folderpath, parent_namespace):
@@ -180,12 +248,15 @@ def ParseFieldFoldersFromFiles(
     return field_folder
 
   return _ParseFoldersFromFiles(
-      field_files, base_lib.ComponentType.FIELD, CreateFieldFolder
+      field_files,
+      base_lib.ComponentType.FIELD,
+      CreateFieldFolder,
+      document_cache,
   )
 
 
 def ParseTypeFoldersFromFiles(
-    types_files, field_universe=None, guid_required=True
+    types_files, field_universe=None, guid_required=True, document_cache=None
 ):
   """Returns list of EntityTypeFolder objects parsed from types_files.
 
@@ -193,6 +264,8 @@ def ParseTypeFoldersFromFiles(
     types_files: list of absolute paths to entity type files.
     field_universe: optional FieldsUniverse object for field validation. If not
       given, validation of fields is not performed.
+    guid_required: whether entity type guids are required.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateEntityTypeFolder(folderpath, parent_namespace):
@@ -202,15 +275,19 @@ def ParseTypeFoldersFromFiles(
     )
 
   return _ParseFoldersFromFiles(
-      types_files, base_lib.ComponentType.ENTITY_TYPE, CreateEntityTypeFolder
+      types_files,
+      base_lib.ComponentType.ENTITY_TYPE,
+      CreateEntityTypeFolder,
+      document_cache,
   )
 
 
-def ParseSubfieldFoldersFromFiles(subfield_files):
+def ParseSubfieldFoldersFromFiles(subfield_files, document_cache=None):
   """Returns list of SubfieldFolder objects parsed from subfield_files.
 
   Args:
     subfield_files: list of absolute paths to subfield files.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateSubfieldFolder(folderpath, parent_namespace):
@@ -218,15 +295,19 @@ def ParseSubfieldFoldersFromFiles(subfield_files):
     return subfield_lib.SubfieldFolder(folderpath)
 
   return _ParseFoldersFromFiles(
-      subfield_files, base_lib.ComponentType.SUBFIELD, CreateSubfieldFolder
+      subfield_files,
+      base_lib.ComponentType.SUBFIELD,
+      CreateSubfieldFolder,
+      document_cache,
   )
 
 
-def ParseStateFoldersFromFiles(state_files):
+def ParseStateFoldersFromFiles(state_files, document_cache=None):
   """Returns list of StateFolder objects parsed from state_files.
 
   Args:
     state_files: list of absolute paths to state files.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateStateFolder(folderpath, parent_namespace):
@@ -234,15 +315,19 @@ def ParseStateFoldersFromFiles(state_files):
     return state_lib.StateFolder(folderpath)
 
   return _ParseFoldersFromFiles(
-      state_files, base_lib.ComponentType.MULTI_STATE, CreateStateFolder
+      state_files,
+      base_lib.ComponentType.MULTI_STATE,
+      CreateStateFolder,
+      document_cache,
   )
 
 
-def ParseConnectionFoldersFromFiles(connection_files):
+def ParseConnectionFoldersFromFiles(connection_files, document_cache=None):
   """Returns list of ConnectionFolder objects parsed from connection_files.
 
   Args:
     connection_files: list of absolute paths to connection files.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateConnectionFolder(folderpath, parent_namespace):
@@ -253,16 +338,20 @@ def ParseConnectionFoldersFromFiles(connection_files):
       connection_files,
       base_lib.ComponentType.CONNECTION,
       CreateConnectionFolder,
+      document_cache,
   )
 
 
-def ParseUnitFoldersFromFiles(unit_files, subfield_universe=None):
+def ParseUnitFoldersFromFiles(
+    unit_files, subfield_universe=None, document_cache=None
+):
   """Returns list of UnitFolder objects parsed from unit_files.
 
   Args:
     unit_files: list of absolute paths to unit files.
     subfield_universe: optional SubfieldUniverse object for validation. If not
       given, validation of subfields is not performed.
+    document_cache: optional DocumentCache to load yaml documents from.
   """
 
   def CreateUnitFolder(folderpath, parent_namespace):
@@ -274,7 +363,10 @@ def ParseUnitFoldersFromFiles(unit_files, subfield_universe=None):
     return unit_folder
 
   return _ParseFoldersFromFiles(
-      unit_files, base_lib.ComponentType.UNIT, CreateUnitFolder
+      unit_files,
+      base_lib.ComponentType.UNIT,
+      CreateUnitFolder,
+      document_cache,
   )
 
 
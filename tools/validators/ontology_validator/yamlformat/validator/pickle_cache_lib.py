@@ -0,0 +1,161 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pickle files of built objects keyed by the hash of their inputs and code.
+
+A cached object is only valid for the input files it was built from and for
+the code of the classes it is made of. Keys therefore combine a hash of the
+input files with a fingerprint of the sources of the packages defining the
+pickled classes, so that upgrading either invalidates old files.
+
+Only load files written by this module into a cache directory you control:
+unpickling runs code named by the file.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+from typing import List, Optional, Type
+
+from yamlformat.validator import base_lib
+
+PICKLE_FILE_EXTENSION = '.pickle'
+
+# Errors raised by unpickling a truncated file or one written by other code.
+_UNPICKLING_ERRORS = (
+    OSError,
+    EOFError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+    pickle.UnpicklingError,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def SourceFingerprint(*source_dirs: str) -> str:
+  """Computes a hash of the python sources of package directories.
+
+  Args:
+    source_dirs: directories holding the modules of the pickled classes.
+
+  Returns:
+    A hex sha256 digest, which changes if any module of the directories is
+    added, removed, renamed or edited, or with the python version.
+  """
+  digest = hashlib.sha256(f'python:{sys.version_info[:2]}'.encode('utf-8'))
+  for source_dir in source_dirs:
+    for file_name in sorted(os.listdir(source_dir)):
+      if not file_name.endswith('.py'):
+        continue
+      digest.update(file_name.encode('utf-8') + b'\0')
+      with open(os.path.join(source_dir, file_name), 'rb') as source_file:
+        digest.update(hashlib.sha256(source_file.read()).digest())
+  return digest.hexdigest()
+
+
+def ComputeFilesHash(
+    path_parts_list: List[base_lib.PathParts], *keys: str
+) -> str:
+  """Computes a hash of file paths and contents, in order, and extra keys.
+
+  Args:
+    path_parts_list: PathParts of the input files.
+    *keys: other inputs of the cached object, such as build options and a
+      SourceFingerprint().
+
+  Returns:
+    A hex sha256 digest, which changes if any file is added, removed, renamed,
+    reordered or edited, or if any key changes.
+  """
+  digest = hashlib.sha256('\0'.join(keys).encode('utf-8'))
+  for path_parts in path_parts_list:
+    digest.update(path_parts.relative_path.encode('utf-8') + b'\0')
+    file_path = os.path.join(path_parts.root, path_parts.relative_path)
+    with open(file_path, 'rb') as input_file:
+      digest.update(hashlib.sha256(input_file.read()).digest())
+  return digest.hexdigest()
+
+
+def GetPicklePath(cache_dir: str, key: str) -> str:
+  """Returns the path of the pickle file of a key in cache_dir."""
+  return os.path.join(cache_dir, key + PICKLE_FILE_EXTENSION)
+
+
+def LoadPickle(
+    pickle_path: str, expected_type: Type[object], description: str
+) -> Optional[object]:
+  """Loads a pickled object.
+
+  Args:
+    pickle_path: path of a file written by SavePickle().
+    expected_type: the type the object must have to be returned.
+    description: what the object is, for warnings.
+
+  Returns:
+    The object, or None if the file is missing, unreadable or holds an object
+    of another type.
+  """
+  if not os.path.isfile(pickle_path):
+    return None
+  try:
+    with open(pickle_path, 'rb') as pickle_file:
+      loaded = pickle.loads(pickle_file.read())
+  except _UNPICKLING_ERRORS as error:
+    print(
+        f'[WARNING]\tIgnoring unreadable {description} {pickle_path}: {error}',
+        file=sys.stderr,
+    )
+    return None
+  if not isinstance(loaded, expected_type):
+    print(
+        f'[WARNING]\tIgnoring invalid {description} {pickle_path}',
+        file=sys.stderr,
+    )
+    return None
+  return loaded
+
+
+def SavePickle(obj: object, pickle_path: str, description: str) -> None:
+  """Pickles an object to a file.
+
+  The file is written atomically, so a concurrent or interrupted run never
+  leaves a partial file behind. Failures are reported and otherwise ignored,
+  as the cache is only an optimization.
+
+  Args:
+    obj: the object to persist.
+    pickle_path: path of the file to write.
+    description: what the object is, for warnings.
+  """
+  os.makedirs(os.path.dirname(pickle_path) or os.curdir, exist_ok=True)
+  tmp_path = f'{pickle_path}.{os.getpid()}.tmp'
+  try:
+    with open(tmp_path, 'wb') as pickle_file:
+      pickle.dump(obj, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, pickle_path)
+  except (OSError, pickle.PicklingError, RecursionError) as error:
+    print(
+        f'[WARNING]\tCould not write {description} {pickle_path}: {error}',
+        file=sys.stderr,
+    )
+    if os.path.exists(tmp_path):
+      os.remove(tmp_path)
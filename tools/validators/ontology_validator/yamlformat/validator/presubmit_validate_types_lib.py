@@ -35,9 +35,11 @@ from yamlformat.validator import field_lib
 from yamlformat.validator import findings_lib
 from yamlformat.validator import namespace_validator
 from yamlformat.validator import parse_config_lib as parse
+from yamlformat.validator import profile_lib
 from yamlformat.validator import state_lib
 from yamlformat.validator import subfield_lib
 from yamlformat.validator import unit_lib
+from yamlformat.validator import universe_cache_lib
 
 # Define namedtuple Config to store the different kinds of config files
 # All attributes should be tuples.
@@ -55,6 +57,9 @@ Config = NamedTuple(
     ],
 )
 
+# Base universe of the last validation in this process, keyed by config hash.
+_base_universe_memo = {}
+
 
 class ConfigUniverse(findings_lib.Findings):
   """Helper class to represent the defined universe of ontology configuration.
@@ -119,6 +124,18 @@ class ConfigUniverse(findings_lib.Findings):
       findings += self.unit_universe.GetFindings(filter_old_warnings)
     return findings
 
+  def GetTypeHierarchy(self):
+    """Get the transitive closure of the entity type hierarchy, if defined.
+
+    Returns:
+      An entity_type_lib.TypeHierarchy for ancestor and descendant lookups, or
+      None if no EntityTypeUniverse is defined.
+    """
+    if not self.entity_type_universe:
+      print('EntityTypeUniverse undefined in ConfigUniverse')
+      return None
+    return self.entity_type_universe.GetTypeHierarchy()
+
   def GetEntityTypeNamespaces(self):
     """Get the entity type namespace objects in this universe, if defined.
 
@@ -215,7 +232,9 @@ class ConfigUniverse(findings_lib.Findings):
     return self.state_universe_reverse_map.get(namespace + '/' + std_field)
 
 
-def BuildUniverse(config, require_type_guids=True):
+def BuildUniverse(
+    config, require_type_guids=True, document_cache=None, profiler=None
+):
   """Verifies that the ontology config is consistent and valid.
 
   Args:
@@ -223,53 +242,72 @@ def BuildUniverse(config, require_type_guids=True):
     require_type_guids: whether type guids are required to be present. This is
       needed to bypass write permission issues on the ontology validator GitHub
       Action.
+    document_cache: optional parse_config_lib.DocumentCache to load yaml
+      documents of unchanged files from.
+    profiler: optional profile_lib.PhaseProfiler recording a phase per
+      component.
 
   Returns:
      A ConfigUniverse that is fully populated with all content specified in the
      config.
   """
+  if profiler is None:
+    profiler = profile_lib.PhaseProfiler()
+
   # Parse state files
   state_universe = None
   if config.states:
-    state_folders = parse.ParseStateFoldersFromFiles(config.states)
-    state_universe = state_lib.StateUniverse(state_folders)
+    with profiler.Phase('states'):
+      state_folders = parse.ParseStateFoldersFromFiles(
+          config.states, document_cache
+      )
+      state_universe = state_lib.StateUniverse(state_folders)
 
   connections_universe = None
   if config.connections:
-    connection_folders = parse.ParseConnectionFoldersFromFiles(
-        config.connections
-    )
-    connections_universe = connection_lib.ConnectionUniverse(connection_folders)
+    with profiler.Phase('connections'):
+      connection_folders = parse.ParseConnectionFoldersFromFiles(
+          config.connections, document_cache
+      )
+      connections_universe = connection_lib.ConnectionUniverse(
+          connection_folders
+      )
 
   # Parse subfield files
   subfields_universe = None
   if config.subfields:
-    subfield_folders = parse.ParseSubfieldFoldersFromFiles(config.subfields)
-    subfields_universe = subfield_lib.SubfieldUniverse(subfield_folders)
+    with profiler.Phase('subfields'):
+      subfield_folders = parse.ParseSubfieldFoldersFromFiles(
+          config.subfields, document_cache
+      )
+      subfields_universe = subfield_lib.SubfieldUniverse(subfield_folders)
 
   # Parse unit files
   unit_universe = None
   if config.units:
-    unit_folders = parse.ParseUnitFoldersFromFiles(
-        config.units, subfields_universe
-    )
-    unit_universe = unit_lib.UnitUniverse(unit_folders)
-    if subfields_universe:
-      subfields_universe.ValidateUnits(unit_universe)
+    with profiler.Phase('units'):
+      unit_folders = parse.ParseUnitFoldersFromFiles(
+          config.units, subfields_universe, document_cache
+      )
+      unit_universe = unit_lib.UnitUniverse(unit_folders)
+      if subfields_universe:
+        subfields_universe.ValidateUnits(unit_universe)
 
   # Parse fields files
   fields_universe = None
   if config.fields:
-    field_folders = parse.ParseFieldFoldersFromFiles(
-        config.fields, subfields_universe, state_universe
-    )
-    fields_universe = field_lib.FieldUniverse(field_folders)
+    with profiler.Phase('fields'):
+      field_folders = parse.ParseFieldFoldersFromFiles(
+          config.fields, subfields_universe, state_universe, document_cache
+      )
+      fields_universe = field_lib.FieldUniverse(field_folders)
 
   # Parse typedef files
-  type_folders = parse.ParseTypeFoldersFromFiles(
-      config.type_defs, fields_universe, require_type_guids
-  )
-  types_universe = entity_type_lib.EntityTypeUniverse(type_folders)
+  with profiler.Phase('entity_types'):
+    type_folders = parse.ParseTypeFoldersFromFiles(
+        config.type_defs, fields_universe, require_type_guids, document_cache
+    )
+    types_universe = entity_type_lib.EntityTypeUniverse(type_folders)
 
   # return findings_list, result_namespaces
   return ConfigUniverse(
@@ -371,6 +409,72 @@ def SeparateConfigFiles(path_tuples):
   )
 
 
+def _BuildBaseUniverse(
+    base_paths,
+    require_type_guids,
+    cache_dir=None,
+    document_cache=None,
+    profiler=None,
+):
+  """Builds the base universe of a validation, with type fields expanded.
+
+  The base files are usually the same across many validations, so the universe
+  is reused when the paths and contents of the base files are unchanged: from
+  memory within a process and from cache_dir across processes. The base
+  universe is only read by the validation, so it is safe to share.
+
+  Args:
+    base_paths: unchanged and original versions of changed config files.
+    require_type_guids: whether entity type guids are required.
+    cache_dir: optional directory persisting base universes across runs.
+    document_cache: optional parse_config_lib.DocumentCache to load yaml
+      documents of unchanged files from.
+    profiler: optional profile_lib.PhaseProfiler recording the build phases.
+
+  Returns:
+    A ConfigUniverse of the base files with inherited type fields expanded.
+  """
+  config_hash = None
+  universe_path = None
+  if base_paths:
+    config_hash = universe_cache_lib.ComputeConfigHash(
+        base_paths, require_type_guids
+    )
+    if config_hash in _base_universe_memo:
+      return _base_universe_memo[config_hash]
+    if cache_dir:
+      universe_path = universe_cache_lib.GetUniversePath(cache_dir, config_hash)
+      universe = universe_cache_lib.LoadUniverse(universe_path)
+      if isinstance(universe, ConfigUniverse):
+        _base_universe_memo.clear()
+        _base_universe_memo[config_hash] = universe
+        return universe
+
+  if profiler is None:
+    profiler = profile_lib.PhaseProfiler()
+  universe = BuildUniverse(
+      SeparateConfigFiles(base_paths),
+      require_type_guids,
+      document_cache,
+      profiler,
+  )
+  # Run validation on base universe to expand types.
+  with profiler.Phase('namespace_validation'):
+    namespace_validator.NamespaceValidator(universe.GetEntityTypeNamespaces())
+  # Memoize type fingerprints so they are reused and persisted too.
+  for type_namespace in universe.GetEntityTypeNamespaces():
+    for entity_type in type_namespace.valid_types_map.values():
+      if entity_type.inherited_fields_expanded:
+        entity_type.GetFingerprint()
+
+  if config_hash:
+    _base_universe_memo.clear()
+    _base_universe_memo[config_hash] = universe
+    if universe_path:
+      universe_cache_lib.SaveUniverse(universe, universe_path)
+  return universe
+
+
 # pylint: disable=consider-using-f-string
 def _ValidateConfigInner(
     unmodified,
@@ -378,6 +482,9 @@ def _ValidateConfigInner(
     modified_client,
     interactive=False,
     require_type_guids=True,
+    base_cache_dir=None,
+    document_cache=None,
+    profiler=None,
 ):
   """Runs config validation and finding filtration.
 
@@ -387,26 +494,35 @@ def _ValidateConfigInner(
     modified_client: paths to changed files in validation
     interactive: Set true for timing log messages.
     require_type_guids: whether entity type guids are required
+    base_cache_dir: optional directory persisting base universes across runs
+    document_cache: optional parse_config_lib.DocumentCache to load yaml
+      documents of unchanged files from
+    profiler: optional profile_lib.PhaseProfiler recording the time and memory
+      of each phase of the validation
 
   Returns:
     A tuple with a list of findings from validation and the universe
   """
+  if profiler is None:
+    profiler = profile_lib.PhaseProfiler()
 
   # Separate different kinds of config files
   # Concatenate paths such that the changed files go last.  This is important
   # because we always want conflicts between new and old files to show as
   # being caused by new changes and files are processed in order.
-  start_time = time.time()
-  cl_paths = unmodified + modified_client
-  cl_config = SeparateConfigFiles(cl_paths)
-  new_universe = BuildUniverse(cl_config, require_type_guids)
-  end_time = time.time()
+  with profiler.Phase('new_universe'):
+    cl_paths = unmodified + modified_client
+    cl_config = SeparateConfigFiles(cl_paths)
+    new_universe = BuildUniverse(
+        cl_config, require_type_guids, document_cache, profiler
+    )
 
   if interactive:
     print(
-        'New universe build: {0} seconds.\n'.format(str(end_time - start_time))
+        'New universe build: {0} seconds.\n'.format(
+            str(profiler.GetSeconds('new_universe'))
+        )
     )
-    start_time = end_time
 
   if not new_universe.IsValid():
     findings = [
@@ -418,9 +534,10 @@ def _ValidateConfigInner(
 
   # Validate across the type namespaces. Short-circuit if validation fails and
   # return any breaking findings.
-  cl_validator = namespace_validator.NamespaceValidator(
-      new_universe.GetEntityTypeNamespaces()
-  )
+  with profiler.Phase('new_namespace_validation'):
+    cl_validator = namespace_validator.NamespaceValidator(
+        new_universe.GetEntityTypeNamespaces()
+    )
   if not cl_validator.IsValid():
     universe_errors = []
     universe_errors = [
@@ -433,63 +550,71 @@ def _ValidateConfigInner(
     return cl_validator.GetFindings() + universe_errors, new_universe
 
   if interactive:
-    end_time = time.time()
-    print('New ns check: {0} seconds.\n'.format(str(end_time - start_time)))
-    start_time = end_time
+    print(
+        'New ns check: {0} seconds.\n'.format(
+            str(profiler.GetSeconds('new_namespace_validation'))
+        )
+    )
 
-  base_paths = unmodified + modified_base
-  base_config = SeparateConfigFiles(base_paths)
-  old_universe = BuildUniverse(base_config, require_type_guids)
+  with profiler.Phase('old_universe'):
+    base_paths = unmodified + modified_base
+    old_universe = _BuildBaseUniverse(
+        base_paths, require_type_guids, base_cache_dir, document_cache, profiler
+    )
 
   if interactive:
-    end_time = time.time()
-    print('Old uverse build: {0} seconds.\n'.format(str(end_time - start_time)))
-    start_time = end_time
+    print(
+        'Old uverse build: {0} seconds.\n'.format(
+            str(profiler.GetSeconds('old_universe'))
+        )
+    )
 
-  # Run validation on base universe to expand types.
-  namespace_validator.NamespaceValidator(old_universe.GetEntityTypeNamespaces())
+  with profiler.Phase('type_analysis'):
+    mgr = entity_type_manager.EntityTypeManager(
+        new_universe.entity_type_universe
+    )
+    mgr.Analyze()
+    del mgr
 
   if interactive:
-    end_time = time.time()
-    print('Old ns check: {0} seconds.\n'.format(str(end_time - start_time)))
-    start_time = end_time
+    print(
+        'Type analysis: {0} seconds.\n'.format(
+            str(profiler.GetSeconds('type_analysis'))
+        )
+    )
 
-  mgr = entity_type_manager.EntityTypeManager(new_universe.entity_type_universe)
-  mgr.Analyze()
-  del mgr
+  with profiler.Phase('backwards_compatibility'):
+    CheckBackwardsCompatibility(
+        new_universe.entity_type_universe, old_universe.entity_type_universe
+    )
 
   if interactive:
-    end_time = time.time()
-    print('Type analysis: {0} seconds.\n'.format(str(end_time - start_time)))
-    start_time = end_time
-
-  CheckBackwardsCompatibility(
-      new_universe.entity_type_universe, old_universe.entity_type_universe
-  )
+    print(
+        'Backwards compat: {0} seconds.\n'.format(
+            str(profiler.GetSeconds('backwards_compatibility'))
+        )
+    )
 
-  if interactive:
-    end_time = time.time()
-    print('Backwards compat: {0} seconds.\n'.format(str(end_time - start_time)))
-    start_time = end_time
-
-  # TODO(berkoben) pass this to methods below when fixing b/116850383?
-  # cl_path_set = set(cl_paths)
-  if new_universe.entity_type_universe:
-    _SetTypeFolderChanges(
-        list(new_universe.entity_type_universe.namespace_folder_map.values())
+  with profiler.Phase('change_marking'):
+    # TODO(berkoben) pass this to methods below when fixing b/116850383?
+    # cl_path_set = set(cl_paths)
+    if new_universe.entity_type_universe:
+      _SetTypeFolderChanges(
+          list(new_universe.entity_type_universe.namespace_folder_map.values())
+      )
+    _SetFieldChanges(new_universe.field_universe, old_universe.field_universe)
+    _SetSubfieldChanges(
+        new_universe.subfield_universe, old_universe.subfield_universe
     )
-  _SetFieldChanges(new_universe.field_universe, old_universe.field_universe)
-  _SetSubfieldChanges(
-      new_universe.subfield_universe, old_universe.subfield_universe
-  )
-  _SetStateChanges(new_universe.state_universe, old_universe.state_universe)
-  _SetUnitChanges(new_universe.unit_universe, old_universe.unit_universe)
+    _SetStateChanges(new_universe.state_universe, old_universe.state_universe)
+    _SetUnitChanges(new_universe.unit_universe, old_universe.unit_universe)
 
-  filtered_findings = new_universe.GetFindings(True)
-  all_findings = new_universe.GetFindings(False)
-  diff = len(all_findings) - len(filtered_findings)
-  if diff > 0:
-    filtered_findings.append(findings_lib.SuppressedFindingsWarning(diff))
+  with profiler.Phase('findings'):
+    filtered_findings = new_universe.GetFindings(True)
+    all_findings = new_universe.GetFindings(False)
+    diff = len(all_findings) - len(filtered_findings)
+    if diff > 0:
+      filtered_findings.append(findings_lib.SuppressedFindingsWarning(diff))
 
   return filtered_findings, new_universe
 
@@ -578,6 +703,8 @@ def CheckBackwardsCompatibility(new_universe, old_universe):
   Method expects types in passed universe to have inherited_fields_expanded.
   Method has the side effect of setting is_changed field on everything in this
   universe that has changes except folders at the entity type level.
+  Namespaces and types are only compared in detail when their fingerprints
+  differ.
 
   Args:
     new_universe: EntityTypeUniverse object for the new config
@@ -616,6 +743,9 @@ def CheckBackwardsCompatibility(new_universe, old_universe):
     # Remove namespace from new ns map so when we're done we'll only have newly
     # created namespaces left in it.
     new_ns = new_ns_map.pop(ns_name)
+    # Namespaces with the same types have no findings and nothing to mark.
+    if new_ns.GetFingerprint() == old_ns.GetFingerprint():
+      continue
     new_ns_types = new_ns.valid_types_map.copy()
     for type_name in old_ns.valid_types_map:
       old_type = old_ns.valid_types_map[type_name]
@@ -651,6 +781,9 @@ def CheckBackwardsCompatibility(new_universe, old_universe):
       if new_type is None:
         raise RuntimeError('new_type should never be None at this point.')
 
+      if new_type.GetFingerprint() == old_type.GetFingerprint():
+        continue
+
       old_fields = old_type.GetAllFields()
       new_fields = new_type.GetAllFields()
       if old_fields == new_fields:
@@ -702,7 +835,13 @@ def CheckBackwardsCompatibility(new_universe, old_universe):
 
 
 def RunPresubmit(
-    unmodified, modified_base, modified_client, require_type_guids=True
+    unmodified,
+    modified_base,
+    modified_client,
+    require_type_guids=True,
+    base_cache_dir=None,
+    document_cache=None,
+    profiler=None,
 ):
   """Top level runner for presubmit.
 
@@ -711,13 +850,25 @@ def RunPresubmit(
     modified_base: paths to original versions of changed files in validation
     modified_client: paths to changed files in validation
     require_type_guids: whether entity type guids are required
+    base_cache_dir: optional directory persisting base universes across runs
+    document_cache: optional parse_config_lib.DocumentCache to load yaml
+      documents of unchanged files from
+    profiler: optional profile_lib.PhaseProfiler recording the time and memory
+      of each phase of the validation
 
   Returns:
       findings: from the validate configuration results.
   """
 
   findings, _ = _ValidateConfigInner(
-      unmodified, modified_base, modified_client, False, require_type_guids
+      unmodified,
+      modified_base,
+      modified_client,
+      False,
+      require_type_guids,
+      base_cache_dir,
+      document_cache,
+      profiler,
   )
   return findings
 
@@ -776,7 +927,12 @@ def PrintFindings(findings, filter_text):
 
 
 def RunInteractive(
-    filter_text, modified_base, modified_client, require_type_guids=True
+    filter_text,
+    modified_base,
+    modified_client,
+    require_type_guids=True,
+    base_cache_dir=None,
+    profiler=None,
 ):
   """Runs interactive mode when presubmit is run as a standalone application.
 
@@ -789,6 +945,9 @@ def RunInteractive(
     modified_base: paths to original versions of changed files in validation.
     modified_client: the list of modified files to validate.
     require_type_guids: whether entity type guids are required.
+    base_cache_dir: optional directory persisting base universes across runs.
+    profiler: optional profile_lib.PhaseProfiler recording the time and memory
+      of each phase of the validation.
 
   Returns:
     zero.
@@ -796,7 +955,13 @@ def RunInteractive(
   print('Analyzing...')
   start_time = time.time()
   findings, universe = _ValidateConfigInner(
-      [], modified_base, modified_client, True, require_type_guids
+      [],
+      modified_base,
+      modified_client,
+      True,
+      require_type_guids,
+      base_cache_dir,
+      profiler=profiler,
   )
 
   PrintFindings(findings, filter_text)
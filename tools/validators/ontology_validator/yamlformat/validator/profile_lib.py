@@ -0,0 +1,144 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per-phase time and memory profile of ontology validation."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, Optional
+
+# Bump when the layout of the JSON profile changes.
+PROFILE_VERSION = 1
+
+
+class PhaseProfiler(object):
+  """Records the wall time and memory of named phases.
+
+  Phases can be nested: a phase started inside another one is named after it,
+  as in 'new_universe/fields'. When memory is traced, each phase records the
+  peak of memory traced by tracemalloc while it ran and the memory it left
+  allocated. Phases are listed in the order they started.
+
+  Attributes:
+    phases: list of dictionaries describing completed and running phases.
+  """
+
+  def __init__(self, trace_memory: bool = False):
+    """Init.
+
+    Args:
+      trace_memory: set true to record memory with tracemalloc. Tracing is
+        started if it is not already and slows the validation down.
+    """
+    self.phases = []
+    self._trace_memory = trace_memory
+    self._started_tracing = False
+    # Running phases, innermost last, with the peak memory seen so far.
+    self._stack = []
+    if trace_memory and not tracemalloc.is_tracing():
+      tracemalloc.start()
+      self._started_tracing = True
+
+  def Stop(self) -> None:
+    """Stops memory tracing if this profiler started it."""
+    if self._started_tracing:
+      tracemalloc.stop()
+      self._started_tracing = False
+
+  @contextlib.contextmanager
+  def Phase(self, name: str):
+    """Context manager recording the phase run by its body.
+
+    Args:
+      name: name of the phase, unique among the phases of its parent.
+
+    Yields:
+      The dictionary describing the phase, completed on exit.
+    """
+    if self._stack:
+      name = f'{self._stack[-1][0]["name"]}/{name}'
+    phase = {'name': name, 'seconds': None}
+    self.phases.append(phase)
+    tracing = self._trace_memory and tracemalloc.is_tracing()
+    start_memory = 0
+    if tracing:
+      start_memory, peak_memory = tracemalloc.get_traced_memory()
+      if self._stack:
+        self._stack[-1][1] = max(self._stack[-1][1], peak_memory)
+      tracemalloc.reset_peak()
+    frame = [phase, 0]
+    self._stack.append(frame)
+    start_time = time.perf_counter()
+    try:
+      yield phase
+    finally:
+      phase['seconds'] = time.perf_counter() - start_time
+      self._stack.pop()
+      if tracing and tracemalloc.is_tracing():
+        end_memory, peak_memory = tracemalloc.get_traced_memory()
+        peak_memory = max(frame[1], peak_memory)
+        phase['peak_memory_bytes'] = peak_memory
+        phase['allocated_bytes'] = end_memory - start_memory
+        if self._stack:
+          self._stack[-1][1] = max(self._stack[-1][1], peak_memory)
+        tracemalloc.reset_peak()
+
+  def GetSeconds(self, name: str) -> Optional[float]:
+    """Returns the seconds of the last completed phase with a full name."""
+    for phase in reversed(self.phases):
+      if phase['name'] == name and phase['seconds'] is not None:
+        return phase['seconds']
+    return None
+
+  def GetProfile(self) -> Dict[str, Any]:
+    """Returns the profile as a JSON serializable dictionary.
+
+    Totals are over top level phases. Memory is in bytes and only present if
+    it was traced.
+    """
+    top_phases = [
+        phase
+        for phase in self.phases
+        if '/' not in phase['name'] and phase['seconds'] is not None
+    ]
+    profile = {
+        'version': PROFILE_VERSION,
+        'total_seconds': sum(phase['seconds'] for phase in top_phases),
+    }
+    peaks = [
+        phase['peak_memory_bytes']
+        for phase in top_phases
+        if 'peak_memory_bytes' in phase
+    ]
+    if peaks:
+      profile['peak_memory_bytes'] = max(peaks)
+    profile['phases'] = [dict(phase) for phase in self.phases]
+    return profile
+
+  def WriteJson(self, profile_path: str) -> None:
+    """Writes the profile to a JSON file.
+
+    Args:
+      profile_path: path of the file to write.
+    """
+    os.makedirs(os.path.dirname(profile_path) or os.curdir, exist_ok=True)
+    with open(profile_path, 'w', encoding='utf-8') as profile_file:
+      json.dump(self.GetProfile(), profile_file, indent=2)
+      profile_file.write('\n')
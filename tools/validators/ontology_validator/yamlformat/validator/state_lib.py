@@ -145,6 +145,7 @@ class StateNamespace(findings_lib.Findings):
       )
       return
     self.states[state.name] = state
+    self._InvalidateFindings()
 
 
 class State(findings_lib.Findings):
@@ -211,6 +211,7 @@ class SubfieldNamespace(findings_lib.Findings):
       return self.subfields[self._subfields_lower[lower_name]]
     self._subfields_lower[lower_name] = subfield.name
     self.subfields[subfield.name] = subfield
+    self._InvalidateFindings()
     return None
 
   def InsertSubfield(self, subfield):
@@ -31,7 +31,7 @@ CONVERSION_MULTIPLIER_KEY: str = 'multiplier'
 CONVERSION_OFFSET_KEY: str = 'offset'
 
 _MeasurementAlias = NamedTuple(
-    'MeasurementAlias',
+    '_MeasurementAlias',
     [
         ('alias_name', str),
         ('base_name', str),
@@ -352,6 +352,7 @@ class UnitNamespace(findings_lib.Findings):
     # to be in a single dict.
     unit_key = f'{measurement_type}-{unit.name}'
     self.units[unit_key] = unit
+    self._InvalidateFindings()
 
   def InsertMeasurementAlias(self, alias):
     """Inserts a measurement alias into this namespace.
@@ -0,0 +1,90 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persisted config universes keyed by the hash of their files and code.
+
+Presubmits validate many changes against the same base ontology. The base
+universe, with inherited type fields expanded, is written once per distinct
+set of base files and validator sources, and loaded in a single read by later
+runs.
+
+Only load universe files written by this module into a cache directory you
+control: unpickling runs code named by the file.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+from typing import List, Optional
+
+from yamlformat.validator import base_lib
+from yamlformat.validator import pickle_cache_lib
+
+# Directory of the modules defining the classes of a universe, whose sources
+# are part of the cache key.
+_VALIDATOR_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def ComputeConfigHash(
+    path_parts_list: List[base_lib.PathParts], require_type_guids: bool
+) -> str:
+  """Computes a hash of config files, build options and validator sources.
+
+  Files are hashed in the given order, because the order in which they are
+  processed determines which definition wins a conflict.
+
+  Args:
+    path_parts_list: PathParts of the config files.
+    require_type_guids: whether entity type guids are required.
+
+  Returns:
+    A hex sha256 digest, which changes if any file is added, removed, renamed,
+    reordered or edited, or if the validator code changes.
+  """
+  return pickle_cache_lib.ComputeFilesHash(
+      path_parts_list,
+      f'require_type_guids:{require_type_guids}',
+      pickle_cache_lib.SourceFingerprint(_VALIDATOR_SOURCE_DIR),
+  )
+
+
+def GetUniversePath(cache_dir: str, config_hash: str) -> str:
+  """Returns the path of the universe file of a config in cache_dir."""
+  return pickle_cache_lib.GetPicklePath(cache_dir, config_hash)
+
+
+def LoadUniverse(universe_path: str) -> Optional[object]:
+  """Loads a persisted universe.
+
+  Args:
+    universe_path: path of a universe file written by SaveUniverse().
+
+  Returns:
+    The universe, or None if the file is missing or unreadable.
+  """
+  return pickle_cache_lib.LoadPickle(universe_path, object, 'universe')
+
+
+def SaveUniverse(universe: object, universe_path: str) -> None:
+  """Persists a universe.
+
+  The file is written atomically, so a concurrent or interrupted run never
+  leaves a partial universe behind.
+
+  Args:
+    universe: the universe to persist.
+    universe_path: path of the universe file to write.
+  """
+  pickle_cache_lib.SavePickle(universe, universe_path, 'universe')
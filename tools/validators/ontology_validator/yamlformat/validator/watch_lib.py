@@ -0,0 +1,209 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the License);
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an AS IS BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Watch mode of the ontology validator.
+
+An OntologyWatcher revalidates an ontology every time one of its yaml files is
+saved. The yaml documents of the ontology are kept in memory and only the
+files that changed are parsed again, which is most of the time a validation
+takes. The universes are then rebuilt from memory and fields are expanded
+again, and only the findings impacted by the change are reported.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import time
+from typing import List, NamedTuple
+
+import yaml
+
+from yamlformat.validator import external_file_lib
+from yamlformat.validator import findings_lib
+from yamlformat.validator import parse_config_lib
+from yamlformat.validator import presubmit_validate_types_lib
+
+POLL_INTERVAL_SECONDS = 0.5
+
+WatchResult = NamedTuple(
+    'WatchResult',
+    [
+        ('changed_files', List[str]),
+        ('findings', List[findings_lib.Finding]),
+        ('resolved_count', int),
+    ],
+)
+
+
+def _FindingKey(finding):
+  """Returns a key identifying a finding across validations."""
+  filepath = finding.file_context.filepath if finding.file_context else None
+  return (type(finding).__name__, filepath, finding.message)
+
+
+class OntologyWatcher(object):
+  """Revalidates an ontology whenever its yaml files change.
+
+  Files are polled for changes of their modification time or size.
+  """
+
+  def __init__(
+      self,
+      original_directory,
+      changed_directory=None,
+      require_type_guids=True,
+      base_cache_dir=None,
+  ):
+    """Init.
+
+    If no changed directory is given, the original directory is validated as a
+    new ontology, like external_file_lib.Validate() does.
+
+    Args:
+      original_directory: the original directory with ontology yaml files.
+      changed_directory: the changed directory with ontology yaml files.
+      require_type_guids: whether entity type guids are required.
+      base_cache_dir: optional directory persisting the universe of the
+        original ontology across runs.
+    """
+    if not changed_directory:
+      changed_directory = original_directory
+      original_directory = None
+    self._original_directory = original_directory
+    self._changed_directory = changed_directory
+    self._require_type_guids = require_type_guids
+    self._base_cache_dir = base_cache_dir
+    self._document_cache = parse_config_lib.DocumentCache()
+    # Maps absolute file paths to their signature at the last validation.
+    self._signatures = {}
+    # Keys of the findings of the last validation, None before the first one.
+    self._finding_keys = None
+
+  def Poll(self):
+    """Validates the ontology if any of its files changed since the last time.
+
+    Findings are impacted by the change if they are in a changed file or if
+    they were not found by the last validation. All findings are impacted on
+    the first validation.
+
+    Returns:
+      A WatchResult with the changed files, the impacted findings and the
+      number of findings that were resolved, or None if no file changed since
+      the last successful validation.
+
+    Raises:
+      OSError: if a file cannot be read.
+      ValueError: if a file is found in a bad folder.
+      yaml.YAMLError: if a file is not valid yaml.
+    """
+    modified_base = external_file_lib.RecursiveDirWalk(self._original_directory)
+    modified_client = external_file_lib.RecursiveDirWalk(
+        self._changed_directory
+    )
+    signatures = {}
+    relative_paths = {}
+    for path_parts in modified_base + modified_client:
+      file_path = os.path.join(path_parts.root, path_parts.relative_path)
+      try:
+        stat = os.stat(file_path)
+      except FileNotFoundError:
+        # Removed since the walk, it will be missing from the next one.
+        continue
+      signatures[file_path] = (stat.st_mtime_ns, stat.st_size)
+      relative_paths[file_path] = path_parts.relative_path
+
+    changed_files = sorted(
+        file_path
+        for file_path in signatures.keys() | self._signatures.keys()
+        if signatures.get(file_path) != self._signatures.get(file_path)
+    )
+    if not changed_files:
+      return None
+
+    findings = presubmit_validate_types_lib.RunPresubmit(
+        [],
+        modified_base,
+        modified_client,
+        self._require_type_guids,
+        self._base_cache_dir,
+        self._document_cache,
+    )
+    # Files are only validated once the whole ontology was, so a failed
+    # validation is retried on the next poll.
+    self._signatures = signatures
+
+    # Finding contexts hold relative paths, or absolute ones for parse errors.
+    changed_paths = set(changed_files)
+    changed_paths.update(
+        relative_paths[file_path]
+        for file_path in changed_files
+        if file_path in relative_paths
+    )
+    finding_keys = {_FindingKey(finding) for finding in findings}
+    previous_keys = self._finding_keys
+    self._finding_keys = finding_keys
+    if previous_keys is None:
+      return WatchResult(changed_files, findings, 0)
+    impacted_findings = [
+        finding
+        for finding in findings
+        if _FindingKey(finding) not in previous_keys
+        or (
+            finding.file_context
+            and finding.file_context.filepath in changed_paths
+        )
+    ]
+    return WatchResult(
+        changed_files, impacted_findings, len(previous_keys - finding_keys)
+    )
+
+  def Run(self, filter_text=None, poll_interval=POLL_INTERVAL_SECONDS):
+    """Validates the ontology on every change until interrupted.
+
+    Args:
+      filter_text: only findings containing this text are printed, if given.
+      poll_interval: seconds between two polls for changes.
+    """
+    print(
+        f'[INFO]\tWatching {self._changed_directory} for changes. Press Ctrl+C'
+        ' to stop.'
+    )
+    # Failed validations are retried on every poll, so an error is only
+    # printed when it differs from the previous one.
+    last_error = None
+    try:
+      while True:
+        start_time = time.time()
+        try:
+          result = self.Poll()
+          last_error = None
+        except (OSError, ValueError, yaml.YAMLError) as error:
+          if str(error) != last_error:
+            print(f'[ERROR]\tCould not validate the ontology: {error}')
+          last_error = str(error)
+          result = None
+        if result is not None:
+          print(
+              f'[INFO]\tValidated {len(result.changed_files)} changed files in'
+              f' {time.time() - start_time:.2f} seconds.'
+          )
+          presubmit_validate_types_lib.PrintFindings(
+              result.findings, filter_text
+          )
+          if result.resolved_count:
+            print(f'[INFO]\t{result.resolved_count} findings resolved.')
+        time.sleep(poll_interval)
+    except KeyboardInterrupt:
+      print('[INFO]\tStopped watching.')